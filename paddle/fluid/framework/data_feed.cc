@@ -658,6 +658,113 @@ void InMemoryDataFeed<T>::LoadIntoMemoryFromSo() {
 // explicit instantiation
 template class InMemoryDataFeed<Record>;
 
+// Reader of the binary slot records written by a data generator with
+// set_record_format("binary"), see NOTE: [ binary slot records ] in
+// python/paddle/distributed/fleet/data_generator/data_generator.py.
+// A record is a uint32 payload length followed by the payload, which holds
+// every slot as a uint32 header and the values. The header is the feasign
+// number, with kFloatSlotBit set if the values are float32, otherwise they
+// are uint64. Values are cast to the type of the slot in DataFeedDesc.
+class BinarySlotRecordReader {
+ public:
+  static constexpr uint32_t kFloatSlotBit = 1u << 31;
+
+  // Read the next record from fp, return false at the end of the file.
+  bool Read(FILE* fp) {
+    uint32_t len = 0;
+    size_t n = fread(&len, 1, sizeof(len), fp);
+    if (n == 0) {
+      return false;
+    }
+    PADDLE_ENFORCE_EQ(n,
+                      sizeof(len),
+                      common::errors::InvalidArgument(
+                          "The binary slot record is truncated, please check "
+                          "the record format of the data generator."));
+    record_.resize(len);
+    PADDLE_ENFORCE_EQ(fread(&record_[0], 1, len, fp),
+                      len,
+                      common::errors::InvalidArgument(
+                          "The binary slot record is truncated, please check "
+                          "the record format of the data generator."));
+    pos_ = 0;
+    return true;
+  }
+
+  // Move to the values of the next slot, return its feasign number.
+  int NextSlot(size_t slot) {
+    uint32_t header = 0;
+    PADDLE_ENFORCE_LE(pos_ + sizeof(header),
+                      record_.size(),
+                      common::errors::InvalidArgument(
+                          "The binary slot record ends before the %d th slot.",
+                          slot));
+    memcpy(&header, &record_[pos_], sizeof(header));
+    is_float_ = (header & kFloatSlotBit) != 0;
+    num_ = header & ~kFloatSlotBit;
+    values_ = &record_[pos_ + sizeof(header)];
+    pos_ += sizeof(header) + num_ * (is_float_ ? sizeof(float) : 8);
+    PADDLE_ENFORCE_LE(pos_,
+                      record_.size(),
+                      common::errors::InvalidArgument(
+                          "The binary slot record ends in the %d th slot.",
+                          slot));
+    PADDLE_ENFORCE_NE(
+        num_,
+        0,
+        common::errors::InvalidArgument(
+            "The number of ids can not be zero, you need padding it in data "
+            "generator. We detect the %d th slot's feasign number is 0.",
+            slot));
+    return static_cast<int>(num_);
+  }
+
+  float GetFloat(int j) const {
+    if (!is_float_) {
+      return static_cast<float>(GetUint64(j));
+    }
+    float value;
+    memcpy(&value, values_ + j * sizeof(float), sizeof(float));
+    return value;
+  }
+
+  uint64_t GetUint64(int j) const {
+    if (is_float_) {
+      return static_cast<uint64_t>(GetFloat(j));
+    }
+    uint64_t value;
+    memcpy(&value, values_ + j * sizeof(uint64_t), sizeof(uint64_t));
+    return value;
+  }
+
+  // Check that all slots of the record are read.
+  void Finish() const {
+    PADDLE_ENFORCE_EQ(pos_,
+                      record_.size(),
+                      common::errors::InvalidArgument(
+                          "The binary slot record has more slots than the "
+                          "dataset, please check the slots of use_var."));
+  }
+
+ private:
+  std::string record_;
+  size_t pos_ = 0;
+  const char* values_ = nullptr;
+  uint32_t num_ = 0;
+  bool is_float_ = false;
+};
+
+static bool IsBinaryRecordFormat(const DataFeedDesc& data_feed_desc) {
+  const std::string& record_format = data_feed_desc.record_format();
+  PADDLE_ENFORCE_EQ(
+      record_format == "text" || record_format == "binary",
+      true,
+      common::errors::InvalidArgument(
+          "The record_format should be text or binary, but received %s.",
+          record_format));
+  return record_format == "binary";
+}
+
 void MultiSlotDataFeed::Init(
     const paddle::framework::DataFeedDesc& data_feed_desc) {
   finish_init_ = false;
@@ -712,6 +819,7 @@ void MultiSlotDataFeed::Init(
   }
   feed_vec_.resize(use_slots_.size());
   pipe_command_ = data_feed_desc.pipe_command();
+  binary_record_ = IsBinaryRecordFormat(data_feed_desc);
   finish_init_ = true;
 }
 
@@ -881,6 +989,9 @@ bool MultiSlotDataFeed::CheckFile(const char* filename) {
 bool MultiSlotDataFeed::ParseOneInstanceFromPipe(
     std::vector<MultiSlotType>* instance) {
 #ifdef _LINUX
+  if (binary_record_) {
+    return ParseOneBinaryInstanceFromPipe(instance);
+  }
   thread_local string::LineFileReader reader;
 
   if (!reader.getline(&*(fp_.get()))) {
@@ -948,6 +1059,39 @@ bool MultiSlotDataFeed::ParseOneInstanceFromPipe(
 #endif
 }
 
+bool MultiSlotDataFeed::ParseOneBinaryInstanceFromPipe(
+    std::vector<MultiSlotType>* instance) {
+#ifdef _LINUX
+  thread_local BinarySlotRecordReader reader;
+
+  if (!reader.Read(&*(fp_.get()))) {
+    return false;
+  }
+  instance->resize(use_slots_.size());
+  for (size_t i = 0; i < use_slots_index_.size(); ++i) {
+    int idx = use_slots_index_[i];
+    int num = reader.NextSlot(i);
+    if (idx == -1) {
+      continue;
+    }
+    (*instance)[idx].Init(all_slots_type_[i]);
+    if ((*instance)[idx].GetType()[0] == 'f') {  // float
+      for (int j = 0; j < num; ++j) {
+        (*instance)[idx].AddValue(reader.GetFloat(j));
+      }
+    } else if ((*instance)[idx].GetType()[0] == 'u') {  // uint64
+      for (int j = 0; j < num; ++j) {
+        (*instance)[idx].AddValue(reader.GetUint64(j));
+      }
+    }
+  }
+  reader.Finish();
+  return true;
+#else
+  return true;
+#endif
+}
+
 bool MultiSlotDataFeed::ParseOneInstance(std::vector<MultiSlotType>* instance) {
 #ifdef _LINUX
   std::string line;
@@ -1141,6 +1285,13 @@ void MultiSlotInMemoryDataFeed::Init(
   visit_.resize(all_slot_num, false);
   pipe_command_ = data_feed_desc.pipe_command();
   so_parser_name_ = data_feed_desc.so_parser_name();
+  binary_record_ = IsBinaryRecordFormat(data_feed_desc);
+  PADDLE_ENFORCE_EQ(binary_record_ && !so_parser_name_.empty(),
+                    false,
+                    common::errors::InvalidArgument(
+                        "Binary slot records can not be parsed by so parser "
+                        "%s.",
+                        so_parser_name_));
   finish_init_ = true;
   input_type_ = data_feed_desc.input_type();
 }
@@ -1170,6 +1321,9 @@ int MultiSlotInMemoryDataFeed::ParseInstanceFromSo(
 
 bool MultiSlotInMemoryDataFeed::ParseOneInstanceFromPipe(Record* instance) {
 #ifdef _LINUX
+  if (binary_record_) {
+    return ParseOneBinaryInstanceFromPipe(instance);
+  }
   thread_local string::LineFileReader reader;
 
   if (!reader.getline(&*(fp_.get()))) {
@@ -1312,6 +1466,70 @@ bool MultiSlotInMemoryDataFeed::ParseOneInstanceFromPipe(Record* instance) {
 #endif
 }
 
+bool MultiSlotInMemoryDataFeed::ParseOneBinaryInstanceFromPipe(
+    Record* instance) {
+#ifdef _LINUX
+  thread_local BinarySlotRecordReader reader;
+
+  PADDLE_ENFORCE_EQ(
+      parse_ins_id_ || parse_content_ || parse_logkey_,
+      false,
+      common::errors::Unimplemented(
+          "Binary slot records do not hold ins_id, content or logkey, please "
+          "use the text record format to parse them."));
+  if (!reader.Read(&*(fp_.get()))) {
+    return false;
+  }
+  for (size_t i = 0; i < use_slots_index_.size(); ++i) {
+    int idx = use_slots_index_[i];
+    int num = reader.NextSlot(i);
+#ifdef PADDLE_WITH_PSLIB
+    if (parse_uid_ && all_slots_[i] == uid_slot_) {
+      PADDLE_ENFORCE(num == 1 && all_slots_type_[i][0] == 'u',
+                     common::errors::PreconditionNotMet(
+                         "The uid has to be uint64 and single."));
+      instance->uid_ = reader.GetUint64(0);
+    }
+#endif
+    if (idx == -1) {
+      continue;
+    }
+    if (all_slots_type_[i][0] == 'f') {  // float
+      for (int j = 0; j < num; ++j) {
+        float feasign = reader.GetFloat(j);
+        // if float feasign is equal to zero, ignore it
+        // except when slot is dense
+        if (fabs(feasign) < 1e-6 && !use_slots_is_dense_[i]) {
+          continue;
+        }
+        FeatureFeasign f;
+        f.float_feasign_ = feasign;
+        instance->float_feasigns_.emplace_back(f, idx);
+      }
+    } else if (all_slots_type_[i][0] == 'u') {  // uint64
+      for (int j = 0; j < num; ++j) {
+        uint64_t feasign = reader.GetUint64(j);
+        // if uint64 feasign is equal to zero, ignore it
+        // except when slot is dense
+        if (feasign == 0 && !use_slots_is_dense_[i]) {
+          continue;
+        }
+        FeatureFeasign f;
+        f.uint64_feasign_ = feasign;
+        instance->uint64_feasigns_.emplace_back(f, idx);
+      }
+    }
+  }
+  reader.Finish();
+  instance->float_feasigns_.shrink_to_fit();
+  instance->uint64_feasigns_.shrink_to_fit();
+  fea_num_ += instance->uint64_feasigns_.size();
+  return true;
+#else
+  return false;
+#endif
+}
+
 bool MultiSlotInMemoryDataFeed::ParseOneInstance(Record* instance) {
 #ifdef _LINUX
   std::string line;
@@ -2167,6 +2385,11 @@ void SlotRecordInMemoryDataFeed::Init(const DataFeedDesc& data_feed_desc) {
   }
   visit_.resize(all_slot_num, false);
   pipe_command_ = data_feed_desc.pipe_command();
+  PADDLE_ENFORCE_EQ(IsBinaryRecordFormat(data_feed_desc),
+                    false,
+                    common::errors::Unimplemented(
+                        "SlotRecordInMemoryDataFeed only supports the text "
+                        "record format."));
   finish_init_ = true;
   input_type_ = data_feed_desc.input_type();
   size_t pos = pipe_command_.find(".so");
@@ -1480,6 +1480,8 @@ class DataFeed {
 
   // The input type of pipe reader, 0 for one sample, 1 for one batch
   int input_type_;
+  // Whether the pipe reader writes binary slot records instead of text lines
+  bool binary_record_ = false;
   int gpu_graph_mode_ = 0;
 #if defined(PADDLE_WITH_PSCORE) && defined(PADDLE_WITH_HETERPS)
   GraphDataGenerator gpu_graph_data_generator_;
@@ -1937,6 +1939,8 @@ class MultiSlotDataFeed
                                    int index);
   virtual bool ParseOneInstance(std::vector<MultiSlotType>* instance);
   virtual bool ParseOneInstanceFromPipe(std::vector<MultiSlotType>* instance);
+  virtual bool ParseOneBinaryInstanceFromPipe(
+      std::vector<MultiSlotType>* instance);
   virtual void PutToFeedVec(const std::vector<MultiSlotType>& ins_vec);
 };
 
@@ -1950,6 +1954,7 @@ class MultiSlotInMemoryDataFeed : public InMemoryDataFeed<Record> {
  protected:
   virtual bool ParseOneInstance(Record* instance);
   virtual bool ParseOneInstanceFromPipe(Record* instance);
+  virtual bool ParseOneBinaryInstanceFromPipe(Record* instance);
   virtual void ParseOneInstanceFromSo(const char* str UNUSED,
                                       Record* instance UNUSED,
                                       CustomParser* parser UNUSED) {}
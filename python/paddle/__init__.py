@@ -88,42 +88,31 @@ else:
     Tensor.__qualname__ = 'Tensor'
 
 import paddle.distributed.fleet
-import paddle.text
-import paddle.vision
 from paddle import (
     amp as amp,
-    audio as audio,
     autograd as autograd,
     dataset as dataset,
     decomposition as decomposition,
     device as device,
     distributed as distributed,
     distribution as distribution,
-    geometric as geometric,
     incubate as incubate,
-    inference as inference,
     io as io,
     jit as jit,
     metric as metric,
     nn as nn,
-    onnx as onnx,
     optimizer as optimizer,
-    quantization as quantization,
     reader as reader,
     regularizer as regularizer,
-    sparse as sparse,
     static as static,
     sysconfig as sysconfig,
-    vision as vision,
 )
 
 # high-level api
 from . import (
     _pir_ops as _pir_ops,
     _typing as _typing,
-    callbacks as callbacks,
     fft as fft,
-    hub as hub,
     linalg as linalg,
     signal as signal,
     tensor as tensor,
@@ -170,11 +159,56 @@ from .framework.random import (
     set_cuda_rng_state,
     set_rng_state,
 )
-from .hapi import (
-    Model,
-    flops,
-    summary,
+
+# NOTE: The subpackages below and hapi are imported on first access by the
+# PEP 562 `__getattr__` of paddle to cut the time of `import paddle`. The
+# eagerly imported modules of paddle must only import them inside functions
+# (e.g. incubate.graph_send_recv, incubate.jit.inference and the Engine of
+# auto parallel), test_import_lazy.py checks that none of them is loaded.
+# Set PADDLE_LAZY_IMPORT=0 to import them eagerly.
+_LAZY_SUBMODULES = (
+    'audio',
+    'callbacks',
+    'geometric',
+    'hub',
+    'inference',
+    'onnx',
+    'quantization',
+    'sparse',
+    'text',
+    'vision',
 )
+_LAZY_ATTRIBUTES = {
+    'Model': 'hapi',
+    'flops': 'hapi',
+    'summary': 'hapi',
+}
+
+if typing.TYPE_CHECKING:
+    from paddle import (
+        audio as audio,
+        callbacks as callbacks,
+        geometric as geometric,
+        hub as hub,
+        inference as inference,
+        onnx as onnx,
+        quantization as quantization,
+        sparse as sparse,
+        text as text,
+        vision as vision,
+    )
+
+    from .hapi import (
+        Model,
+        flops,
+        summary,
+    )
+else:
+    from .utils.lazy_import import lazy_submodules
+
+    __getattr__, __dir__ = lazy_submodules(
+        __name__, _LAZY_SUBMODULES, _LAZY_ATTRIBUTES
+    )
 from .nn.functional.distance import (
     pdist,
 )
@@ -1230,6 +1264,11 @@ __all__ = [
 
 import os
 
+if os.environ.get("PADDLE_LAZY_IMPORT", "1").lower() in ("0", "false", "off"):
+    for _name in (*_LAZY_SUBMODULES, *_LAZY_ATTRIBUTES):
+        __getattr__(_name)
+    del _name
+
 FLAGS_trace_api = os.environ.get("FLAGS_trace_api", None)
 if FLAGS_trace_api is not None and FLAGS_trace_api != "":
     from .api_tracer import start_api_tracer
@@ -50,7 +50,6 @@ from ...utils.log_utils import get_logger
 from ..interface import CollectionNames, fetch, get_collection
 from ..static.dist_tensor import DistributedTensor
 from ..strategy import Strategy
-from .callbacks import config_callbacks
 from .cluster import Cluster, get_default_cluster
 from .converter import Converter
 from .cost.estimate_cost import get_cost_from_engine
@@ -1671,6 +1670,8 @@ class Engine:
 
         fetch_names, fetch_indices = self._prepare_fetch(None, mode=self._mode)
 
+        from .callbacks import config_callbacks
+
         cbks = config_callbacks(
             callbacks,
             engine=self,
@@ -1827,6 +1828,8 @@ class Engine:
 
         fetch_names, fetch_indices = self._prepare_fetch(None, mode=self._mode)
 
+        from .callbacks import config_callbacks
+
         cbks = config_callbacks(
             callbacks,
             engine=self,
@@ -1937,6 +1940,8 @@ class Engine:
 
         fetch_names, fetch_indices = self._prepare_fetch(None, mode=self._mode)
 
+        from .callbacks import config_callbacks
+
         outputs = []
         cbks = config_callbacks(callbacks, engine=self, verbose=verbose)
         test_steps = steps_per_epoch
@@ -73,7 +73,7 @@ def same_cfgs_beside(attrs, cur_cfg, history_cfgs=[]):
                 continue
             if key not in cfg or (
                 cfg[key] != cur_cfg[key]
-                and key not in ["estimated_memory_usage"]
+                and key not in ["estimated_memory_usage", "estimated_step_time"]
             ):
                 same = False
                 break
@@ -707,6 +707,49 @@ def prune_by_memory_estimation(tuner_cfg, cur_cfg, history_cfgs=[]):
         )
 
 
+@register_prune
+def prune_by_simulator(tuner_cfg, cur_cfg, history_cfgs=[]):
+    """
+    Prune by the analytical simulator if "simulator" is set in tuner_cfg.
+    The config is pruned if its estimated memory exceeds max_mem_usage, or its
+    estimated step time is more than time_ratio times the fastest config
+    accepted so far, i.e. history_cfgs.
+    """
+    from .simulator import get_simulator
+
+    simulator = get_simulator(tuner_cfg)
+    if simulator is None:
+        return False
+
+    cur_cfg.update(simulator.simulate(cur_cfg))
+    max_mem_usage = tuner_cfg.get(
+        "max_mem_usage", tuner_cfg.get("per_card_memory", None)
+    )
+    if (
+        max_mem_usage is not None
+        and cur_cfg["estimated_memory_usage"] > max_mem_usage * 1024
+    ):
+        pruned_reason = f"estimated memory usage {cur_cfg['estimated_memory_usage']} MB exceeds {max_mem_usage} GB."
+        log_pruned_info(cur_cfg, pruned_reason, tuner_cfg)
+        return True
+
+    time_ratio = simulator.cfg["time_ratio"]
+    if time_ratio is not None:
+        step_times = [
+            cfg["estimated_step_time"]
+            for cfg in history_cfgs
+            if cfg.get("estimated_step_time") is not None
+        ]
+        if (
+            step_times
+            and cur_cfg["estimated_step_time"] > min(step_times) * time_ratio
+        ):
+            pruned_reason = f"estimated step time {cur_cfg['estimated_step_time']}s is more than {time_ratio} times of the fastest {min(step_times)}s."
+            log_pruned_info(cur_cfg, pruned_reason, tuner_cfg)
+            return True
+    return False
+
+
 @register_prune_history
 def prune_by_sharding_overlap(
     tuner_cfg, cur_cfg, history_cfgs=[], pruned_cfgs=[]
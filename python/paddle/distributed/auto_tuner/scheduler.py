@@ -0,0 +1,311 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+
+from .utils import (
+    find_error_from_log,
+    gen_log_dir_name,
+    gen_new_args,
+    read_log,
+)
+
+logger = logging.getLogger('auto_tuner')
+
+
+def split_devices(devices, num_slots):
+    """Split the devices of the node into num_slots disjoint subsets."""
+    if num_slots <= 0 or len(devices) % num_slots != 0:
+        raise ValueError(
+            f"The {len(devices)} devices can not be split into {num_slots} parallel trials evenly."
+        )
+    size = len(devices) // num_slots
+    return [devices[i * size : (i + 1) * size] for i in range(num_slots)]
+
+
+def read_metric_values(path, file="workerlog.0", target_metric='step/s'):
+    """Return all the values of the metric printed in the log file."""
+    target_file = os.path.join(path, file)
+    if not os.path.exists(target_file):
+        return []
+    re_metric_pattern = (
+        target_metric + r":* *(\d+(\.\d*)?)|(\d+(\.\d*)?) *" + target_metric
+    )
+    values = []
+    with open(target_file, "r", errors="ignore") as f:
+        for line in f:
+            metric = re.findall(re_metric_pattern, line)
+            if not metric:
+                continue
+            for item in metric[0]:
+                try:
+                    values.append(float(item))
+                    break
+                except ValueError:
+                    continue
+    return values
+
+
+class Trial:
+    def __init__(self, job_id, cfg, devices, log_dir, process):
+        self.job_id = job_id
+        self.cfg = cfg
+        self.devices = devices
+        self.log_dir = log_dir
+        self.process = process
+        self.start_time = time.time()
+
+    @property
+    def task_job_id(self):
+        return "auto_tuner_" + str(self.job_id)
+
+    def terminate(self, timeout=10):
+        if self.process.poll() is not None:
+            return
+        # the trial is launched in a new session, kill the launcher and all
+        # the workers of it
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+
+
+class ParallelTrialScheduler:
+    """
+    Run several trials of the auto tuner at the same time, every trial on a
+    disjoint subset of the devices of the node, and stop the poor trials
+    early.
+
+    The candidates are searched for the device subset of one trial, i.e. the
+    `num_gpus` of tuner_cfg should be the number of devices of one trial.
+    A trial is stopped early if the average metric of its first
+    `early_stop_steps` steps is worse than `early_stop_ratio` of the best
+    metric so far, and the partial metric is recorded as its metric.
+
+    Args:
+        auto_tuner (AutoTuner): The auto tuner to search the configs.
+        recorder (HistoryRecorder): The recorder of the finished configs.
+        tuner_cfg (dict): The configuration of auto tuner user defined.
+        devices (list[str]): The devices of the node.
+        training_script (str): The training script of every trial.
+        raw_args (list[str]): The args of the training script.
+        log_root (str): The directory of the log dirs of the trials.
+    """
+
+    def __init__(
+        self,
+        auto_tuner,
+        recorder,
+        tuner_cfg,
+        devices,
+        training_script,
+        raw_args,
+        log_root,
+    ):
+        self.auto_tuner = auto_tuner
+        self.recorder = recorder
+        self.tuner_cfg = tuner_cfg
+        self.slots = split_devices(devices, tuner_cfg["parallel_trials"])
+        self.training_script = training_script
+        self.raw_args = raw_args
+        self.log_root = log_root
+        self.metric_name = tuner_cfg["metric_cfg"]["name"]
+        self.maximize = (
+            tuner_cfg["metric_cfg"].get("OptimizationDirection", "Maximize")
+            == "Maximize"
+        )
+        self.max_time_per_task = tuner_cfg.get("max_time_per_task", 1800)
+        self.early_stop_steps = tuner_cfg.get("early_stop_steps", 0)
+        self.early_stop_ratio = tuner_cfg.get("early_stop_ratio", 0.8)
+        self.poll_interval = tuner_cfg.get("poll_interval", 5)
+        self.job_id = 0
+        self.best_metric = None
+
+    def _launch(self, cfg, devices):
+        self.job_id += 1
+        global_batch_size = cfg.get(
+            "global_batch_size",
+            self.tuner_cfg["model_cfg"]["global_batch_size"],
+        )
+        cfg["global_batch_size"] = global_batch_size
+        cfg["acc_steps"] = (
+            global_batch_size
+            // cfg["dp_degree"]
+            // cfg["sharding_degree"]
+            // cfg["micro_batch_size"]
+        )
+        cfg["job_id"] = self.job_id
+        log_dir_name = gen_log_dir_name(self.job_id, cfg, self.tuner_cfg)
+        log_dir = os.path.join(self.log_root, log_dir_name)
+
+        cfg["log_dir_name"] = log_dir_name
+        new_args = gen_new_args(self.raw_args, cfg, self.tuner_cfg)
+        cfg.pop("log_dir_name")
+
+        cmd = [
+            sys.executable,
+            "-m",
+            "paddle.distributed.launch",
+            "--devices",
+            ",".join(devices),
+            "--job_id",
+            "auto_tuner_" + str(self.job_id),
+            "--log_dir",
+            log_dir,
+            self.training_script,
+            *new_args,
+        ]
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        trial = Trial(self.job_id, cfg, devices, log_dir, process)
+        logger.info(
+            f"Launch task: job_id {trial.task_job_id}, log_dir {log_dir_name}, devices {','.join(devices)}"
+        )
+        return trial
+
+    def _is_worse(self, metric, ratio=1.0):
+        if self.best_metric is None:
+            return False
+        if self.maximize:
+            return metric < self.best_metric * ratio
+        return metric > self.best_metric / ratio
+
+    def _partial_metric(self, trial):
+        """Return the average metric of the first steps, or None if not enough."""
+        values = read_metric_values(
+            trial.log_dir, target_metric=self.metric_name
+        )
+        if len(values) < self.early_stop_steps:
+            return None
+        values = values[: self.early_stop_steps]
+        # the first step includes the time of warmup
+        if len(values) > 1:
+            values = values[1:]
+        return sum(values) / len(values)
+
+    def _finish(self, trial, early_stopped_metric=None):
+        cfg = trial.cfg
+        cfg["exec_time"] = round(time.time() - trial.start_time, 2)
+        cfg["early_stopped"] = early_stopped_metric is not None
+        metric, mem, err = read_log(
+            path=trial.log_dir,
+            metric_file="workerlog.0",
+            target_metric=self.metric_name,
+            memory_file=f"{trial.task_job_id}.gpu.log",
+        )
+        if early_stopped_metric is not None:
+            metric = round(early_stopped_metric, 5)
+            # the metric of the first steps is valid even if the trial is
+            # killed before printing the others
+            err = err & ~(1 << 0)
+
+        has_error = bool(err & (1 << 0) or err & (1 << 1))
+        if has_error:
+            # for pruner use
+            cfg["time"] = -1
+            cfg[self.metric_name] = None
+        else:
+            cfg["time"] = metric
+            cfg[self.metric_name] = metric
+            if not self._is_worse(metric):
+                self.best_metric = metric
+        if err & (1 << 1):
+            cfg["max_mem_usage"] = "OOM"
+        elif err & (1 << 2):
+            cfg["max_mem_usage"] = None
+        else:
+            cfg["max_mem_usage"] = mem
+        cfg["has_error"] = has_error
+        cfg["error_info"] = None
+        if has_error:
+            cfg["error_info"] = (
+                ["Out of memory"]
+                if err & (1 << 1)
+                else [find_error_from_log(trial.log_dir)]
+            )
+
+        logger.info(
+            f"Task: job_id {trial.task_job_id} ended in {cfg['exec_time']}s, {self.metric_name} {cfg[self.metric_name]}, early stopped {cfg['early_stopped']}"
+        )
+        self.recorder.add_cfg(**cfg)
+
+    def run(self, history_file_path, max_search_time=None):
+        """Run the trials until the search is finished."""
+        start_time = time.time()
+        running = {}
+        exhausted = False
+        while True:
+            free_slots = [i for i in range(len(self.slots)) if i not in running]
+            timeout = (
+                max_search_time is not None
+                and time.time() - start_time > max_search_time
+            )
+            if free_slots and not exhausted and not timeout:
+                new_cfgs = self.auto_tuner.search_batch(len(free_slots))
+                if not new_cfgs:
+                    exhausted = True
+                for slot, cfg in zip(free_slots, new_cfgs):
+                    self.auto_tuner.add_cfg(cfg)
+                    running[slot] = self._launch(cfg, self.slots[slot])
+            if not running:
+                break
+
+            time.sleep(self.poll_interval)
+            for slot, trial in list(running.items()):
+                early_stopped_metric = None
+                if trial.process.poll() is None:
+                    if time.time() - trial.start_time > self.max_time_per_task:
+                        trial.terminate()
+                    elif self.early_stop_steps > 0:
+                        metric = self._partial_metric(trial)
+                        if metric is None or not self._is_worse(
+                            metric, self.early_stop_ratio
+                        ):
+                            continue
+                        logger.info(
+                            f"Stop task: job_id {trial.task_job_id} early, {self.metric_name} {metric} of the first steps is worse than the best {self.best_metric}"
+                        )
+                        trial.terminate()
+                        early_stopped_metric = metric
+                    else:
+                        continue
+                self._finish(trial, early_stopped_metric)
+                del running[slot]
+
+                cur_best_cfg, err = self.recorder.get_best(
+                    metric=self.metric_name,
+                    direction="Maximize" if self.maximize else "Minimize",
+                )
+                if not err:
+                    logger.info(
+                        f"Current best config: {json.dumps(cur_best_cfg)}"
+                    )
+                self.recorder.store_history(history_file_path)
@@ -14,9 +14,13 @@
 
 
 import logging
+import math
 import os
+import random
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from .prune import _PRUNE_HISTORY_FUNC
 from .utils import (
     gbs_search_all,
@@ -37,6 +41,16 @@ class SearchAlgo(ABC):
     def search_once(self, history_cfgs):
         pass
 
+    def search_batch(self, history_cfgs, num):
+        """Return at most num new configs which can be run at the same time."""
+        new_cfgs = []
+        for _ in range(num):
+            new_cfg = self.search_once(history_cfgs + new_cfgs)
+            if new_cfg is None:
+                break
+            new_cfgs.append(new_cfg)
+        return new_cfgs
+
     def prune(self, tuner_cfg, cur_cfg, history_cfgs, pruned_cfgs):
         for func in _PRUNE_HISTORY_FUNC:
             result = func(tuner_cfg, cur_cfg, history_cfgs, pruned_cfgs)
@@ -155,3 +169,179 @@ class CustomizeSearch(SearchAlgo):
         new_cfg = self.all_tasks[self.idx]
         self.idx += 1
         return new_cfg
+
+
+class ModelBasedSearch(SearchAlgo):
+    """
+    Search the candidates by a cost model fitted to the history configs.
+
+    The metric of a config is modeled by a bayesian linear regression on the
+    log2 of the degrees, their pairwise products and the one-hot encoded
+    categorical params. The candidate with the highest upper confidence bound
+    of the model is searched next, so the tuner explores the configs whose
+    metric is uncertain and exploits the configs predicted to be good. The
+    first `num_init` configs are randomly sampled to fit the model.
+
+    The options are read from tuner_cfg["search_algo"]:
+        num_init (int): The number of random configs before fitting the model. Default: 4.
+        explore (float): The weight of the standard deviation in the upper confidence bound. Default: 0.5.
+        noise (float): The variance of the metric noise relative to the metric variance. Default: 0.1.
+        seed (int): The random seed of the initial configs. Default: 0.
+    """
+
+    def __init__(self, tuner_cfg):
+        super().__init__(tuner_cfg)
+        self.idx = 0
+        self.all_tasks = search_all(tuner_cfg)
+        algo_cfg = tuner_cfg["search_algo"]
+        self.num_init = algo_cfg.get("num_init", 4)
+        self.explore = algo_cfg.get("explore", 0.5)
+        self.noise = algo_cfg.get("noise", 0.1)
+        self.rng = random.Random(algo_cfg.get("seed", 0))
+        self.metric_name = tuner_cfg["metric_cfg"]["name"]
+        self.maximize = (
+            tuner_cfg["metric_cfg"].get("OptimizationDirection", "Maximize")
+            == "Maximize"
+        )
+        self.remaining = list(range(len(self.all_tasks)))
+        self._build_encoder()
+        self.features = self._featurize(self.all_tasks)
+
+    def _build_encoder(self):
+        """Decide how every param of the candidates is encoded."""
+        self.numeric_keys = []
+        self.categories = {}
+        keys = sorted({key for cfg in self.all_tasks for key in cfg})
+        for key in keys:
+            values = [cfg.get(key) for cfg in self.all_tasks]
+            if len({str(value) for value in values}) <= 1:
+                continue
+            if all(
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and value > 0
+                for value in values
+            ):
+                self.numeric_keys.append(key)
+            else:
+                self.categories[key] = sorted({str(value) for value in values})
+
+    def _featurize(self, cfgs):
+        columns = []
+        numeric = []
+        for key in self.numeric_keys:
+            column = []
+            for cfg in cfgs:
+                value = cfg.get(key)
+                try:
+                    column.append(math.log2(float(value)))
+                except (TypeError, ValueError):
+                    column.append(0.0)
+            numeric.append(column)
+        columns.extend(numeric)
+        for i in range(len(numeric)):
+            for j in range(i, len(numeric)):
+                columns.append([a * b for a, b in zip(numeric[i], numeric[j])])
+        for key, values in self.categories.items():
+            for value in values:
+                columns.append(
+                    [float(str(cfg.get(key)) == value) for cfg in cfgs]
+                )
+        if not columns:
+            return np.zeros([len(cfgs), 0])
+        return np.array(columns, dtype="float64").T
+
+    def _observations(self, history_cfgs):
+        """Return the features and the targets of the finished configs."""
+        cfgs = []
+        targets = []
+        failed_cfgs = []
+        for cfg in history_cfgs:
+            if cfg is None or "time" not in cfg:
+                # the config is still running
+                continue
+            metric = cfg.get(self.metric_name)
+            if cfg["time"] == -1 or not isinstance(metric, (int, float)):
+                failed_cfgs.append(cfg)
+                continue
+            metric = float(metric)
+            if metric <= 0:
+                failed_cfgs.append(cfg)
+                continue
+            cfgs.append(cfg)
+            target = math.log(metric)
+            targets.append(target if self.maximize else -target)
+        if targets:
+            # a failed config, e.g. OOM, is regarded as worse than all the
+            # runnable configs
+            worst = min(targets) - max(np.std(targets), 1.0)
+            cfgs.extend(failed_cfgs)
+            targets.extend([worst] * len(failed_cfgs))
+        return self._featurize(cfgs), np.array(targets, dtype="float64")
+
+    def _fit_predict(self, x, y, candidates):
+        """Return the posterior mean and std of the candidates."""
+        all_x = self.features
+        scale = all_x.std(axis=0)
+        scale[scale == 0] = 1.0
+        shift = all_x.mean(axis=0)
+
+        def normalize(features):
+            features = (features - shift) / scale
+            return np.concatenate(
+                [np.ones([len(features), 1]), features], axis=1
+            )
+
+        phi = normalize(x)
+        phi_star = normalize(candidates)
+        y_mean = y.mean()
+        y_std = y.std() if y.std() > 0 else 1.0
+        y = (y - y_mean) / y_std
+
+        precision = phi.T @ phi / self.noise + np.eye(phi.shape[1])
+        covariance = np.linalg.inv(precision)
+        weight = covariance @ phi.T @ y / self.noise
+        mean = phi_star @ weight
+        var = self.noise + np.einsum(
+            "ij,jk,ik->i", phi_star, covariance, phi_star
+        )
+        return mean * y_std + y_mean, np.sqrt(var) * y_std
+
+    def search_batch(self, history_cfgs, num):
+        x, y = self._observations(history_cfgs)
+        use_model = len(y) >= self.num_init
+        new_cfgs = []
+        while len(new_cfgs) < num and self.remaining:
+            if use_model:
+                mean, std = self._fit_predict(
+                    x, y, self.features[self.remaining]
+                )
+                ucb = mean + self.explore * std
+                task_idx = self.remaining[int(np.argmax(ucb))]
+            else:
+                task_idx = self.rng.choice(self.remaining)
+            self.remaining.remove(task_idx)
+            self.idx += 1
+            new_cfg = self.all_tasks[task_idx]
+            pruned = self.prune(
+                self.tuner_cfg,
+                new_cfg,
+                history_cfgs + new_cfgs,
+                self.pruned_cfgs,
+            )
+            self.pruned_cfgs.append(new_cfg)
+            if pruned:
+                continue
+            new_cfgs.append(new_cfg)
+            if use_model:
+                # believe the predicted metric of the picked config, so the
+                # other configs of the batch are not picked around it
+                picked = self.features[task_idx : task_idx + 1]
+                mean, _ = self._fit_predict(x, y, picked)
+                x = np.concatenate([x, picked])
+                y = np.append(y, mean)
+        return new_cfgs
+
+    def search_once(self, history_cfgs):
+        new_cfgs = self.search_batch(history_cfgs, 1)
+        return new_cfgs[0] if new_cfgs else None
@@ -0,0 +1,405 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+An analytical simulator of the per-rank peak memory and the step time of a
+transformer model under a hybrid parallel config.
+
+The memory consists of the parameters, the gradients and the optimizer states
+partitioned by mp, pp and the sharding stage, and the activations of the
+micro batches in flight of the first pipeline stage. The activation of a layer
+follows "Reducing Activation Recomputation in Large Transformer Models", and
+is reduced by the recompute granularity.
+
+The step time consists of the computation of all the micro batches including
+the recomputed forward and the pipeline bubble, the mp all-reduce, the pp
+send/recv and the gradient synchronization of dp and sharding.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import math
+
+logger = logging.getLogger('auto_tuner')
+
+_DEFAULT_SIMULATOR_CFG = {
+    # peak TFLOPS of one device in the training dtype
+    "peak_tflops": 312,
+    # the ratio of the peak TFLOPS reached by the matmuls
+    "efficiency": 0.5,
+    # bandwidth in GB/s
+    "intra_node_bandwidth": 150,
+    "inter_node_bandwidth": 25,
+    # the memory in GB reserved by the framework, e.g. cuda context
+    "reserved_memory": 2,
+    # bytes of the parameters, gradients and activations
+    "dtype_bytes": 2,
+    # prune the configs slower than time_ratio * the fastest config
+    "time_ratio": None,
+}
+
+_GB = 1024**3
+_MB = 1024**2
+
+
+class TransformerSimulator:
+    """
+    Simulate a transformer model described by the model_cfg of auto tuner.
+
+    Args:
+        model_cfg (dict): The model config, which should contain hidden_size,
+            num_layers, num_attention_heads, vocab_size, global_batch_size and
+            seq_length (or max_sequence_length). intermediate_size (default
+            4 * hidden_size), gated_mlp (default False) and num_params (the
+            number of parameters, default calculated by the shape) are
+            optional.
+        simulator_cfg (dict, optional): The hardware description, see
+            _DEFAULT_SIMULATOR_CFG for the keys.
+        gpus_per_node (int, optional): The number of devices per node, which
+            decides the bandwidth of the communication. Default: 8.
+    """
+
+    def __init__(self, model_cfg, simulator_cfg=None, gpus_per_node=8):
+        self.cfg = copy.deepcopy(_DEFAULT_SIMULATOR_CFG)
+        self.cfg.update(simulator_cfg or {})
+        self.gpus_per_node = gpus_per_node
+
+        self.h = model_cfg["hidden_size"]
+        self.l = model_cfg["num_layers"]
+        self.a = model_cfg["num_attention_heads"]
+        self.V = model_cfg["vocab_size"]
+        self.s = model_cfg.get(
+            "seq_length", model_cfg.get("max_sequence_length", None)
+        )
+        if self.s is None:
+            raise ValueError(
+                "seq_length or max_sequence_length should be set in model_cfg to simulate."
+            )
+        self.gbs = model_cfg["global_batch_size"]
+        self.ffn = model_cfg.get("intermediate_size", None) or 4 * self.h
+        self.mlp_matrices = 3 if model_cfg.get("gated_mlp", False) else 2
+
+        self.embedding_params = self.V * self.h
+        num_params = model_cfg.get("num_params", None)
+        if num_params is None:
+            self.layer_params = (
+                4 * self.h * self.h
+                + self.mlp_matrices * self.h * self.ffn
+                + 4 * self.h
+            )
+        else:
+            self.layer_params = max(
+                (num_params - self.embedding_params) / self.l, 0
+            )
+
+    @classmethod
+    def from_program(
+        cls, program, model_cfg, simulator_cfg=None, gpus_per_node=8
+    ):
+        """Build the simulator with the number of parameters of a static program."""
+        num_params = 0
+        for param in program.all_parameters():
+            num_params += math.prod(param.shape)
+        model_cfg = dict(model_cfg, num_params=num_params)
+        return cls(model_cfg, simulator_cfg, gpus_per_node)
+
+    def _bandwidth(self, group_span):
+        """Return the bandwidth in bytes/s of a group spanning group_span ranks."""
+        if group_span > self.gpus_per_node:
+            return self.cfg["inter_node_bandwidth"] * _GB
+        return self.cfg["intra_node_bandwidth"] * _GB
+
+    def _layer_activation(self, b, mp, use_recompute, granularity):
+        """Return the activation bytes of one layer for one micro batch."""
+        s, h, a = self.s, self.h, self.a
+        sbh = s * b * h
+        attn_scores = 5 * a * s * s * b / mp
+        ffn_ratio = self.ffn * self.mlp_matrices / (8 * h)
+        mlp = sbh * (2 + 16 * ffn_ratio / mp)
+        attn = sbh * (3 + 8 / mp) + attn_scores
+        norm = sbh * 5
+        if not use_recompute:
+            return attn + mlp + norm
+        if granularity == "core_attn":
+            return attn + mlp + norm - attn_scores
+        if granularity == "full_attn":
+            return mlp + norm
+        # full recompute only saves the input of every layer
+        return 2 * sbh
+
+    def _layer_flops(self, b):
+        """Return the forward FLOPs of one layer for one micro batch."""
+        s, h = self.s, self.h
+        attn = 2 * b * s * 4 * h * h + 4 * b * s * s * h
+        mlp = 2 * b * s * self.mlp_matrices * h * self.ffn
+        return attn, mlp
+
+    def estimate_memory(self, cfg):
+        """Return the estimated peak memory of one rank in MB."""
+        mp = cfg["mp_degree"]
+        pp = cfg["pp_degree"]
+        vpp = cfg.get("vpp_degree", 1) or 1
+        dp = cfg["dp_degree"]
+        sharding = cfg["sharding_degree"]
+        stage = cfg.get("sharding_stage", 1) or 1
+        b = cfg["micro_batch_size"]
+        use_recompute = bool(cfg.get("use_recompute", False))
+        granularity = cfg.get("recompute_granularity", None) or "full"
+        dtype_bytes = self.cfg["dtype_bytes"]
+
+        # the first stage holds the embedding and the most activations
+        params = (self.layer_params * self.l / pp + self.embedding_params) / mp
+        weight_bytes = params * dtype_bytes
+        grad_bytes = params * dtype_bytes
+        # fp32 master weights and two moments of adam
+        optimizer_bytes = params * 12
+        if sharding > 1:
+            optimizer_bytes /= sharding
+            if stage >= 2:
+                grad_bytes /= sharding
+            if stage >= 3:
+                weight_bytes /= sharding
+
+        acc_steps = max(self.gbs // (b * dp * sharding), 1)
+        in_flight = min(pp, acc_steps)
+        vpp_ratio = 1 + (pp - 1) / (pp * vpp) if vpp > 1 else 1
+        act_bytes = (
+            self._layer_activation(b, mp, use_recompute, granularity)
+            * self.l
+            / pp
+            * in_flight
+            * vpp_ratio
+        )
+        if use_recompute:
+            # the activations of the layer being recomputed
+            act_bytes += self._layer_activation(b, mp, False, None)
+        # fp32 logits and their gradient of the last stage
+        logits_bytes = 2 * 4 * self.s * b * self.V / mp if pp == 1 else 0
+
+        total = (
+            weight_bytes
+            + grad_bytes
+            + optimizer_bytes
+            + act_bytes
+            + logits_bytes
+            + self.cfg["reserved_memory"] * _GB
+        )
+        return total / _MB
+
+    def estimate_step_time(self, cfg):
+        """Return the estimated time of one step in seconds."""
+        mp = cfg["mp_degree"]
+        pp = cfg["pp_degree"]
+        vpp = cfg.get("vpp_degree", 1) or 1
+        dp = cfg["dp_degree"]
+        sharding = cfg["sharding_degree"]
+        stage = cfg.get("sharding_stage", 1) or 1
+        b = cfg["micro_batch_size"]
+        use_recompute = bool(cfg.get("use_recompute", False))
+        granularity = cfg.get("recompute_granularity", None) or "full"
+        dtype_bytes = self.cfg["dtype_bytes"]
+        acc_steps = max(self.gbs // (b * dp * sharding), 1)
+
+        # computation of one micro batch on one stage, backward costs twice
+        # of the forward
+        attn_flops, mlp_flops = self._layer_flops(b)
+        layer_flops = 3 * (attn_flops + mlp_flops)
+        if use_recompute:
+            if granularity == "core_attn":
+                layer_flops += 4 * b * self.s * self.s * self.h
+            elif granularity == "full_attn":
+                layer_flops += attn_flops
+            else:
+                layer_flops += attn_flops + mlp_flops
+        stage_flops = layer_flops * self.l / pp
+        # the logits on the last stage
+        stage_flops += 3 * 2 * b * self.s * self.h * self.V
+        flops_per_second = (
+            self.cfg["peak_tflops"] * 1e12 * self.cfg["efficiency"]
+        )
+        micro_batch_time = stage_flops / mp / flops_per_second
+
+        # mp all-reduce, twice in forward and twice in backward per layer
+        if mp > 1:
+            size = self.s * b * self.h * dtype_bytes
+            all_reduce = 2 * (mp - 1) / mp * size / self._bandwidth(mp)
+            num_all_reduce = 4 + (2 if use_recompute else 0)
+            micro_batch_time += num_all_reduce * all_reduce * self.l / pp
+
+        # 1F1B schedule, the bubble is reduced by the virtual stages
+        compute_time = micro_batch_time * (acc_steps + (pp - 1) / vpp)
+
+        # pp send/recv of the activation and its gradient
+        comm_time = 0
+        if pp > 1:
+            size = self.s * b * self.h * dtype_bytes / mp
+            p2p = size / self._bandwidth(mp * dp * sharding * pp)
+            comm_time += 2 * (acc_steps + pp - 1) * vpp * p2p
+
+        # gradient synchronization, sharding does reduce-scatter and
+        # all-gather which is as much as an all-reduce
+        grad_group = dp * sharding
+        if grad_group > 1:
+            params = (
+                self.layer_params * self.l / pp + self.embedding_params
+            ) / mp
+            size = params * dtype_bytes
+            span = mp * pp * grad_group
+            all_reduce = (
+                2 * (grad_group - 1) / grad_group * size / self._bandwidth(span)
+            )
+            comm_time += all_reduce
+            if sharding > 1 and stage >= 3:
+                # all-gather the parameters in forward and backward
+                comm_time += all_reduce * acc_steps
+        return compute_time + comm_time
+
+    def simulate(self, cfg):
+        """Return the estimated memory in MB and step time in seconds."""
+        return {
+            "estimated_memory_usage": round(self.estimate_memory(cfg), 2),
+            "estimated_step_time": round(self.estimate_step_time(cfg), 5),
+        }
+
+
+_simulators = {}
+
+
+def get_simulator(tuner_cfg):
+    """Return the simulator of the tuner_cfg, or None if it is not enabled."""
+    simulator_cfg = tuner_cfg.get("simulator", None)
+    if simulator_cfg is None:
+        return None
+    if simulator_cfg is True:
+        simulator_cfg = {}
+    gpus_per_node = tuner_cfg.get("gpus_per_node", 8)
+    key = (
+        repr(sorted(tuner_cfg["model_cfg"].items())),
+        repr(sorted(simulator_cfg.items())),
+        gpus_per_node,
+    )
+    if key not in _simulators:
+        _simulators[key] = TransformerSimulator(
+            tuner_cfg["model_cfg"], simulator_cfg, gpus_per_node
+        )
+    return _simulators[key]
+
+
+def _rank(values):
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def _spearman(x, y):
+    if len(x) < 2:
+        return None
+    rx, ry = _rank(x), _rank(y)
+    mx, my = sum(rx) / len(rx), sum(ry) / len(ry)
+    cov = sum((a - mx) * (b - my) for a, b in zip(rx, ry))
+    vx = math.sqrt(sum((a - mx) ** 2 for a in rx))
+    vy = math.sqrt(sum((b - my) ** 2 for b in ry))
+    if vx == 0 or vy == 0:
+        return None
+    return cov / (vx * vy)
+
+
+def validate_simulator(history_cfgs, tuner_cfg, simulator=None):
+    """
+    Compare the simulator with the configs recorded in the history.
+
+    Args:
+        history_cfgs (list[dict]|str): The history configs or the path of the
+            history csv file stored by HistoryRecorder.
+        tuner_cfg (dict): The configuration of auto tuner user defined.
+        simulator (TransformerSimulator, optional): The simulator to validate.
+            Default: the simulator of tuner_cfg.
+
+    Returns:
+        dict: memory_mape is the mean absolute percentage error of the peak
+        memory, oom_recall is the ratio of the OOM configs predicted to exceed
+        the memory, time_spearman is the rank correlation between the
+        estimated step time and the measured step time.
+    """
+    if isinstance(history_cfgs, str):
+        import pandas as pd
+
+        history_cfgs = pd.read_csv(history_cfgs).to_dict("records")
+    if simulator is None:
+        simulator = get_simulator(tuner_cfg) or TransformerSimulator(
+            tuner_cfg["model_cfg"],
+            gpus_per_node=tuner_cfg.get("gpus_per_node", 8),
+        )
+    metric_name = tuner_cfg["metric_cfg"]["name"]
+    maximize = (
+        tuner_cfg["metric_cfg"].get("OptimizationDirection", "Maximize")
+        == "Maximize"
+    )
+    max_mem_usage = tuner_cfg.get(
+        "max_mem_usage", tuner_cfg.get("per_card_memory", None)
+    )
+
+    memory_errors = []
+    oom_total = 0
+    oom_detected = 0
+    estimated_times = []
+    measured_times = []
+    for cfg in history_cfgs:
+        estimated = simulator.simulate(cfg)
+        mem = cfg.get("max_mem_usage")
+        if mem == "OOM":
+            oom_total += 1
+            if (
+                max_mem_usage is not None
+                and estimated["estimated_memory_usage"] > max_mem_usage * 1024
+            ):
+                oom_detected += 1
+            continue
+        try:
+            mem = float(mem)
+        except (TypeError, ValueError):
+            mem = None
+        if mem is not None and not math.isnan(mem) and mem > 0:
+            memory_errors.append(
+                abs(estimated["estimated_memory_usage"] - mem) / mem
+            )
+        try:
+            metric = float(cfg.get(metric_name))
+        except (TypeError, ValueError):
+            continue
+        if math.isnan(metric) or metric <= 0:
+            continue
+        # a maximized metric is a throughput, the step time is its inverse
+        measured_times.append(1 / metric if maximize else metric)
+        estimated_times.append(estimated["estimated_step_time"])
+
+    result = {
+        "memory_mape": (
+            sum(memory_errors) / len(memory_errors) if memory_errors else None
+        ),
+        "oom_recall": oom_detected / oom_total if oom_total else None,
+        "time_spearman": _spearman(estimated_times, measured_times),
+    }
+    logger.info(f"Validate the simulator with the history: {result}")
+    return result
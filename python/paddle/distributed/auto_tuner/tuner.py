@@ -48,6 +48,11 @@ class AutoTuner:
 
             tuner_cfg["candidates"] = gbs_default_candidates(tuner_cfg)
             self.algo = GBSSearch(tuner_cfg)
+        elif search_algo == "model_based":
+            from .search import ModelBasedSearch
+
+            tuner_cfg["candidates"] = default_candidates(tuner_cfg)
+            self.algo = ModelBasedSearch(tuner_cfg)
         elif search_algo == "customize":
             from .search import CustomizeSearch
 
@@ -68,6 +73,15 @@ class AutoTuner:
 
         return new_cfg
 
+    def search_batch(self, num):
+        """Return at most num new task configs to run at the same time."""
+        num = min(num, self.task_limit - self.cur_task_id + 1)
+        if num <= 0:
+            return []
+        new_cfgs = self.algo.search_batch(self.history_cfgs, num)
+        self.cur_task_id += len(new_cfgs)
+        return new_cfgs
+
     def add_cfg(self, cfg):
         """Add cfg into history cfgs"""
         self.history_cfgs.append(cfg)
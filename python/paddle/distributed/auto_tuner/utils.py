@@ -1403,6 +1403,38 @@ def gen_new_ctx(ctx, cur_cfg, tuner_cfg):
     return new_ctx
 
 
+def gen_log_dir_name(job_id, cur_cfg, tuner_cfg):
+    """Generate the log dir name of the task."""
+    log_dir = "Job{}_GBS{}_DP{}_MP{}_PP{}_VPP{}_Sharding{}_Stage{}_MBS{}_Recompute_{}_Granularity_{}_AccStep{}".format(
+        job_id,
+        cur_cfg["global_batch_size"],
+        cur_cfg["dp_degree"],
+        cur_cfg["mp_degree"],
+        cur_cfg["pp_degree"],
+        cur_cfg["vpp_degree"],
+        cur_cfg["sharding_degree"],
+        cur_cfg["sharding_stage"],
+        cur_cfg["micro_batch_size"],
+        cur_cfg["use_recompute"],
+        cur_cfg["recompute_granularity"],
+        cur_cfg["acc_steps"],
+    )
+    if "sharding_overlap" in cur_cfg:
+        log_dir = log_dir + f"_Overlap_{cur_cfg['sharding_overlap']}"
+    if "refined_recompute" in tuner_cfg:
+        for key in tuner_cfg["refined_recompute"]:
+            dir_name = "".join(i.capitalize() for i in key.split("_"))
+            dir_name += str(cur_cfg[key])
+            log_dir = log_dir + "_" + dir_name
+
+    if "custom_search_dim" in tuner_cfg:
+        for key in tuner_cfg["custom_search_dim"]:
+            dir_name = "".join(i.capitalize() for i in key.split("_"))
+            dir_name += str(cur_cfg[key])
+            log_dir = log_dir + "_" + dir_name
+    return log_dir
+
+
 def read_metric_log(
     path, file="workerlog.0", target_metric='step/s'
 ) -> tuple[float, int]:
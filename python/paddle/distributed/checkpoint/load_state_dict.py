@@ -14,19 +14,31 @@
 
 from __future__ import annotations
 
+import collections
 import copy
+import dataclasses
+import math
 import os
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 import paddle
+from paddle.base import core
 from paddle.base.framework import (
     _current_expected_place,
+    convert_to_proto_type,
 )
 from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
 
 from .metadata import LocalTensorIndex, LocalTensorMetadata
+from .range_reader import (
+    RangeReader,
+    get_storage_index,
+    is_range_read_available,
+)
 from .utils import (
     check_unique_id,
     compute_local_shape_and_global_offset,
@@ -51,6 +63,10 @@ class ReadItem:
 
 PATH_TO_CHECKPOINT_FILES: dict[str, tuple[list, list]] = {}
 
+# The default max bytes of checkpoint data held by one rank at a time when
+# loading with ``streaming=True``.
+LOAD_MEMORY_BUDGET = 1024 * 1024 * 1024
+
 
 def get_checkpoint_files(path, use_cache=True, unique_id=None):
     # if unique_id is None, all file ends with .metadata and .distcp is returned
@@ -531,6 +547,8 @@ def load_state_dict(
     unique_id: int | None = None,
     offload: bool = False,
     mw_name_compatibility: bool = True,
+    streaming: bool = False,
+    memory_budget: int | None = None,
 ) -> None:
     """
     Load the state_dict inplace from a checkpoint path.
@@ -543,6 +561,8 @@ def load_state_dict(
         unique_id(int): The unique id of ckeckpoint, used to distinguish between different checkpoint versions. Default is None, in which case the id the max id of given path, and the newest version checkpoint is loaded.
         offload(bool): Whether to offload the checkpoint data from GPU to CPU.
         mw_name_compatibility(bool): Enable name compatibility between dynamic and static graph semi-automatic parallel. Default is True.
+        streaming(bool): Whether to read only the byte ranges of the checkpoint files that each rank needs, and to send them to the ranks that need them with point-to-point communication, instead of loading whole files and broadcasting. Default is False.
+        memory_budget(int|None): The max bytes of checkpoint data held by one rank at a time when ``streaming`` is True. Default is None, in which case 1GB is used.
     Example:
         .. code-block:: python
 
@@ -637,31 +657,43 @@ def load_state_dict(
         for d in global_local_data_files:
             rank_to_local_data_files.update(d)
 
-        local_load_files = get_rank_to_read_files(
-            rank_to_files, rank_to_local_data_files
-        )
+        if streaming and is_range_read_available():
+            _streaming_load_state_dict(
+                flat_state_dict,
+                path,
+                metadata_list,
+                rank_to_local_data_files,
+                process_group,
+                memory_budget,
+            )
+        else:
+            local_load_files = get_rank_to_read_files(
+                rank_to_files, rank_to_local_data_files
+            )
 
-        source_state_dict = {}
-        for file in local_load_files:
-            if offload:
-                state_dict_numpy = paddle.load(
-                    os.path.join(path, file), return_numpy=True
-                )
-                source_state_dict[file] = {
-                    key: paddle.to_tensor(value, place=paddle.CPUPlace())
-                    for key, value in state_dict_numpy.items()
-                }
-            else:
-                source_state_dict[file] = paddle.load(os.path.join(path, file))
-
-        _load_state_dict(
-            flat_state_dict,
-            source_state_dict,
-            metadata_list,
-            process_group,
-            coordinator_rank,
-            offload,
-        )
+            source_state_dict = {}
+            for file in local_load_files:
+                if offload:
+                    state_dict_numpy = paddle.load(
+                        os.path.join(path, file), return_numpy=True
+                    )
+                    source_state_dict[file] = {
+                        key: paddle.to_tensor(value, place=paddle.CPUPlace())
+                        for key, value in state_dict_numpy.items()
+                    }
+                else:
+                    source_state_dict[file] = paddle.load(
+                        os.path.join(path, file)
+                    )
+
+            _load_state_dict(
+                flat_state_dict,
+                source_state_dict,
+                metadata_list,
+                process_group,
+                coordinator_rank,
+                offload,
+            )
 
         for flat_key, keys in mapping.items():
             if (
@@ -815,6 +847,231 @@ def _load_state_dict(
             paddle.distributed.barrier(process_group)
 
 
+# NOTE: [ streaming checkpoint loading ]
+# _load_state_dict loads every needed file as a whole on one of the ranks
+# that can access it and broadcasts each read item over the whole process
+# group. _streaming_load_state_dict instead
+#   1. splits every read item along its leading dimensions so that no part
+#      is larger than the memory budget,
+#   2. assigns each part to a reader rank: the rank that needs it when that
+#      rank can access the file, otherwise the rank with the least assigned
+#      bytes among those that can,
+#   3. groups the parts into batches in which no rank holds more than the
+#      memory budget, and for each batch reads only the byte ranges of the
+#      parts (see NOTE: [ reading byte ranges of checkpoint files ]) and
+#      sends the parts read for other ranks with point-to-point operations.
+# All ranks compute the same schedule from the gathered read items, so the
+# sends and receives of every batch match without extra synchronization.
+
+
+def _element_size(dtype: str) -> int:
+    return core.size_of_dtype(convert_to_proto_type(dtype))
+
+
+def _split_read_item(
+    item: ReadItem, nbytes: int, max_bytes: int
+) -> list[ReadItem]:
+    """
+    Split ``item`` along its leading dimensions into parts of at most
+    ``max_bytes`` bytes, as far as a single element allows.
+    """
+    if nbytes <= max_bytes:
+        return [item]
+    dims = [dim for dim, length in enumerate(item.lengths) if length > 1]
+    if len(dims) == 0:
+        return [item]
+    dim = dims[0]
+    length = item.lengths[dim]
+    step_bytes = nbytes // length
+    step = max(1, max_bytes // step_bytes)
+
+    def replace(values, value):
+        return (*values[:dim], value, *values[dim + 1 :])
+
+    items = []
+    for begin in range(0, length, step):
+        size = min(step, length - begin)
+        part = dataclasses.replace(
+            item,
+            cur_offset=replace(
+                item.cur_offset, item.cur_offset[dim] + begin
+            ),
+            storage_offset=replace(
+                item.storage_offset, item.storage_offset[dim] + begin
+            ),
+            lengths=replace(item.lengths, size),
+        )
+        items += _split_read_item(part, step_bytes * size, max_bytes)
+    return items
+
+
+def get_read_schedule(
+    read_items: list[ReadItem],
+    storage_files: dict[LocalTensorIndex, str],
+    rank_to_local_data_files: dict[int, list[str]],
+    memory_budget: int,
+) -> list[list[tuple[ReadItem, str, int]]]:
+    """
+    Schedule the read items in batches of (read_item, file_name, reader_rank),
+    see NOTE: [ streaming checkpoint loading ].
+    """
+    file_to_ranks = {}
+    for rank in sorted(rank_to_local_data_files):
+        for file_name in rank_to_local_data_files[rank]:
+            file_to_ranks.setdefault(file_name, []).append(rank)
+
+    read_bytes = collections.defaultdict(int)
+    batches = []
+    batch = []
+    batch_bytes = collections.defaultdict(int)
+    for item in read_items:
+        file_name = storage_files[item.local_tensor_index]
+        assert (
+            file_name in file_to_ranks
+        ), f"The file:{file_name} of read item:{item} is not accessible by any rank."
+        readers = file_to_ranks[file_name]
+        element_size = _element_size(item.dtype)
+        nbytes = math.prod(item.lengths) * element_size
+        for part in _split_read_item(item, nbytes, memory_budget):
+            part_bytes = math.prod(part.lengths) * element_size
+            if part.rank in readers:
+                reader = part.rank
+            else:
+                reader = min(readers, key=lambda rank: (read_bytes[rank], rank))
+            read_bytes[reader] += part_bytes
+            ranks = {reader, part.rank}
+            if len(batch) > 0 and any(
+                batch_bytes[rank] + part_bytes > memory_budget
+                for rank in ranks
+            ):
+                batches.append(batch)
+                batch = []
+                batch_bytes = collections.defaultdict(int)
+            batch.append((part, file_name, reader))
+            for rank in ranks:
+                batch_bytes[rank] += part_bytes
+    if len(batch) > 0:
+        batches.append(batch)
+    return batches
+
+
+def _assign_read_item(target_state_dict, item, value, use_dist):
+    target = target_state_dict[item.local_tensor_index.tensor_key]
+    cur_local_tensor = (
+        target._local_value() if use_dist and target.is_dist() else target
+    )
+    if isinstance(value, np.ndarray):
+        value = paddle.to_tensor(value, place=cur_local_tensor.place)
+    elif cur_local_tensor.place.is_cpu_place():
+        value = value.cpu()
+    cur_ends = [
+        cur_offset + cur_length
+        for cur_offset, cur_length in zip(item.cur_offset, item.lengths)
+    ]
+    # The cur_chunk_tensor and cur_local_tensor share the same memory.
+    if len(item.lengths) > 0:
+        cur_chunk_tensor = paddle.slice(
+            cur_local_tensor,
+            list(range(len(item.lengths))),
+            item.cur_offset,
+            cur_ends,
+        )
+    else:
+        cur_chunk_tensor = cur_local_tensor
+    paddle.assign(value, cur_chunk_tensor)
+
+
+def _streaming_load_state_dict(
+    target_state_dict,
+    path,
+    metadata_list,
+    rank_to_local_data_files,
+    process_group=None,
+    memory_budget=None,
+) -> None:
+    with paddle.base.dygraph.guard():
+        use_dist = True if paddle.distributed.get_world_size() > 1 else False
+        if memory_budget is None:
+            memory_budget = LOAD_MEMORY_BUDGET
+        assert memory_budget > 0, "memory_budget should be positive."
+
+        storage_files = {}
+        for metadata in metadata_list:
+            storage_files.update(metadata.storage_metadata)
+        read_items = get_read_items(
+            metadata_list, target_state_dict, process_group, use_dist
+        )
+        batches = get_read_schedule(
+            read_items, storage_files, rank_to_local_data_files, memory_budget
+        )
+
+        cur_rank = paddle.distributed.get_rank()
+        # the indices hold the small tensors of the files, they are only
+        # kept during this load
+        storage_indices = {}
+        with RangeReader() as reader:
+            for batch in batches:
+                requests = []
+                for item, file_name, reader_rank in batch:
+                    if reader_rank == cur_rank:
+                        file_path = os.path.join(path, file_name)
+                        if file_path not in storage_indices:
+                            storage_indices[file_path] = get_storage_index(
+                                file_path
+                            )
+                        entry = storage_indices[file_path][
+                            item.local_tensor_index.tensor_key
+                        ]
+                        requests.append(
+                            (
+                                file_path,
+                                entry,
+                                item.storage_offset,
+                                item.lengths,
+                            )
+                        )
+                values = iter(reader.read(requests))
+
+                p2p_ops = []
+                received = []
+                for item, _, reader_rank in batch:
+                    if reader_rank == cur_rank:
+                        value = next(values)
+                        if item.rank == cur_rank:
+                            _assign_read_item(
+                                target_state_dict, item, value, use_dist
+                            )
+                        else:
+                            p2p_ops.append(
+                                paddle.distributed.P2POp(
+                                    paddle.distributed.isend,
+                                    paddle.to_tensor(value),
+                                    item.rank,
+                                    process_group,
+                                )
+                            )
+                    elif item.rank == cur_rank:
+                        tensor = paddle.empty(list(item.lengths), item.dtype)
+                        p2p_ops.append(
+                            paddle.distributed.P2POp(
+                                paddle.distributed.irecv,
+                                tensor,
+                                reader_rank,
+                                process_group,
+                            )
+                        )
+                        received.append((item, tensor))
+
+                if len(p2p_ops) > 0:
+                    for task in paddle.distributed.batch_isend_irecv(p2p_ops):
+                        task.wait()
+                for item, tensor in received:
+                    _assign_read_item(target_state_dict, item, tensor, use_dist)
+
+        if use_dist:
+            paddle.distributed.barrier(process_group)
+
+
 def compute_global_shape(local_tensor_indices):
     rank = len(local_tensor_indices[0].local_shape)
     global_shape = []
@@ -0,0 +1,312 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import math
+import os
+import pickle
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy.typing as npt
+
+# NOTE: [ reading byte ranges of checkpoint files ]
+# A .distcp file is the paddle.save pickle of a dict of (name, ndarray)
+# tuples. With protocol >= 3 the raw data of every ndarray is pickled as a
+# single BINBYTES(8) payload, and payloads of 64KB or more are written
+# outside of any pickle frame, i.e. they are plain contiguous byte ranges
+# of the file. ``get_storage_index`` walks the pickle with the pure python
+# unpickler, seeking over those payloads instead of reading them, and
+# returns the offset, shape and dtype of every tensor. Small tensors and
+# pickles that do not follow that layout are kept in memory as they are.
+#
+# With the index, a slice of a stored tensor is a set of contiguous runs in
+# the file, one for every index of the leading dimensions that are not
+# fully covered by the slice. ``RangeReader`` reads those runs with pread
+# on a thread pool, so resharding a checkpoint only reads the bytes that
+# the current rank actually needs.
+
+# Max bytes read by one task of the thread pool.
+READ_CHUNK_SIZE = 16 * 1024 * 1024
+READ_NUM_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class _Extent:
+    offset: int
+    size: int
+
+
+class _ArrayStub:
+    """
+    Stands for ``numpy.ndarray`` while unpickling, and records its state
+    without reading the data.
+    """
+
+    def __init__(self, *args):
+        self.state = None
+
+    def __setstate__(self, state):
+        self.state = state
+
+
+class _IndexUnpickler(pickle._Unpickler):
+    dispatch = dict(pickle._Unpickler.dispatch)
+
+    def __init__(self, file):
+        super().__init__(file)
+        self._file = file
+
+    def find_class(self, module, name):
+        if name == '_reconstruct' and module.endswith('multiarray'):
+            return _ArrayStub
+        return super().find_class(module, name)
+
+    def _load_bytes(self, size_format):
+        header = self.read(struct.calcsize(size_format))
+        (size,) = struct.unpack(size_format, header)
+        # payloads outside of frames are read from the file directly, so the
+        # file position is the start of the payload.
+        if self._unframer.current_frame is None:
+            offset = self._file.tell()
+            self._file.seek(size, os.SEEK_CUR)
+            self.append(_Extent(offset, size))
+        else:
+            self.append(self.read(size))
+
+    def load_binbytes(self):
+        self._load_bytes('<I')
+
+    def load_binbytes8(self):
+        self._load_bytes('<Q')
+
+    dispatch[pickle.BINBYTES[0]] = load_binbytes
+    dispatch[pickle.BINBYTES8[0]] = load_binbytes8
+
+
+@dataclass
+class StorageEntry:
+    """
+    The location of a tensor stored in a checkpoint file. ``array`` is set
+    instead of ``offset`` when the tensor is held in memory.
+    """
+
+    shape: tuple[int, ...]
+    dtype: np.dtype
+    offset: int = -1
+    array: npt.NDArray[Any] | None = None
+
+    @property
+    def nbytes(self) -> int:
+        return math.prod(self.shape) * self.dtype.itemsize
+
+
+def _to_entry(stub: _ArrayStub, file) -> StorageEntry:
+    state = stub.state
+    if len(state) == 5:
+        state = state[1:]
+    shape, dtype, is_fortran, data = state
+    shape = tuple(shape)
+    if (
+        isinstance(data, _Extent)
+        and not is_fortran
+        and not dtype.hasobject
+        and data.size == math.prod(shape) * dtype.itemsize
+    ):
+        return StorageEntry(shape, dtype, offset=data.offset)
+    if isinstance(data, _Extent):
+        file.seek(data.offset)
+        data = file.read(data.size)
+    array = np.ndarray((0,), np.int8)
+    array.__setstate__((shape, dtype, is_fortran, data))
+    return StorageEntry(shape, dtype, array=array)
+
+
+def _build_index(obj, file) -> dict[str, StorageEntry]:
+    index = {}
+    for key, value in obj.items():
+        # paddle.save pickles a Tensor as (name, ndarray)
+        if isinstance(value, tuple) and len(value) == 2:
+            value = value[1]
+        if isinstance(value, _ArrayStub):
+            index[key] = _to_entry(value, file)
+        elif isinstance(value, np.ndarray):
+            index[key] = StorageEntry(value.shape, value.dtype, array=value)
+    return index
+
+
+def get_storage_index(file_path: str) -> dict[str, StorageEntry]:
+    """
+    Get the :class:`StorageEntry` of every tensor saved in ``file_path``,
+    see NOTE: [ reading byte ranges of checkpoint files ]. The index holds
+    the small tensors of the file, so it should only be kept as long as the
+    file is read.
+    """
+    with open(file_path, 'rb') as f:
+        return _build_index(_IndexUnpickler(f).load(), f)
+
+
+def contiguous_runs(
+    shape: Sequence[int], offsets: Sequence[int], lengths: Sequence[int]
+) -> tuple[npt.NDArray[np.int64], int]:
+    """
+    Split the slice ``[offsets, offsets + lengths)`` of a C-contiguous array
+    of ``shape`` into contiguous runs.
+
+    Returns:
+        The start of every run in elements, in the order of the elements of
+        the slice, and the number of elements of each run.
+    """
+    ndim = len(shape)
+    # the trailing dimensions fully covered by the slice are contiguous
+    # with the first one that is not.
+    k = ndim
+    while k > 0 and offsets[k - 1] == 0 and lengths[k - 1] == shape[k - 1]:
+        k -= 1
+    if k == 0:
+        return np.zeros([1], dtype=np.int64), math.prod(shape)
+
+    strides = [math.prod(shape[i + 1 :]) for i in range(ndim)]
+    run = lengths[k - 1] * strides[k - 1]
+    base = sum(offsets[i] * strides[i] for i in range(k))
+    if k == 1:
+        return np.full([1], base, dtype=np.int64), run
+    grid = np.indices(lengths[: k - 1], dtype=np.int64).reshape(k - 1, -1)
+    starts = base + np.asarray(strides[: k - 1], dtype=np.int64) @ grid
+    return starts, run
+
+
+def _pread_into(fd: int, view: memoryview, offset: int) -> None:
+    while len(view) > 0:
+        n = os.preadv(fd, [view], offset)
+        if n <= 0:
+            raise OSError(
+                f"Unexpected end of file while reading the checkpoint at "
+                f"offset {offset}."
+            )
+        view = view[n:]
+        offset += n
+
+
+def _read_runs(fd: int, dst: memoryview, runs) -> None:
+    for file_offset, dst_offset, size in runs:
+        _pread_into(fd, dst[dst_offset : dst_offset + size], file_offset)
+
+
+class RangeReader:
+    """
+    Read slices of the tensors stored in checkpoint files, only reading the
+    byte ranges covered by the slices.
+
+    Reads are split into tasks of at most ``READ_CHUNK_SIZE`` bytes, which
+    are submitted file by file in the order of their offsets and run on a
+    pool of ``num_workers`` threads.
+    """
+
+    def __init__(self, num_workers: int = READ_NUM_WORKERS):
+        self._pool = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix='ckpt_reader'
+        )
+        self._fds = {}
+        self._lock = threading.Lock()
+
+    def _fd(self, file_path):
+        with self._lock:
+            if file_path not in self._fds:
+                self._fds[file_path] = os.open(
+                    file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+                )
+            return self._fds[file_path]
+
+    def read(
+        self,
+        requests: Sequence[
+            tuple[str, StorageEntry, Sequence[int], Sequence[int]]
+        ],
+    ) -> list[npt.NDArray[Any]]:
+        """
+        Read every ``(file_path, entry, offsets, lengths)`` slice in
+        ``requests`` into a new C-contiguous array.
+        """
+        outs = [None] * len(requests)
+        tasks = {}
+        for i, (file_path, entry, offsets, lengths) in enumerate(requests):
+            offsets, lengths = tuple(offsets), tuple(lengths)
+            if entry.array is not None:
+                slices = tuple(
+                    slice(o, o + n) for o, n in zip(offsets, lengths)
+                )
+                outs[i] = np.array(entry.array[slices], order='C')
+                continue
+
+            out = np.empty(lengths, dtype=entry.dtype)
+            outs[i] = out
+            if out.size == 0:
+                continue
+            itemsize = entry.dtype.itemsize
+            starts, run = contiguous_runs(entry.shape, offsets, lengths)
+            run_bytes = run * itemsize
+            file_offsets = entry.offset + starts * itemsize
+            dst = memoryview(out.reshape([-1]).view(np.uint8))
+            file_tasks = tasks.setdefault(file_path, [])
+            # cut the runs into tasks of about READ_CHUNK_SIZE bytes
+            batch, batch_bytes = [], 0
+            for j, file_offset in enumerate(file_offsets.tolist()):
+                for begin in range(0, run_bytes, READ_CHUNK_SIZE):
+                    size = min(READ_CHUNK_SIZE, run_bytes - begin)
+                    batch.append(
+                        (file_offset + begin, j * run_bytes + begin, size)
+                    )
+                    batch_bytes += size
+                    if batch_bytes >= READ_CHUNK_SIZE:
+                        file_tasks.append((batch[0][0], dst, batch))
+                        batch, batch_bytes = [], 0
+            if batch:
+                file_tasks.append((batch[0][0], dst, batch))
+
+        futures = []
+        for file_path, file_tasks in tasks.items():
+            fd = self._fd(file_path)
+            file_tasks.sort(key=lambda task: task[0])
+            for _, dst, runs in file_tasks:
+                futures.append(self._pool.submit(_read_runs, fd, dst, runs))
+        for future in futures:
+            future.result()
+        return outs
+
+    def close(self) -> None:
+        self._pool.shutdown()
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def is_range_read_available() -> bool:
+    return hasattr(os, 'preadv')
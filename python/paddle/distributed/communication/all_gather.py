@@ -16,8 +16,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, TypeVar
 
-import numpy as np
-
 import paddle
 from paddle import framework
 from paddle.distributed.communication import stream
@@ -25,6 +23,8 @@ from paddle.distributed.communication import stream
 from .serialization_utils import (
     convert_object_to_tensor,
     convert_tensor_to_object,
+    get_object_tensor_sizes,
+    pad_object_tensor,
 )
 
 if TYPE_CHECKING:
@@ -34,6 +34,10 @@ if TYPE_CHECKING:
 
     _T = TypeVar("_T")
 
+# bytes of every serialized object sent by the first all gather of
+# all_gather_object, its header carries the size of the object
+_OBJECT_HEAD_SIZE = 1024
+
 
 def all_gather(
     tensor_list: list[Tensor],
@@ -123,22 +127,36 @@ def all_gather_object(
         framework.in_dynamic_mode()
     ), "all_gather_object doesn't support static graph mode."
 
-    tensor, len_of_tensor = convert_object_to_tensor(obj)
-
-    # gather len_of_tensor from all ranks
-    list_len_of_tensor = []
-    all_gather(list_len_of_tensor, len_of_tensor, group)
-    # get the max length from list
-    max_len_of_tensor = int(max(list_len_of_tensor).item())
-    # resize the input tensor to max length avoid hang in all gather
-    # Note(liyurui): Maybe we should support various length all_gather?
-    # Now this operation is efficient for we don't support resize in python.
-    numpy_data = tensor.numpy()
-    numpy_data = np.resize(numpy_data, [max_len_of_tensor])
-    input_tensor = paddle.to_tensor(numpy_data)
-
-    tensor_list = []
-    all_gather(tensor_list, input_tensor, group)
+    tensor, _ = convert_object_to_tensor(obj)
+
+    # NOTE: the sizes of the objects are not gathered by a collective of
+    # their own, the first _OBJECT_HEAD_SIZE bytes of every object are
+    # gathered together with them, and the rest of the objects larger than
+    # that are gathered afterwards, padded to the max size.
+    head = pad_object_tensor(tensor[:_OBJECT_HEAD_SIZE], _OBJECT_HEAD_SIZE)
+    head_list = []
+    all_gather(head_list, head, group)
+    list_len_of_tensor = get_object_tensor_sizes(head_list)
+    max_len_of_tensor = max(list_len_of_tensor)
+
+    tensor_list = head_list
+    if max_len_of_tensor > _OBJECT_HEAD_SIZE:
+        rest = tensor[_OBJECT_HEAD_SIZE:]
+        if tensor.shape[0] <= _OBJECT_HEAD_SIZE:
+            rest = paddle.zeros([0], dtype="uint8")
+        rest = pad_object_tensor(rest, max_len_of_tensor - _OBJECT_HEAD_SIZE)
+        rest_list = []
+        all_gather(rest_list, rest, group)
+        tensor_list = [
+            (
+                paddle.concat([head_tensor, rest_tensor])
+                if len_of_tensor > _OBJECT_HEAD_SIZE
+                else head_tensor
+            )
+            for head_tensor, rest_tensor, len_of_tensor in zip(
+                head_list, rest_list, list_len_of_tensor
+            )
+        ]
     for i, tensor in enumerate(tensor_list):
         object_list.append(
             convert_tensor_to_object(tensor, list_len_of_tensor[i])
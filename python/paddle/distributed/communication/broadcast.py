@@ -131,18 +131,17 @@ def broadcast_object_list(
     else:
         obj_size_tensor = paddle.empty([obj_nums], dtype="int64")
     broadcast(obj_size_tensor, src, group)
+    obj_sizes = obj_size_tensor.numpy().tolist()
 
     if rank == src:
         # cast to uint8 to keep the same dtype
         obj_data_tensor = paddle.concat(obj_tensors).cast("uint8")
     else:
-        data_len = paddle.sum(obj_size_tensor).item()
-        obj_data_tensor = paddle.empty([data_len], dtype="uint8")
+        obj_data_tensor = paddle.empty([sum(obj_sizes)], dtype="uint8")
     broadcast(obj_data_tensor, src, group)
 
     offset = 0
-    for i in range(obj_nums):
-        data_len = obj_size_tensor[i]
+    for i, data_len in enumerate(obj_sizes):
         object_list[i] = convert_tensor_to_object(
             obj_data_tensor[offset : offset + data_len], data_len
         )
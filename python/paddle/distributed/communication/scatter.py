@@ -23,7 +23,6 @@ if TYPE_CHECKING:
     from paddle.base.core import task
     from paddle.distributed.communication.group import Group
 
-import numpy as np
 
 import paddle
 import paddle.distributed as dist
@@ -33,6 +32,7 @@ from paddle.distributed.communication import stream
 from .serialization_utils import (
     convert_object_to_tensor,
     convert_tensor_to_object,
+    pad_object_tensor,
 )
 
 
@@ -132,34 +132,35 @@ def scatter_object_list(
     ), "scatter_object_list doesn't support static graph mode."
 
     rank = dist.get_rank()
+    if group is None:
+        nranks, group_rank = dist.get_world_size(), rank
+    else:
+        nranks, group_rank = group.nranks, group.rank
     in_obj_tensors = []
-    in_obj_sizes = []
 
+    # broadcast the sizes of all the objects at once, every rank gets both
+    # the max size and the size of its own object from it
     if rank == src:
+        in_obj_sizes = []
         for obj in in_object_list:
             obj_tensor, obj_size = convert_object_to_tensor(obj)
             in_obj_tensors.append(obj_tensor)
             in_obj_sizes.append(obj_size)
-        max_obj_size_tensor = max(in_obj_sizes)
+        obj_size_tensor = paddle.stack(in_obj_sizes)
     else:
-        max_obj_size_tensor = paddle.empty([], dtype="int64")
-    stream.broadcast(max_obj_size_tensor, src)
-    max_obj_size = int(max_obj_size_tensor.item())
+        obj_size_tensor = paddle.empty([nranks], dtype="int64")
+    stream.broadcast(obj_size_tensor, src, group)
+    obj_sizes = obj_size_tensor.numpy().tolist()
+    max_obj_size = max(obj_sizes)
 
     # resize to the same size
-    in_tensor_list = []
-    for tensor in in_obj_tensors:
-        numpy_data = tensor.numpy()
-        numpy_data = np.resize(numpy_data, [max_obj_size])
-        in_tensor = paddle.to_tensor(numpy_data)
-        in_tensor_list.append(in_tensor)
+    in_tensor_list = [
+        pad_object_tensor(tensor, max_obj_size) for tensor in in_obj_tensors
+    ]
     out_tensor = paddle.empty([max_obj_size], dtype="uint8")
     scatter(out_tensor, in_tensor_list if rank == src else None, src, group)
 
-    out_tensor_size = paddle.empty([], dtype="int64")
-    scatter(out_tensor_size, in_obj_sizes if rank == src else None, src, group)
-
     out_object_list.clear()
     out_object_list.append(
-        convert_tensor_to_object(out_tensor, out_tensor_size.item())
+        convert_tensor_to_object(out_tensor, obj_sizes[group_rank])
     )
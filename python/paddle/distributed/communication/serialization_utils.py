@@ -12,23 +12,213 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copyreg
 import io
 import pickle
 
 import numpy as np
 
 import paddle
+from paddle.base import core, framework
+from paddle.base.data_feeder import convert_dtype
+
+# The object is serialized by pickle protocol 5, the numpy arrays in it are
+# taken out of the pickle stream as out-of-band buffers, and the tensors on
+# the current device are replaced by persistent ids and sent as they are.
+# The layout of the result tensor is:
+#   | header | pickle stream | buffer 0 | ... | tensor 0 | ...
+# with the header
+#   | total size | host size | num buffers | num tensors |
+#   | size of the pickle stream | size of every buffer | size of every tensor |
+# all the sizes are int64, and every segment is aligned to _ALIGNMENT bytes
+# so that the arrays and tensors rebuilt on the received data are aligned
+# too. The header, the pickle stream and the buffers (the host part) are
+# gathered into one host array and copied to the device at once, the
+# tensors are viewed as uint8 and copied once into the result tensor,
+# without going through numpy. The receiver copies only the host part to
+# the host and rebuilds the tensors as views of the received tensor.
+_PICKLE_PROTOCOL = 5
+_ALIGNMENT = 64
+_HEADER_ITEMS = 4
+# dtypes which the tensors can be viewed as uint8 from and back to
+_VIEW_DTYPES = (
+    'bool',
+    'float16',
+    'float32',
+    'float64',
+    'int8',
+    'int32',
+    'int64',
+    'uint8',
+)
+
+
+def _rebuild_tensor(data, dtype, stop_gradient):
+    return paddle.to_tensor(data, dtype=dtype, stop_gradient=stop_gradient)
+
+
+def _reduce_tensor(tensor):
+    return (
+        _rebuild_tensor,
+        (tensor.numpy(), convert_dtype(tensor.dtype), tensor.stop_gradient),
+    )
+
+
+def _padding(size):
+    return -size % _ALIGNMENT
+
+
+def _can_send_as_tensor(tensor, place):
+    # the tensors on other places, and the dtypes without a uint8 view, go
+    # through numpy as out-of-band buffers
+    return (
+        int(np.prod(tensor.shape)) > 0
+        and convert_dtype(tensor.dtype) in _VIEW_DTYPES
+        and tensor.place._equals(place)
+        and paddle.get_flags('FLAGS_use_stride_kernel')[
+            'FLAGS_use_stride_kernel'
+        ]
+    )
+
+
+class _ObjectPickler(pickle.Pickler):
+    def __init__(self, file, buffers, tensors, place):
+        super().__init__(
+            file, protocol=_PICKLE_PROTOCOL, buffer_callback=buffers.append
+        )
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        self.dispatch_table[core.eager.Tensor] = _reduce_tensor
+        self._tensors = tensors
+        self._place = place
+        # a tensor referenced more than once is sent once
+        self._indices = {}
+
+    def persistent_id(self, obj):
+        # the same tensors as the dispatch table, subclasses such as
+        # parameters keep their own reduce
+        if type(obj) is not core.eager.Tensor:
+            return None
+        if not _can_send_as_tensor(obj, self._place):
+            return None
+        index = self._indices.get(id(obj))
+        if index is None:
+            index = self._indices[id(obj)] = len(self._tensors)
+            self._tensors.append(obj)
+        return (
+            index,
+            convert_dtype(obj.dtype),
+            obj.shape,
+            obj.stop_gradient,
+        )
+
+
+class _ObjectUnpickler(pickle.Unpickler):
+    def __init__(self, file, buffers, tensors):
+        super().__init__(file, buffers=buffers)
+        self._tensors = tensors
+        self._rebuilt = {}
+
+    def persistent_load(self, pid):
+        index, dtype, shape, stop_gradient = pid
+        if index not in self._rebuilt:
+            tensor = paddle.view(self._tensors[index], dtype).reshape(shape)
+            tensor = tensor.detach()
+            tensor.stop_gradient = stop_gradient
+            self._rebuilt[index] = tensor
+        return self._rebuilt[index]
 
 
 def convert_object_to_tensor(obj):
-    _pickler = pickle.Pickler
     f = io.BytesIO()
-    _pickler(f).dump(obj)
-    data = np.frombuffer(f.getvalue(), dtype=np.uint8)
-    tensor = paddle.to_tensor(data)
+    buffers = []
+    tensors = []
+    place = framework._current_expected_place()
+    _ObjectPickler(f, buffers, tensors, place).dump(obj)
+
+    stream = f.getbuffer()
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    tensor_sizes = [int(np.prod(t.shape)) * t.element_size() for t in tensors]
+    sizes = [len(stream)] + [buffer.nbytes for buffer in raw_buffers]
+    header_size = 8 * (_HEADER_ITEMS + len(sizes) + len(tensor_sizes))
+    host_size = header_size + sum(size + _padding(size) for size in sizes)
+    # the pickle stream is padded together with the header
+    host_size += _padding(header_size + len(stream)) - _padding(len(stream))
+    total_size = host_size + sum(size + _padding(size) for size in tensor_sizes)
+
+    host = np.zeros([host_size], dtype=np.uint8)
+    host[:header_size] = np.array(
+        [
+            total_size,
+            host_size,
+            len(raw_buffers),
+            len(tensors),
+            *sizes,
+            *tensor_sizes,
+        ],
+        dtype=np.int64,
+    ).view(np.uint8)
+    offset = header_size
+    for i, buffer in enumerate([stream, *raw_buffers]):
+        host[offset : offset + buffer.nbytes] = np.frombuffer(
+            buffer, dtype=np.uint8
+        )
+        offset += buffer.nbytes
+        offset += _padding(offset) if i == 0 else _padding(buffer.nbytes)
+    del stream
+
+    segments = [paddle.to_tensor(host, place=place)]
+    for t, size in zip(tensors, tensor_sizes):
+        segments.append(paddle.view(t.reshape([-1]), 'uint8'))
+        if _padding(size):
+            segments.append(paddle.zeros([_padding(size)], dtype="uint8"))
+    tensor = segments[0] if len(segments) == 1 else paddle.concat(segments)
     return tensor, tensor.numel()
 
 
+def get_object_tensor_sizes(tensors):
+    """
+    Return the sizes of the serialized objects of which ``tensors`` hold the
+    first bytes, with one copy to the host.
+    """
+    heads = paddle.stack([tensor[:8] for tensor in tensors]).numpy()
+    return np.ascontiguousarray(heads).view(np.int64).reshape([-1]).tolist()
+
+
 def convert_tensor_to_object(tensor, len_of_tensor):
-    _unpickler = pickle.Unpickler
-    return _unpickler(io.BytesIO(tensor.numpy()[:len_of_tensor])).load()
+    host_size = int(tensor[:16].numpy().view(np.int64)[1])
+    host = tensor[:host_size].numpy()
+    header = np.frombuffer(host, dtype=np.int64, count=_HEADER_ITEMS)
+    num_buffers, num_tensors = int(header[2]), int(header[3])
+    sizes = np.frombuffer(
+        host,
+        dtype=np.int64,
+        count=num_buffers + 1 + num_tensors,
+        offset=8 * _HEADER_ITEMS,
+    ).tolist()
+    sizes, tensor_sizes = sizes[: num_buffers + 1], sizes[num_buffers + 1 :]
+
+    view = memoryview(host)
+    offset = 8 * (_HEADER_ITEMS + len(sizes) + len(tensor_sizes))
+    segments = []
+    for i, size in enumerate(sizes):
+        segments.append(view[offset : offset + size])
+        offset += size
+        # the pickle stream is padded together with the header
+        offset += _padding(offset) if i == 0 else _padding(size)
+    tensors = []
+    for size in tensor_sizes:
+        tensors.append(tensor[offset : offset + size])
+        offset += size + _padding(size)
+    return _ObjectUnpickler(
+        io.BytesIO(segments[0]), segments[1:], tensors
+    ).load()
+
+
+def pad_object_tensor(tensor, size):
+    """Pad the serialized object tensor to size on its device."""
+    padding = size - tensor.shape[0]
+    if padding <= 0:
+        return tensor
+    if tensor.shape[0] == 0:
+        return paddle.zeros([size], dtype="uint8")
+    return paddle.concat([tensor, paddle.zeros([padding], dtype="uint8")])
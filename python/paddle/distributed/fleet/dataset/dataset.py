@@ -30,6 +30,7 @@ if TYPE_CHECKING:
     from paddle.distributed.fleet import Fleet
 
     _InputType: TypeAlias = Literal[0, 1]
+    _RecordFormat: TypeAlias = Literal["text", "binary"]
     _CurrentPhase: TypeAlias = Literal[0, 1]
 
     class _DatasetBaseSettings(TypedDict):
@@ -41,6 +42,7 @@ if TYPE_CHECKING:
         fs_name: NotRequired[str]
         fs_ugi: NotRequired[str]
         download_cmd: NotRequired[str]
+        record_format: NotRequired[_RecordFormat]
 
     class _InMemoryDatasetDistributedSettings(TypedDict):
         merge_size: NotRequired[int]
@@ -103,6 +105,7 @@ class DatasetBase:
         fs_name: str = "",
         fs_ugi: str = "",
         download_cmd: str = "cat",
+        record_format: _RecordFormat = "text",
     ) -> None:
         """
         should be called only once in user's python scripts to initialize settings of dataset instance.
@@ -117,6 +120,7 @@ class DatasetBase:
             fs_name(str): fs name. default is "".
             fs_ugi(str): fs ugi. default is "".
             download_cmd(str): customized download command. default is "cat"
+            record_format(str): the format of the samples written by the pipe command, "text" or "binary". It should be the same as the record format of the data generator. default is "text".
 
 
         """
@@ -127,6 +131,7 @@ class DatasetBase:
         self._set_input_type(input_type)
         self._set_hdfs_config(fs_name, fs_ugi)
         self._set_download_cmd(download_cmd)
+        self._set_record_format(record_format)
 
     def _set_pipe_command(self, pipe_command):
         """
@@ -146,6 +151,29 @@ class DatasetBase:
         """
         self.proto_desc.pipe_command = pipe_command
 
+    def _set_record_format(self, record_format):
+        """
+        Set the format of the samples written by the pipe command, "text" for
+        space-separated lines, or "binary" for the length-prefixed records
+        written by a data generator with set_record_format("binary").
+
+        Examples:
+            .. code-block:: python
+
+                >>> import paddle
+                >>> dataset = paddle.distributed.fleet.DatasetBase()
+                >>> dataset._set_record_format("binary")
+
+        Args:
+            record_format(str): record format
+
+        """
+        if record_format not in ("text", "binary"):
+            raise ValueError(
+                f"record_format should be 'text' or 'binary', but got {record_format}."
+            )
+        self.proto_desc.record_format = record_format
+
     def _set_batch_size(self, batch_size):
         """
         Set batch size. Will be effective during training
@@ -550,6 +578,7 @@ class InMemoryDataset(DatasetBase):
             fs_ugi(str): fs ugi. default is "".
             pipe_command(str): pipe command of current dataset. A pipe command is a UNIX pipeline command that can be used only. default is "cat"
             download_cmd(str): customized download command. default is "cat"
+            record_format(str): the format of the samples written by the pipe command, "text" or "binary". default is "text".
             data_feed_type(str): data feed type used in c++ code. default is "MultiSlotInMemoryDataFeed".
             queue_num(int): Dataset output queue num, training threads get data from queues. default is-1, which is set same as thread number in c++.
 
@@ -600,6 +629,8 @@ class InMemoryDataset(DatasetBase):
                 self._set_hdfs_config(kwargs[key], kwargs["fs_ugi"])
             elif key == "download_cmd":
                 self._set_download_cmd(kwargs[key])
+            elif key == "record_format":
+                self._set_record_format(kwargs[key])
             elif key == "merge_size" and kwargs.get("merge_size", -1) > 0:
                 self._set_merge_by_lineid(kwargs[key])
             elif key == "parse_ins_id":
@@ -631,6 +662,7 @@ class InMemoryDataset(DatasetBase):
             fs_ugi(str): fs ugi. default is "".
             pipe_command(str): pipe command of current dataset. A pipe command is a UNIX pipeline command that can be used only. default is "cat"
             download_cmd(str): customized download command. default is "cat"
+            record_format(str): the format of the samples written by the pipe command, "text" or "binary". default is "text".
             data_feed_type(str): data feed type used in c++ code. default is "MultiSlotInMemoryDataFeed".
             queue_num(int): Dataset output queue num, training threads get data from queues. default is -1, which is set same as thread number in c++.
 
@@ -685,6 +717,7 @@ class InMemoryDataset(DatasetBase):
         fs_ugi = kwargs.get("fs_ugi", "")
         pipe_command = kwargs.get("pipe_command", "cat")
         download_cmd = kwargs.get("download_cmd", "cat")
+        record_format = kwargs.get("record_format", "text")
 
         if self.use_ps_gpu:
             data_feed_type = "SlotRecordInMemoryDataFeed"
@@ -701,6 +734,7 @@ class InMemoryDataset(DatasetBase):
             fs_name=fs_name,
             fs_ugi=fs_ugi,
             download_cmd=download_cmd,
+            record_format=record_format,
         )
 
         if kwargs.get("queue_num", -1) > 0:
@@ -20,6 +20,7 @@ from paddle.utils import strtobool
 env_args_mapping = {
     'POD_IP': ('host', str),
     'PADDLE_MASTER': ('master', str),
+    'PADDLE_RENDEZVOUS_FANOUT': ('rendezvous_fanout', int),
     'PADDLE_DEVICES': ('devices', str),
     'PADDLE_NNODES': ('nnodes', str),
     'PADDLE_RUN_MODE': ('run_mode', str),
@@ -65,6 +66,14 @@ def parse_args():
         help="the master/rendezvous server, ip:port",
     )
 
+    base_group.add_argument(
+        "--rendezvous_fanout",
+        type=int,
+        default=32,
+        help="the max number of peers syncing from one pod in http master, "
+        "0 to sync all from the master",
+    )
+
     base_group.add_argument(
         "--legacy", type=strtobool, default=False, help="use legacy launch"
     )
@@ -20,8 +20,11 @@ import sys
 import threading
 import time
 
-from paddle.distributed.launch.utils.kv_client import KVClient
-from paddle.distributed.launch.utils.kv_server import KVServer
+from paddle.distributed.launch.utils.rendezvous import (
+    RendezvousClient,
+    RendezvousStore,
+    rendezvous,
+)
 
 ETCD_PROTOCOL = 'etcd://'
 
@@ -84,7 +87,7 @@ class HTTPMaster(Master):
                 time.sleep(2 * random.random())
                 while not self.ctx.node.is_server_ready(ip, int(port)):
                     try:
-                        self.server = KVServer(int(port))
+                        self.server = RendezvousStore(int(port))
                         self.role = Master.MAIN
                         break
                     except Exception as e:
@@ -94,7 +97,7 @@ class HTTPMaster(Master):
         else:
             port = self.ctx.node.get_free_port()
             self.endpoint = f"{self.ctx.node.ip}:{port}"
-            self.server = KVServer(port)
+            self.server = RendezvousStore(port)
             self.role = Master.MAIN
 
             print("Copy the following command to other nodes to run.")
@@ -116,7 +119,10 @@ class HTTPMaster(Master):
 
         if '127.0.0.1' in self.endpoint:
             self.endpoint = self.endpoint.replace('127.0.0.1', self.ctx.node.ip)
-        self.client = KVClient(self.endpoint)
+        self.client = RendezvousClient(self.endpoint)
+
+        self.relay = None
+        self.relay_endpoint = ''
 
         self.initialized = True
 
@@ -127,10 +133,23 @@ class HTTPMaster(Master):
             self.server.start()
             self.ctx.logger.debug(f"KV server start at {self.endpoint}")
 
+    def _start_relay(self):
+        # the main pod is the root of the rendezvous tree, others relay the
+        # peers to their children to keep the load of the root bounded
+        if self.role == Master.MAIN or self.relay is not None:
+            return
+        port = self.ctx.node.get_free_port()
+        self.relay = RendezvousStore(port)
+        self.relay.start()
+        self.relay_endpoint = f"{self.ctx.node.ip}:{port}"
+        self.ctx.logger.debug(f"relay server start at {self.relay_endpoint}")
+
     def _stop_server(self):
         if self.server and not self.server.stopped:
             self.server.stop()
             self.ctx.logger.debug("KV server stopped")
+        if self.relay and not self.relay.stopped:
+            self.relay.stop()
 
     def stop(self):
         self._stop_server()
@@ -154,33 +173,40 @@ class HTTPMaster(Master):
         ky = 'aaaaaa' if rank < 0 and self.role == Master.MAIN else key
         k = f"{prefix}/{ky}/{rank}"
 
-        while not self.ctx.status.is_done():
-            if not self.client.put(k, value):
-                self.ctx.logger.warning("put value failed")
-                time.sleep(0.1)
-                continue
-
-            rjson = self.client.get_prefix(prefix)
-            self.ctx.logger.debug(f"sync peers {rjson}")
-            if rjson and len(rjson) == size:
-                if self.ctx.args.sort_ip:
-                    ret = sorted(rjson.values(), key=_cmp_by_ip)
-                    idx = ret.index(value)
-                    return ret, idx
-                elif rank < 0:
-                    keys = list(rjson.keys())
-                    keys.sort()
-                    ret = [rjson[k] for k in keys]
-                    idx = ret.index(value)
-                    return ret, idx
-                else:
-                    ret = [None] * size
-                    for k, v in rjson.items():
-                        ret[int(k.split('/')[-1])] = v
-                    return ret, rank
-            else:
-                time.sleep(0.5)
-        return [], 0
+        fanout = self.ctx.args.rendezvous_fanout
+        if fanout > 0 and size > fanout:
+            self._start_relay()
+
+        rjson = rendezvous(
+            self.client,
+            prefix,
+            k,
+            value,
+            size,
+            fanout=fanout,
+            relay=self.relay,
+            relay_endpoint=self.relay_endpoint,
+            is_done=self.ctx.status.is_done,
+        )
+        self.ctx.logger.debug(f"sync peers {rjson}")
+        if not rjson:
+            return [], 0
+
+        if self.ctx.args.sort_ip:
+            ret = sorted(rjson.values(), key=_cmp_by_ip)
+            idx = ret.index(value)
+            return ret, idx
+        elif rank < 0:
+            keys = list(rjson.keys())
+            keys.sort()
+            ret = [rjson[k] for k in keys]
+            idx = ret.index(value)
+            return ret, idx
+        else:
+            ret = [None] * size
+            for k, v in rjson.items():
+                ret[int(k.split('/')[-1])] = v
+            return ret, rank
 
 
 class ETCDMaster(Master):
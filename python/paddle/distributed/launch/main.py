@@ -311,6 +311,7 @@ def launch() -> None:
         from paddle.distributed.auto_tuner.utils import (
             add_overlap_performance,
             find_error_from_log,
+            gen_log_dir_name,
             gen_new_args,
             gen_new_ctx,
             read_completed,
@@ -588,6 +589,26 @@ def launch() -> None:
                 f"AutoTuner for GBS search ends in {end_time - start_time}s."
             )
 
+        # parallel trials, every trial runs on a disjoint subset of devices
+        parallel_trials = tuner_cfg.get("parallel_trials", 1)
+        if parallel_trials > 1:
+            if nnodes > 1:
+                raise ValueError(
+                    "Parallel trials of auto tuner only support single node."
+                )
+            from paddle.distributed.auto_tuner.scheduler import split_devices
+
+            devices = (
+                ctx.args.devices.split(",")
+                if ctx.args.devices
+                else [str(i) for i in range(gpus_per_node)]
+            )
+            trial_devices = split_devices(devices, parallel_trials)
+            tuner_cfg["gpus_per_node"] = len(trial_devices[0])
+            tuner_cfg["num_gpus"] = len(trial_devices[0])
+            # the configs are tuned for the devices of one trial
+            raw_ctx.args.devices = ",".join(trial_devices[0])
+
         # build AutoTuner to get new config
         auto_tuner = AutoTuner(tuner_cfg)
         logger.info(
@@ -597,8 +618,6 @@ def launch() -> None:
             "resume_csv_file_path", history_file_path
         )
         auto_tuner.resume_form_history(resume_csv_file_path)
-        cur_cfg = auto_tuner.search_once()
-        auto_tuner.add_cfg(cur_cfg)
         error_msg = (
             "No config can search. Please check if there are any situations "
             + "where GBS is unable to divide dp degree or shading degree, "
@@ -607,7 +626,30 @@ def launch() -> None:
             + "num_ Layers cannot divide pp degree."
         )
 
-        assert cur_cfg is not None, error_msg
+        if parallel_trials > 1:
+            from paddle.distributed.auto_tuner.scheduler import (
+                ParallelTrialScheduler,
+            )
+
+            scheduler = ParallelTrialScheduler(
+                auto_tuner,
+                recorder,
+                tuner_cfg,
+                devices,
+                ctx.args.training_script,
+                raw_args,
+                os.path.dirname(ctx.args.auto_tuner_json),
+            )
+            scheduler.run(
+                history_file_path,
+                int(max_search_time) if max_search_time else None,
+            )
+            assert scheduler.job_id > 0, error_msg
+            cur_cfg = None
+        else:
+            cur_cfg = auto_tuner.search_once()
+            auto_tuner.add_cfg(cur_cfg)
+            assert cur_cfg is not None, error_msg
         while cur_cfg:
             task_start_time = time.time()
             ctx = copy.deepcopy(raw_ctx)
@@ -633,33 +675,7 @@ def launch() -> None:
             job_id += 1
             task_job_id = "auto_tuner_" + str(job_id)
             ctx.args.job_id = task_job_id
-            log_dir = "Job{}_GBS{}_DP{}_MP{}_PP{}_VPP{}_Sharding{}_Stage{}_MBS{}_Recompute_{}_Granularity_{}_AccStep{}".format(
-                job_id,
-                global_batch_size,
-                cur_cfg["dp_degree"],
-                cur_cfg["mp_degree"],
-                cur_cfg["pp_degree"],
-                cur_cfg["vpp_degree"],
-                cur_cfg["sharding_degree"],
-                cur_cfg["sharding_stage"],
-                cur_cfg["micro_batch_size"],
-                cur_cfg["use_recompute"],
-                cur_cfg["recompute_granularity"],
-                cur_cfg["acc_steps"],
-            )
-            if "sharding_overlap" in cur_cfg:
-                log_dir = log_dir + f"_Overlap_{cur_cfg['sharding_overlap']}"
-            if "refined_recompute" in tuner_cfg:
-                for key in tuner_cfg["refined_recompute"]:
-                    dir_name = "".join(i.capitalize() for i in key.split("_"))
-                    dir_name += str(cur_cfg[key])
-                    log_dir = log_dir + "_" + dir_name
-
-            if "custom_search_dim" in tuner_cfg:
-                for key in tuner_cfg["custom_search_dim"]:
-                    dir_name = "".join(i.capitalize() for i in key.split("_"))
-                    dir_name += str(cur_cfg[key])
-                    log_dir = log_dir + "_" + dir_name
+            log_dir = gen_log_dir_name(job_id, cur_cfg, tuner_cfg)
 
             ctx.args.log_dir = os.path.join(
                 os.path.dirname(ctx.args.auto_tuner_json), log_dir
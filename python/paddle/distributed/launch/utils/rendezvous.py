@@ -0,0 +1,371 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+# the timeout of one long-poll request, the client polls again after it
+LONG_POLL_TIMEOUT = 30
+
+
+class RendezvousHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _parse(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        return url.path, query
+
+    def do_GET(self):
+        path, query = self._parse()
+        if 'wait' in query:
+            value = self.server.wait_prefix(
+                path,
+                int(query['wait']),
+                float(query.get('timeout', LONG_POLL_TIMEOUT)),
+            )
+            self.output(408 if value is None else 200, value or b'')
+        else:
+            value = self.server.get_prefix(path)
+            self.output(404 if value is None else 200, value or b'')
+
+    def do_PUT(self):
+        self.do_POST()
+
+    def do_POST(self):
+        path, query = self._parse()
+        content_length = int(self.headers['Content-Length'] or 0)
+        try:
+            value = self.rfile.read(content_length).decode(encoding="utf-8")
+            if 'join' in query:
+                ret = self.server.join(
+                    query['prefix'],
+                    path,
+                    value,
+                    query.get('relay', ''),
+                    int(query.get('fanout', 0)),
+                )
+                self.output(200, json.dumps(ret).encode("utf-8"))
+            elif 'batch' in query:
+                self.server.put_batch(json.loads(value))
+                self.output(200)
+            else:
+                self.server.put_batch({path: value})
+                self.output(200)
+        except Exception:
+            self.output(500)
+
+    def do_DELETE(self):
+        path, _ = self._parse()
+        self.output(200 if self.server.delete(path) else 404)
+
+    def output(self, code, value=b''):
+        self.send_response(code)
+        self.send_header("Content-Length", len(value))
+        self.send_header("Content-Type", "application/json; charset=utf8")
+        self.end_headers()
+        if value:
+            self.wfile.write(value)
+
+    def log_message(self, format, *args):
+        return
+
+
+class RendezvousStore(ThreadingHTTPServer):
+    """
+    A threaded key-value store for the rendezvous of the launchers.
+
+    Compared with KVServer, the requests are served concurrently, a prefix
+    can be watched by a long-poll request instead of being polled, and the
+    result of a prefix read is serialized once and shared by all the
+    readers. The store is also used as the relay of the tree-structured
+    rendezvous, see `rendezvous`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port):
+        super().__init__(('', port), RendezvousHandler)
+        self.port = port
+        self.stopped = False
+        self.started = False
+        self._cond = threading.Condition()
+        self._kv = {'/healthy': 'ok'}
+        # the number of keys of every watched prefix
+        self._counts = {}
+        # the arrival order and the relay of the peers joined every prefix
+        self._joins = {}
+        self._relays = {}
+        self._version = 0
+        self._snapshots = {}
+
+    def start(self):
+        self.listen_thread = threading.Thread(
+            target=self.serve_forever, daemon=True
+        )
+        self.listen_thread.start()
+        self.started = True
+
+    def stop(self):
+        self.shutdown()
+        self.listen_thread.join()
+        self.server_close()
+        self.stopped = True
+
+    def put_batch(self, kvs):
+        with self._cond:
+            for key, value in kvs.items():
+                if key not in self._kv:
+                    for prefix in self._counts:
+                        if key.startswith(prefix):
+                            self._counts[prefix] += 1
+                self._kv[key] = value
+            self._version += 1
+            self._cond.notify_all()
+
+    def delete(self, key):
+        with self._cond:
+            if key not in self._kv:
+                return False
+            del self._kv[key]
+            for prefix in self._counts:
+                if key.startswith(prefix):
+                    self._counts[prefix] -= 1
+            self._version += 1
+            self._cond.notify_all()
+            return True
+
+    def delete_prefix(self, prefix):
+        """Delete the keys under prefix and forget the peers joined it."""
+        with self._cond:
+            for key in [k for k in self._kv if k.startswith(prefix)]:
+                del self._kv[key]
+            self._counts.pop(prefix, None)
+            self._joins.pop(prefix, None)
+            self._relays.pop(prefix, None)
+            self._version += 1
+
+    def join(self, prefix, key, value, relay, fanout):
+        """
+        Put the value of a peer, return the arrival index of the peer and the
+        relay of its parent, the peers of index [0, fanout) are the children
+        of the store itself.
+        """
+        self.put_batch({key: value})
+        with self._cond:
+            joins = self._joins.setdefault(prefix, {})
+            relays = self._relays.setdefault(prefix, [])
+            if key not in joins:
+                joins[key] = len(relays)
+                relays.append(relay)
+            index = joins[key]
+        parent = ''
+        if fanout > 0 and index >= fanout:
+            parent = relays[(index - fanout) // fanout]
+        return {'index': index, 'parent': parent}
+
+    def _count(self, prefix):
+        if prefix not in self._counts:
+            self._counts[prefix] = sum(
+                1 for k in self._kv if k.startswith(prefix)
+            )
+        return self._counts[prefix]
+
+    def _snapshot(self, prefix):
+        version, value = self._snapshots.get(prefix, (None, None))
+        if version != self._version:
+            ret = {k: v for k, v in self._kv.items() if k.startswith(prefix)}
+            value = json.dumps(ret).encode("utf-8") if ret else None
+            self._snapshots[prefix] = (self._version, value)
+        return value
+
+    def get_prefix(self, prefix):
+        with self._cond:
+            return self._snapshot(prefix)
+
+    def wait_prefix(self, prefix, count, timeout):
+        """Wait until there are count keys under prefix, and read them."""
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._count(prefix) >= count, timeout
+            ):
+                return None
+            return self._snapshot(prefix)
+
+
+class RendezvousClient:
+    def __init__(self, endpoint):
+        self.endpoint = (
+            endpoint if endpoint.startswith("http://") else f"http://{endpoint}"
+        )
+        self._client = httpx.Client(timeout=None)
+
+    def _url(self, key):
+        key = key if key.startswith('/') else f"/{key}"
+        return f"{self.endpoint}{key}"
+
+    def put(self, key, value):
+        try:
+            r = self._client.post(self._url(key), content=value)
+            return r.status_code == 200
+        except Exception:
+            return False
+
+    def put_batch(self, kvs):
+        try:
+            r = self._client.post(
+                self._url('/'), params={'batch': 1}, content=json.dumps(kvs)
+            )
+            return r.status_code == 200
+        except Exception:
+            return False
+
+    def get(self, key):
+        key = key if key.startswith('/') else f"/{key}"
+        ret = self.get_prefix(key)
+        return ret.get(key, '') if ret else ''
+
+    def get_prefix(self, key):
+        try:
+            r = self._client.get(self._url(key))
+            if r.status_code == 200:
+                return r.json()
+        except Exception:
+            pass
+        return {}
+
+    def delete(self, key):
+        try:
+            return self._client.delete(self._url(key)).status_code == 200
+        except Exception:
+            return False
+
+    def join(self, prefix, key, value, relay='', fanout=0):
+        """Return the arrival index and the parent relay, or None if failed."""
+        try:
+            r = self._client.post(
+                self._url(key),
+                params={
+                    'join': 1,
+                    'prefix': prefix,
+                    'relay': relay,
+                    'fanout': fanout,
+                },
+                content=value,
+            )
+            if r.status_code == 200:
+                ret = r.json()
+                return ret['index'], ret['parent']
+        except Exception:
+            pass
+        return None
+
+    def wait_prefix(self, prefix, count, timeout=LONG_POLL_TIMEOUT):
+        """
+        Long-poll until there are count keys under prefix, return the dict of
+        them, {} if timeout or None if the store is not reachable.
+        """
+        try:
+            r = self._client.get(
+                self._url(prefix), params={'wait': count, 'timeout': timeout}
+            )
+            return r.json() if r.status_code == 200 else {}
+        except Exception:
+            return None
+
+    def wait_server_ready(self, timeout=3):
+        end = time.time() + timeout
+        while time.time() < end:
+            if self.get("/healthy") == "ok":
+                return True
+            time.sleep(0.1)
+        return False
+
+
+def rendezvous(
+    client,
+    prefix,
+    key,
+    value,
+    size,
+    fanout=32,
+    relay=None,
+    relay_endpoint='',
+    is_done=lambda: False,
+):
+    """
+    Put the value under prefix and wait until all the size peers are put,
+    return the dict of the key and value of all the peers.
+
+    The peers are arranged as a tree by their arrival order, every node has
+    at most fanout children and the store of client is the root. Every peer
+    puts its value to the root in a single request, and then reads all the
+    values from the relay of its parent by a long-poll request and puts them
+    to its own relay for its children, so the root only serves fanout
+    readers and the sync takes O(log(size)) hops. If the relay of the parent
+    is not reachable, the peer reads from the root directly.
+
+    Args:
+        client (RendezvousClient): The client of the root store.
+        prefix (str): The scope of the rendezvous.
+        key (str): The key of this peer, should be under prefix.
+        value (str): The value of this peer.
+        size (int): The number of the peers.
+        fanout (int): The max number of the children of a node.
+        relay (RendezvousStore|None): The store of this peer to relay the
+            values to its children, None if this peer has no store.
+        relay_endpoint (str): The endpoint of relay.
+        is_done (callable): Return True if the rendezvous should be aborted.
+
+    Returns:
+        dict: The values of all the peers, {} if aborted.
+    """
+    if relay is None and not relay_endpoint:
+        # the children of this peer read from the root
+        relay_endpoint = client.endpoint
+    if relay is not None:
+        # drop the values relayed in the previous round, the children join
+        # after this peer so they never read them
+        relay.delete_prefix(prefix)
+    ret = None
+    while ret is None and not is_done():
+        ret = client.join(prefix, key, value, relay_endpoint, fanout)
+        if ret is None:
+            time.sleep(0.1)
+    if ret is None:
+        return {}
+    index, parent = ret
+
+    peers = {}
+    source = RendezvousClient(parent) if parent else client
+    while not is_done():
+        peers = source.wait_prefix(prefix, size)
+        if peers is None and source is not client:
+            # the parent is lost, fall back to the root
+            source = client
+            continue
+        if peers:
+            break
+        if peers is None:
+            time.sleep(0.1)
+
+    if peers and relay is not None and index * fanout + fanout < size:
+        relay.put_batch(peers)
+    return peers or {}
+
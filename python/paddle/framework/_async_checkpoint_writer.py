@@ -0,0 +1,155 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# The writer process of `paddle.async_save`, see NOTE: [ async checkpoint
+# engine ] in async_checkpoint.py. This file is run as a script by a new
+# python interpreter, so it only imports the standard library and numpy,
+# never paddle or the modules of the training script.
+
+import io
+import os
+import pickle
+import signal
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# pickle bytes written between two progress reports
+_PROGRESS_INTERVAL = 64 * 1024 * 1024
+# max bytes of a single write, writing more than 4GB at a time fails on
+# MAC python3
+_MAX_WRITE_BYTES = 2**30
+
+
+class _ProgressWriter:
+    def __init__(self, f, on_progress):
+        self._f = f
+        self._on_progress = on_progress
+        self.nbytes = 0
+        self._reported = 0
+
+    def write(self, data):
+        view = memoryview(data).cast('B')
+        for start in range(0, len(view), _MAX_WRITE_BYTES):
+            self._f.write(view[start : start + _MAX_WRITE_BYTES])
+        self.nbytes += len(view)
+        if self.nbytes - self._reported >= _PROGRESS_INTERVAL:
+            self._reported = self.nbytes
+            self._on_progress(self.nbytes)
+        return len(view)
+
+
+def write_checkpoint(obj, path, protocol, on_progress):
+    """
+    Pickle `obj` into the file `path`, fsync it and report the bytes
+    written by `on_progress`.
+    """
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+        os.makedirs(dirname, exist_ok=True)
+    # write to a temporary file and rename it, an interrupted save never
+    # leaves a truncated checkpoint at `path`
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            writer = _ProgressWriter(f, on_progress)
+            pickle.dump(obj, writer, protocol=protocol)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    on_progress(writer.nbytes)
+
+
+class _StagedUnpickler(pickle.Unpickler):
+    """Resolve the staged tensors to arrays in the shared buffer."""
+
+    def __init__(self, file, buffer):
+        super().__init__(file)
+        self._buffer = buffer
+
+    def persistent_load(self, pid):
+        offset, shape, dtype = pid
+        return np.ndarray(
+            shape, dtype=dtype, buffer=self._buffer, offset=offset
+        )
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # python < 3.13 always tracks the segment, the resource tracker of
+        # this process would unlink it at exit, while it is owned by the
+        # training process
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+def _picklable(error):
+    error = error.with_traceback(None)
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(repr(error))
+    return error
+
+
+def _write(message, send):
+    """Write a checkpoint, return the error if it fails."""
+    buffer_name, structure, path, protocol = message
+    shm = obj = error = None
+    try:
+        shm = _attach(buffer_name)
+        obj = _StagedUnpickler(io.BytesIO(structure), shm.buf).load()
+        write_checkpoint(obj, path, protocol, lambda n: send(('progress', n)))
+    except Exception as e:
+        # drop the traceback, its frames hold views of the shared buffer
+        error = _picklable(e)
+    obj = None
+    if shm is not None:
+        shm.close()
+    return error
+
+
+def main():
+    # messages are pickled to the original stdout, anything printed goes to
+    # stderr
+    out = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+    # Ctrl-C interrupts the training process, which finishes the saves in
+    # flight before exit, and this process exits when its stdin is closed
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    def send(message):
+        pickle.dump(message, out)
+        out.flush()
+
+    stdin = sys.stdin.buffer
+    while True:
+        try:
+            message = pickle.load(stdin)
+        except EOFError:
+            break
+        error = _write(message, send)
+        send(('done', None) if error is None else ('error', error))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,655 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# NOTE: [ async checkpoint engine ] `paddle.async_save` saves a checkpoint
+# in three stages, so that the calling thread only enqueues copies:
+#
+#   1. snapshot (calling thread): GPU tensors are copied into reusable
+#      pinned buffers on a side stream, the current stream waits for the
+#      side stream, so kernels launched later can not modify the tensors
+#      before they are copied. CPU tensors are cloned.
+#   2. staging (stager thread): wait for the copies and gather the host
+#      buffers into a reusable shared memory buffer.
+#   3. writing (writer process): pickle the checkpoint from the shared
+#      memory buffer in the same format as `paddle.save`, fsync it and
+#      rename it to the target path, so pickling does not hold the GIL of
+#      the training process.
+#
+# The writer process is a new python interpreter started by `subprocess`
+# running _async_checkpoint_writer.py, which only imports the standard
+# library and numpy. It is neither forked, as forking a process which runs
+# threads and holds a CUDA context may deadlock or crash the child, nor
+# started by multiprocessing spawn or forkserver, which import `__main__`
+# again and rerun training scripts without a `if __name__ == '__main__'`
+# guard. The writer thread of the engine only sends the structure of the
+# checkpoint, in which the tensors are replaced by their place in the
+# shared buffer, and waits for the writer process.
+#
+# The writer thread pickles the checkpoint itself, holding the GIL, when
+# the writer process can not be used: saving into a memory buffer, saving
+# objects which the writer process can not unpickle without importing
+# paddle or the training script (only builtin, collections and numpy
+# objects are sent), a shared memory (/dev/shm) too small for the
+# checkpoint, or a writer process that fails to start.
+#
+# At most FLAGS_async_save_max_staged checkpoints are in flight, saving
+# one more blocks until the oldest is written, which bounds the host
+# memory used by pinned buffers and shared memory buffers.
+
+from __future__ import annotations
+
+import atexit
+import collections
+import concurrent.futures
+import io
+import math
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+import warnings
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import paddle
+from paddle.base import core
+from paddle.base.data_feeder import convert_dtype
+
+from . import _async_checkpoint_writer
+from .io_utils import _is_memory_buffer
+
+_ASYNC_SAVE_ALIGNMENT = 64
+# modules of the objects the writer process can unpickle
+_WRITER_PROCESS_MODULES = ('builtins', 'collections', 'copyreg', 'numpy')
+
+
+def _get_max_staged():
+    max_staged = os.environ.get('FLAGS_async_save_max_staged', '2')
+    try:
+        return max(int(max_staged), 1)
+    except ValueError:
+        return 2
+
+
+def _align(size, alignment=_ASYNC_SAVE_ALIGNMENT):
+    return (size + alignment - 1) // alignment * alignment
+
+
+class _StagedTensor:
+    """
+    Placeholder of the `index`-th tensor in the host buffer, or of the
+    elements [start, stop) of the flattened tensor if `part` is given.
+    """
+
+    __slots__ = ('index', 'part')
+
+    def __init__(self, index, part=None):
+        self.index = index
+        self.part = part
+
+    def __reduce__(self):
+        return (_StagedTensor, (self.index, self.part))
+
+    def view(self, layout):
+        """Return the (offset, shape, dtype) of the placeholder."""
+        offset, shape, dtype = layout[self.index]
+        if self.part is None:
+            return offset, shape, dtype
+        start, stop = self.part
+        return offset + start * np.dtype(dtype).itemsize, (stop - start,), dtype
+
+
+def _flatten_checkpoint(obj, protocol):
+    """
+    Replace the tensors in `obj` with `_StagedTensor`, return the structure
+    and the tensors. As `paddle.save` does, a state dict is converted as
+    `_build_saved_state_dict` and `_unpack_saved_dict` do, and tensors in
+    other objects are saved as (name, array) tuples as `_pickle_save` does,
+    at any depth.
+    """
+    from .io import _is_state_dict
+
+    tensors = []
+
+    def stage(tensor):
+        if not tensor._is_initialized():
+            raise ValueError(
+                "The saved tensor is not initialized. If you used group sharded, please use save_group_sharded_model."
+            )
+        tensors.append(tensor)
+        return _StagedTensor(len(tensors) - 1)
+
+    if _is_state_dict(obj):
+        structure = {}
+        name_table = {}
+        for key, value in obj.items():
+            if isinstance(value, core.eager.Tensor):
+                structure[key] = stage(value)
+                name_table[key] = value.name
+            elif isinstance(value, core.DenseTensor):
+                structure[key] = np.array(value)
+            else:
+                structure[key] = value
+        structure["StructuredToParameterName@@"] = name_table
+        return _split_large_arrays(structure, tensors, protocol), tensors
+
+    def walk(value):
+        if isinstance(value, core.eager.Tensor):
+            return (value.name, stage(value))
+        if isinstance(value, core.DenseTensor):
+            return np.array(value)
+        if isinstance(value, paddle.nn.Layer):
+            raise ValueError(
+                "paddle do not support saving `paddle.nn.Layer` object."
+            )
+        if type(value) in (dict, collections.OrderedDict):
+            return type(value)((k, walk(v)) for k, v in value.items())
+        if type(value) in (list, tuple):
+            return type(value)(walk(v) for v in value)
+        return value
+
+    return walk(obj), tensors
+
+
+def _split_large_arrays(structure, tensors, protocol):
+    """
+    Split the arrays of a state dict as `_unpack_saved_dict` does, the
+    pickle of protocol 2 and 3 can not be larger than 4GB. The slices of
+    staged tensors are views of the host buffer instead of copies.
+    """
+    if not 1 < protocol < 4:
+        return structure
+    unpack_info = {}
+    for key, value in list(structure.items()):
+        if isinstance(value, _StagedTensor):
+            tensor = tensors[value.index]
+            shape = tuple(tensor.shape)
+            itemsize = np.dtype(convert_dtype(tensor.dtype)).itemsize
+        elif isinstance(value, np.ndarray):
+            shape = value.shape
+            itemsize = value.dtype.itemsize
+        else:
+            continue
+        max_number_of_element = int((2**30 - 1) / itemsize)
+        num_element = int(np.prod(shape, dtype=np.int64))
+        if num_element <= max_number_of_element:
+            continue
+        del structure[key]
+        slices = []
+        for i in range(math.ceil(num_element / max_number_of_element)):
+            start = i * max_number_of_element
+            stop = min(start + max_number_of_element, num_element)
+            part_name = key + "@@." + str(i)
+            if isinstance(value, _StagedTensor):
+                structure[part_name] = _StagedTensor(value.index, (start, stop))
+            else:
+                structure[part_name] = value.reshape([-1])[start:stop]
+            slices.append(part_name)
+        unpack_info[key] = {"OriginShape": shape, "slices": slices}
+    if unpack_info:
+        structure['UnpackBigParamInfor@@'] = unpack_info  # typos: disable-line
+    return structure
+
+
+def _fill_checkpoint(structure, layout, buffer):
+    if isinstance(structure, _StagedTensor):
+        offset, shape, dtype = structure.view(layout)
+        return np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+    if type(structure) in (dict, collections.OrderedDict):
+        return type(structure)(
+            (k, _fill_checkpoint(v, layout, buffer))
+            for k, v in structure.items()
+        )
+    if type(structure) in (list, tuple):
+        return type(structure)(
+            _fill_checkpoint(v, layout, buffer) for v in structure
+        )
+    return structure
+
+
+def _write_checkpoint(structure, layout, buffer, path, protocol, on_progress):
+    obj = _fill_checkpoint(structure, layout, buffer)
+    if _is_memory_buffer(path):
+        pickle.dump(obj, path, protocol=protocol)
+    else:
+        _async_checkpoint_writer.write_checkpoint(
+            obj, path, protocol, on_progress
+        )
+
+
+class _NotPortable(Exception):
+    pass
+
+
+class _StructurePickler(pickle.Pickler):
+    """
+    Pickle the structure of a checkpoint for the writer process, staged
+    tensors are pickled as their (offset, shape, dtype) in the shared
+    buffer. Raise `_NotPortable` for objects of other modules than
+    `_WRITER_PROCESS_MODULES`.
+    """
+
+    def __init__(self, file, layout):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._layout = layout
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _StagedTensor):
+            return obj.view(self._layout)
+        return None
+
+    def reducer_override(self, obj):
+        if callable(obj):
+            module = getattr(obj, '__module__', None) or ''
+        else:
+            module = type(obj).__module__
+        if module.split('.')[0] not in _WRITER_PROCESS_MODULES:
+            raise _NotPortable(module)
+        return NotImplemented
+
+
+def _dump_structure(structure, layout):
+    """Return the pickled structure, or None if it is not portable."""
+    f = io.BytesIO()
+    try:
+        _StructurePickler(f, layout).dump(structure)
+    except _NotPortable:
+        return None
+    return f.getvalue()
+
+
+class _WriterProcess:
+    """
+    The writer process, see NOTE: [ async checkpoint engine ]. Requests are
+    pickled to its stdin, progress and results are pickled from its stdout.
+    """
+
+    def __init__(self):
+        # the writer process imports numpy from the same paths, but not the
+        # modules next to _async_checkpoint_writer.py, e.g. io.py
+        bootstrap = (
+            "import runpy, sys; sys.path[:] = sys.argv[2:]; "
+            "runpy.run_path(sys.argv[1], run_name='__main__')"
+        )
+        self._proc = subprocess.Popen(
+            [
+                sys.executable,
+                '-c',
+                bootstrap,
+                _async_checkpoint_writer.__file__,
+                *[p for p in sys.path if p],
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def alive(self):
+        return self._proc.poll() is None
+
+    def write(self, buffer_name, structure, path, protocol, on_progress):
+        try:
+            pickle.dump(
+                (buffer_name, structure, path, protocol), self._proc.stdin
+            )
+            self._proc.stdin.flush()
+            while True:
+                kind, value = pickle.load(self._proc.stdout)
+                if kind != 'progress':
+                    break
+                on_progress(value)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            raise RuntimeError(
+                f"The writer process of async_save exited with code {self._proc.poll()}."
+            ) from e
+        if kind == 'error':
+            raise value
+
+    def close(self):
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        self._proc.wait()
+
+
+class AsyncSaveHandle:
+    """
+    Handle of a checkpoint saved by ``paddle.async_save``.
+
+    ``staged`` is a future resolved when the tensors are copied into host
+    memory, ``completed`` is a future resolved when the checkpoint is
+    written and synced to disk, both of them are set with the exception if
+    the save fails.
+    """
+
+    def __init__(self, path, total_bytes):
+        self.path = path
+        self.total_bytes = total_bytes
+        self.bytes_written = 0
+        self.staged = concurrent.futures.Future()
+        self.completed = concurrent.futures.Future()
+
+    def progress(self):
+        """Return the fraction of the checkpoint written, in [0, 1]."""
+        if self.completed.done() and self.completed.exception() is None:
+            return 1.0
+        if self.total_bytes == 0:
+            return 0.0
+        return min(self.bytes_written / self.total_bytes, 1.0)
+
+    def done(self):
+        return self.completed.done()
+
+    def wait(self, timeout=None):
+        """Wait until the save is finished, return whether it is finished."""
+        concurrent.futures.wait([self.completed], timeout)
+        return self.completed.done()
+
+    def result(self, timeout=None):
+        """Wait until the save is finished, raise the error if it fails."""
+        return self.completed.result(timeout)
+
+    def exception(self, timeout=None):
+        return self.completed.exception(timeout)
+
+    def _set_exception(self, error):
+        if not self.staged.done():
+            self.staged.set_exception(error)
+        self.completed.set_exception(error)
+
+
+class _PinnedBufferPool:
+    """Pinned host buffers reused by snapshots, keyed by shape and dtype."""
+
+    def __init__(self):
+        self._buffers = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def copy(self, tensor):
+        key = (tuple(tensor.shape), tensor.dtype)
+        with self._lock:
+            buffers = self._buffers[key]
+            buffer = buffers.pop() if buffers else None
+        if buffer is None:
+            return tensor._copy_to(core.CUDAPinnedPlace(), False)
+        buffer.copy_(tensor, False)
+        return buffer
+
+    def release(self, buffers):
+        with self._lock:
+            for buffer in buffers:
+                key = (tuple(buffer.shape), buffer.dtype)
+                self._buffers[key].append(buffer)
+
+
+def _shared_memory_available(nbytes):
+    if not os.path.isdir('/dev/shm'):
+        return True
+    # writing beyond the size of /dev/shm (64MB in docker by default)
+    # crashes the process with SIGBUS instead of raising an error
+    stat = os.statvfs('/dev/shm')
+    return stat.f_bavail * stat.f_frsize >= nbytes
+
+
+class _HostBufferPool:
+    """
+    Shared memory buffers reused by checkpoints, at most `max_buffers`
+    buffers are kept. A numpy array is returned instead if there is not
+    enough shared memory.
+    """
+
+    def __init__(self, max_buffers):
+        self._max_buffers = max_buffers
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self, nbytes):
+        nbytes = max(nbytes, 1)
+        with self._lock:
+            fits = [buf for buf in self._free if buf.size >= nbytes]
+            if fits:
+                buf = min(fits, key=lambda buf: buf.size)
+                self._free.remove(buf)
+                return buf
+            if len(self._free) >= self._max_buffers:
+                # drop a buffer too small, the state dict may grow
+                self._destroy(self._free.pop(0))
+        if _shared_memory_available(nbytes):
+            try:
+                return shared_memory.SharedMemory(create=True, size=nbytes)
+            except OSError:
+                pass
+        return np.empty([nbytes], dtype=np.uint8)
+
+    def release(self, buf):
+        if not isinstance(buf, shared_memory.SharedMemory):
+            return
+        with self._lock:
+            self._free.append(buf)
+
+    @staticmethod
+    def _destroy(buf):
+        try:
+            buf.close()
+        except BufferError:
+            # the arrays of a failed save may still be referenced by its
+            # error, the mapping is released with them
+            pass
+        buf.unlink()
+
+    def close(self):
+        with self._lock:
+            for buf in self._free:
+                self._destroy(buf)
+            self._free = []
+
+
+def _buffer_of(buf):
+    if isinstance(buf, shared_memory.SharedMemory):
+        return buf.buf
+    return buf
+
+
+class _AsyncCheckpointEngine:
+    def __init__(self, max_staged):
+        self._slots = threading.BoundedSemaphore(max_staged)
+        self._pinned_pool = _PinnedBufferPool()
+        self._buffer_pool = _HostBufferPool(max_staged)
+        self._stream = None
+        self._writer_process = None
+        self._writer_process_failed = False
+        self._closed = False
+
+        self._stage_queue = queue.Queue()
+        self._write_queue = queue.Queue()
+        self._stager = threading.Thread(target=self._stage_loop, daemon=True)
+        self._stager.start()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def save(self, obj, path, protocol):
+        structure, tensors = _flatten_checkpoint(obj, protocol)
+        layout = []
+        nbytes = 0
+        for tensor in tensors:
+            dtype = convert_dtype(tensor.dtype)
+            shape = tuple(tensor.shape)
+            layout.append((nbytes, shape, dtype))
+            nbytes += _align(
+                int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            )
+        handle = AsyncSaveHandle(path, nbytes)
+
+        self._slots.acquire()
+        try:
+            snapshots, event = self._snapshot(tensors)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._stage_queue.put(
+            (
+                handle,
+                (structure, layout, protocol),
+                snapshots,
+                event,
+            )
+        )
+        return handle
+
+    def _snapshot(self, tensors):
+        snapshots = [None] * len(tensors)
+        gpu_indices = [
+            i for i, t in enumerate(tensors) if t.place.is_gpu_place()
+        ]
+        event = None
+        if gpu_indices:
+            current_stream = paddle.device.current_stream()
+            if self._stream is None:
+                self._stream = paddle.device.Stream()
+            self._stream.wait_stream(current_stream)
+            with paddle.device.stream_guard(self._stream):
+                for i in gpu_indices:
+                    snapshots[i] = self._pinned_pool.copy(tensors[i])
+            event = self._stream.record_event()
+            # kernels launched later may modify the tensors in place
+            current_stream.wait_stream(self._stream)
+
+        for i, tensor in enumerate(tensors):
+            if snapshots[i] is not None:
+                continue
+            if tensor.is_dense() and tensor.place.is_custom_place():
+                tensor = paddle._C_ops.npu_identity(tensor, -1)
+            snapshots[i] = tensor._copy_to(core.CPUPlace(), True)
+        return snapshots, event
+
+    def _stage_loop(self):
+        while True:
+            item = self._stage_queue.get()
+            if item is None:
+                self._write_queue.put(None)
+                break
+            handle, task, snapshots, event = item
+            layout = task[1]
+            buf = None
+            try:
+                if event is not None:
+                    event.synchronize()
+                buf = self._buffer_pool.acquire(handle.total_bytes)
+                for (offset, shape, dtype), snapshot in zip(layout, snapshots):
+                    dst = np.ndarray(
+                        shape,
+                        dtype=dtype,
+                        buffer=_buffer_of(buf),
+                        offset=offset,
+                    )
+                    dst[...] = snapshot.numpy()
+                    del dst
+                self._pinned_pool.release(
+                    [s for s in snapshots if s.place.is_cuda_pinned_place()]
+                )
+                del snapshots
+                handle.staged.set_result(None)
+                self._write_queue.put((handle, task, buf))
+            except BaseException as e:
+                self._finish(handle, buf, e)
+
+    def _write_loop(self):
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            handle, (structure, layout, protocol), buf = item
+            try:
+                self._write(handle, structure, layout, protocol, buf)
+            except BaseException as e:
+                self._finish(handle, buf, e)
+            else:
+                self._finish(handle, buf)
+        if self._writer_process is not None:
+            self._writer_process.close()
+
+    def _write(self, handle, structure, layout, protocol, buf):
+        def on_progress(nbytes):
+            handle.bytes_written = nbytes
+
+        writer_process = None
+        if isinstance(buf, shared_memory.SharedMemory) and not (
+            _is_memory_buffer(handle.path)
+        ):
+            pickled_structure = _dump_structure(structure, layout)
+            if pickled_structure is not None:
+                writer_process = self._get_writer_process()
+        if writer_process is None:
+            _write_checkpoint(
+                structure,
+                layout,
+                _buffer_of(buf),
+                handle.path,
+                protocol,
+                on_progress,
+            )
+        else:
+            writer_process.write(
+                buf.name, pickled_structure, handle.path, protocol, on_progress
+            )
+
+    def _get_writer_process(self):
+        if self._writer_process is not None and self._writer_process.alive():
+            return self._writer_process
+        if self._writer_process_failed:
+            return None
+        try:
+            self._writer_process = _WriterProcess()
+        except OSError as e:
+            self._writer_process_failed = True
+            warnings.warn(
+                f"async_save can not start its writer process ({e}), the checkpoints are written by a thread of this process."
+            )
+            return None
+        return self._writer_process
+
+    def _finish(self, handle, buf, error=None):
+        if buf is not None:
+            self._buffer_pool.release(buf)
+        self._slots.release()
+        if error is None:
+            handle.completed.set_result(None)
+        else:
+            handle._set_exception(error)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # finish the saves in flight before exit
+        self._stage_queue.put(None)
+        self._stager.join()
+        self._writer.join()
+        self._buffer_pool.close()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _get_async_checkpoint_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = _AsyncCheckpointEngine(_get_max_staged())
+            atexit.register(_engine.close)
+        return _engine
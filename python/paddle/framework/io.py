@@ -19,7 +19,6 @@ import copyreg
 import os
 import pickle
 import sys
-import threading
 import warnings
 from collections.abc import Iterable
 from typing import TYPE_CHECKING
@@ -43,6 +42,7 @@ from paddle.base.framework import (
     in_pir_mode,
 )
 
+from .async_checkpoint import _get_async_checkpoint_engine
 from .io_utils import (
     _is_file_path,
     _is_memory_buffer,
@@ -52,6 +52,12 @@ from .io_utils import (
     _pickle_loads_mac,
     _unpack_saved_dict,
 )
+from .tensor_file import (
+    _DEFAULT_NUM_IO_THREADS,
+    _is_tensor_file,
+    _load_tensor_file,
+    _save_tensor_file,
+)
 
 if TYPE_CHECKING:
     from io import BytesIO
@@ -63,6 +69,8 @@ if TYPE_CHECKING:
     from paddle._typing import NestedStructure
     from paddle.nn.layer.layers import _StateDict
 
+    from .async_checkpoint import AsyncSaveHandle
+
     class _EmptyDict(TypedDict):
         pass
 
@@ -71,10 +79,13 @@ if TYPE_CHECKING:
         params_filename: NotRequired[str]
         keep_name_table: NotRequired[bool]
         return_numpy: NotRequired[bool]
+        mmap: NotRequired[bool]
 
     class _SaveOptions(TypedDict):
         use_binary_format: NotRequired[bool]
         pickle_protocol: NotRequired[Literal[2, 3, 4]]
+        use_tensor_file: NotRequired[bool]
+        num_io_threads: NotRequired[int]
 
 
 __all__ = []
@@ -83,12 +94,18 @@ async_save_queue = []
 
 def clear_async_save_task_queue() -> None:
     '''
-    wait until all async save task to be done.
+    wait until all async save task to be done, the error of the first failed task is raised.
     '''
+    error = None
     while len(async_save_queue) > 0:
         task = async_save_queue.pop()
-        if task and task.is_alive():
-            task.join()
+        if task is None:
+            continue
+        task.wait()
+        if error is None:
+            error = task.exception()
+    if error is not None:
+        raise error
 
 
 def async_save(
@@ -97,13 +114,22 @@ def async_save(
     protocol: Literal[2, 3, 4] = 4,
     sync_other_task: bool = False,
     **configs: Unpack[_EmptyDict],
-) -> None:
+) -> AsyncSaveHandle:
     '''
     async version of paddle.save.
     Note:
         currently only support dygraph mode.
     Note:
         any argument passed through configs will be overridden by default setting.
+    Note:
+        the tensors are copied into reusable host buffers (pinned buffers for GPU tensors, copied on a side stream)
+        and this API returns without waiting for the copies, the checkpoint is serialized and synced to disk by a
+        writer process, a new python interpreter which reads the tensors from shared memory, so serialization does
+        not hold the GIL of the training process. Checkpoints saved into a memory buffer, checkpoints holding objects
+        other than builtin, ``collections`` and numpy objects, and checkpoints larger than the free space of
+        ``/dev/shm`` are serialized by a background thread of the training process instead, which holds the GIL
+        while pickling. At most ``FLAGS_async_save_max_staged`` (default 2) checkpoints are in flight, calling
+        this API with more blocks until the oldest one is written.
     Args:
         obj(Object) : The object to be saved.
         path(str|BytesIO) : The path/buffer of the object to be saved.
@@ -112,6 +138,10 @@ def async_save(
                                  Default: 4
         sync_other_task(bool) : Determine whether to wait other async save task to be finished before this one be put in queue.
         **configs(dict, optional): compatible argument to paddle.save, but will be overridden by default setting.
+    Returns:
+        AsyncSaveHandle: the handle of the save task, ``handle.staged`` and ``handle.completed`` are futures resolved
+        when the tensors are copied into host memory and when the checkpoint is written, ``handle.progress()`` returns
+        the fraction written.
     Examples:
         .. code-block:: python
             :name: code-example-1
@@ -121,11 +151,13 @@ def async_save(
             layer_state_dict = emb.state_dict()
 
             # call paddle.async_save with the same style of paddle.save
-            paddle.async_save(layer_state_dict, "emb.pdparams")
+            handle = paddle.async_save(layer_state_dict, "emb.pdparams")
             for i in range(10):
                 # do some calculations here
-            # wait if any async_save task has not been done
-            paddle.clear_async_task_queue()
+            # wait until the checkpoint is written
+            handle.result()
+            # or wait if any async_save task has not been done
+            paddle.clear_async_save_task_queue()
     '''
     if not in_dygraph_mode():
         raise ValueError(
@@ -135,29 +167,27 @@ def async_save(
         warnings.warn(
             "configs are not supported in async mode, will be overridden by default settings."
         )
-
-    # TODO: make this part async
-    def move_state_dict_to_cpu(sd):
-        for k, v in sd.items():
-            if isinstance(v, dict):
-                move_state_dict_to_cpu(v)
-            elif isinstance(v, core.eager.Tensor):
-                sd[k] = v.pin_memory() if core.is_compiled_with_cuda() else v
-
-    if isinstance(obj, dict):
-        move_state_dict_to_cpu(obj)
-    elif isinstance(obj, core.eager.Tensor):
-        obj = obj.pin_memory() if core.is_compiled_with_cuda() else obj
-    else:
+    if not isinstance(obj, (dict, core.eager.Tensor)):
         # other types are currently not supported
         raise TypeError(
             f"currently async_save does not support this type: {type(obj)}"
         )
+    if not isinstance(protocol, int) or protocol < 2 or protocol > 4:
+        raise ValueError(
+            f"Expected 1<'protocol'<5, but received protocol={protocol}"
+        )
+    if _is_file_path(path) and os.path.basename(path) == "":
+        raise ValueError(
+            "The input path MUST be format of dirname/filename "
+            "[dirname\\filename in Windows system], but received "
+            "filename is empty string."
+        )
+
     if sync_other_task:
         clear_async_save_task_queue()
-    t = threading.Thread(target=save, args=(obj, path, protocol))
-    t.start()
-    async_save_queue.append(t)
+    handle = _get_async_checkpoint_engine().save(obj, path, protocol)
+    async_save_queue.append(handle)
+    return handle
 
 
 def _build_saved_state_dict(state_dict):
@@ -365,6 +395,7 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'mmap',
     ]
 
     # input check
@@ -384,12 +415,18 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.mmap = configs.get('mmap', False)
 
     return inner_config
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'pickle_protocol',
+        'use_tensor_file',
+        'num_io_threads',
+    ]
 
     # input check
     for key in configs:
@@ -406,6 +443,10 @@ def _parse_save_config(configs):
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
+    inner_config.use_tensor_file = configs.get('use_tensor_file', False)
+    inner_config.num_io_threads = configs.get(
+        'num_io_threads', _DEFAULT_NUM_IO_THREADS
+    )
 
     return inner_config
 
@@ -801,6 +842,11 @@ def save(
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_tensor_file(bool): If True, save the ``state_dict`` in tensor file format instead of pickle, tensors are copied
+          to host in bounded chunks and written by several threads, and the saved file can be loaded lazily by
+          ``paddle.load(path, mmap=True)``. Only a dict of Tensor, numpy.ndarray and json serializable objects is supported,
+          and ``path`` must be a file path. Default: False
+          num_io_threads(int): The number of threads to write the tensor file when ``use_tensor_file`` is True. Default: 4
 
     Returns:
         None
@@ -932,7 +978,13 @@ def save(
             f"Type of `use_binary_format` should be bool, but received {type(config.use_binary_format)}."
         )
 
-    if config.use_binary_format:
+    if config.use_tensor_file:
+        if config.use_binary_format:
+            raise ValueError(
+                "`use_tensor_file` and `use_binary_format` can not be True at the same time."
+            )
+        _save_tensor_file(obj, path, num_threads=config.num_io_threads)
+    elif config.use_binary_format:
         _save_binary_var(obj, path)
     else:
         # `protocol` need to be used, `pickle_protocol` is a deprecated arg.
@@ -1062,6 +1114,9 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) mmap(bool): Only for the file saved with ``use_tensor_file=True``. If specified as True, the file is
+            memory-mapped and a read-only mapping is returned, each value is read when it is accessed and the tensors
+            share memory with the copy-on-write mapping. Default False.
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1182,6 +1237,12 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
 
     '''
 
+    if _is_file_path(path) and _is_tensor_file(path):
+        config = _parse_load_config(configs)
+        return _load_tensor_file(
+            path, return_numpy=config.return_numpy, mmap=config.mmap
+        )
+
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
         exception_type = pickle.UnpicklingError
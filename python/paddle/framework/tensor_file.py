@@ -0,0 +1,329 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# NOTE: [ tensor file format ] A safetensors-style file format for state
+# dict, which is used by `paddle.save(..., use_tensor_file=True)`:
+#
+#   | magic (8 bytes) | header size N (8 bytes, little endian) |
+#   | header (N bytes, utf-8 json, padded with spaces)           |
+#   | tensor payloads, each aligned to _TENSOR_FILE_ALIGNMENT     |
+#
+# The header maps each key to the dtype, shape, name and byte range of
+# the tensor relative to the start of payloads, non-tensor values which
+# can be serialized as json are stored in `__metadata__`. As the offsets
+# are known before writing, tensors are copied from device to host in
+# bounded chunks and written with `os.pwrite` by several threads, and the
+# header is written last, so an interrupted save never leaves a file which
+# looks complete. The file can be memory-mapped to read keys lazily.
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import paddle
+from paddle.base import core
+from paddle.base.data_feeder import convert_dtype
+
+_TENSOR_FILE_MAGIC = b'PDTENSOR'
+_TENSOR_FILE_VERSION = 1
+_TENSOR_FILE_ALIGNMENT = 64
+_METADATA_KEY = '__metadata__'
+
+# max bytes of a tensor copied from device to host at a time
+_DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+_DEFAULT_NUM_IO_THREADS = 4
+
+
+def _align(size, alignment=_TENSOR_FILE_ALIGNMENT):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _is_tensor(value):
+    return isinstance(value, (core.eager.Tensor, core.DenseTensor))
+
+
+def _tensor_meta(value):
+    if isinstance(value, np.ndarray):
+        dtype, shape = value.dtype.name, list(value.shape)
+    elif isinstance(value, core.DenseTensor):
+        dtype, shape = convert_dtype(value._dtype()), value.shape()
+    else:
+        dtype, shape = convert_dtype(value.dtype), list(value.shape)
+    if dtype not in np.sctypeDict or np.dtype(dtype).hasobject:
+        raise TypeError(
+            f"The tensor file format does not support saving dtype {dtype}."
+        )
+    return dtype, shape
+
+
+def _to_host_numpy(value):
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, core.DenseTensor):
+        p = core.Place()
+        p.set_place(paddle.CPUPlace())
+        return np.array(value._copy(p))
+    if value.is_dense() and value.place.is_custom_place():
+        value = paddle._C_ops.npu_identity(value, -1)
+    return np.array(value.cpu())
+
+
+def _iter_host_chunks(value, nbytes, chunk_size):
+    """
+    Yield the content of `value` as host numpy arrays, a tensor larger than
+    `chunk_size` is copied from device by slices of at most `chunk_size`.
+    """
+    if nbytes <= chunk_size or isinstance(
+        value, (np.ndarray, core.DenseTensor)
+    ):
+        # numpy arrays and DenseTensors are on host already
+        yield _to_host_numpy(value)
+        return
+    numel = int(np.prod(value.shape))
+    chunk_numel = max(chunk_size // (nbytes // numel), 1)
+    flat = value.reshape([-1])
+    for start in range(0, numel, chunk_numel):
+        yield _to_host_numpy(flat[start : min(start + chunk_numel, numel)])
+
+
+def _write_all(fd, data, offset):
+    view = memoryview(data).cast('B')
+    while len(view) > 0:
+        if hasattr(os, 'pwrite'):
+            written = os.pwrite(fd, view, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            written = os.write(fd, view)
+        view = view[written:]
+        offset += written
+
+
+def _build_header(state_dict):
+    header = {}
+    metadata = {}
+    tensors = []
+    offset = 0
+    for key, value in state_dict.items():
+        if not isinstance(key, str):
+            raise TypeError(
+                f"The keys of state dict saved as tensor file should be str, but got {type(key)}."
+            )
+        if _is_tensor(value) or isinstance(value, np.ndarray):
+            dtype, shape = _tensor_meta(value)
+            nbytes = (
+                int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            )
+            header[key] = {
+                'dtype': dtype,
+                'shape': shape,
+                'data_offsets': [offset, offset + nbytes],
+            }
+            if isinstance(value, core.eager.Tensor):
+                header[key]['name'] = value.name
+            tensors.append((key, value, offset, nbytes))
+            offset = _align(offset + nbytes)
+        else:
+            try:
+                json.dumps(value)
+            except TypeError:
+                raise TypeError(
+                    f"The value of key '{key}' with type {type(value)} can not be saved "
+                    "as tensor file, only Tensor, numpy.ndarray and json serializable "
+                    "objects are supported."
+                )
+            metadata[key] = value
+
+    header[_METADATA_KEY] = {
+        'format': 'paddle',
+        'version': _TENSOR_FILE_VERSION,
+        'objects': metadata,
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _align(16 + len(header_bytes))
+    header_bytes = header_bytes.ljust(data_start - 16, b' ')
+    return header_bytes, data_start, tensors
+
+
+def _save_tensor_file(
+    state_dict,
+    path,
+    num_threads=_DEFAULT_NUM_IO_THREADS,
+    chunk_size=_DEFAULT_CHUNK_SIZE,
+):
+    if not isinstance(state_dict, Mapping):
+        raise TypeError(
+            f"Only state dict (a Mapping) can be saved as tensor file, but got {type(state_dict)}."
+        )
+    if not isinstance(path, str):
+        raise ValueError(
+            f"Tensor file can only be saved to a file path, but got {type(path)}."
+        )
+
+    header_bytes, data_start, tensors = _build_header(state_dict)
+    # NOTE: os.pwrite is not available on Windows, tensors are written in
+    # one thread by seek and write there
+    if not hasattr(os, 'pwrite'):
+        num_threads = 1
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+
+        def write_tensor(item):
+            _, value, offset, nbytes = item
+            offset += data_start
+            if nbytes == 0:
+                return
+            for chunk in _iter_host_chunks(value, nbytes, chunk_size):
+                chunk = np.ascontiguousarray(chunk)
+                _write_all(fd, chunk, offset)
+                offset += chunk.nbytes
+
+        if num_threads > 1 and len(tensors) > 1:
+            # write large tensors first to balance the threads
+            tensors = sorted(tensors, key=lambda item: -item[3])
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                list(executor.map(write_tensor, tensors))
+        else:
+            for item in tensors:
+                write_tensor(item)
+
+        end = data_start + (
+            max(offset + nbytes for _, _, offset, nbytes in tensors)
+            if tensors
+            else 0
+        )
+        os.ftruncate(fd, end)
+        _write_all(
+            fd,
+            _TENSOR_FILE_MAGIC
+            + len(header_bytes).to_bytes(8, 'little')
+            + header_bytes,
+            0,
+        )
+    finally:
+        os.close(fd)
+
+
+def _is_tensor_file(path):
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(_TENSOR_FILE_MAGIC)) == _TENSOR_FILE_MAGIC
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        magic = f.read(len(_TENSOR_FILE_MAGIC))
+        if magic != _TENSOR_FILE_MAGIC:
+            raise ValueError(f"{path} is not a tensor file.")
+        header_size = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_size).decode('utf-8'))
+    metadata = header.pop(_METADATA_KEY, {})
+    if metadata.get('version', 0) > _TENSOR_FILE_VERSION:
+        raise ValueError(
+            f"The version of tensor file {path} is {metadata['version']}, "
+            f"which is newer than supported version {_TENSOR_FILE_VERSION}."
+        )
+    return header, metadata.get('objects', {}), 16 + header_size
+
+
+class LazyTensorFile(Mapping):
+    """
+    A read-only mapping of a tensor file saved by
+    ``paddle.save(state_dict, path, use_tensor_file=True)``. The file is
+    memory-mapped, and a key is read when it is accessed.
+
+    The tensors share memory with the copy-on-write mapping of the file,
+    modifying them never changes the file.
+    """
+
+    def __init__(self, path, return_numpy=False):
+        self.path = path
+        self._return_numpy = return_numpy
+        self._header, self._objects, self._data_start = _read_header(path)
+        self._mmap = None
+        if os.path.getsize(path) > self._data_start:
+            self._mmap = np.memmap(path, dtype=np.uint8, mode='c')
+
+    def __len__(self):
+        return len(self._header) + len(self._objects)
+
+    def __iter__(self):
+        yield from self._header
+        yield from self._objects
+
+    def __contains__(self, key):
+        return key in self._header or key in self._objects
+
+    def numpy(self, key):
+        """Return the numpy array of `key` sharing memory with the file."""
+        meta = self._header[key]
+        start, end = meta['data_offsets']
+        dtype = np.dtype(meta['dtype'])
+        if end == start:
+            return np.empty(meta['shape'], dtype=dtype)
+        return np.ndarray(
+            meta['shape'],
+            dtype=dtype,
+            buffer=self._mmap,
+            offset=self._data_start + start,
+        )
+
+    def _to_tensor(self, key, array, copy):
+        name = self._header[key].get('name')
+        if paddle.in_dynamic_mode():
+            if copy:
+                tensor = paddle.to_tensor(array)
+            else:
+                tensor = core.eager.Tensor(
+                    value=array,
+                    place=core.CPUPlace(),
+                    zero_copy=True,
+                )
+            if name:
+                tensor.name = name
+            return tensor
+        tensor = core.DenseTensor()
+        tensor.set(array, core.CPUPlace(), not copy)
+        return tensor
+
+    def __getitem__(self, key):
+        if key in self._objects:
+            return self._objects[key]
+        array = self.numpy(key)
+        if self._return_numpy:
+            return array
+        return self._to_tensor(key, array, copy=False)
+
+
+def _load_tensor_file(path, return_numpy=False, mmap=False):
+    lazy_file = LazyTensorFile(path, return_numpy)
+    if mmap:
+        return lazy_file
+    state_dict = {}
+    for key in lazy_file:
+        if key in lazy_file._objects:
+            state_dict[key] = lazy_file[key]
+        elif return_numpy:
+            state_dict[key] = np.array(lazy_file.numpy(key))
+        else:
+            state_dict[key] = lazy_file._to_tensor(
+                key, lazy_file.numpy(key), copy=True
+            )
+    return state_dict
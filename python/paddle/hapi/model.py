@@ -1211,6 +1211,8 @@ class DynamicGraphAdapter:
         self._amp_configs = {}
         self._amp_custom_lists = {}
         self._use_fp16_guard = True
+        # keep the losses and metric outputs on device, see Model.fit
+        self._deferred_sync = False
 
         if self._nranks > 1:
             dist.init_parallel_env()
@@ -1277,6 +1279,10 @@ class DynamicGraphAdapter:
                 self.model._optimizer.minimize(final_loss)
                 self.model.network.clear_gradients()
 
+        if self._deferred_sync:
+            losses, metric_outs = self._detach_outputs(losses, outputs, labels)
+            return (losses, metric_outs) if len(metric_outs) > 0 else losses
+
         metrics = []
         for metric in self.model._metrics:
             metric_outs = metric.compute(*(to_list(outputs) + labels))
@@ -1289,6 +1295,22 @@ class DynamicGraphAdapter:
             else [to_numpy(l) for l in losses]
         )
 
+    def _detach_outputs(self, losses, outputs, labels):
+        """
+        Return the detached losses and the detached outputs of metric.compute
+        without fetching them to host, the metrics are updated later by
+        Model._sync_deferred_outputs.
+        """
+
+        def detach(x):
+            return x.detach() if isinstance(x, paddle.Tensor) else x
+
+        metric_outs = []
+        for metric in self.model._metrics:
+            outs = metric.compute(*(to_list(outputs) + labels))
+            metric_outs.append([detach(o) for o in to_list(outs)])
+        return [detach(l) for l in losses], metric_outs
+
     def eval_batch(self, inputs, labels=None):
         self.model.network.eval()
         self.mode = 'eval'
@@ -1337,6 +1359,17 @@ class DynamicGraphAdapter:
                     self._merge_count[self.mode + '_total'] += samples
                     self._merge_count[self.mode + '_batch'] = samples
 
+        if self._deferred_sync:
+            losses, metric_outs = self._detach_outputs(
+                losses if self.model._loss else [], outputs, labels
+            )
+            if self.model._loss and len(metric_outs):
+                return losses, metric_outs
+            elif self.model._loss:
+                return losses
+            else:
+                return metric_outs
+
         metrics = []
         for metric in self.model._metrics:
             # cut off padding value.
@@ -1602,6 +1635,8 @@ class Model:
         self._is_shape_inferred = False
         self._test_dataloader = None
         self.stop_training = False
+        self._deferred_sync = False
+        self._log_freq = 10
 
         if not in_dynamic_mode():
             if not isinstance(inputs, (list, tuple, dict, Input)):
@@ -2214,6 +2249,7 @@ class Model:
         callbacks: Sequence[Callback] | Callback | None = None,
         accumulate_grad_batches: int = 1,
         num_iters: int | None = None,
+        deferred_sync: bool = False,
     ) -> None:
         """
 
@@ -2262,6 +2298,12 @@ class Model:
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            deferred_sync (bool, optional): Whether to keep the losses and the metric
+                outputs of every step on device, and fetch them to update the metrics
+                only every `log_freq` steps and at the end of epoch, which avoids the
+                device to host synchronization of every step. The logs passed to the
+                callbacks between two fetches hold the values of the last fetch. It
+                only works in dynamic graph mode. Default: False.
 
         Returns:
             None
@@ -2398,6 +2440,8 @@ class Model:
         self._test_dataloader = eval_loader
 
         self._accumulate = accumulate_grad_batches
+        self._deferred_sync = deferred_sync and in_dynamic_mode()
+        self._log_freq = log_freq
 
         steps = self._len_data_loader(train_loader)
         self.num_iters = num_iters
@@ -2445,6 +2489,7 @@ class Model:
 
         cbks.on_end('train', logs)
         self._test_dataloader = None
+        self._deferred_sync = False
 
     def evaluate(
         self,
@@ -2777,6 +2822,10 @@ class Model:
         logs={},
     ):
         outputs = []
+        deferred = self._deferred_sync and mode != 'predict'
+        self._adapter._deferred_sync = deferred
+        pending_outs = []
+        steps = self._len_data_loader(data_loader) if deferred else None
         for step, data in enumerate(data_loader):
             # Data might come from different types of data_loader and have
             # different format, as following:
@@ -2811,21 +2860,26 @@ class Model:
 
                 outs = getattr(self, mode + '_batch')(*_inputs)
 
-                if self._metrics and self._loss:
-                    metrics = [[float(l) for l in outs[0]]]
-                elif self._loss:
-                    metrics = [[float(l) for l in outs]]
+                if deferred:
+                    pending_outs.append(outs)
+                    if (step + 1) % self._log_freq == 0 or step + 1 == steps:
+                        self._sync_deferred_outputs(pending_outs, logs)
                 else:
-                    metrics = []
+                    if self._metrics and self._loss:
+                        metrics = [[float(l) for l in outs[0]]]
+                    elif self._loss:
+                        metrics = [[float(l) for l in outs]]
+                    else:
+                        metrics = []
 
-                # metrics
-                for metric in self._metrics:
-                    res = metric.accumulate()
-                    metrics.extend(to_list(res))
+                    # metrics
+                    for metric in self._metrics:
+                        res = metric.accumulate()
+                        metrics.extend(to_list(res))
 
-                assert len(self._metrics_name()) == len(metrics)
-                for k, v in zip(self._metrics_name(), metrics):
-                    logs[k] = v
+                    assert len(self._metrics_name()) == len(metrics)
+                    for k, v in zip(self._metrics_name(), metrics):
+                        logs[k] = v
             else:
                 if self._inputs is not None:
                     outs = self.predict_batch(data[: len(self._inputs)])
@@ -2852,6 +2906,9 @@ class Model:
                     self.stop_training = True
                     del self.num_iters
                     break
+        if deferred:
+            self._sync_deferred_outputs(pending_outs, logs)
+            self._adapter._deferred_sync = False
         self._reset_metrics()
 
         if mode == 'predict':
@@ -2967,6 +3024,39 @@ class Model:
 
         return out_specs
 
+    def _sync_deferred_outputs(self, pending_outs, logs):
+        """
+        Fetch the outputs of the steps run with `deferred_sync`, update the
+        metrics in order and write the loss of the last step and the metrics
+        to logs.
+        """
+        if not pending_outs:
+            return
+        for outs in pending_outs:
+            if self._metrics and self._loss:
+                metric_outs = outs[1]
+            elif self._loss:
+                metric_outs = []
+            else:
+                metric_outs = outs
+            for metric, m_outs in zip(self._metrics, metric_outs):
+                metric.update(*[to_numpy(m) for m in m_outs])
+
+        outs = pending_outs[-1]
+        if self._metrics and self._loss:
+            metrics = [[float(l) for l in outs[0]]]
+        elif self._loss:
+            metrics = [[float(l) for l in outs]]
+        else:
+            metrics = []
+        for metric in self._metrics:
+            metrics.extend(to_list(metric.accumulate()))
+
+        assert len(self._metrics_name()) == len(metrics)
+        for k, v in zip(self._metrics_name(), metrics):
+            logs[k] = v
+        pending_outs.clear()
+
     def _reset_metrics(self):
         for metric in self._metrics:
             metric.reset()
@@ -26,7 +26,6 @@ from typing_extensions import ParamSpec
 
 import paddle
 from paddle.base.framework import use_pir_api
-from paddle.inference import Config, PrecisionType, create_predictor
 from paddle.nn import Layer
 from paddle.static import InputSpec
 
@@ -44,6 +43,8 @@ def is_inference_mode(function):
 
 
 def get_inference_precision(precision_str):
+    from paddle.inference import PrecisionType
+
     if precision_str == "float32":
         return PrecisionType.Float32
     elif precision_str == "float16":
@@ -375,6 +376,8 @@ class InferenceEngine:
 
     # why we need input_tensor_lists? this is for TensorRT max/min/opt shape.
     def create_predictor(self, input_tensor_lists):
+        from paddle.inference import Config, create_predictor
+
         # create predictor
         if use_pir_api():
             model_file = os.path.join(self.save_model_dir, "infer.json")
@@ -27,10 +27,6 @@ from paddle.base.data_feeder import (
 from paddle.base.framework import Variable
 from paddle.base.layer_helper import LayerHelper
 from paddle.framework import in_dynamic_or_pir_mode
-from paddle.geometric.message_passing.utils import (
-    convert_out_size_to_list,
-    get_out_size_tensor_inputs,
-)
 from paddle.utils import deprecated
 
 if TYPE_CHECKING:
@@ -141,6 +137,11 @@ def graph_send_recv(
              [0. , 0. , 0. ]])
     """
 
+    from paddle.geometric.message_passing.utils import (
+        convert_out_size_to_list,
+        get_out_size_tensor_inputs,
+    )
+
     if pool_type not in ["sum", "mean", "max", "min"]:
         raise ValueError(
             f"pool_type should be `sum`, `mean`, `max` or `min`, but received {pool_type}"
@@ -17,6 +17,7 @@
 from .dataloader import (
     BatchSampler,
     ChainDataset,
+    CompiledCollateFn,
     ComposeDataset,
     ConcatDataset,
     Dataset,
@@ -52,4 +53,5 @@ __all__ = [
     'Subset',
     'SubsetRandomSampler',
     'ConcatDataset',
+    'CompiledCollateFn',
 ]
@@ -16,6 +16,7 @@ from .batch_sampler import (  # noqa: F401
     BatchSampler,
     DistributedBatchSampler,
 )
+from .collate import CompiledCollateFn  # noqa: F401
 from .dataset import (  # noqa: F401
     ChainDataset,
     ComposeDataset,
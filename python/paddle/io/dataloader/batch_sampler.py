@@ -18,6 +18,7 @@ import math
 from typing import (
     Iterable,
     Iterator,
+    Literal,
     Sequence,
     Sized,
 )
@@ -189,6 +190,109 @@ class _InfiniteIterableSampler(Sampler[Sequence[None]]):
             yield [None] * self.batch_size
 
 
+class _FeistelPermutation:
+    """
+    A seeded pseudo-random permutation of [0, size), which is evaluated
+    lazily on a numpy int array of positions with a balanced Feistel
+    network, positions mapped outside [0, size) are re-encrypted until
+    they fall into it (cycle walking). Only the queried positions are
+    materialized, so a shard can be computed in O(shard) memory.
+    """
+
+    _NUM_ROUNDS = 4
+
+    def __init__(self, size: int, seed: int) -> None:
+        self.size = size
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._half_bits = np.uint64(half_bits)
+        self._mask = np.uint64((1 << half_bits) - 1)
+        self._keys = np.random.RandomState(seed).randint(
+            0, 2**63, size=self._NUM_ROUNDS, dtype=np.uint64
+        )
+
+    def _round(self, x: np.ndarray, key: np.uint64) -> np.ndarray:
+        # finalizer of splitmix64, uint64 multiplication wraps around
+        z = x ^ key
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        return z & self._mask
+
+    def _encrypt(self, x: np.ndarray) -> np.ndarray:
+        left = x >> self._half_bits
+        right = x & self._mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half_bits) | right
+
+    def __call__(self, positions: np.ndarray) -> np.ndarray:
+        x = self._encrypt(np.asarray(positions, dtype=np.uint64))
+        out_of_range = x >= np.uint64(self.size)
+        while out_of_range.any():
+            x[out_of_range] = self._encrypt(x[out_of_range])
+            out_of_range = x >= np.uint64(self.size)
+        return x.astype(np.int64)
+
+
+class _DistributedShardIndexer:
+    """
+    Compute the sample indices of a rank's shard with numpy int arrays.
+
+    The dataset indices are padded to `total_size` by wrapping around and
+    permuted by `permutation`, then the shard of `rank` is made of batches
+    of `batch_size` taken every `batch_size * nranks` positions, and an
+    equal part of the incomplete tail. Position `p` of the shard is mapped
+    to the padded position directly, so any range of a shard can be
+    computed without building the shards of other ranks.
+    """
+
+    def __init__(
+        self,
+        dataset_size: int,
+        total_size: int,
+        batch_size: int,
+        nranks: int,
+        rank: int,
+        permutation: np.ndarray | _FeistelPermutation | None = None,
+    ) -> None:
+        self.dataset_size = dataset_size
+        self.batch_size = batch_size
+        self.nranks = nranks
+        self.rank = rank
+        self.permutation = permutation
+
+        last_batch_size = total_size % (batch_size * nranks)
+        assert last_batch_size % nranks == 0
+        self._last_local_batch_size = last_batch_size // nranks
+        self._full_size = total_size - last_batch_size
+        self._full_local_size = self._full_size // nranks
+
+    def global_positions(self, local_positions: np.ndarray) -> np.ndarray:
+        local_positions = np.asarray(local_positions, dtype=np.int64)
+        batch_idx, offset = np.divmod(local_positions, self.batch_size)
+        positions = (
+            batch_idx * self.batch_size * self.nranks
+            + self.rank * self.batch_size
+            + offset
+        )
+        in_tail = local_positions >= self._full_local_size
+        positions[in_tail] = (
+            self._full_size
+            + self.rank * self._last_local_batch_size
+            + local_positions[in_tail]
+            - self._full_local_size
+        )
+        return positions
+
+    def indices(self, start: int, stop: int) -> np.ndarray:
+        positions = self.global_positions(np.arange(start, stop))
+        if isinstance(self.permutation, np.ndarray):
+            positions = self.permutation[positions]
+        elif self.permutation is not None:
+            positions = self.permutation(positions)
+        return positions % self.dataset_size
+
+
 class DistributedBatchSampler(BatchSampler):
     """Sampler that restricts data loading to a subset of the dataset.
 
@@ -215,6 +319,13 @@ class DistributedBatchSampler(BatchSampler):
             batch indices. Default False.
         drop_last(bool, optional): whether drop the last incomplete(less than a mini-batch) batch dataset size.
             Default False.
+        shuffle_method(str, optional): the method to shuffle indices when :attr:`shuffle`
+            is True, 'numpy' or 'feistel'. 'numpy' shuffles the padded indices with
+            ``numpy.random.RandomState(epoch)``, which holds an int array of the whole
+            dataset on each rank. 'feistel' computes a pseudo-random permutation seeded
+            by epoch lazily, each rank only computes the indices of its own shard, which
+            is suitable for very large datasets, but the order differs from 'numpy'.
+            Default 'numpy'.
 
     Returns:
         DistributedBatchSampler, return an iterable object for indices iterating.
@@ -264,6 +375,7 @@ class DistributedBatchSampler(BatchSampler):
         rank: int | None = None,
         shuffle: bool = False,
         drop_last: bool = False,
+        shuffle_method: Literal['numpy', 'feistel'] = 'numpy',
     ) -> None:
         self.dataset = dataset
 
@@ -273,6 +385,11 @@ class DistributedBatchSampler(BatchSampler):
         self.batch_size = batch_size
         assert isinstance(shuffle, bool), "shuffle should be a boolean value"
         self.shuffle = shuffle
+        assert shuffle_method in (
+            'numpy',
+            'feistel',
+        ), f"shuffle_method should be 'numpy' or 'feistel', but got {shuffle_method}"
+        self.shuffle_method = shuffle_method
         assert isinstance(
             drop_last, bool
         ), "drop_last should be a boolean number"
@@ -303,68 +420,45 @@ class DistributedBatchSampler(BatchSampler):
         # TODO(dev): consider to make it as public argument, acc_steps is only used
         # in auto-parallel
         self._acc_steps = 1
+        self._sample_offset = 0
+
+    def _get_permutation(self) -> np.ndarray | _FeistelPermutation | None:
+        if not self.shuffle:
+            return None
+        if self.shuffle_method == 'feistel':
+            return _FeistelPermutation(self.total_size, self.epoch)
+        # NOTE: shuffle an int array of padded positions, which generates the
+        # same permutation as shuffling the python list of padded indices
+        dtype = np.int32 if self.total_size < 2**31 else np.int64
+        permutation = np.arange(self.total_size, dtype=dtype)
+        np.random.RandomState(self.epoch).shuffle(permutation)
+        return permutation
 
     def __iter__(self) -> Iterator[list[int]]:
         local_batch_size = self.batch_size * self._acc_steps
-        num_samples = len(self.dataset)
-        indices = np.arange(num_samples).tolist()
-        # add extra samples to make it evenly divisible
-        padding_size = self.total_size - len(indices)
-        if padding_size <= len(indices):
-            indices += indices[:padding_size]
-        else:
-            indices += (indices * math.ceil(padding_size / len(indices)))[
-                :padding_size
-            ]
-
-        assert len(indices) == self.total_size
+        sample_offset = self._sample_offset
+        self._sample_offset = 0
+
+        indexer = _DistributedShardIndexer(
+            len(self.dataset),
+            self.total_size,
+            self.batch_size,
+            self.nranks,
+            self.local_rank,
+            self._get_permutation(),
+        )
         if self.shuffle:
-            np.random.RandomState(self.epoch).shuffle(indices)
             self.epoch += 1
 
-        # subsample
-        def _get_indices_by_batch_size(indices):
-            subsampled_indices = []
-            last_batch_size = self.total_size % (self.batch_size * self.nranks)
-            assert last_batch_size % self.nranks == 0
-            last_local_batch_size = last_batch_size // self.nranks
-
-            for i in range(
-                self.local_rank * self.batch_size,
-                len(indices) - last_batch_size,
-                self.batch_size * self.nranks,
-            ):
-                subsampled_indices.extend(indices[i : i + self.batch_size])
-
-            indices = indices[len(indices) - last_batch_size :]
-            subsampled_indices.extend(
-                indices[
-                    self.local_rank
-                    * last_local_batch_size : (self.local_rank + 1)
-                    * last_local_batch_size
-                ]
-            )
-
-            return subsampled_indices
-
-        if self.nranks > 1:
-            indices = _get_indices_by_batch_size(indices)
-
-        assert len(indices) == self.num_samples
-        _sample_iter = iter(indices)
-
-        batch_indices = []
-        for idx in _sample_iter:
-            batch_indices.append(idx)
-            if len(batch_indices) == local_batch_size:
-                yield batch_indices
-                batch_indices = []
-        if not self.drop_last and len(batch_indices) > 0:
-            yield batch_indices
+        for start in range(sample_offset, self.num_samples, local_batch_size):
+            stop = min(start + local_batch_size, self.num_samples)
+            if self.drop_last and stop - start < local_batch_size:
+                break
+            yield indexer.indices(start, stop).tolist()
 
     def __len__(self) -> int:
         local_batch_size = self.batch_size * self._acc_steps
-        num_samples = self.num_samples
+        num_samples = self.num_samples - self._sample_offset
         num_samples += int(not self.drop_last) * (local_batch_size - 1)
         return num_samples // local_batch_size
 
@@ -406,3 +500,33 @@ class DistributedBatchSampler(BatchSampler):
                 ...     sampler.set_epoch(epoch)
         """
         self.epoch = epoch
+
+    def set_sample_offset(self, sample_offset: int) -> None:
+        """
+        Sets the number of samples already consumed by the current rank in
+        the epoch, the next iteration will resume from this offset of the
+        shard, and the offset is cleared once the iteration starts. It is
+        used to resume training from a checkpoint saved in the middle of
+        an epoch together with :code:`set_epoch`.
+
+        Arguments:
+            sample_offset (int): Number of samples of the shard to skip.
+
+        Examples:
+            .. code-block:: python
+
+                >>> from paddle.io import DistributedBatchSampler
+
+                >>> sampler = DistributedBatchSampler(
+                ...     range(100), batch_size=8, num_replicas=2, rank=0
+                ... )
+                >>> sampler.set_epoch(3)
+                >>> sampler.set_sample_offset(16)
+                >>> len(sampler)
+                5
+        """
+        assert (
+            isinstance(sample_offset, int)
+            and 0 <= sample_offset <= self.num_samples
+        ), f"sample_offset should be an integer in [0, {self.num_samples}]"
+        self._sample_offset = sample_offset
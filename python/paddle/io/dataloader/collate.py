@@ -109,3 +109,252 @@ def default_convert_fn(batch):
         return [default_convert_fn(d) for d in batch]
     else:
         return batch
+
+
+class _SchemaMismatch(Exception):
+    pass
+
+
+# leaf kinds of the sample structure
+_ARRAY, _NUMBER, _STRING, _TENSOR = range(4)
+
+
+class _CollatePlan:
+    """
+    Flat collate plan compiled from the first sample of a batch, records
+    the path, kind, shape and dtype of each leaf field. Samples are
+    flattened into a tuple of leaves by a generated function, and each
+    leaf column is stacked into a preallocated output array.
+    """
+
+    def __init__(self, sample):
+        self.leaves = []
+        self._keys = []
+        self._length_checks = []
+        self.structure = self._compile(sample, "s")
+        self._flatten = self._build_flatten()
+
+    def _key_ref(self, key):
+        self._keys.append(key)
+        return f"_keys[{len(self._keys) - 1}]"
+
+    def _add_leaf(self, kind, expr, shape=None, dtype=None):
+        self.leaves.append((kind, expr, shape, dtype))
+        return len(self.leaves) - 1
+
+    def _compile(self, sample, expr):
+        if isinstance(sample, np.ndarray):
+            if sample.dtype.hasobject:
+                raise _SchemaMismatch
+            return self._add_leaf(_ARRAY, expr, sample.shape, sample.dtype)
+        elif isinstance(sample, paddle.Tensor):
+            return self._add_leaf(_TENSOR, expr)
+        elif isinstance(sample, numbers.Number):
+            dtype = np.array([sample]).dtype
+            return self._add_leaf(_NUMBER, expr, (), dtype)
+        elif isinstance(sample, (str, bytes)):
+            return self._add_leaf(_STRING, expr)
+        elif isinstance(sample, Mapping):
+            return (
+                dict,
+                {
+                    key: self._compile(
+                        sample[key], f"{expr}[{self._key_ref(key)}]"
+                    )
+                    for key in sample
+                },
+            )
+        elif isinstance(sample, Sequence):
+            self._length_checks.append((expr, len(sample)))
+            return (
+                list,
+                [
+                    self._compile(field, f"{expr}[{i}]")
+                    for i, field in enumerate(sample)
+                ],
+            )
+        raise TypeError(
+            "batch data con only contains: tensor, numpy.ndarray, "
+            f"dict, list, number, but got {type(sample)}"
+        )
+
+    def _build_flatten(self):
+        lines = ["def _flatten(s):"]
+        if self._length_checks:
+            checks = " or ".join(
+                f"len({expr}) != {length}"
+                for expr, length in self._length_checks
+            )
+            lines.append(f"    if {checks}:")
+            lines.append("        raise _SchemaMismatch")
+        leaves = "".join(f"{leaf[1]}, " for leaf in self.leaves)
+        lines.append(f"    return ({leaves})")
+        scope = {"_keys": tuple(self._keys), "_SchemaMismatch": _SchemaMismatch}
+        exec("\n".join(lines), scope)
+        return scope["_flatten"]
+
+    def match(self, sample, structure=None):
+        """Check the structure and leaf kinds of `sample` with the plan."""
+        structure = self.structure if structure is None else structure
+        if isinstance(structure, int):
+            kind, _, shape, dtype = self.leaves[structure]
+            if kind == _ARRAY:
+                return (
+                    isinstance(sample, np.ndarray)
+                    and sample.shape == shape
+                    and sample.dtype == dtype
+                )
+            elif kind == _NUMBER:
+                return isinstance(sample, numbers.Number)
+            elif kind == _TENSOR:
+                return isinstance(sample, paddle.Tensor)
+            return isinstance(sample, (str, bytes))
+        container, children = structure
+        if container is dict:
+            return (
+                isinstance(sample, Mapping)
+                and len(sample) == len(children)
+                and all(
+                    key in sample and self.match(sample[key], child)
+                    for key, child in children.items()
+                )
+            )
+        return (
+            isinstance(sample, Sequence)
+            and not isinstance(sample, (str, bytes))
+            and len(sample) == len(children)
+            and all(
+                self.match(field, child)
+                for field, child in zip(sample, children)
+            )
+        )
+
+    def output_specs(self, batch_size):
+        return [
+            ((batch_size, *shape), dtype)
+            for kind, _, shape, dtype in self.leaves
+            if kind in (_ARRAY, _NUMBER)
+        ]
+
+    def collate(self, batch, outputs):
+        try:
+            columns = list(zip(*map(self._flatten, batch)))
+        except (KeyError, IndexError, TypeError):
+            raise _SchemaMismatch
+
+        outputs = iter(outputs)
+        results = []
+        for (kind, _, _, dtype), column in zip(self.leaves, columns):
+            if kind == _ARRAY:
+                out = next(outputs)
+                try:
+                    np.concatenate(
+                        [field[np.newaxis] for field in column],
+                        axis=0,
+                        out=out,
+                        casting='no',
+                    )
+                except (TypeError, ValueError, IndexError):
+                    raise _SchemaMismatch
+                results.append(out)
+            elif kind == _NUMBER:
+                out = next(outputs)
+                values = np.array(column)
+                if values.dtype != dtype:
+                    raise _SchemaMismatch
+                out[...] = values
+                results.append(out)
+            elif kind == _TENSOR:
+                results.append(paddle.stack(list(column), axis=0))
+            else:
+                results.append(list(column))
+        return self._restore(self.structure, results)
+
+    def _restore(self, structure, results):
+        if isinstance(structure, int):
+            return results[structure]
+        container, children = structure
+        if container is dict:
+            return {
+                key: self._restore(child, results)
+                for key, child in children.items()
+            }
+        return [self._restore(child, results) for child in children]
+
+
+class CompiledCollateFn:
+    """
+    Batch collating function for :code:`paddle.io.DataLoader`, which
+    gives the same result as :code:`default_collate_fn` but infers the
+    sample structure from the first batch and compiles it into a flat
+    plan of leaf fields. Later batches are collated by the plan without
+    type dispatching, and each leaf is stacked directly into an output
+    array allocated by :attr:`allocator`. If the structure, shapes or
+    dtypes of samples change, the batch falls back to
+    :code:`default_collate_fn` and the plan is compiled again from the
+    next batch.
+
+    When it is used with multi-process DataLoader and shared memory ring
+    (see ``FLAGS_dataloader_shm_ring_slab_size``), batches are stacked
+    into shared memory slabs directly.
+
+    Args:
+        allocator(Callable|None, optional): function to allocate output
+            arrays, which is called with a list of (shape, dtype) of the
+            stacked numpy fields and returns a list of numpy arrays, or
+            None to allocate with :code:`numpy.empty`. It can be used to
+            stack batches into pinned or shared memory buffers. Default
+            None.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.io import CompiledCollateFn
+
+            >>> collate_fn = CompiledCollateFn()
+            >>> batch = [
+            ...     {'image': np.ones([3, 4], 'float32'), 'label': i}
+            ...     for i in range(4)
+            ... ]
+            >>> data = collate_fn(batch)
+            >>> print(data['image'].shape, data['label'])
+            (4, 3, 4) [0 1 2 3]
+    """
+
+    def __init__(self, allocator=None):
+        self.allocator = allocator
+        self._plan = None
+        self.num_fallbacks = 0
+
+    def _allocate(self, specs):
+        outputs = None
+        if self.allocator is not None and len(specs) > 0:
+            outputs = self.allocator(specs)
+        if outputs is None:
+            outputs = [np.empty(shape, dtype) for shape, dtype in specs]
+        return outputs
+
+    def __call__(self, batch):
+        if len(batch) == 0:
+            return default_collate_fn(batch)
+
+        plan = self._plan
+        if plan is None or not plan.match(batch[0]):
+            try:
+                plan = _CollatePlan(batch[0])
+            except _SchemaMismatch:
+                plan = None
+        self._plan = plan
+        if plan is None:
+            self.num_fallbacks += 1
+            return default_collate_fn(batch)
+
+        try:
+            return plan.collate(
+                batch, self._allocate(plan.output_specs(len(batch)))
+            )
+        except _SchemaMismatch:
+            self._plan = None
+            self.num_fallbacks += 1
+            return default_collate_fn(batch)
@@ -39,6 +39,11 @@ from ..multiprocess_utils import (
 from .batch_sampler import _InfiniteIterableSampler
 from .collate import default_collate_fn, default_convert_fn
 from .flat import _flatten_batch, _restore_batch
+from .shm_ring import (
+    _get_shm_ring_slab_size,
+    _SharedMemoryBatch,
+    _SharedMemoryRing,
+)
 from .worker import (
     _DatasetKind,
     _IterableDatasetStopIteration,
@@ -427,6 +432,24 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             (self._worker_shm_buffer_size) * 2 * self._num_workers
         )
 
+        # NOTE: [ shared memory ring ] if FLAGS_dataloader_shm_ring_slab_size
+        # is set, each worker writes batches into a recycled ring of shared
+        # memory slabs, which are wrapped as tensors here without copying.
+        # Slabs of a worker should cover its outstanding batches and the
+        # batches cached in blocking_queue, see shm_ring.py for details
+        self._shm_ring_slab_size = (
+            _get_shm_ring_slab_size() if self._use_shared_memory else 0
+        )
+        self._shm_ring_num_slabs = (
+            -(-self._outstanding_capacity // self._num_workers) + 2
+        )
+        self._shm_rings = []
+        # transport statistics, batches and bytes wrapped from shared memory
+        # ring without copying, and batches fell back to DenseTensor transport
+        self._shm_ring_batches = 0
+        self._shm_ring_nbytes = 0
+        self._shm_fallback_batches = 0
+
         # init workers and indices queues and put 2 indices in each indices queue
         self._init_workers()
         for _ in range(self._outstanding_capacity):
@@ -456,6 +479,13 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             indices_queue = multiprocessing.Queue()
             indices_queue.cancel_join_thread()
             self._indices_queues.append(indices_queue)
+            shm_ring_info = None
+            if self._shm_ring_slab_size > 0:
+                shm_ring = _SharedMemoryRing(
+                    self._shm_ring_num_slabs, self._shm_ring_slab_size
+                )
+                self._shm_rings.append(shm_ring)
+                shm_ring_info = shm_ring.info()
             worker = multiprocessing.Process(
                 target=_worker_loop,
                 args=(
@@ -473,6 +503,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._use_shared_memory,
                     self._base_seed,
                     self._worker_shm_buffer_size,
+                    shm_ring_info,
                 ),
             )
             worker.daemon = True
@@ -604,6 +635,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         q.close()
             finally:
                 core._erase_process_pids(id(self))
+                for shm_ring in self._shm_rings:
+                    shm_ring.close()
                 self._shutdown = True
 
     def _thread_loop(self, legacy_expected_place):
@@ -628,7 +661,15 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     try:
                         # pack as DenseTensorArray
                         array = core.DenseTensorArray()
-                        if self._use_shared_memory:
+                        if isinstance(batch, _SharedMemoryBatch):
+                            shm_ring = self._shm_rings[batch.worker_id]
+                            for tensor in shm_ring.wrap(batch):
+                                array.append(tensor)
+                            self._shm_ring_batches += 1
+                            self._shm_ring_nbytes += batch.nbytes
+                        elif self._use_shared_memory:
+                            if self._shm_ring_slab_size > 0:
+                                self._shm_fallback_batches += 1
                             for tensor in batch:
                                 array.append(tensor)
                         else:
@@ -0,0 +1,303 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import itertools
+import os
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ...framework import core
+
+# NOTE: [ shared memory ring ] Each DataLoader worker owns a ring of
+# pre-allocated shared memory slabs, the worker writes the numpy fields
+# of a collated batch into a free slab and only sends the field metas
+# through the result queue, the main process wraps the slab as tensors
+# without copying. A slab is marked as free again once all the tensors
+# wrapped on it are released, so slabs are recycled across batches and
+# no shared memory file is created or mapped per batch.
+#
+# The ring is enabled by setting FLAGS_dataloader_shm_ring_slab_size to
+# the slab size in bytes, batches which are larger than a slab or arrive
+# when all slabs of the worker are still in use fall back to the default
+# shared memory DenseTensor transport. With `CompiledCollateFn`, batches
+# are stacked into the slab directly and are sent without any copy.
+
+# slab payloads and field offsets are aligned to cache lines
+_SHM_RING_ALIGNMENT = 64
+
+_SLAB_FREE = 0
+_SLAB_BUSY = 1
+
+
+def _align(size, alignment=_SHM_RING_ALIGNMENT):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _get_shm_ring_slab_size():
+    slab_size = os.environ.get('FLAGS_dataloader_shm_ring_slab_size', '0')
+    try:
+        return max(int(slab_size), 0)
+    except ValueError:
+        return 0
+
+
+def _is_slab_field(field):
+    return (
+        isinstance(field, np.ndarray)
+        and not field.dtype.hasobject
+        and field.dtype.kind != 'U'
+    )
+
+
+class _SlabField:
+    __slots__ = ('offset', 'shape', 'dtype')
+
+    def __init__(self, offset, shape, dtype):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.offset, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.offset, self.shape, self.dtype = state
+
+
+class _SharedMemoryBatch:
+    """
+    Flattened batch sent from worker, numpy fields are stored in slab
+    `slab_id` of the worker's ring and described by `_SlabField`, other
+    fields are kept as shared memory DenseTensor.
+    """
+
+    def __init__(self, worker_id, slab_id, fields, nbytes):
+        self.worker_id = worker_id
+        self.slab_id = slab_id
+        self.fields = fields
+        self.nbytes = nbytes
+
+
+class _SlabLease:
+    def __init__(self, status, slab_id, num_fields):
+        self._status = status
+        self._slab_id = slab_id
+        self._num_fields = num_fields
+        # next() on itertools.count is atomic under GIL, which is safe to
+        # be called in finalizers of different threads
+        self._released = itertools.count(1)
+
+    def release(self):
+        if next(self._released) == self._num_fields:
+            self._status[self._slab_id] = _SLAB_FREE
+
+
+class _SharedMemoryRing:
+    """
+    A ring of `num_slabs` shared memory slabs of `slab_size` bytes. The
+    ring is created by the main process and attached by the worker with
+    the name, the first bytes of the segment record the status of slabs.
+    """
+
+    def __init__(self, num_slabs, slab_size, name=None):
+        self.num_slabs = num_slabs
+        self.slab_size = _align(slab_size)
+        self._header_size = _align(num_slabs)
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(
+                create=True,
+                size=self._header_size + self.num_slabs * self.slab_size,
+            )
+        else:
+            # NOTE: workers share the resource tracker of main process, the
+            # segment is registered only once and unlinked by main process
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._status = np.ndarray(
+            (num_slabs,), dtype=np.uint8, buffer=self._shm.buf
+        )
+        if self._owner:
+            self._status[:] = _SLAB_FREE
+        self._next_slab = 0
+        # slab allocated by collate_allocator and not put yet
+        self._pending = None
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def info(self):
+        return (self.name, self.num_slabs, self.slab_size)
+
+    def _slab_offset(self, slab_id):
+        return self._header_size + slab_id * self.slab_size
+
+    # ---------------------- worker side ----------------------
+
+    def _acquire(self):
+        for i in range(self.num_slabs):
+            slab_id = (self._next_slab + i) % self.num_slabs
+            if self._status[slab_id] == _SLAB_FREE:
+                self._status[slab_id] = _SLAB_BUSY
+                self._next_slab = (slab_id + 1) % self.num_slabs
+                return slab_id
+        return None
+
+    def allocate(self, specs):
+        """
+        Acquire a free slab and allocate arrays described by `specs`, a
+        list of (shape, dtype), in it. Return (slab_id, arrays, fields),
+        or None if all slabs are in use or the arrays exceed a slab.
+        """
+        offsets = []
+        nbytes = 0
+        for shape, dtype in specs:
+            offsets.append(nbytes)
+            nbytes += _align(
+                int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            )
+        if nbytes > self.slab_size:
+            return None
+
+        slab_id = self._acquire()
+        if slab_id is None:
+            return None
+
+        base = self._slab_offset(slab_id)
+        arrays = []
+        fields = []
+        for offset, (shape, dtype) in zip(offsets, specs):
+            shape = tuple(shape)
+            dtype = np.dtype(dtype)
+            arrays.append(
+                np.ndarray(
+                    shape,
+                    dtype=dtype,
+                    buffer=self._shm.buf,
+                    offset=base + offset,
+                )
+            )
+            fields.append(_SlabField(offset, shape, dtype.str))
+        return slab_id, arrays, fields
+
+    def _release_pending(self):
+        if self._pending is not None:
+            self._status[self._pending[0]] = _SLAB_FREE
+            self._pending = None
+
+    def collate_allocator(self, specs):
+        """
+        Allocator for `CompiledCollateFn` to stack a batch directly into a
+        free slab, `put_batch` will send the slab without copying.
+        """
+        self._release_pending()
+        allocated = self.allocate(specs)
+        if allocated is None:
+            return None
+        slab_id, arrays, fields = allocated
+        self._pending = (slab_id, arrays, fields)
+        return arrays
+
+    def _take_pending(self, slab_fields):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return None
+        slab_id, arrays, fields = pending
+        metas = {id(arr): field for arr, field in zip(arrays, fields)}
+        if slab_fields and all(id(b) in metas for b in slab_fields):
+            return slab_id, [metas[id(b)] for b in slab_fields]
+        # batch is not the one stacked in slab, e.g. modified after collating
+        self._status[slab_id] = _SLAB_FREE
+        return None
+
+    def put_batch(self, worker_id, batch, convert_fn):
+        """
+        Write the numpy fields of flattened `batch` into a free slab, other
+        fields are converted by `convert_fn`. Return a `_SharedMemoryBatch`,
+        or None if the batch can not be transported by the ring.
+        """
+        slab_fields = [b for b in batch if _is_slab_field(b)]
+        taken = self._take_pending(slab_fields)
+        if len(slab_fields) == 0:
+            return None
+
+        if taken is not None:
+            slab_id, metas = taken
+        else:
+            allocated = self.allocate([(b.shape, b.dtype) for b in slab_fields])
+            if allocated is None:
+                return None
+            slab_id, arrays, metas = allocated
+            for dst, src in zip(arrays, slab_fields):
+                np.copyto(dst, src, casting='no')
+        nbytes = sum(b.nbytes for b in slab_fields)
+
+        metas = iter(metas)
+        fields = [
+            next(metas) if _is_slab_field(b) else convert_fn(b) for b in batch
+        ]
+        return _SharedMemoryBatch(worker_id, slab_id, fields, nbytes)
+
+    # ------------------- main process side -------------------
+
+    def wrap(self, shm_batch):
+        """
+        Wrap the fields of `shm_batch` as CPU DenseTensors sharing memory
+        with the slab, the slab is released when all of them are freed.
+        """
+        base = self._slab_offset(shm_batch.slab_id)
+        num_slab_fields = sum(
+            isinstance(f, _SlabField) for f in shm_batch.fields
+        )
+        lease = _SlabLease(self._status, shm_batch.slab_id, num_slab_fields)
+
+        tensors = []
+        for field in shm_batch.fields:
+            if not isinstance(field, _SlabField):
+                tensors.append(field)
+                continue
+            arr = np.ndarray(
+                field.shape,
+                dtype=np.dtype(field.dtype),
+                buffer=self._shm.buf,
+                offset=base + field.offset,
+            )
+            weakref.finalize(arr, lease.release)
+            tensor = core.DenseTensor()
+            tensor.set(arr, core.CPUPlace(), True)
+            tensors.append(tensor)
+        return tensors
+
+    def num_free_slabs(self):
+        return int(np.count_nonzero(self._status == _SLAB_FREE))
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._status = None
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        # NOTE: tensors wrapped on slabs may be still alive, the segment
+        # will be unmapped when the last of them is released
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+        self._shm = None
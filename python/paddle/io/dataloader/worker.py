@@ -29,8 +29,10 @@ from ..multiprocess_utils import (
     CleanupFuncRegistrar,
     _cleanup_mmap,
 )
+from .collate import CompiledCollateFn
 from .fetcher import _IterableDatasetFetcher, _MapDatasetFetcher
 from .flat import _flatten_batch
+from .shm_ring import _SharedMemoryRing
 
 if TYPE_CHECKING:
     from paddle.io import Dataset
@@ -293,7 +295,9 @@ def _worker_loop(
     use_shared_memory,
     base_seed,
     shm_cache_size=0,
+    shm_ring_info=None,
 ):
+    shm_ring = None
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
         # some shared memory objects may have been applied for but have not yet
@@ -306,6 +310,19 @@ def _worker_loop(
 
         core._set_max_memory_map_allocation_pool_size(shm_cache_size)
 
+        # NOTE: [ shared memory ring ] attach the slabs ring created by
+        # main process, see shm_ring.py for details
+        if use_shared_memory and shm_ring_info is not None:
+            shm_ring = _SharedMemoryRing(
+                shm_ring_info[1], shm_ring_info[2], name=shm_ring_info[0]
+            )
+            # stack batches into slabs directly
+            if (
+                isinstance(collate_fn, CompiledCollateFn)
+                and collate_fn.allocator is None
+            ):
+                collate_fn.allocator = shm_ring.collate_allocator
+
         # set different numpy seed for each worker
         try:
             import random
@@ -398,15 +415,23 @@ def _worker_loop(
                         lodtensor.set(arr, core.CPUPlace())
                         return lodtensor
 
-                    tensor_list = [
-                        (
+                    def to_shared_tensor(b):
+                        return (
                             numpy2lodtensor(b)
                             if isinstance(b, np.ndarray)
                             else b.get_tensor()
                         )
-                        for b in batch
-                    ]
-                    out_queue.put((idx, tensor_list, structure))
+
+                    shm_batch = None
+                    if shm_ring is not None:
+                        shm_batch = shm_ring.put_batch(
+                            worker_id, batch, to_shared_tensor
+                        )
+                    if shm_batch is not None:
+                        out_queue.put((idx, shm_batch, structure))
+                    else:
+                        tensor_list = [to_shared_tensor(b) for b in batch]
+                        out_queue.put((idx, tensor_list, structure))
                 else:
                     out_queue.put((idx, batch, structure))
     except KeyboardInterrupt:
@@ -417,6 +442,8 @@ def _worker_loop(
     finally:
         if use_shared_memory:
             _cleanup_mmap()
+        if shm_ring is not None:
+            shm_ring.close()
     if done_event.is_set():
         out_queue.cancel_join_thread()
         out_queue.close()
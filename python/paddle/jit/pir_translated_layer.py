@@ -321,73 +321,93 @@ def _construct_params_and_buffers(model_path, programs, params_filename=None):
         return var_dict
 
 
-def _run_dygraph(instance, input, program_holder):
-    # 1. prepare inputs, outputs, attrs
-    input_tensors = []
-    input_tensor_names = []
+# NOTE: [ PirTranslatedLayer call plan ]
+# The same as NOTE: [ TranslatedLayer call plan ] for the PIR program: the
+# names of the inputs, the lookup of the persistable variables of the layer
+# and the PartialProgramLayer running the program do not depend on the
+# values of the inputs. They are built once into a _CallPlan, cached on the
+# layer for every program holder and mode, instead of building a new
+# PartialProgramLayer for every call. The plans are dropped when a parameter
+# or buffer of the layer is set, deleted or converted.
+
+
+class _CallPlan:
+    def __init__(self, instance, program_holder):
+        from paddle.jit.dy2static.pir_partial_program import (
+            PartialProgramLayer,
+        )
 
-    for i, value in enumerate(input):
-        if not isinstance(value, (np.ndarray, core.eager.Tensor)):
-            raise TypeError(
-                f"The type of input in PirTranslatedLayer must be numpy array or Variable(Tensor), but received {type(value)}."
+        if not instance._is_test and not program_holder.support_train:
+            raise ValueError(
+                "The model is not trainable, please check model_file of jit.save."
             )
+        self.input_names = [var.name for var in program_holder.input_vars]
+
+        persistable_tensors = []
+        origin_persistable_var_name = [
+            program_holder._suffix_varname_dict[var_name]
+            for var_name in program_holder.persistable_names
+        ]
+        for var_name in origin_persistable_var_name:
+            dy_var_name = instance._persistable_var_name_dict[var_name]
+            if dy_var_name in instance._parameters:
+                persistable_tensors.append(instance._parameters[dy_var_name])
+            elif dy_var_name in instance._buffers:
+                persistable_tensors.append(instance._buffers[dy_var_name])
+            else:
+                raise ValueError(
+                    f"The persistable variable {var_name} does not exist in current PirTranslatedLayer."
+                )
+
+        self.layer = PartialProgramLayer(
+            program_holder.infer_program,
+            program_holder.input_vars,
+            program_holder.output_vars,
+            (persistable_tensors, program_holder.persistable_vars),
+        )
+        self.layer.training = not instance._is_test
+
+
+def _get_call_plan(instance, program_holder):
+    key = (program_holder, instance._is_test)
+    plan = instance._call_plans.get(key)
+    if plan is None:
+        plan = instance._call_plans[key] = _CallPlan(instance, program_holder)
+    return plan
+
+
+def _run_dygraph(instance, input, program_holder):
+    # 1. prepare inputs
+    if len(input) > len(program_holder.input_vars):
+        raise IndexError(
+            f"The number of input is invalid, expected at most {len(program_holder.input_vars)}, but received {len(input)}."
+        )
+    plan = _get_call_plan(instance, program_holder)
+    input_tensors = []
+    for name, value in zip(plan.input_names, input):
         # NOTE: In order to unify the API, firstly convert the input to Tensor
         if isinstance(value, np.ndarray):
             tensor = core.eager.Tensor(
                 value=value,
-                name=program_holder.input_vars[i].name,
+                name=name,
                 persistable=False,
                 place=framework._current_expected_place(),
                 zero_copy=True,
             )
-        else:
+        elif isinstance(value, core.eager.Tensor):
             tensor = value
             # NOTE: we changed var name here,
             # but it may be an important name set by user
-            tensor.name = program_holder.input_vars[i].name
-        input_tensor_names.append(tensor.name)
-        input_tensors.append(tensor)
-
-    persistable_tensors = []
-    origin_persistable_var_name = [
-        program_holder._suffix_varname_dict[var_name]
-        for var_name in program_holder.persistable_names
-    ]
-    for var_name in origin_persistable_var_name:
-        dy_var_name = instance._persistable_var_name_dict[var_name]
-        if dy_var_name in instance._parameters:
-            persistable_tensors.append(instance._parameters[dy_var_name])
-        elif dy_var_name in instance._buffers:
-            persistable_tensors.append(instance._buffers[dy_var_name])
+            tensor.name = name
         else:
-            raise ValueError(
-                f"The persistable variable {var_name} does not exist in current PirTranslatedLayer."
-            )
-
-    from paddle.jit.dy2static.pir_partial_program import PartialProgramLayer
-
-    inputs = program_holder.input_vars
-    outputs = program_holder.output_vars
-    parameters = (persistable_tensors, program_holder.persistable_vars)
-
-    layer = PartialProgramLayer(
-        program_holder.infer_program,
-        inputs,
-        outputs,
-        parameters,
-    )
-    instance.layer = layer
-    if instance._is_test:
-        layer.training = False
-    else:
-        if not program_holder.support_train:
-            raise ValueError(
-                "The model is not trainable, please check model_file of jit.save."
+            raise TypeError(
+                f"The type of input in PirTranslatedLayer must be numpy array or Variable(Tensor), but received {type(value)}."
             )
-        else:
-            layer.training = True
+        input_tensors.append(tensor)
 
-    return instance.layer(input_tensors)
+    # 2. run program
+    instance.layer = plan.layer
+    return plan.layer(input_tensors)
 
 
 def _run_static_graph(inputs, program_holder, src_program):
@@ -562,6 +582,8 @@ class PirTranslatedLayer(layers.Layer):
             )
 
         self._program_holder_dict = programs
+        # see NOTE: [ PirTranslatedLayer call plan ]
+        self._call_plans = {}
 
         # NOTE(chenweihang): [ why not use var name directly? ]
         # When add parameter or buffer to Layer by follow apis,
@@ -590,6 +612,29 @@ class PirTranslatedLayer(layers.Layer):
         self._is_test = True
         self._input_args_names = None
 
+    # NOTE: the call plans hold the parameters and buffers of the layer, see
+    # NOTE: [ PirTranslatedLayer call plan ]
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if isinstance(value, core.eager.Tensor):
+            self._call_plans.clear()
+
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        self._call_plans.clear()
+
+    def add_parameter(self, name, parameter):
+        self._call_plans.clear()
+        return super().add_parameter(name, parameter)
+
+    def register_buffer(self, name, tensor, persistable=True):
+        self._call_plans.clear()
+        super().register_buffer(name, tensor, persistable)
+
+    def _apply(self, func, device, dtype, blocking, include_sublayers=True):
+        super()._apply(func, device, dtype, blocking, include_sublayers)
+        self._call_plans.clear()
+
     @staticmethod
     @framework.dygraph_only
     def _construct(model_path, configs=None):
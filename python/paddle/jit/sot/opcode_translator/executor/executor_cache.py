@@ -15,12 +15,13 @@
 from __future__ import annotations
 
 import gc
+import time
 import traceback
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple
 
 from paddle.base.dygraph.base import sot_simulation_mode_guard
 
-from ...profiler import EventGuard, event_register
+from ...profiler import EventGuard, event_register, get_guard_stats
 from ...psdb import NO_FALLBACK_CODES
 from ...utils import (
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
@@ -37,6 +38,7 @@ from ...utils import (
 from ..custom_code import CustomCode
 from .guard import Guard
 from .opcode_executor import OpcodeExecutor, OpcodeExecutorBase
+from .persistent_cache import get_persistent_cache
 
 if TYPE_CHECKING:
     import types
@@ -49,6 +51,112 @@ dummy_guard.expr = "lambda frame: True"
 dummy_guard.inlined_expr = "lambda frame: True"
 
 
+class GuardIndex:
+    """
+    Index of the guarded functions of a code object, which selects the
+    candidates whose guards may pass for a frame without evaluating all of
+    them.
+
+    Most guards of a code share the same equality sub-expressions with
+    different constants, e.g. `frame.f_locals['x'].shape[0] == 3`. When a
+    guarded function is added, the left sides of its equality guards
+    (`guard_fn.discriminators`) are evaluated on the frame it is translated
+    from. The left sides shared by all guarded functions and having
+    different values among them form the discriminating key, a guarded
+    function can only pass on a frame with the same key, so only the bucket
+    of the key needs to be checked. Guarded functions without recorded
+    values, e.g. `dummy_guard`, are checked for every key. The candidates
+    keep the order of insertion, so the first passed guarded function is
+    the same as scanning all of them.
+
+    Attributes:
+        records (list): The left side values of each guarded function, None if not recorded.
+        key_fns (list): The functions computing the discriminating key of a frame.
+    """
+
+    MAX_KEY_SIZE = 4
+
+    records: list[dict[str, Any] | None]
+    key_fns: list[Callable[[types.FrameType], Any]]
+
+    def __init__(self):
+        self.records = []
+        self.key_fns = []
+        self.buckets = {}
+        self.default_candidates = []
+        self._compiled_fns = {}
+
+    def _compile(self, lhs: str, free_vars: dict[str, Any]):
+        if lhs not in self._compiled_fns:
+            self._compiled_fns[lhs] = eval(f"lambda frame: {lhs}", free_vars)
+        return self._compiled_fns[lhs]
+
+    def record(self, guard_fn: Guard, frame: types.FrameType):
+        discriminators = getattr(guard_fn, "discriminators", None)
+        record = None
+        if discriminators:
+            try:
+                # the recorded values are only meaningful if guard passes
+                if guard_fn(frame):
+                    record = {}
+                    for lhs, free_vars in discriminators.items():
+                        value = self._compile(lhs, free_vars)(frame)
+                        hash(value)
+                        record[lhs] = value
+            except Exception:
+                record = None
+        self.records.append(record)
+        self.build()
+
+    def sync(self, num_guarded_fns: int):
+        # guarded functions may be added without frame, e.g. by load_state
+        if len(self.records) != num_guarded_fns:
+            self.records = (self.records + [None] * num_guarded_fns)[
+                :num_guarded_fns
+            ]
+            self.build()
+
+    def build(self):
+        recorded = [r for r in self.records if r is not None]
+        self.key_fns = []
+        self.buckets = {}
+        self.default_candidates = list(range(len(self.records)))
+        if len(recorded) < 2:
+            return
+        shared = set(recorded[0]).intersection(*recorded[1:])
+        num_values = {
+            lhs: len({r[lhs] for r in recorded}) for lhs in sorted(shared)
+        }
+        key_exprs = sorted(
+            (lhs for lhs, n in num_values.items() if n > 1),
+            key=lambda lhs: -num_values[lhs],
+        )[: self.MAX_KEY_SIZE]
+        if not key_exprs:
+            return
+        self.key_fns = [self._compiled_fns[lhs] for lhs in key_exprs]
+        self.default_candidates = [
+            i for i, r in enumerate(self.records) if r is None
+        ]
+        for i, r in enumerate(self.records):
+            if r is None:
+                continue
+            key = tuple(r[lhs] for lhs in key_exprs)
+            if key not in self.buckets:
+                self.buckets[key] = []
+            self.buckets[key].append(i)
+        for key, bucket in self.buckets.items():
+            self.buckets[key] = sorted(bucket + self.default_candidates)
+
+    def candidates(self, frame: types.FrameType) -> list[int]:
+        if not self.key_fns:
+            return self.default_candidates
+        try:
+            key = tuple(fn(frame) for fn in self.key_fns)
+            return self.buckets.get(key, self.default_candidates)
+        except Exception:
+            return list(range(len(self.records)))
+
+
 class OpcodeExecutorCache(metaclass=Singleton):
     """
     A singleton class that implements a cache for translated instructions.
@@ -61,11 +169,13 @@ class OpcodeExecutorCache(metaclass=Singleton):
 
     MAX_CACHE_SIZE = 20
     cache: dict[types.CodeType, GuardedFunctions]
+    guard_index: dict[types.CodeType, GuardIndex]
     translate_count: int
     code_symbolic_inputs: dict[types.CodeType, dict[str, None | dict[int, int]]]
 
     def __init__(self):
         self.cache = {}
+        self.guard_index = {}
         self.translate_count = 0
         self.code_symbolic_inputs = {}
 
@@ -80,28 +190,46 @@ class OpcodeExecutorCache(metaclass=Singleton):
         Clears the cache and resets the translate count.
         """
         self.cache.clear()
+        self.guard_index.clear()
         self.translate_count = 0
         self.code_symbolic_inputs.clear()
 
     def dump_state(self):
         return {
             "cache": self.cache,
+            "guard_index": self.guard_index,
             "translate_count": self.translate_count,
             "code_symbolic_inputs": self.code_symbolic_inputs,
         }
 
     def load_state(self, state):
         self.cache = state["cache"]
+        self.guard_index = state.get("guard_index", {})
         self.translate_count = state["translate_count"]
         self.code_symbolic_inputs = state["code_symbolic_inputs"]
 
+    def get_guard_index(self, code: types.CodeType) -> GuardIndex:
+        if code not in self.guard_index:
+            self.guard_index[code] = GuardIndex()
+        return self.guard_index[code]
+
     def __call__(self, frame: types.FrameType, **kwargs) -> CustomCode:
         code: types.CodeType = frame.f_code
         if code not in self.cache:
+            persistent_cache = get_persistent_cache()
+            if persistent_cache is not None and (
+                loaded_fns := persistent_cache.load(frame)
+            ):
+                self.cache[code] = loaded_fns
+                return self.lookup(frame, loaded_fns, **kwargs)
             log(2, f"[Cache]: Firstly call {code}\n")
+            get_guard_stats().misses += 1
             new_custom_code, guard_fn = self.translate(frame, **kwargs)
             assert guard_fn is not None
             self.cache[code] = [(new_custom_code, guard_fn)]
+            self.guard_index[code] = GuardIndex()
+            self.guard_index[code].record(guard_fn, frame)
+            self.persist(frame, self.cache[code])
             return new_custom_code
         guarded_fns = self.cache[code]
         return self.lookup(frame, guarded_fns, **kwargs)
@@ -125,7 +253,13 @@ class OpcodeExecutorCache(metaclass=Singleton):
             log(2, "[Cache]: Exceed max cache size, skip it\n")
             return CustomCode(None, False)
 
-        for custom_code, guard_fn in guarded_fns:
+        guard_stats = get_guard_stats()
+        guard_index = self.get_guard_index(frame.f_code)
+        guard_index.sync(len(guarded_fns))
+        start_time = time.perf_counter_ns()
+        for idx in guard_index.candidates(frame):
+            custom_code, guard_fn = guarded_fns[idx]
+            guard_stats.guard_evals += 1
             try:
                 with EventGuard("try guard"):
                     guard_result = guard_fn(frame)
@@ -134,6 +268,10 @@ class OpcodeExecutorCache(metaclass=Singleton):
                         2,
                         f"[Cache] Cache hit, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
                     )
+                    guard_stats.hits += 1
+                    guard_stats.guard_eval_time_ns += (
+                        time.perf_counter_ns() - start_time
+                    )
                     return custom_code
                 else:
                     log_do(
@@ -161,12 +299,25 @@ class OpcodeExecutorCache(metaclass=Singleton):
 
                 continue
 
+        guard_stats.misses += 1
+        guard_stats.guard_eval_time_ns += time.perf_counter_ns() - start_time
         log(2, "[Cache]: all guards missed\n")
         new_custom_code, guard_fn = self.translate(frame, **kwargs)
         if guard_fn is not None:
             guarded_fns.append((new_custom_code, guard_fn))
+            guard_index.record(guard_fn, frame)
+            self.persist(frame, guarded_fns)
         return new_custom_code
 
+    def persist(self, frame: types.FrameType, guarded_fns: GuardedFunctions):
+        """
+        Saves the fallbacks of the frame's code object to the persistent cache if `SOT_CACHE_DIR` is set.
+        Translated code is not persisted, see NOTE: [ SOT persistent cache ].
+        """
+        persistent_cache = get_persistent_cache()
+        if persistent_cache is not None:
+            persistent_cache.save(frame, guarded_fns)
+
     def before_translate_hook(self, frame: types.FrameType):
         if not ENV_SOT_ALLOW_DYNAMIC_SHAPE.get():
             return
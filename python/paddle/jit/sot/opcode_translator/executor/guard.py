@@ -72,6 +72,29 @@ class StringifiedExpression:
             *[sub_expr.inlined_expr for sub_expr in self.sub_exprs]
         )
 
+    @cached_property
+    def equality_lhs(self) -> str | None:
+        """
+        The inlined left side of the expression if it is in the form of
+        `<lhs> == <constant>`, e.g. `frame.f_locals['x'].shape[0]` of
+        `{}.shape[0] == 3`, which is used to index the guards of a code.
+        """
+        template = getattr(self, "original_expr_template", self.expr_template)
+        parts = template.split(" == ")
+        if len(parts) != 2 or len(self.sub_exprs) != 1:
+            return None
+        lhs_template, rhs = parts
+        if "{" in rhs or " and " in rhs or " or " in rhs:
+            return None
+        if lhs_template.count("{}") + lhs_template.count("{0}") != 1:
+            return None
+        lhs = lhs_template.format(self.sub_exprs[0].inlined_expr)
+        try:
+            compile(lhs, "<guard>", "eval")
+        except SyntaxError:
+            return None
+        return lhs
+
     def gen_expr(self):
         def gen_expr_fn():
             return self.expr_template.format(
@@ -98,6 +121,7 @@ class FasterStringifiedExpression(StringifiedExpression):
         free_vars: dict[str, Any],
     ):
         self.faster_guard = faster_guard
+        self.original_expr_template = expr_template
         if ENV_SOT_ENABLE_FASTER_GUARD.get():
             original_expr_template = expr_template
             guard_cls_name = faster_guard.__class__.__name__
@@ -135,6 +159,7 @@ def make_guard(stringified_guards: list[StringifiedExpression]) -> Guard:
             guard = lambda frame: True
             guard.expr = "lambda frame: True"
             guard.original_guard = guard
+            guard.discriminators = {}
             return guard
 
         free_vars = union_free_vars(
@@ -152,6 +177,14 @@ def make_guard(stringified_guards: list[StringifiedExpression]) -> Guard:
         log(3, f"[Guard]: {inlined_guard_expr}\n")
         guard.inlined_expr = inlined_guard_expr
         guard.expr = guard_expr
+        # NOTE: The left sides of the equality guards, which are usually
+        # shared by the guards of a code, are used to index them, see
+        # GuardIndex in executor_cache.py for details.
+        guard.discriminators = {
+            expr.equality_lhs: expr.free_vars
+            for expr in stringified_guards
+            if expr.equality_lhs is not None
+        }
 
         assert callable(guard), "guard must be callable."
 
@@ -0,0 +1,235 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# NOTE: [ SOT persistent cache ] Deciding that a code object falls back to
+# the original bytecode may take as long as translating it, as the whole
+# code is simulated until the unsupported operation is found. Such
+# decisions are saved to `SOT_CACHE_DIR` and loaded when the code is called
+# the first time in a new process, so the code is not simulated again.
+#
+# Only the fallbacks guarded by `dummy_guard` are persisted, they hold for
+# any input of the code, so their key needs no guard inputs. This is a cache
+# of fallback decisions, not a compilation cache: translated code and its
+# guards are not persisted and are translated again in every process.
+# Translated code loads the compiled graph functions (`___graph_fn_SIR_<n>`)
+# and other process local objects from the globals, and most of its guards
+# compare ids of objects. Persisting it would need the static programs of
+# the graph functions serialized and rebound to the parameters of the new
+# process, and guards rewritten over serializable inputs keyed into the
+# file name, which SOT does not provide.
+#
+# The cache directory is namespaced by the Paddle version, the Python
+# version and the environment variables affecting translation, and each
+# file is named by the hash of the marshaled code object, so the cache is
+# invalidated when any of them changes. Files are JSON holding plain
+# values and a checksum, they are never unpickled or evaluated since the
+# directory may be written by other jobs, and a file which fails the
+# checks is dropped. When the size of the cache directory exceeds
+# `SOT_CACHE_MAX_SIZE_MB`, the least recently used files are removed.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import types
+from typing import TYPE_CHECKING
+
+import paddle
+
+from ...utils import (
+    ENV_MIN_GRAPH_SIZE,
+    ENV_SOT_ALLOW_DYNAMIC_SHAPE,
+    ENV_SOT_CACHE_DIR,
+    ENV_SOT_CACHE_MAX_SIZE_MB,
+    ENV_SOT_ENABLE_FASTER_GUARD,
+    ENV_SOT_WITH_CONTROL_FLOW,
+    log,
+)
+from ..custom_code import CustomCode
+
+if TYPE_CHECKING:
+    from .executor_cache import GuardedFunctions
+
+PERSISTENT_CACHE_FORMAT_VERSION = 2
+
+
+def code_hash(code: types.CodeType) -> str:
+    return hashlib.sha256(marshal.dumps(code)).hexdigest()
+
+
+def entries_checksum(code_digest: str, entries: list) -> str:
+    payload = json.dumps([code_digest, entries], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PersistentCache:
+    """
+    The on-disk cache of the fallback decisions of code objects. Translated
+    code is not cached, see [ SOT persistent cache ] for details.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int):
+        self.cache_dir = os.path.join(cache_dir, self.namespace())
+        self.max_size = max_size
+        self.hits = 0
+        self.saved = 0
+        self.skipped = 0
+
+    @staticmethod
+    def namespace() -> str:
+        flags = (
+            ENV_MIN_GRAPH_SIZE.get(),
+            ENV_SOT_ALLOW_DYNAMIC_SHAPE.get(),
+            ENV_SOT_ENABLE_FASTER_GUARD.get(),
+            ENV_SOT_WITH_CONTROL_FLOW.get(),
+            paddle.framework.use_pir_api(),
+        )
+        flags_hash = hashlib.sha256(repr(flags).encode()).hexdigest()[:16]
+        python_version = f"py{sys.version_info.major}{sys.version_info.minor}"
+        return f"{paddle.__version__}-{paddle.version.commit[:8]}-{python_version}-{flags_hash}"
+
+    def _path(self, code: types.CodeType) -> str:
+        return os.path.join(self.cache_dir, f"{code_hash(code)}.json")
+
+    # ------------------------- save -------------------------
+
+    def save(self, frame: types.FrameType, guarded_fns: GuardedFunctions):
+        from .executor_cache import dummy_guard
+
+        entries = []
+        for custom_code, guard_fn in guarded_fns:
+            if custom_code.code is None and guard_fn is dummy_guard:
+                entries.append(
+                    {"disable_eval_frame": custom_code.disable_eval_frame}
+                )
+            else:
+                self.skipped += 1
+        if not entries:
+            return
+        digest = code_hash(frame.f_code)
+        data = json.dumps(
+            {
+                "version": PERSISTENT_CACHE_FORMAT_VERSION,
+                "code_hash": digest,
+                "entries": entries,
+                "checksum": entries_checksum(digest, entries),
+            }
+        )
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temporary file and rename it, concurrent processes
+            # never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(frame.f_code))
+        except OSError as e:
+            log(2, f"[PersistentCache] Failed to save cache: {e}\n")
+            return
+        self.saved += len(entries)
+        self.evict()
+
+    # ------------------------- load -------------------------
+
+    def load(self, frame: types.FrameType) -> GuardedFunctions:
+        from .executor_cache import dummy_guard
+
+        digest = code_hash(frame.f_code)
+        path = self._path(frame.f_code)
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data["version"] != PERSISTENT_CACHE_FORMAT_VERSION:
+                raise ValueError(f"unsupported version {data['version']}")
+            entries = data["entries"]
+            if data["code_hash"] != digest or data["checksum"] != (
+                entries_checksum(digest, entries)
+            ):
+                raise ValueError("checksum mismatch")
+            guarded_fns = []
+            for entry in entries:
+                disable_eval_frame = entry["disable_eval_frame"]
+                if not isinstance(disable_eval_frame, bool):
+                    raise ValueError(f"invalid entry {entry}")
+                guarded_fns.append(
+                    (CustomCode(None, disable_eval_frame), dummy_guard)
+                )
+        except Exception as e:
+            # the file is corrupted or written by an incompatible version
+            log(2, f"[PersistentCache] Drop invalid cache {path}: {e}\n")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return []
+        # mark the file as recently used for eviction
+        os.utime(path)
+        self.hits += 1
+        log(
+            2,
+            f"[PersistentCache] Load {len(guarded_fns)} fallbacks of "
+            f"{frame.f_code.co_name}\n",
+        )
+        return guarded_fns
+
+    def evict(self):
+        try:
+            files = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(".json")
+            ]
+        except OSError:
+            return
+        stats = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in files
+        ]
+        total_size = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
+
+
+_persistent_cache: PersistentCache | None = None
+
+
+def get_persistent_cache() -> PersistentCache | None:
+    """
+    Return the persistent cache if `SOT_CACHE_DIR` is set, otherwise None.
+    """
+    global _persistent_cache
+    cache_dir = ENV_SOT_CACHE_DIR.get()
+    if not cache_dir:
+        return None
+    if (
+        _persistent_cache is None
+        or _persistent_cache.cache_dir
+        != os.path.join(cache_dir, PersistentCache.namespace())
+    ):
+        _persistent_cache = PersistentCache(
+            cache_dir, ENV_SOT_CACHE_MAX_SIZE_MB.get() * 1024 * 1024
+        )
+    return _persistent_cache
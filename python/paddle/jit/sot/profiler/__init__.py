@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .guard_stats import (
+    GuardStats as GuardStats,
+    get_guard_stats as get_guard_stats,
+)
 from .kernel_stats import SotStepProfilerGuard as SotStepProfilerGuard
 from .profiler import (
     EventGuard as EventGuard,
@@ -0,0 +1,60 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class GuardStats:
+    """
+    Counters of the guard lookup in OpcodeExecutorCache.
+
+    Attributes:
+        hits: The number of calls which reuse a translated code.
+        misses: The number of calls which translate the code.
+        guard_evals: The number of guard functions evaluated.
+        guard_eval_time_ns: The time spent on evaluating guards.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    guard_evals: int = 0
+    guard_eval_time_ns: int = 0
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.guard_evals = 0
+        self.guard_eval_time_ns = 0
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0
+        evals_per_lookup = self.guard_evals / lookups if lookups else 0
+        summary = ""
+        summary += f"guard cache hits: {self.hits}\n"
+        summary += f"guard cache misses: {self.misses}\n"
+        summary += f"guard cache hit rate: {hit_rate:.2%}\n"
+        summary += f"guard evaluations per lookup: {evals_per_lookup:.2f}\n"
+        summary += f"guard evaluation time: {self.guard_eval_time_ns / 1000000:.2f} ms\n"
+        return summary
+
+
+_guard_stats = GuardStats()
+
+
+def get_guard_stats() -> GuardStats:
+    return _guard_stats
@@ -18,6 +18,8 @@ from .envs import (  # noqa: F401
     ENV_COST_MODEL,
     ENV_MIN_GRAPH_SIZE,
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
+    ENV_SOT_CACHE_DIR,
+    ENV_SOT_CACHE_MAX_SIZE_MB,
     ENV_SOT_ENABLE_FASTER_GUARD,
     ENV_SOT_ENABLE_GUARD_TREE,
     ENV_SOT_EXPORT,
@@ -31,6 +33,7 @@ from .envs import (  # noqa: F401
     faster_guard_guard,
     guard_tree_guard,
     min_graph_size_guard,
+    sot_cache_dir_guard,
     sot_step_profiler_guard,
     strict_mode_guard,
     with_control_flow_guard,
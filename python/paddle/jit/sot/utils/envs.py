@@ -58,6 +58,10 @@ ENV_SOT_COLLECT_INFO = StringListEnvironmentVariable("SOT_COLLECT_INFO", [])
 ENV_SOT_FORCE_FALLBACK_SIR_IDS = StringEnvironmentVariable(
     "SOT_FORCE_FALLBACK_SIR_IDS", ""
 )
+ENV_SOT_CACHE_DIR = StringEnvironmentVariable("SOT_CACHE_DIR", "")
+ENV_SOT_CACHE_MAX_SIZE_MB = IntegerEnvironmentVariable(
+    "SOT_CACHE_MAX_SIZE_MB", 1024
+)
 
 
 @contextmanager
@@ -108,6 +112,12 @@ def guard_tree_guard(value: bool):
         yield
 
 
+@contextmanager
+def sot_cache_dir_guard(value: str):
+    with EnvironmentVariableGuard(ENV_SOT_CACHE_DIR, value):
+        yield
+
+
 @contextmanager
 def sot_step_profiler_guard(value: bool):
     with EnvironmentVariableGuard(ENV_ENABLE_SOT_STEP_PROFILER, value):
@@ -885,142 +885,188 @@ def _valid_vars(vars):
     return vars if vars else None
 
 
+# NOTE: [ TranslatedLayer call plan ]
+# Most of the work of _run_dygraph besides running the program does not
+# depend on the values of the inputs: the names of the inputs, the lookup of
+# the persistable variables of the layer, the descs of the outputs, the attrs
+# of run_program and the gradient types of the parameters. They are computed
+# once into a _CallPlan, cached on the layer for every program holder, mode
+# and number of inputs, which matters for small models served at batch size
+# 1. The plans are dropped when a parameter or buffer of the layer is set,
+# deleted or converted, so the cached persistable variables stay the ones
+# of the layer. The output tensors are created for every call, as outputs
+# of previous calls may still share their buffers with the user's tensors.
+
+
+class _CallPlan:
+    def __init__(self, instance, program_holder, num_inputs):
+        is_test = instance._is_test
+        self.input_names = [
+            desc.name() for desc in program_holder.input_descs[:num_inputs]
+        ]
+
+        self.persistable_vars = []
+        for var_name in program_holder.persistable_names:
+            dy_var_name = instance._persistable_var_name_dict[var_name]
+            if dy_var_name in instance._parameters:
+                self.persistable_vars.append(instance._parameters[dy_var_name])
+            elif dy_var_name in instance._buffers:
+                self.persistable_vars.append(instance._buffers[dy_var_name])
+            else:
+                raise ValueError(
+                    f"The persistable variable {var_name} does not exist in current TranslatedLayer."
+                )
+
+        self.output_args = [
+            {
+                'dtype': var_desc.dtype(),
+                'dims': var_desc.shape(),
+                'name': var_desc.name(),
+                'type': var_desc.type(),
+                'persistable': False,
+            }
+            for var_desc in program_holder.output_descs
+        ]
+
+        trace_program = (
+            program_holder.infer_program
+            if is_test
+            else program_holder.train_program
+        )
+        forward_program = (
+            program_holder._infer_program_desc
+            if is_test
+            else program_holder.forward_program
+        )
+        end_op_index = program_holder.infer_program.block(0).op_size()
+
+        attrs = [
+            'global_block',
+            trace_program.block(0),
+            'start_op_index',
+            0,
+            'end_op_index',
+            end_op_index,
+            'is_test',
+            is_test,
+            'program_id',
+            paddle.utils._hash_with_id(trace_program, instance),
+            'x_names',
+            self.input_names,
+        ]
+        if not is_test:
+            attrs.extend(
+                (
+                    'param_grad_names',
+                    program_holder.grad_var_names.get('param', []),
+                    'out_grad_names',
+                    program_holder.grad_var_names.get('out', []),
+                    'x_grad_names',
+                    program_holder.grad_var_names.get('x', []),
+                )
+            )
+
+        use_interpretorcore = True
+        attrs.extend(('use_interpretorcore', use_interpretorcore))
+        if use_interpretorcore:
+            attrs.extend(
+                (
+                    'forward_global_block',
+                    forward_program.block(0),
+                )
+            )
+            if not is_test:
+                attrs.extend(
+                    (
+                        'backward_global_block',
+                        program_holder.backward_program.block(0),
+                    )
+                )
+        self.attrs = attrs
+
+        # NOTE: [ why need set param's gradient type here ]
+        # if user set sparse gradient mode, the param's gradient
+        # will be SelectedRows, not DenseTensor. But tracer will just
+        # set param grad Tensor by forward Tensor(DenseTensor)
+        # If we don't change grad_var type here, RunProgramOp need
+        # transform SelectedRows to DenseTensor forcibly, it may not
+        # be user wanted result.
+        self.grad_types = []
+        for persistable_var in self.persistable_vars:
+            grad_var_name = persistable_var.name + core.grad_var_suffix()
+            grad_var = trace_program.block(0).find_var(grad_var_name.encode())
+            # NOTE: cannot find var desc maybe not problem,
+            # such as in batch_norm
+            if grad_var is None:
+                continue
+            self.grad_types.append((persistable_var, grad_var.type()))
+
+    def output_vars(self):
+        return [core.eager.Tensor(**args) for args in self.output_args]
+
+
+def _get_call_plan(instance, program_holder, num_inputs):
+    key = (program_holder, instance._is_test, num_inputs)
+    plan = instance._call_plans.get(key)
+    if plan is None:
+        plan = instance._call_plans[key] = _CallPlan(
+            instance, program_holder, num_inputs
+        )
+    return plan
+
+
 def _run_dygraph(instance, input, program_holder):
     # 1. prepare inputs, outputs, attrs
+    if len(input) > len(program_holder.input_descs):
+        raise IndexError(
+            f"The number of input is invalid, expected at most {len(program_holder.input_descs)}, but received {len(input)}."
+        )
+    plan = _get_call_plan(instance, program_holder, len(input))
     input_vars = []
-    input_var_names = []
-    for i, value in enumerate(input):
-        if not isinstance(value, (np.ndarray, core.eager.Tensor)):
-            raise TypeError(
-                f"The type of input in TranslatedLayer must be numpy array or Variable(Tensor), but received {type(value)}."
-            )
+    for name, value in zip(plan.input_names, input):
         # NOTE: In order to unify the API, firstly convert the input to Tensor
         if isinstance(value, np.ndarray):
             var = core.eager.Tensor(
                 value=value,
-                name=program_holder.input_descs[i].name(),
+                name=name,
                 persistable=False,
                 place=framework._current_expected_place(),
                 zero_copy=True,
             )
-        else:
+        elif isinstance(value, core.eager.Tensor):
             var = value
             # NOTE: we changed var name here,
             # but it may be an important name set by user
-            var.name = program_holder.input_descs[i].name()
-        input_var_names.append(var.name)
+            var.name = name
+        else:
+            raise TypeError(
+                f"The type of input in TranslatedLayer must be numpy array or Variable(Tensor), but received {type(value)}."
+            )
         input_vars.append(var)
     if instance._input_args_names is None:
         instance._input_args_names = [
             ins.name() for ins in program_holder.input_descs
         ]
 
-    persistable_vars = []
-    for var_name in program_holder.persistable_names:
-        dy_var_name = instance._persistable_var_name_dict[var_name]
-        if dy_var_name in instance._parameters:
-            persistable_vars.append(instance._parameters[dy_var_name])
-        elif dy_var_name in instance._buffers:
-            persistable_vars.append(instance._buffers[dy_var_name])
-        else:
-            raise ValueError(
-                f"The persistable variable {var_name} does not exist in current TranslatedLayer."
-            )
-
-    output_vars = []
-    for var_desc in program_holder.output_descs:
-        var = core.eager.Tensor(
-            dtype=var_desc.dtype(),
-            dims=var_desc.shape(),
-            name=var_desc.name(),
-            type=var_desc.type(),
-            persistable=False,
-        )
-        output_vars.append(var)
+    persistable_vars = plan.persistable_vars
+    output_vars = plan.output_vars()
 
     # hold forward variables
     tmp_scope_vec = [program_holder.scope]
 
     # 2. run program by op
-    trace_program = (
-        program_holder.infer_program
-        if instance._is_test
-        else program_holder.train_program
-    )
-    forward_program = (
-        program_holder._infer_program_desc
-        if instance._is_test
-        else program_holder.forward_program
-    )
-    end_op_index = program_holder.infer_program.block(0).op_size()
-
-    attrs = [
-        'global_block',
-        trace_program.block(0),
-        'start_op_index',
-        0,
-        'end_op_index',
-        end_op_index,
-        'is_test',
-        instance._is_test,
-        'program_id',
-        paddle.utils._hash_with_id(trace_program, instance),
-        'x_names',
-        input_var_names,
-    ]
-    if not instance._is_test:
-        attrs.extend(
-            (
-                'param_grad_names',
-                program_holder.grad_var_names.get('param', []),
-                'out_grad_names',
-                program_holder.grad_var_names.get('out', []),
-                'x_grad_names',
-                program_holder.grad_var_names.get('x', []),
-            )
-        )
-
-    use_interpretorcore = True
-    attrs.extend(('use_interpretorcore', use_interpretorcore))
-    if use_interpretorcore:
-        attrs.extend(
-            (
-                'forward_global_block',
-                forward_program.block(0),
-            )
-        )
-        if not instance._is_test:
-            attrs.extend(
-                (
-                    'backward_global_block',
-                    program_holder.backward_program.block(0),
-                )
-            )
-
     _legacy_C_ops.run_program(
         _valid_vars(input_vars),
         _valid_vars(persistable_vars),
         _valid_vars(output_vars),
         tmp_scope_vec,
         None,
-        *attrs,
+        *plan.attrs,
     )
 
-    # NOTE: [ why need set param's gradient type here ]
-    # if user set sparse gradient mode, the param's gradient
-    # will be SelectedRows, not DenseTensor. But tracer will just
-    # set param grad Tensor by forward Tensor(DenseTensor)
-    # If we don't change grad_var type here, RunProgramOp need
-    # transform SelectedRows to DenseTensor forcibly, it may not
-    # be user wanted result.
-    for persistable_var in persistable_vars:
-        grad_var_name = persistable_var.name + core.grad_var_suffix()
-        grad_var = trace_program.block(0).find_var(grad_var_name.encode())
-        # NOTE: cannot find var desc maybe not problem,
-        # such as in batch_norm
-        if grad_var is None:
-            continue
-        persistable_var._set_grad_type(grad_var.type())
+    # see NOTE: [ why need set param's gradient type here ]
+    for persistable_var, grad_type in plan.grad_types:
+        persistable_var._set_grad_type(grad_type)
 
     # 3. prepare output, keep same form with inputs
     outs = output_vars
@@ -1390,6 +1436,8 @@ class TranslatedLayer(layers.Layer):
             )
 
         self._program_holder_dict = programs
+        # see NOTE: [ TranslatedLayer call plan ]
+        self._call_plans = {}
 
         # NOTE(chenweihang): [ why not use var name directly? ]
         # When add parameter or buffer to Layer by follow apis,
@@ -1418,6 +1466,29 @@ class TranslatedLayer(layers.Layer):
         self._is_test = True
         self._input_args_names = None
 
+    # NOTE: the call plans hold the parameters and buffers of the layer, see
+    # NOTE: [ TranslatedLayer call plan ]
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if isinstance(value, core.eager.Tensor):
+            self._call_plans.clear()
+
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        self._call_plans.clear()
+
+    def add_parameter(self, name, parameter):
+        self._call_plans.clear()
+        return super().add_parameter(name, parameter)
+
+    def register_buffer(self, name, tensor, persistable=True):
+        self._call_plans.clear()
+        super().register_buffer(name, tensor, persistable)
+
+    def _apply(self, func, device, dtype, blocking, include_sublayers=True):
+        super()._apply(func, device, dtype, blocking, include_sublayers)
+        self._call_plans.clear()
+
     @staticmethod
     @framework.dygraph_only
     def _construct(model_path, configs=None):
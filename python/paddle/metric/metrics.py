@@ -633,7 +633,8 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
+    The predictions of each mini-batch are bucketed into a histogram at once,
+    and the histograms of different workers can be combined with :code:`merge`.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -651,8 +652,6 @@ class Auc(Metric):
         name (str, optional): String name of the metric instance. Default
             is `auc`.
 
-    "NOTE: only implement the ROC curve type via Python now."
-
     Examples:
         .. code-block:: python
             :name: code-standalone-example
@@ -718,6 +717,10 @@ class Auc(Metric):
         **kwargs: Any,
     ) -> None:
         super().__init__(*args, **kwargs)
+        if curve not in ('ROC', 'PR'):
+            raise ValueError(
+                f"The 'curve' must be 'ROC' or 'PR', but received {curve}."
+            )
         self._curve = curve
         self._num_thresholds = num_thresholds
 
@@ -752,19 +755,45 @@ class Auc(Metric):
         elif not _is_numpy_(preds):
             raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
 
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+        labels = np.asarray(labels).reshape(-1)
+        preds = np.asarray(preds)
+        if preds.ndim != 2 or preds.shape[0] < labels.shape[0]:
+            raise ValueError(
+                "The 'preds' must be in the shape of (batch_size, 2), "
+                f"but received shape {preds.shape} for {labels.shape[0]} labels."
+            )
+        if labels.shape[0] == 0:
+            return
+
+        bin_idx = (preds[: labels.shape[0], 1] * self._num_thresholds).astype(
+            'int64'
+        )
+        assert (
+            bin_idx.min() >= 0 and bin_idx.max() <= self._num_thresholds
+        ), "The predicted probabilities must be in the range [0, 1]."
+
+        _num_pred_buckets = self._num_thresholds + 1
+        is_pos = labels != 0
+        self._stat_pos += np.bincount(
+            bin_idx[is_pos], minlength=_num_pred_buckets
+        )
+        self._stat_neg += np.bincount(
+            bin_idx[~is_pos], minlength=_num_pred_buckets
+        )
 
     @staticmethod
     def trapezoid_area(x1: float, x2: float, y1: float, y2: float) -> float:
         return abs(x1 - x2) * (y1 + y2) / 2.0
 
+    def _cumulative_stats(
+        self,
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        # walk the thresholds from high to low, the i-th element is the
+        # number of positive/negative instances predicted above threshold i
+        tot_pos = np.cumsum(self._stat_pos[::-1])
+        tot_neg = np.cumsum(self._stat_neg[::-1])
+        return tot_pos, tot_neg
+
     def accumulate(self) -> float:
         """
         Return the area (a float score) under auc curve
@@ -772,24 +801,92 @@ class Auc(Metric):
         Return:
             float: the area under auc curve
         """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
-            )
-            idx -= 1
+        tot_pos, tot_neg = self._cumulative_stats()
+        pos, neg = tot_pos[-1], tot_neg[-1]
+        if pos <= 0.0 or neg <= 0.0:
+            return 0.0
 
-        return (
-            auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
+        if self._curve == 'PR':
+            return self._accumulate_pr(tot_pos, tot_neg)
+
+        tot_pos = np.concatenate(([0.0], tot_pos))
+        tot_neg = np.concatenate(([0.0], tot_neg))
+        auc = np.sum(
+            np.abs(np.diff(tot_neg)) * (tot_pos[1:] + tot_pos[:-1]) / 2.0
         )
+        return float(auc / pos / neg)
+
+    def _accumulate_pr(
+        self,
+        tot_pos: npt.NDArray[np.float64],
+        tot_neg: npt.NDArray[np.float64],
+    ) -> float:
+        # only thresholds that predict at least one instance as positive
+        # define a precision value, the curve starts at (recall=0, precision=1)
+        predicted = tot_pos + tot_neg
+        valid = predicted > 0
+        recall = np.concatenate(([0.0], tot_pos[valid] / tot_pos[-1]))
+        precision = np.concatenate(([1.0], tot_pos[valid] / predicted[valid]))
+        auc = np.sum(np.diff(recall) * (precision[1:] + precision[:-1]) / 2.0)
+        return float(auc)
+
+    def get_state(self) -> dict[str, npt.NDArray[np.float64]]:
+        """
+        Return the histogram states of the metric, which can be gathered
+        from different workers and combined with :code:`merge`.
+
+        Return:
+            dict: A dict with the positive histogram ``stat_pos`` and the
+            negative histogram ``stat_neg``, both are numpy arrays in the
+            shape of (num_thresholds + 1,).
+        """
+        return {
+            'stat_pos': self._stat_pos.copy(),
+            'stat_neg': self._stat_neg.copy(),
+        }
+
+    def merge(self, other: Auc | dict[str, npt.NDArray[Any]]) -> None:
+        """
+        Merge the histogram states of another Auc metric into this one.
+        The result of :code:`accumulate` is the same as if all the samples
+        were updated into a single metric.
+
+        Args:
+            other (Auc|dict): Another Auc metric with the same
+                `num_thresholds`, or the states returned by its
+                :code:`get_state`.
+
+        Examples:
+            .. code-block:: python
+
+                >>> import numpy as np
+                >>> import paddle
+
+                >>> preds = np.array([[0.2, 0.8], [0.6, 0.4], [0.3, 0.7], [0.9, 0.1]])
+                >>> labels = np.array([[1], [0], [1], [0]])
+
+                >>> m0 = paddle.metric.Auc()
+                >>> m1 = paddle.metric.Auc()
+                >>> m0.update(preds[:2], labels[:2])
+                >>> m1.update(preds[2:], labels[2:])
+                >>> m0.merge(m1.get_state())
+                >>> print(m0.accumulate())
+                1.0
+        """
+        state = other.get_state() if isinstance(other, Auc) else other
+        stat_pos = np.asarray(state['stat_pos'])
+        stat_neg = np.asarray(state['stat_neg'])
+        if (
+            stat_pos.shape != self._stat_pos.shape
+            or stat_neg.shape != self._stat_neg.shape
+        ):
+            raise ValueError(
+                "Only Auc metrics with the same num_thresholds can be merged, "
+                f"expected states in the shape of {self._stat_pos.shape}, "
+                f"but received {stat_pos.shape} and {stat_neg.shape}."
+            )
+        self._stat_pos += stat_pos
+        self._stat_neg += stat_neg
 
     def reset(self) -> None:
         """
@@ -21,9 +21,19 @@ from typing import Any
 
 from typing_extensions import Self
 
-from ...base.dygraph.base import param_guard
-from ...base.framework import Parameter
-from .layers import Layer
+from ...base.dygraph.base import (
+    in_sot_simulation_mode,
+    in_to_static_mode,
+    param_guard,
+)
+from ...base.framework import Parameter, in_dygraph_mode
+from ...profiler.utils import in_profiler_mode
+from .layers import Layer, _get_call_plan_version, _VersionedDict
+
+# kinds of the steps in the call plan of Sequential
+_CALL_FORWARD = 0
+_CALL_WITH_HOOKS = 1
+_CALL_LAYER = 2
 
 if typing.TYPE_CHECKING:
     from paddle import Tensor
@@ -716,6 +726,9 @@ class Sequential(Layer):
 
     def __init__(self, *layers: Layer | tuple[str, Layer] | list[Any]) -> None:
         super().__init__()
+        # see [ layer call plan ] in layers.py
+        self._sub_layers = _VersionedDict()
+        self._call_plan = None
         if len(layers) > 0 and isinstance(layers[0], (list, tuple)):
             for name, layer in layers:
                 self.add_sublayer(name, layer)
@@ -749,9 +762,60 @@ class Sequential(Layer):
     def __len__(self) -> int:
         return len(self._sub_layers)
 
+    def _get_call_plan(self):
+        # decide how to call every sublayer once, instead of checking the
+        # hooks and the build status of every sublayer in every call
+        version = _get_call_plan_version()
+        plan = self.__dict__.get('_call_plan')
+        if plan is None or plan[0] != version:
+            steps = []
+            for layer in self._sub_layers.values():
+                pre_hooks = layer._forward_pre_hooks
+                post_hooks = layer._forward_post_hooks
+                if type(layer).__call__ is not Layer.__call__ or not (
+                    isinstance(pre_hooks, _VersionedDict)
+                    and isinstance(post_hooks, _VersionedDict)
+                ):
+                    steps.append((_CALL_LAYER, layer))
+                elif (
+                    pre_hooks
+                    or post_hooks
+                    or not (
+                        type(layer)._build_once is Layer._build_once
+                        or layer._built
+                    )
+                ):
+                    steps.append((_CALL_WITH_HOOKS, layer))
+                else:
+                    steps.append((_CALL_FORWARD, layer))
+            plan = (version, tuple(steps))
+            self._call_plan = plan
+        return plan[1]
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(super().__getstate__())
+        state['_call_plan'] = None
+        return state
+
     def forward(self, input: Any) -> Any:
-        for layer in self._sub_layers.values():
-            input = layer(input)
+        if (
+            not isinstance(self._sub_layers, _VersionedDict)
+            or in_to_static_mode()
+            or in_sot_simulation_mode()
+            or in_profiler_mode()
+            or not in_dygraph_mode()
+        ):
+            for layer in self._sub_layers.values():
+                input = layer(input)
+            return input
+
+        for kind, layer in self._get_call_plan():
+            if kind == _CALL_FORWARD:
+                input = layer.forward(input)
+            elif kind == _CALL_WITH_HOOKS:
+                input = layer._dygraph_call_func(input)
+            else:
+                input = layer(input)
         return input
 
     def append(self, module: Layer) -> Sequential:
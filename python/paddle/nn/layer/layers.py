@@ -350,6 +350,77 @@ class HookRemoveHelper:
             del hooks[self._hook_id]
 
 
+# NOTE: [ layer call plan ] The hooks and the sublayers of Sequential are
+# kept in `_VersionedDict`, every change of them bumps the global version
+# below, so the call plans cached from them stay valid as long as the
+# version does not change. Hooks are rarely changed after a model is built.
+_call_plan_version = 0
+
+
+def _invalidate_call_plans():
+    global _call_plan_version
+    _call_plan_version += 1
+
+
+def _get_call_plan_version():
+    return _call_plan_version
+
+
+class _VersionedDict(OrderedDict):
+    """
+    OrderedDict which bumps the call plan version on every change, and
+    caches its values as a tuple for the call plans.
+    """
+
+    def _changed(self):
+        _invalidate_call_plans()
+
+    def values_tuple(self):
+        cached = self.__dict__.get('_values_tuple')
+        if cached is None or cached[0] != _call_plan_version:
+            cached = (_call_plan_version, tuple(self.values()))
+            self._values_tuple = cached
+        return cached[1]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self, last=True):
+        self._changed()
+        return super().popitem(last)
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def move_to_end(self, key, last=True):
+        super().move_to_end(key, last)
+        self._changed()
+
+
+def _hook_values(hooks):
+    if isinstance(hooks, _VersionedDict):
+        return hooks.values_tuple()
+    return tuple(hooks.values())
+
+
 class Layer:
     """
     Dynamic graph Layer based on OOD, includes the parameters of the layer, the structure of the forward graph and so on.
@@ -432,10 +503,10 @@ class Layer:
         self._customized_attrs = {}
 
         self._forward_pre_hooks: typing.OrderedDict[int, _ForwardPreHook] = (
-            OrderedDict()
+            _VersionedDict()
         )
         self._forward_post_hooks: typing.OrderedDict[int, _ForwardPostHook] = (
-            OrderedDict()
+            _VersionedDict()
         )
 
         # only used in AMP Training
@@ -1490,7 +1561,7 @@ class Layer:
         pass
 
     def _dygraph_call_func(self, *inputs: Any, **kwargs: Any) -> Any:
-        for forward_pre_hook in self._forward_pre_hooks.values():
+        for forward_pre_hook in _hook_values(self._forward_pre_hooks):
             hook_result = forward_pre_hook(self, inputs)
             if hook_result is not None:
                 if not isinstance(hook_result, tuple):
@@ -1501,17 +1572,22 @@ class Layer:
             self._build_once(*inputs, **kwargs)
 
             self._built = True
+            # the layer may be called by forward directly from now on
+            _invalidate_call_plans()
 
         if in_profiler_mode():
             with profiler.RecordEvent(
                 self.__class__.__name__, profiler.TracerEventType.Forward
             ):
                 outputs = self.forward(*inputs, **kwargs)
+        elif in_dygraph_mode():
+            # name_struct records nothing in dygraph mode
+            outputs = self.forward(*inputs, **kwargs)
         else:
             with name_struct(self.__class__.__name__):
                 outputs = self.forward(*inputs, **kwargs)
 
-        for forward_post_hook in self._forward_post_hooks.values():
+        for forward_post_hook in _hook_values(self._forward_post_hooks):
             hook_result = forward_post_hook(self, inputs, outputs)
             if hook_result is not None:
                 outputs = hook_result
@@ -0,0 +1,315 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from paddle.base.core import TracerEventType
+
+# NOTE: [ columnar profiler event table ]
+# The summaries of profiler_statistic.py used to walk the node trees of the
+# profiler result several times each, wrapping every node into a python
+# object and merging time ranges held in lists of tuples. EventTable walks
+# the trees once and flattens all host, runtime and device nodes into numpy
+# columns, with the ``parent`` row of every node, so that the summaries are
+# computed with array operations instead:
+#
+# * times accumulated over subtrees are summed level by level from the
+#   deepest nodes up, see ``subtree_sum``.
+# * properties inherited from ancestors are propagated level by level from
+#   the roots down, see ``inherit``.
+# * statistics of items are aggregated over rows grouped by keys, see
+#   ``group_by`` and ``aggregate``.
+#
+# Host nodes are visited depth first, in the order the trees used to be
+# walked, and every host node is followed by the device nodes it holds, then
+# by its runtime nodes each followed by their device nodes. Groups are
+# numbered by their first row, so the items of the summaries are created in
+# the same order as when walking the trees.
+#
+# Strings and enum values (names, event types, thread ids, device ids and
+# places) are stored as ids into lists of the distinct values.
+
+HOST = 0
+RUNTIME = 1
+DEVICE = 2
+
+_NUM_FIELDS = 10
+
+
+def _intern(ids, values, key):
+    idx = ids.get(key)
+    if idx is None:
+        idx = ids[key] = len(values)
+        values.append(key)
+    return idx
+
+
+def group_by(*keys):
+    r"""
+    Group rows by one or more integer key columns.
+
+    Returns:
+        The group of every row and the first row of every group, groups are
+        numbered in the order of their first row.
+    """
+    if keys[0].size == 0:
+        return np.zeros([0], dtype=np.int64), np.zeros([0], dtype=np.int64)
+    if len(keys) == 1:
+        _, first, inverse = np.unique(
+            keys[0], return_index=True, return_inverse=True
+        )
+    else:
+        _, first, inverse = np.unique(
+            np.stack(keys, axis=1),
+            axis=0,
+            return_index=True,
+            return_inverse=True,
+        )
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return rank[inverse.reshape([-1])], first[order]
+
+
+def split_by(rows, *keys):
+    r"""
+    Split ``rows`` into groups by the given key columns, see group_by.
+
+    Returns:
+        A list of the rows of every group, in their original order.
+    """
+    if rows.size == 0:
+        return []
+    group, first = group_by(*(key[rows] for key in keys))
+    order = np.argsort(group, kind='stable')
+    counts = np.bincount(group, minlength=first.size)
+    return np.split(rows[order], np.cumsum(counts)[:-1])
+
+
+def aggregate(group, num_groups, values):
+    r"""
+    Get the sum, max and min of ``values`` in every group as python lists.
+    """
+    total = np.zeros([num_groups], dtype=values.dtype)
+    np.add.at(total, group, values)
+    high = np.full([num_groups], np.iinfo(values.dtype).min, values.dtype)
+    np.maximum.at(high, group, values)
+    low = np.full([num_groups], np.iinfo(values.dtype).max, values.dtype)
+    np.minimum.at(low, group, values)
+    return total.tolist(), high.tolist(), low.tolist()
+
+
+class EventTable:
+    r"""
+    All nodes of the profiler result trees as columns of numpy arrays, see
+    NOTE: [ columnar profiler event table ].
+
+    Node columns:
+        kind: HOST, RUNTIME or DEVICE.
+        type: id of the TracerEventType.
+        start, end: time range in ns, 0 for the root nodes whose range
+            may be infinite.
+        parent: row of the parent node, -1 for the root nodes.
+        depth: depth of the node, 0 for the root nodes.
+        index: index of the node in the node list of its parent.
+        name: id of the name.
+        thread: id of the thread_id of host and runtime nodes.
+        device: id of the device_id of device nodes.
+
+    ``operator_nodes`` holds the row and the original node of every host
+    node of TracerEventType.Operator.
+
+    Memory event columns, prefixed with ``mem_``:
+        owner: row of the host node holding the event.
+        index: index of the event in the mem_node list of its owner.
+        type: id of the TracerMemEventType.
+        place: id of the place.
+        bytes: increase_bytes of the event.
+        peak_allocated, peak_reserved: peak values of the event.
+    """
+
+    def __init__(self, nodetrees):
+        self.names, self._name_ids = [], {}
+        self.types, self._type_ids = [], {}
+        self.threads, self._thread_ids = [], {}
+        self.devices, self._device_ids = [], {}
+        self.mem_types, self._mem_type_ids = [], {}
+        self.places, self._place_ids = [], {}
+
+        records = []
+        mem_records = []
+        self.operator_nodes = []
+        operator = TracerEventType.Operator
+
+        def add(node, kind, parent, depth, index, thread=-1, device=-1):
+            row = len(records)
+            if parent < 0:
+                start = end = 0
+            else:
+                start, end = node.start_ns, node.end_ns
+            records.append(
+                (
+                    kind,
+                    _intern(self._type_ids, self.types, node.type),
+                    start,
+                    end,
+                    parent,
+                    depth,
+                    index,
+                    _intern(self._name_ids, self.names, node.name),
+                    thread,
+                    device,
+                )
+            )
+            return row
+
+        def add_devices(nodes, parent, depth):
+            for i, device_node in enumerate(nodes):
+                add(
+                    device_node,
+                    DEVICE,
+                    parent,
+                    depth,
+                    i,
+                    device=_intern(
+                        self._device_ids, self.devices, device_node.device_id
+                    ),
+                )
+
+        for rootnode in nodetrees.values():
+            stack = [(rootnode, -1, 0, 0)]
+            while stack:
+                node, parent, depth, index = stack.pop()
+                thread = _intern(self._thread_ids, self.threads, node.thread_id)
+                row = add(node, HOST, parent, depth, index, thread=thread)
+                if node.type == operator:
+                    self.operator_nodes.append((row, node))
+                add_devices(node.device_node, row, depth + 1)
+                for i, runtimenode in enumerate(node.runtime_node):
+                    runtime_row = add(
+                        runtimenode,
+                        RUNTIME,
+                        row,
+                        depth + 1,
+                        i,
+                        thread=_intern(
+                            self._thread_ids,
+                            self.threads,
+                            runtimenode.thread_id,
+                        ),
+                    )
+                    add_devices(
+                        runtimenode.device_node, runtime_row, depth + 2
+                    )
+                for i, memnode in enumerate(node.mem_node):
+                    mem_records.append(
+                        (
+                            row,
+                            i,
+                            _intern(
+                                self._mem_type_ids, self.mem_types, memnode.type
+                            ),
+                            _intern(
+                                self._place_ids, self.places, memnode.place
+                            ),
+                            memnode.increase_bytes,
+                            memnode.peak_allocated,
+                            memnode.peak_reserved,
+                        )
+                    )
+                for i, childnode in enumerate(node.children_node):
+                    stack.append((childnode, row, depth + 1, i))
+
+        columns = np.array(records, dtype=np.int64).reshape([-1, _NUM_FIELDS])
+        (
+            self.kind,
+            self.type,
+            self.start,
+            self.end,
+            self.parent,
+            self.depth,
+            self.index,
+            self.name,
+            self.thread,
+            self.device,
+        ) = np.ascontiguousarray(columns.T)
+        self.size = len(records)
+
+        mem_columns = np.array(mem_records, dtype=np.int64).reshape([-1, 7])
+        (
+            self.mem_owner,
+            self.mem_index,
+            self.mem_type,
+            self.mem_place,
+            self.mem_bytes,
+            self.mem_peak_allocated,
+            self.mem_peak_reserved,
+        ) = np.ascontiguousarray(mem_columns.T)
+
+        self.is_root = self.parent < 0
+        # the row of the host node of every node, i.e. the node itself for
+        # host nodes, and the node launching it for runtime and device nodes.
+        self.host = np.arange(self.size)
+        for _ in range(2):
+            not_host = self.kind[self.host] != HOST
+            self.host[not_host] = self.parent[self.host[not_host]]
+        # device nodes launched by runtime nodes, instead of held by host
+        # nodes directly.
+        self.launched = np.zeros([self.size], dtype=bool)
+        is_device = self.kind == DEVICE
+        self.launched[is_device] = (
+            self.kind[self.parent[is_device]] == RUNTIME
+        )
+
+        order = np.argsort(self.depth, kind='stable')
+        bounds = np.searchsorted(
+            self.depth[order], np.arange(1, self.depth.max(initial=0) + 1)
+        )
+        self._levels = np.split(order, bounds)
+
+    def type_id(self, event_type):
+        return self._type_ids.get(event_type, -1)
+
+    def mem_type_id(self, mem_type):
+        return self._mem_type_ids.get(mem_type, -1)
+
+    def is_type(self, *event_types):
+        return np.isin(self.type, [self.type_id(t) for t in event_types])
+
+    def name_flags(self, predicate):
+        r"""
+        Evaluate ``predicate`` on every distinct name, and return its value
+        for every row.
+        """
+        flags = np.array([bool(predicate(n)) for n in self.names], dtype=bool)
+        return flags[self.name]
+
+    def subtree_sum(self, values):
+        r"""
+        Sum ``values`` of every node and all of its descendants.
+        """
+        values = np.array(values)
+        for rows in reversed(self._levels[1:]):
+            np.add.at(values, self.parent[rows], values[rows])
+        return values
+
+    def inherit(self, flags):
+        r"""
+        Whether ``flags`` is set on every node or any of its ancestors.
+        """
+        flags = np.array(flags, dtype=bool)
+        for rows in self._levels[1:]:
+            flags[rows] |= flags[self.parent[rows]]
+        return flags
+
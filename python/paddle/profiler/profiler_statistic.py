@@ -15,14 +15,27 @@ import collections
 import re
 from enum import Enum
 
+import numpy as np
+
 from paddle.base.core import TracerEventType, TracerMemEventType
 from paddle.utils.flops import flops
 
+from .event_table import (
+    DEVICE,
+    HOST,
+    EventTable,
+    aggregate,
+    group_by,
+    split_by,
+)
 from .statistic_helper import (
-    intersection_ranges,
+    intersect_intervals,
+    merge_intervals,
     merge_ranges,
-    merge_self_ranges,
+    sum_intervals,
     sum_ranges,
+    to_ranges,
+    union_intervals,
 )
 
 _AllTracerEventType = [
@@ -155,35 +168,17 @@ class HostStatisticNode:
         return getattr(self.hostnode, name)
 
 
-def traverse_tree(nodetrees):
-    results = collections.defaultdict(list)
-    for thread_id, rootnode in nodetrees.items():
-        stack = []
-        stack.append(rootnode)
-        threadlist = results[thread_id]
-        while stack:
-            current_node = stack.pop()
-            threadlist.append(current_node)
-            for childnode in current_node.children_node:
-                stack.append(childnode)
-    return results
+def _get_event_table(nodetrees, event_table):
+    if event_table is None:
+        event_table = EventTable(nodetrees)
+    return event_table
 
 
-def get_device_nodes(hostnode):
-    '''
-    Get all device nodes called in the time range of hostnode.
-    '''
-    stack = []
-    device_nodes = []
-    stack.append(hostnode)
-    while stack:
-        current_node = stack.pop()
-        for childnode in current_node.children_node:
-            stack.append(childnode)
-        for runtimenode in current_node.runtime_node:
-            for devicenode in runtimenode.device_node:
-                device_nodes.append(devicenode)
-    return device_nodes
+def _count_distinct_ranges(table, rows):
+    if rows.size == 0:
+        return 0
+    ranges = np.stack([table.start[rows], table.end[rows]], axis=1)
+    return len(np.unique(ranges, axis=0))
 
 
 def _build_layer_from_tree(nodetrees):
@@ -294,46 +289,6 @@ def gen_layer_flops(nodetrees, repeat=1):
     return _gen_layer_flops(layer_tree, repeat)
 
 
-def wrap_tree(nodetrees):
-    '''
-    Using HostStatisticNode to wrap original profiler result tree, and calculate node statistic metrics.
-    '''
-    node_statistic_tree = {}
-    results = collections.defaultdict(list)
-    newresults = collections.defaultdict(list)
-    for thread_id, rootnode in nodetrees.items():
-        stack = []
-        stack.append(rootnode)
-        root_statistic_node = HostStatisticNode(rootnode)
-        newstack = []
-        newstack.append(root_statistic_node)
-        node_statistic_tree[thread_id] = root_statistic_node
-        threadlist = results[thread_id]
-        newthreadlist = newresults[thread_id]
-        while stack:
-            current_node = stack.pop()
-            threadlist.append(current_node)
-            current_statistic_node = newstack.pop()
-            newthreadlist.append(current_statistic_node)
-            for childnode in current_node.children_node:
-                stack.append(childnode)
-                child_statistic_node = HostStatisticNode(childnode)
-                current_statistic_node.children_node.append(
-                    child_statistic_node
-                )
-                newstack.append(child_statistic_node)
-            for runtimenode in current_node.runtime_node:
-                runtime_statistic_node = HostStatisticNode(runtimenode)
-                current_statistic_node.runtime_node.append(
-                    runtime_statistic_node
-                )
-    # recursive calculate node statistic values
-    for thread_id, root_statistic_node in node_statistic_tree.items():
-        root_statistic_node.cal_statistic()
-
-    return node_statistic_tree, newresults
-
-
 class TimeRangeSummary:
     r"""
     Analyse time ranges for each TracerEventType, and summarize the time.
@@ -350,58 +305,34 @@ class TimeRangeSummary:
         )
         self.call_times = collections.defaultdict(int)
 
-    def parse(self, nodetrees):
+    def parse(self, nodetrees, event_table=None):
         r"""
         Analysis node trees in profiler result, and get time range for different tracer event type.
         """
-        thread2hostnodes = traverse_tree(nodetrees)
-        for threadid, hostnodes in thread2hostnodes.items():
-            CPUTimeRange = collections.defaultdict(list)
-            GPUTimeRange = collections.defaultdict(
-                lambda: collections.defaultdict(
-                    lambda: collections.defaultdict(list)
-                )
-            )  # device_id/type/stream_id
-            for hostnode in hostnodes[1:]:  # skip root node
-                CPUTimeRange[hostnode.type].append(
-                    (hostnode.start_ns, hostnode.end_ns)
-                )
-                self.call_times[hostnode.type] += 1
-                for runtimenode in hostnode.runtime_node:
-                    CPUTimeRange[runtimenode.type].append(
-                        (runtimenode.start_ns, runtimenode.end_ns)
-                    )
-                    self.call_times[runtimenode.type] += 1
-                    for devicenode in runtimenode.device_node:
-                        GPUTimeRange[devicenode.device_id][devicenode.type][
-                            devicenode.stream_id
-                        ].append((devicenode.start_ns, devicenode.end_ns))
-                        self.call_times[devicenode.type] += 1
-
-            for event_type, time_ranges in CPUTimeRange.items():
-                time_ranges = merge_self_ranges(time_ranges, is_sorted=False)
-                self.CPUTimeRange[event_type] = merge_ranges(
-                    self.CPUTimeRange[event_type], time_ranges, is_sorted=True
-                )
-            for device_id, device_time_ranges in GPUTimeRange.items():
-                for event_type, event_time_ranges in device_time_ranges.items():
-                    for stream_id, time_ranges in event_time_ranges.items():
-                        time_ranges = merge_self_ranges(
-                            time_ranges, is_sorted=False
-                        )
-                        self.GPUTimeRange[device_id][event_type] = merge_ranges(
-                            self.GPUTimeRange[device_id][event_type],
-                            time_ranges,
-                            is_sorted=True,
-                        )
-
-        for event_type, time_ranges in self.CPUTimeRange.items():
-            self.CPUTimeRangeSum[event_type] = sum_ranges(time_ranges)
-        for device_id, device_time_ranges in self.GPUTimeRange.items():
-            for event_type, time_ranges in device_time_ranges.items():
-                self.GPUTimeRangeSum[device_id][event_type] = sum_ranges(
-                    time_ranges
-                )
+        table = _get_event_table(nodetrees, event_table)
+        # host and runtime nodes, and device nodes launched by runtime nodes,
+        # all below the root nodes.
+        in_step = ~table.is_root[table.host]
+        cpu_mask = in_step & (table.kind != DEVICE)
+        gpu_mask = in_step & table.launched
+
+        for rows in split_by(np.flatnonzero(cpu_mask | gpu_mask), table.type):
+            self.call_times[table.types[table.type[rows[0]]]] = rows.size
+        for rows in split_by(np.flatnonzero(cpu_mask), table.type):
+            event_type = table.types[table.type[rows[0]]]
+            starts, ends = merge_intervals(table.start[rows], table.end[rows])
+            self.CPUTimeRange[event_type] = to_ranges(starts, ends)
+            self.CPUTimeRangeSum[event_type] = sum_intervals(starts, ends)
+        # GPU events of all streams of a device are merged
+        gpu_rows = np.flatnonzero(gpu_mask)
+        for rows in split_by(gpu_rows, table.device, table.type):
+            device_id = table.devices[table.device[rows[0]]]
+            event_type = table.types[table.type[rows[0]]]
+            starts, ends = merge_intervals(table.start[rows], table.end[rows])
+            self.GPUTimeRange[device_id][event_type] = to_ranges(starts, ends)
+            self.GPUTimeRangeSum[device_id][event_type] = sum_intervals(
+                starts, ends
+            )
 
     def get_gpu_devices(self):
         return self.GPUTimeRange.keys()
@@ -428,76 +359,69 @@ class DistributedSummary:
         self.cpu_calls = 0
         self.gpu_calls = 0
 
-    def parse(self, nodetrees):
+    def parse(self, nodetrees, event_table=None):
         '''
         Collect all communication and computation time ranges.
         '''
-        thread2hostnodes = traverse_tree(nodetrees)
-        for threadid, hostnodes in thread2hostnodes.items():
-            for hostnode in hostnodes[1:]:  # skip root node
-                # case 1: TracerEventType is Communication
-                if hostnode.type == TracerEventType.Communication:
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
-                    )
-                    device_nodes = get_device_nodes(hostnode)
-                    for device_node in device_nodes:
-                        if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
-
-                # case 2: TracerEventType is Operator but is communication op
-                elif hostnode.type == TracerEventType.Operator and any(
-                    name in hostnode.name.lower()
-                    for name in _CommunicationOpName
-                ):
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
+        table = _get_event_table(nodetrees, event_table)
+        host = (table.kind == HOST) & ~table.is_root
+        kernel = table.launched & table.is_type(TracerEventType.Kernel)
+
+        # case 1: TracerEventType is Communication
+        # case 2: TracerEventType is Operator but is communication op
+        communication = host & (
+            table.is_type(TracerEventType.Communication)
+            | (
+                table.is_type(TracerEventType.Operator)
+                & table.name_flags(
+                    lambda name: any(
+                        op_name in name.lower()
+                        for op_name in _CommunicationOpName
                     )
-                    device_nodes = get_device_nodes(hostnode)
-                    for device_node in device_nodes:
-                        if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
-
-                # case 3: Others, filter kernels named with nccl
-                else:
-                    for runtimenode in hostnode.runtime_node:
-                        for devicenode in runtimenode.device_node:
-                            if devicenode.type == TracerEventType.Kernel:
-                                kernel_name = devicenode.name.lower()
-                                if (
-                                    'nccl' in kernel_name
-                                    or 'xccl' in kernel_name
-                                ):
-                                    self.gpu_communication_range.append(
-                                        (devicenode.start_ns, devicenode.end_ns)
-                                    )
-                                else:
-                                    self.computation_range.append(
-                                        (devicenode.start_ns, devicenode.end_ns)
-                                    )
-        self.cpu_calls = len(set(self.cpu_communication_range))
-        self.gpu_calls = len(set(self.gpu_communication_range))
-        self.cpu_communication_range = merge_self_ranges(
-            self.cpu_communication_range, is_sorted=False
+                )
+            )
+        )
+        # all kernels launched in the time range of communication nodes
+        gpu_communication = kernel & table.inherit(communication)
+
+        # case 3: Others, filter kernels named with nccl
+        other_kernel = kernel & host[table.host] & ~communication[table.host]
+        is_nccl = table.name_flags(
+            lambda name: 'nccl' in name.lower() or 'xccl' in name.lower()
+        )
+        gpu_communication |= other_kernel & is_nccl
+        computation = np.flatnonzero(other_kernel & ~is_nccl)
+
+        cpu_communication = np.flatnonzero(communication)
+        gpu_communication = np.flatnonzero(gpu_communication)
+        self.cpu_calls = _count_distinct_ranges(table, cpu_communication)
+        self.gpu_calls = _count_distinct_ranges(table, gpu_communication)
+
+        cpu_starts, cpu_ends = merge_intervals(
+            table.start[cpu_communication], table.end[cpu_communication]
         )
-        self.gpu_communication_range = merge_self_ranges(
-            self.gpu_communication_range, is_sorted=False
+        gpu_starts, gpu_ends = merge_intervals(
+            table.start[gpu_communication], table.end[gpu_communication]
         )
-        self.communication_range = merge_ranges(
-            self.cpu_communication_range,
-            self.gpu_communication_range,
-            is_sorted=True,
+        communication_starts, communication_ends = union_intervals(
+            cpu_starts, cpu_ends, gpu_starts, gpu_ends
         )
-        self.computation_range = merge_self_ranges(
-            self.computation_range, is_sorted=False
+        computation_starts, computation_ends = merge_intervals(
+            table.start[computation], table.end[computation]
         )
-        self.overlap_range = intersection_ranges(
-            self.communication_range, self.computation_range, is_sorted=True
+        overlap_starts, overlap_ends = intersect_intervals(
+            communication_starts,
+            communication_ends,
+            computation_starts,
+            computation_ends,
         )
+        self.cpu_communication_range = to_ranges(cpu_starts, cpu_ends)
+        self.gpu_communication_range = to_ranges(gpu_starts, gpu_ends)
+        self.communication_range = to_ranges(
+            communication_starts, communication_ends
+        )
+        self.computation_range = to_ranges(computation_starts, computation_ends)
+        self.overlap_range = to_ranges(overlap_starts, overlap_ends)
 
 
 class EventSummary:
@@ -630,131 +554,213 @@ class EventSummary:
         self.memory_manipulation_items = {}  # for memory manipulation summary
         self.kernel_items = {}  # for kernel summary
 
-    def parse(self, nodetrees):
+    def parse(self, nodetrees, event_table=None):
         r"""
         Analysis operator event in the nodetress.
         """
-        node_statistic_trees, thread2host_statistic_nodes = wrap_tree(nodetrees)
-        for (
-            threadid,
-            host_statistic_nodes,
-        ) in thread2host_statistic_nodes.items():
-            for host_statistic_node in host_statistic_nodes[
-                1:
-            ]:  # skip root node
-                if host_statistic_node.type == TracerEventType.Operator:
-                    self.add_operator_item(host_statistic_node)
-                if (
-                    host_statistic_node.type == TracerEventType.UserDefined
-                    or host_statistic_node.type
-                    == TracerEventType.PythonUserDefined
-                ):
-                    if (
-                        'memcpy' in host_statistic_node.name.lower()
-                        or 'memorycopy' in host_statistic_node.name.lower()
-                        or 'memset' in host_statistic_node.name.lower()
-                    ):
-                        self.add_memory_manipulation_item(host_statistic_node)
-                    else:
-                        if (
-                            host_statistic_node.type
-                            == TracerEventType.PythonUserDefined
-                        ):
-                            self.add_userdefined_item(host_statistic_node)
-            self.add_kernel_item(host_statistic_nodes[0])
-
-        for threadid, root_statistic_node in node_statistic_trees.items():
-            deque = collections.deque()
-            deque.append(root_statistic_node)
-            while deque:
-                current_node = deque.popleft()
-                for child in current_node.children_node:
-                    if (
-                        child.type == TracerEventType.Forward
-                        or child.type == TracerEventType.Dataloader
-                        or child.type == TracerEventType.Backward
-                        or child.type == TracerEventType.Optimization
-                    ):
-                        self.add_model_perspective_item(
-                            child
-                        )  # find first model perspective node
-                    else:
-                        if child.type == TracerEventType.ProfileStep:
-                            self.add_model_perspective_item(child)
-                        deque.append(child)
-
-    def add_forward_item(self, operator_node):
-        pass
-
-    def add_operator_item(self, operator_node):
-        if operator_node.name not in self.items:
-            self.items[operator_node.name] = EventSummary.OperatorItem(
-                operator_node.name
-            )
-
-        self.items[operator_node.name].add_item(operator_node)
+        table = _get_event_table(nodetrees, event_table)
+        duration = table.end - table.start
+        device_time = np.where(table.kind == DEVICE, duration, 0)
+        kernel_time = np.where(
+            table.is_type(TracerEventType.Kernel), device_time, 0
+        )
+        node_flops = np.zeros([table.size], dtype=np.int64)
+        for row, node in table.operator_nodes:
+            if hasattr(node, 'input_shapes'):
+                node_flops[row] = flops(
+                    _nodename2opname(node.name),
+                    node.input_shapes,
+                    node.attributes,
+                )
+        # the same statistic values as HostStatisticNode.cal_statistic
+        statistic = {
+            'cpu_time': duration,
+            'gpu_time': table.subtree_sum(kernel_time),
+            'general_gpu_time': table.subtree_sum(device_time),
+            'flops': table.subtree_sum(node_flops),
+        }
+        host = (table.kind == HOST) & ~table.is_root
+
+        rows = np.flatnonzero(host & table.is_type(TracerEventType.Operator))
+        items, _, _ = self._operator_items(
+            table, statistic, rows, table.name[rows]
+        )
+        for item in items:
+            self.items[item.name] = item
+        items, _, first = self._operator_items(
+            table, statistic, rows, table.thread[rows], table.name[rows]
+        )
+        for item, thread in zip(items, table.thread[first].tolist()):
+            self.thread_items[table.threads[thread]][item.name] = item
 
-        if operator_node.name not in self.thread_items[operator_node.thread_id]:
-            self.thread_items[operator_node.thread_id][operator_node.name] = (
-                EventSummary.OperatorItem(operator_node.name)
-            )
-        self.thread_items[operator_node.thread_id][operator_node.name].add_item(
-            operator_node
+        userdefined = host & table.is_type(
+            TracerEventType.UserDefined, TracerEventType.PythonUserDefined
+        )
+        is_memory_manipulation = table.name_flags(
+            lambda name: 'memcpy' in name.lower()
+            or 'memorycopy' in name.lower()
+            or 'memset' in name.lower()
+        )
+        rows = np.flatnonzero(userdefined & is_memory_manipulation)
+        items, _, _ = self._general_items(
+            table, statistic, rows, table.name[rows]
+        )
+        for item in items:
+            self.memory_manipulation_items[item.name] = item
+        rows = np.flatnonzero(
+            userdefined
+            & ~is_memory_manipulation
+            & table.is_type(TracerEventType.PythonUserDefined)
+        )
+        items, _, _ = self._general_items(
+            table, statistic, rows, table.name[rows]
+        )
+        for item in items:
+            self.userdefined_items[item.name] = item
+        items, _, first = self._general_items(
+            table, statistic, rows, table.thread[rows], table.name[rows]
         )
+        for item, thread in zip(items, table.thread[first].tolist()):
+            self.userdefined_thread_items[table.threads[thread]][
+                item.name
+            ] = item
+
+        # find first model perspective node, i.e. the ProfileStep nodes and
+        # the outermost nodes of the other model perspective types.
+        model_types = {
+            TracerEventType.Forward: 'Forward',
+            TracerEventType.Backward: 'Backward',
+            TracerEventType.Optimization: 'Optimization',
+            TracerEventType.Dataloader: 'Dataloader',
+        }
+        inner_model = table.inherit(host & table.is_type(*model_types))
+        rows = np.flatnonzero(
+            host
+            & ~inner_model[table.parent]
+            & table.is_type(TracerEventType.ProfileStep, *model_types)
+        )
+        model_types[TracerEventType.ProfileStep] = 'ProfileStep'
+        names = [model_types.get(event_type) for event_type in table.types]
+        items, _, _ = self._general_items(
+            table, statistic, rows, table.type[rows], names=names
+        )
+        for item in items:
+            self.model_perspective_items[item.name] = item
 
-    def add_userdefined_item(self, userdefined_node):
-        if userdefined_node.name not in self.userdefined_items:
-            self.userdefined_items[userdefined_node.name] = (
-                EventSummary.GeneralItem(userdefined_node.name)
-            )
+        rows = np.flatnonzero(
+            table.launched & table.is_type(TracerEventType.Kernel)
+        )
+        items, _, _ = self._device_items(
+            table, rows, duration, table.name[rows]
+        )
+        for item in items:
+            self.kernel_items[item.name] = item
 
-        self.userdefined_items[userdefined_node.name].add_item(userdefined_node)
+    @staticmethod
+    def _make_items(item_class, table, rows, values, *keys, names=None):
+        r"""
+        Create an item of ``item_class`` for every group of ``rows`` grouped
+        by ``keys``, and aggregate the statistic ``values`` of the rows.
 
-        if (
-            userdefined_node.name
-            not in self.userdefined_thread_items[userdefined_node.thread_id]
+        Returns:
+            The items, the group of every row and the first row of every
+            group.
+        """
+        group, first = group_by(*keys)
+        first = rows[first]
+        if names is None:
+            names = table.names
+            name_ids = table.name[first]
+        else:
+            name_ids = table.type[first]
+        items = [item_class(names[name_id]) for name_id in name_ids.tolist()]
+        for item, call in zip(
+            items, np.bincount(group, minlength=len(items)).tolist()
         ):
-            self.userdefined_thread_items[userdefined_node.thread_id][
-                userdefined_node.name
-            ] = EventSummary.GeneralItem(userdefined_node.name)
-        self.userdefined_thread_items[userdefined_node.thread_id][
-            userdefined_node.name
-        ].add_item(userdefined_node)
-
-    def add_memory_manipulation_item(self, memory_manipulation_node):
-        if memory_manipulation_node.name not in self.memory_manipulation_items:
-            self.memory_manipulation_items[memory_manipulation_node.name] = (
-                EventSummary.GeneralItem(memory_manipulation_node.name)
-            )
-        self.memory_manipulation_items[memory_manipulation_node.name].add_item(
-            memory_manipulation_node
+            item.call = call
+        for key, value in values.items():
+            total, high, low = aggregate(group, len(items), value[rows])
+            if key == 'flops':
+                for item, flops_value in zip(items, total):
+                    item.add_flops(flops_value)
+                continue
+            for item, total_time, max_time, min_time in zip(
+                items, total, high, low
+            ):
+                setattr(item, key, total_time)
+                setattr(item, 'max_' + key, max_time)
+                setattr(item, 'min_' + key, min_time)
+        return items, group, first
+
+    def _general_items(self, table, statistic, rows, *keys, names=None):
+        values = {
+            key: statistic[key]
+            for key in ['cpu_time', 'gpu_time', 'general_gpu_time']
+        }
+        return self._make_items(
+            EventSummary.GeneralItem, table, rows, values, *keys, names=names
         )
 
-    def add_model_perspective_item(self, model_perspective_node):
-        if model_perspective_node.type == TracerEventType.Forward:
-            name = 'Forward'
-        elif model_perspective_node.type == TracerEventType.Backward:
-            name = 'Backward'
-        elif model_perspective_node.type == TracerEventType.Optimization:
-            name = 'Optimization'
-        elif model_perspective_node.type == TracerEventType.Dataloader:
-            name = 'Dataloader'
-        elif model_perspective_node.type == TracerEventType.ProfileStep:
-            name = 'ProfileStep'
-        else:
-            return
-        if name not in self.model_perspective_items:
-            self.model_perspective_items[name] = EventSummary.GeneralItem(name)
-        self.model_perspective_items[name].add_item(model_perspective_node)
+    def _device_items(self, table, rows, duration, *keys):
+        return self._make_items(
+            EventSummary.DeviceItem,
+            table,
+            rows,
+            {'gpu_time': duration},
+            *keys,
+        )
+
+    def _operator_items(self, table, statistic, rows, *keys):
+        r"""
+        Create the OperatorItem of every group of operator nodes, with the
+        items of their inner nodes and of the device nodes they launch.
+        """
+        items, group, first = self._make_items(
+            EventSummary.OperatorItem, table, rows, statistic, *keys
+        )
+        owner = np.full([table.size], -1)
+        owner[rows] = group
+        position = np.zeros([table.size], dtype=np.int64)
+        position[rows] = np.arange(rows.size)
+
+        # non-operator children, in the order of ``rows`` and then of the
+        # children lists.
+        parent_owner = np.where(table.is_root, -1, owner[table.parent])
+        inner = np.flatnonzero(
+            (table.kind == HOST)
+            & (parent_owner >= 0)
+            & ~table.is_type(TracerEventType.Operator)
+        )
+        if inner.size > 0:
+            inner = inner[
+                np.lexsort(
+                    (table.index[inner], position[table.parent[inner]])
+                )
+            ]
+            inner_items, _, inner_first = self._operator_items(
+                table, statistic, inner, parent_owner[inner], table.name[inner]
+            )
+            for inner_item, item_id in zip(
+                inner_items, parent_owner[inner_first].tolist()
+            ):
+                items[item_id].operator_inners[inner_item.name] = inner_item
 
-    def add_kernel_item(self, root_node):
-        device_nodes = get_device_nodes(root_node)
-        for device_node in device_nodes:
-            if device_node.type == TracerEventType.Kernel:
-                name = device_node.name
-                if name not in self.kernel_items:
-                    self.kernel_items[name] = EventSummary.DeviceItem(name)
-                self.kernel_items[name].add_item(device_node)
+        devices = np.flatnonzero(table.launched & (owner[table.host] >= 0))
+        devices = devices[
+            np.argsort(position[table.host[devices]], kind='stable')
+        ]
+        device_items, _, device_first = self._device_items(
+            table,
+            devices,
+            statistic['cpu_time'],
+            owner[table.host[devices]],
+            table.name[devices],
+        )
+        for device_item, item_id in zip(
+            device_items, owner[table.host[device_first]].tolist()
+        ):
+            items[item_id].devices[device_item.name] = device_item
+        return items, group, first
 
 
 class MemorySummary:
@@ -802,55 +808,113 @@ class MemorySummary:
         self.peak_allocation_values = collections.defaultdict(int)
         self.peak_reserved_values = collections.defaultdict(int)
 
-    def _analyse_node_memory(self, event_name, node):
-        for memnode in node.mem_node:  # self mem node
-            if (
-                memnode.type == TracerMemEventType.Allocate
-                or memnode.type == TracerMemEventType.Free
-            ):
-                if event_name not in self.allocated_items[memnode.place]:
-                    self.allocated_items[memnode.place][event_name] = (
-                        MemorySummary.MemoryItem(
-                            event_name, memnode.place, 'Allocated'
-                        )
-                    )
-                self.allocated_items[memnode.place][
-                    event_name
-                ].add_memory_record(memnode.increase_bytes, memnode.type)
-            elif (
-                memnode.type == TracerMemEventType.ReservedAllocate
-                or memnode.type == TracerMemEventType.ReservedFree
-            ):
-                if event_name not in self.reserved_items[memnode.place]:
-                    self.reserved_items[memnode.place][event_name] = (
-                        MemorySummary.MemoryItem(
-                            event_name, memnode.place, 'Reserved'
-                        )
-                    )
-                self.reserved_items[memnode.place][
-                    event_name
-                ].add_memory_record(memnode.increase_bytes, memnode.type)
-            self.peak_allocation_values[memnode.place] = max(
-                self.peak_allocation_values[memnode.place],
-                memnode.peak_allocated,
-            )
-            self.peak_reserved_values[memnode.place] = max(
-                self.peak_reserved_values[memnode.place], memnode.peak_reserved
-            )
-
-    def parse(self, nodetrees):
+    def parse(self, nodetrees, event_table=None):
         r"""
         Analyse memory event in the nodetress.
         """
-        thread2hostnodes = traverse_tree(nodetrees)
-        for threadid, host_nodes in thread2hostnodes.items():
-            for host_node in host_nodes[1:]:  # skip root node
-                if host_node.type == TracerEventType.OperatorInner:
-                    continue
-                if host_node.type == TracerEventType.Operator:
-                    for child in host_node.children_node:
-                        self._analyse_node_memory(host_node.name, child)
-                self._analyse_node_memory(host_node.name, host_node)
+        table = _get_event_table(nodetrees, event_table)
+        owner = table.mem_owner
+        parent = table.parent[owner]
+        # memory events of a node are counted for the node itself, and for
+        # its parent if it is an operator.
+        own = np.flatnonzero(
+            ~table.is_root[owner]
+            & ~table.is_type(TracerEventType.OperatorInner)[owner]
+        )
+        of_operator = np.flatnonzero(
+            ~table.is_root[owner]
+            & ~table.is_root[parent]
+            & table.is_type(TracerEventType.Operator)[parent]
+        )
+        events = np.concatenate([own, of_operator])
+        event_names = np.concatenate(
+            [table.name[owner[own]], table.name[parent[of_operator]]]
+        )
+        # in the order of walking the trees, where the events of the
+        # children of an operator come before its own events.
+        order = np.lexsort(
+            (
+                table.mem_index[events],
+                np.concatenate(
+                    [np.zeros_like(own), table.index[owner[of_operator]]]
+                ),
+                np.concatenate(
+                    [np.ones_like(own), np.zeros_like(of_operator)]
+                ),
+                np.concatenate([owner[own], parent[of_operator]]),
+            )
+        )
+        events, event_names = events[order], event_names[order]
+        event_type = table.mem_type[events]
+        event_bytes = table.mem_bytes[events]
+        event_place = table.mem_place[events]
+
+        for items, memory_type, allocate, free in [
+            (
+                self.allocated_items,
+                'Allocated',
+                TracerMemEventType.Allocate,
+                TracerMemEventType.Free,
+            ),
+            (
+                self.reserved_items,
+                'Reserved',
+                TracerMemEventType.ReservedAllocate,
+                TracerMemEventType.ReservedFree,
+            ),
+        ]:
+            is_allocate = event_type == table.mem_type_id(allocate)
+            is_free = event_type == table.mem_type_id(free)
+            rows = np.flatnonzero(is_allocate | is_free)
+            group, first = group_by(event_place[rows], event_names[rows])
+            first = rows[first]
+            num_items = first.size
+            allocation_count = np.bincount(
+                group[is_allocate[rows]], minlength=num_items
+            )
+            free_count = np.bincount(group[is_free[rows]], minlength=num_items)
+            allocation_size = np.zeros([num_items], dtype=np.int64)
+            np.add.at(
+                allocation_size,
+                group,
+                np.where(is_allocate[rows], event_bytes[rows], 0),
+            )
+            # size is sign(-) when free.
+            free_size = np.zeros([num_items], dtype=np.int64)
+            np.add.at(
+                free_size, group, np.where(is_free[rows], -event_bytes[rows], 0)
+            )
+            for i, (place_id, name_id) in enumerate(
+                zip(event_place[first].tolist(), event_names[first].tolist())
+            ):
+                place = table.places[place_id]
+                item = MemorySummary.MemoryItem(
+                    table.names[name_id], place, memory_type
+                )
+                item.allocation_count = int(allocation_count[i])
+                item.free_count = int(free_count[i])
+                item.allocation_size = int(allocation_size[i])
+                item.free_size = int(free_size[i])
+                item.increase_size = item.allocation_size - item.free_size
+                items[place][item.event_name] = item
+
+        group, first = group_by(event_place)
+        _, peak_allocated, _ = aggregate(
+            group, first.size, table.mem_peak_allocated[events]
+        )
+        _, peak_reserved, _ = aggregate(
+            group, first.size, table.mem_peak_reserved[events]
+        )
+        for place_id, allocated, reserved in zip(
+            event_place[first].tolist(), peak_allocated, peak_reserved
+        ):
+            place = table.places[place_id]
+            self.peak_allocation_values[place] = max(
+                self.peak_allocation_values[place], allocated
+            )
+            self.peak_reserved_values[place] = max(
+                self.peak_reserved_values[place], reserved
+            )
 
 
 class StatisticData:
@@ -865,10 +929,11 @@ class StatisticData:
         self.event_summary = EventSummary()
         self.distributed_summary = DistributedSummary()
         self.memory_summary = MemorySummary()
-        self.time_range_summary.parse(node_trees)
-        self.event_summary.parse(node_trees)
-        self.distributed_summary.parse(node_trees)
-        self.memory_summary.parse(node_trees)
+        event_table = EventTable(node_trees)
+        self.time_range_summary.parse(node_trees, event_table)
+        self.event_summary.parse(node_trees, event_table)
+        self.distributed_summary.parse(node_trees, event_table)
+        self.memory_summary.parse(node_trees, event_table)
 
 
 def _build_table(
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
 
 def sum_ranges(ranges):
     result = 0
@@ -226,3 +228,68 @@ def subtract_ranges(range_list1, range_list2, is_sorted=False):
             if indx1 != len1:
                 range1 = range_list1[indx1]
     return result_range
+
+
+# NOTE: The functions below are the vectorized counterparts of the ones above
+# on numpy arrays of starts and ends, they are used with the columnar event
+# table in event_table.py.
+
+
+def to_ranges(starts, ends):
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def sum_intervals(starts, ends):
+    return int(np.sum(ends - starts))
+
+
+def merge_intervals(starts, ends):
+    r"""
+    Merge overlapping or touching intervals as merge_self_ranges does, the
+    intervals do not need to be sorted.
+
+    Returns:
+        The sorted starts and ends of the disjoint merged intervals.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if starts.size == 0:
+        return starts, ends
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+    # an interval starts a new merged interval when it begins after the
+    # furthest end of all intervals before it.
+    first = np.ones(starts.size, dtype=bool)
+    np.greater(starts[1:], reach[:-1], out=first[1:])
+    last = np.ones(starts.size, dtype=bool)
+    last[:-1] = first[1:]
+    return starts[first], reach[last]
+
+
+def union_intervals(starts1, ends1, starts2, ends2):
+    return merge_intervals(
+        np.concatenate([starts1, starts2]), np.concatenate([ends1, ends2])
+    )
+
+
+def intersect_intervals(starts1, ends1, starts2, ends2):
+    r"""
+    Intersect two sets of merged intervals, see merge_intervals.
+
+    Returns:
+        The sorted starts and ends of the intersection.
+    """
+    # the intervals of the second set overlapping interval i of the first
+    # one are [lo[i], hi[i]), as both sets are sorted and disjoint.
+    lo = np.searchsorted(ends2, starts1, side='right')
+    hi = np.searchsorted(starts2, ends1, side='left')
+    counts = np.maximum(hi - lo, 0)
+    index1 = np.repeat(np.arange(starts1.size), counts)
+    index2 = np.arange(int(counts.sum())) + np.repeat(
+        lo - (np.cumsum(counts) - counts), counts
+    )
+    return (
+        np.maximum(starts1[index1], starts2[index2]),
+        np.minimum(ends1[index1], ends2[index2]),
+    )
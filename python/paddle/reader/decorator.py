@@ -17,6 +17,7 @@ from __future__ import annotations
 import itertools
 import logging
 import multiprocessing
+import os
 import random
 import sys
 import warnings
@@ -36,6 +37,7 @@ from typing import (
 from typing_extensions import NotRequired, TypeAlias, Unpack
 
 from paddle.base.reader import QUEUE_GET_TIMEOUT
+from paddle.reader import pipeline
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -72,6 +74,19 @@ _U = TypeVar('_U')
 _Reader: TypeAlias = Callable[[], Generator[_T, None, None]]
 
 
+def _use_process_pool():
+    # xmap_readers and multiprocess_reader run on the process pool engine in
+    # `paddle.reader.pipeline` if FLAGS_reader_use_process_pool=1 and fork is
+    # available. It is opt-in: the workers are forked from a process which
+    # may run threads or hold a CUDA context, the samples must be picklable
+    # and the updates of the mappers to shared state are lost.
+    flag = os.environ.get('FLAGS_reader_use_process_pool', '0')
+    return (
+        flag.lower() in ('1', 'true', 'on')
+        and pipeline.is_process_pool_available()
+    )
+
+
 def cache(reader: _Reader[_T]) -> _Reader[_T]:
     """
     Cache the reader data into memory.
@@ -481,12 +496,20 @@ def xmap_readers(
     order: bool = False,
 ) -> _Reader[_U]:
     """
-    Use multi-threads to map samples from reader by a mapper defined by user.
+    Use multi-processes to map samples from reader by a mapper defined by user.
+
+    The samples are mapped by threads. If ``FLAGS_reader_use_process_pool`` is
+    set to 1 and fork is available, they are mapped by a pool of forked worker
+    processes and moved by bounded shared memory queues instead, see
+    ``paddle.reader.pipeline.process_map``. Then the samples must be
+    picklable, the changes of ``mapper`` to shared state are not seen by the
+    current process, and the current process should not have initialized
+    CUDA before.
 
     Args:
         mapper (callable): a function to map the data from reader.
         reader (callable): a data reader which yields the data.
-        process_num (int): thread number to handle original sample.
+        process_num (int): process or thread number to handle original sample.
         buffer_size (int): size of the queue to read data in.
         order (bool): whether to keep the data order from original reader.
             Default False.
@@ -494,6 +517,11 @@ def xmap_readers(
     Returns:
         callable: a decorated reader with data mapping.
     """
+    if _use_process_pool():
+        return pipeline.process_map(
+            mapper, reader, process_num, buffer_size, order
+        )
+
     end = XmapEndSignal()
 
     # define a worker to read samples from reader to in_queue
@@ -587,6 +615,13 @@ def multiprocess_reader(
     ``readers`` list, please guarantee every reader can work independently
     to avoid conflicts in parallel environment.
 
+    If ``FLAGS_reader_use_process_pool`` is set to 1 and fork is available,
+    the data are merged by a bounded shared memory queue of ``queue_size``
+    samples instead whatever ``use_pipe`` is, see
+    ``paddle.reader.pipeline.process_readers``. The samples are pickled
+    instead of json encoded then, so they keep their types, e.g. tuples are
+    not turned into lists.
+
 
     ``Multiprocess.Queue`` require the rw access right to /dev/shm, and it's not supported
     in some platforms.
@@ -663,6 +698,24 @@ def multiprocess_reader(
             "The multiprocess_reader method is not supported on windows."
         )
 
+    assert (
+        isinstance(readers, (list, tuple)) and len(readers) > 0
+    ), "`readers` must be list or tuple."
+
+    if _use_process_pool():
+        merged_reader = pipeline.process_readers(readers, queue_size)
+
+        def pool_reader():
+            try:
+                yield from merged_reader()
+            except RuntimeError as e:
+                raise ValueError(
+                    f"multiprocess_reader failed to read data: {e}"
+                ) from e
+
+        pool_reader.stats = merged_reader.stats
+        return pool_reader
+
     # ujson is ultra fast json encoder and decoder written in pure C with bindings for Python 3.6+.
     try:
         import ujson as json
@@ -673,10 +726,6 @@ def multiprocess_reader(
         )
         import json
 
-    assert (
-        isinstance(readers, (list, tuple)) and len(readers) > 0
-    ), "`readers` must be list or tuple."
-
     def _read_into_queue(reader, queue):
         try:
             for sample in reader():
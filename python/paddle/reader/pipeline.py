@@ -0,0 +1,491 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING, Callable, Generator, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+_T = TypeVar('_T')
+_U = TypeVar('_U')
+
+# NOTE: [ reader pipeline ] The process pool engine of the legacy reader
+# decorators. Samples are moved between processes by `_SharedMemoryQueue`,
+# a bounded queue whose slots live in one shared memory segment. A sample
+# is pickled with protocol 5, its out-of-band buffers (e.g. the data of
+# numpy arrays) are written to a free slot next to the pickle header, and
+# only the slot id goes through the pipe. The number of slots bounds the
+# samples in flight, so a fast producer blocks instead of filling memory.
+# Samples larger than a slot are sent through the pipe.
+#
+# The shared memory of a queue is FLAGS_reader_shm_queue_size bytes, 32MB
+# by default, set it to 0 to send all samples through pipes.
+
+_SLOT_ALIGNMENT = 64
+
+_MAX_SLOT_SIZE = 4 * 1024 * 1024
+
+# interval to check whether the workers are alive while waiting
+_POLL_INTERVAL = 5
+
+
+def _align(size, alignment=_SLOT_ALIGNMENT):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _get_shm_queue_size():
+    size = os.environ.get('FLAGS_reader_shm_queue_size', str(32 << 20))
+    try:
+        return max(int(size), 0)
+    except ValueError:
+        return 0
+
+
+def _get_context():
+    # workers are forked to run mappers and readers which are closures
+    if sys.platform == 'win32' or 'fork' not in (
+        multiprocessing.get_all_start_methods()
+    ):
+        return None
+    return multiprocessing.get_context('fork')
+
+
+def is_process_pool_available():
+    """Whether the process pool engine can be used on this platform."""
+    return _get_context() is not None
+
+
+class _StageCounter:
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def throughput(self):
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+
+class PipelineStats:
+    """
+    Counters of the stages of a reader pipeline. For every stage, `count`
+    is the number of samples passed and `seconds` is the time spent on
+    them, e.g. the time of the mappers summed over the workers for the
+    ``map`` stage, or the time the consumer waited for the ``output``
+    stage. They are accumulated over the runs of the reader.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def add(self, stage, count, seconds):
+        with self._lock:
+            counter = self.stages.get(stage)
+            if counter is None:
+                counter = self.stages[stage] = _StageCounter()
+            counter.count += count
+            counter.seconds += seconds
+
+    def __getitem__(self, stage):
+        return self.stages[stage]
+
+    def __repr__(self):
+        lines = ['PipelineStats(']
+        for stage, counter in self.stages.items():
+            lines.append(
+                f'  {stage}: {counter.count} samples in '
+                f'{counter.seconds:.3f}s, {counter.throughput:.1f} samples/s'
+            )
+        lines.append(')')
+        return '\n'.join(lines)
+
+
+class _SharedMemoryQueue:
+    """
+    A bounded multi-producer queue between processes with `capacity` slots
+    in shared memory, see [ reader pipeline ].
+    """
+
+    def __init__(self, ctx, capacity, shm_size=None):
+        self.capacity = max(int(capacity), 1)
+        if shm_size is None:
+            shm_size = _get_shm_queue_size()
+        slot_size = shm_size // self.capacity
+        self.slot_size = min(
+            _MAX_SLOT_SIZE, slot_size // _SLOT_ALIGNMENT * _SLOT_ALIGNMENT
+        )
+        self._shm = None
+        if self.slot_size > 0:
+            from multiprocessing import shared_memory
+
+            try:
+                self._shm = shared_memory.SharedMemory(
+                    create=True, size=self.capacity * self.slot_size
+                )
+            except OSError:
+                self.slot_size = 0
+        self._free = ctx.Queue()
+        for slot in range(self.capacity):
+            self._free.put(slot)
+        self._ready = ctx.Queue()
+
+    def _acquire(self, stop_event):
+        while True:
+            try:
+                return self._free.get(timeout=0.1)
+            except queue.Empty:
+                if stop_event is not None and stop_event.is_set():
+                    return None
+            except (OSError, ValueError):
+                # the queue is closed by the consumer
+                return None
+
+    def put(self, obj, stop_event=None):
+        """
+        Put obj, block while all slots are in use. Return False if
+        stop_event is set before a slot is free.
+        """
+        slot = self._acquire(stop_event)
+        if slot is None:
+            return False
+        try:
+            self._put(slot, obj)
+        except:
+            self._free.put(slot)
+            raise
+        return True
+
+    def _put(self, slot, obj):
+        buffers = []
+        header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        if self._shm is not None and buffers:
+            raws = [b.raw() for b in buffers]
+            offset = _align(len(header))
+            spans = []
+            for raw in raws:
+                spans.append((offset, raw.nbytes))
+                offset += _align(raw.nbytes)
+            if offset <= self.slot_size:
+                base = slot * self.slot_size
+                buf = self._shm.buf
+                buf[base : base + len(header)] = header
+                for raw, (start, nbytes) in zip(raws, spans):
+                    buf[base + start : base + start + nbytes] = raw
+                self._ready.put((slot, len(header), spans, offset))
+                return
+            header = pickle.dumps(obj, protocol=5)
+        elif buffers:
+            header = pickle.dumps(obj, protocol=5)
+        self._ready.put((slot, None, header, 0))
+
+    def get(self, timeout=None):
+        """Get an object, raise queue.Empty if timeout."""
+        slot, header_size, payload, total = self._ready.get(timeout=timeout)
+        try:
+            if header_size is None:
+                return pickle.loads(payload)
+            base = slot * self.slot_size
+            # copy out once, the arrays are rebuilt as views of the copy
+            data = memoryview(bytearray(self._shm.buf[base : base + total]))
+            return pickle.loads(
+                data[:header_size],
+                buffers=[data[s : s + n] for s, n in payload],
+            )
+        finally:
+            self._free.put(slot)
+
+    def close(self):
+        for q in (self._free, self._ready):
+            q.cancel_join_thread()
+            q.close()
+        if self._shm is not None:
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm = None
+
+
+class _Error:
+    def __init__(self, message):
+        self.message = message
+
+
+def _map_worker(mapper, batched, in_queue, out_queue):
+    try:
+        while True:
+            task = in_queue.get()
+            if task is None:
+                break
+            seq, samples = task
+            start = time.perf_counter()
+            if batched:
+                results = list(mapper(samples))
+            else:
+                results = [mapper(s) for s in samples]
+            out_queue.put((seq, results, time.perf_counter() - start))
+    except Exception:
+        out_queue.put((-1, _Error(traceback.format_exc()), 0))
+    out_queue.put(None)
+
+
+def _read_worker(reader, batch_size, out_queue):
+    try:
+        samples = []
+        start = time.perf_counter()
+        for sample in reader():
+            if sample is None:
+                raise ValueError("sample has None")
+            samples.append(sample)
+            if len(samples) == batch_size:
+                out_queue.put((-1, samples, time.perf_counter() - start))
+                samples = []
+                start = time.perf_counter()
+        if samples:
+            out_queue.put((-1, samples, time.perf_counter() - start))
+    except Exception:
+        out_queue.put((-1, _Error(traceback.format_exc()), 0))
+    out_queue.put(None)
+
+
+def _feed(reader, batch_size, num_workers, in_queue, out_queue, stats, stop):
+    seq = 0
+    try:
+        samples = []
+        start = time.perf_counter()
+        for sample in reader():
+            samples.append(sample)
+            if len(samples) == batch_size:
+                stats.add('read', len(samples), time.perf_counter() - start)
+                if not in_queue.put((seq, samples), stop):
+                    return
+                seq += 1
+                samples = []
+                start = time.perf_counter()
+        if samples:
+            stats.add('read', len(samples), time.perf_counter() - start)
+            if not in_queue.put((seq, samples), stop):
+                return
+    except Exception:
+        out_queue.put((-1, _Error(traceback.format_exc()), 0), stop)
+    for _ in range(num_workers):
+        if not in_queue.put(None, stop):
+            return
+
+
+def _run(start_workers, out_queue, num_workers, order, stats, name):
+    """
+    Start the workers and yield the samples they put into out_queue until
+    all of them finish, the workers are terminated on early exit.
+    """
+    workers = start_workers()
+    finished = 0
+    next_seq = 0
+    pending = {}
+    try:
+        while finished < num_workers:
+            wait_start = time.perf_counter()
+            try:
+                item = out_queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if any(
+                    w.exitcode not in (None, 0)
+                    for w in workers
+                    if isinstance(w, multiprocessing.process.BaseProcess)
+                ):
+                    raise RuntimeError(
+                        f"{name} worker exited unexpectedly"
+                    ) from None
+                continue
+            if item is None:
+                finished += 1
+                continue
+            seq, samples, seconds = item
+            if isinstance(samples, _Error):
+                raise RuntimeError(f"{name} worker failed:\n{samples.message}")
+            stats.add('map' if seq >= 0 else 'read', len(samples), seconds)
+            if order and seq >= 0:
+                pending[seq] = samples
+                ready = []
+                while next_seq in pending:
+                    ready.extend(pending.pop(next_seq))
+                    next_seq += 1
+                samples = ready
+            stats.add('output', len(samples), time.perf_counter() - wait_start)
+            yield from samples
+    finally:
+        for w in workers:
+            if isinstance(w, threading.Thread):
+                continue
+            if w.is_alive():
+                w.terminate()
+            w.join()
+
+
+def process_map(
+    mapper: Callable[[_T], _U],
+    reader: Callable[[], Generator[_T, None, None]],
+    num_workers: int,
+    buffer_size: int,
+    order: bool = False,
+    batch_size: int = 1,
+    batched: bool = False,
+    stats: PipelineStats | None = None,
+) -> Callable[[], Generator[_U, None, None]]:
+    """
+    Map the samples of reader by mapper in a pool of worker processes.
+
+    The samples are read in the calling process, grouped into tasks of
+    batch_size samples and sent to the workers by shared memory queues of
+    buffer_size tasks, so at most about 2 * buffer_size + num_workers tasks
+    are in flight.
+
+    Args:
+        mapper (callable): a function to map a sample, or a list of samples
+            if batched is True.
+        reader (callable): a data reader which yields the data.
+        num_workers (int): number of the worker processes.
+        buffer_size (int): number of the tasks buffered by each queue.
+        order (bool): whether to keep the order of the samples.
+        batch_size (int): number of the samples of a task.
+        batched (bool): whether mapper maps a list of samples to a list.
+        stats (PipelineStats|None): the counters of the ``read``, ``map``
+            and ``output`` stages, a new one is created if None.
+
+    Returns:
+        callable: a decorated reader with data mapping, its ``stats``
+        attribute is the PipelineStats.
+    """
+    ctx = _get_context()
+    assert ctx is not None, "process pool needs the fork start method"
+    num_workers = max(int(num_workers), 1)
+    batch_size = max(int(batch_size), 1)
+    stats = PipelineStats() if stats is None else stats
+
+    def pool_reader():
+        in_queue = _SharedMemoryQueue(ctx, buffer_size)
+        out_queue = _SharedMemoryQueue(ctx, buffer_size)
+        stop = threading.Event()
+
+        def start_workers():
+            workers = []
+            for _ in range(num_workers):
+                w = ctx.Process(
+                    target=_map_worker,
+                    args=(mapper, batched, in_queue, out_queue),
+                )
+                w.daemon = True
+                w.start()
+                workers.append(w)
+            feeder = threading.Thread(
+                target=_feed,
+                args=(
+                    reader,
+                    batch_size,
+                    num_workers,
+                    in_queue,
+                    out_queue,
+                    stats,
+                    stop,
+                ),
+            )
+            feeder.daemon = True
+            feeder.start()
+            return workers + [feeder]
+
+        try:
+            yield from _run(
+                start_workers,
+                out_queue,
+                num_workers,
+                order,
+                stats,
+                'process_map',
+            )
+        finally:
+            stop.set()
+            in_queue.close()
+            out_queue.close()
+
+    pool_reader.stats = stats
+    return pool_reader
+
+
+def process_readers(
+    readers: Sequence[Callable[[], Generator[_T, None, None]]],
+    buffer_size: int,
+    batch_size: int = 1,
+    stats: PipelineStats | None = None,
+) -> Callable[[], Generator[_T, None, None]]:
+    """
+    Run every reader in a worker process and merge their samples, the
+    samples of different readers are interleaved in arrival order.
+
+    Args:
+        readers (list|tuple): the readers to run.
+        buffer_size (int): number of the tasks buffered by the queue.
+        batch_size (int): number of the samples sent at once by a worker.
+        stats (PipelineStats|None): the counters of the ``read`` and
+            ``output`` stages, a new one is created if None.
+
+    Returns:
+        callable: the merged reader, its ``stats`` attribute is the
+        PipelineStats.
+    """
+    ctx = _get_context()
+    assert ctx is not None, "process pool needs the fork start method"
+    batch_size = max(int(batch_size), 1)
+    stats = PipelineStats() if stats is None else stats
+
+    def pool_reader():
+        out_queue = _SharedMemoryQueue(ctx, buffer_size)
+
+        def start_workers():
+            workers = []
+            for reader in readers:
+                w = ctx.Process(
+                    target=_read_worker, args=(reader, batch_size, out_queue)
+                )
+                w.daemon = True
+                w.start()
+                workers.append(w)
+            return workers
+
+        try:
+            yield from _run(
+                start_workers,
+                out_queue,
+                len(readers),
+                False,
+                stats,
+                'process_readers',
+            )
+        finally:
+            out_queue.close()
+
+    pool_reader.stats = stats
+    return pool_reader
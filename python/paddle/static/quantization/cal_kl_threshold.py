@@ -92,38 +92,45 @@ def cal_kl_threshold(hist, bin_width, bits):
     starting_iter = int((hist_bins - 1) * 0.5)
     quant_range = 2 ** (bits - 1) - 1
 
-    P_sum = np.sum(np.array(hist).ravel())
+    # The same divergences as computed by expand_quantized_bins and
+    # safe_entropy, with numpy over the bins of every candidate.
+    hist = np.asarray(hist, dtype=np.float64)
+    P_sum = np.sum(hist)
+    outliers = np.cumsum(hist[::-1])[::-1]
     min_kl_divergence = 0
     min_kl_index = 0
     kl_inited = False
 
     for i in range(starting_iter, hist_bins):
-        reference_distr_P = hist[0:i].tolist()
-        outliers_count = sum(hist[i:])
-        if reference_distr_P[i - 1] == 0:
+        if hist[i - 1] == 0:
             continue
-        reference_distr_P[i - 1] += outliers_count
-        reference_distr_bins = reference_distr_P[:]
-        candidate_distr_Q = hist[0:i].tolist()
+        reference_distr_P = hist[0:i].copy()
+        reference_distr_P[i - 1] += outliers[i]
+        # The bins of hist[0:i] are merged into quant_range bins of
+        # num_merged_bins, the last one holding the remaining bins.
         num_merged_bins = int(i / quant_range)
-        candidate_distr_Q_quantized = [0] * quant_range
-        j_start = 0
-        j_end = num_merged_bins
-        for idx in range(quant_range):
-            candidate_distr_Q_quantized[idx] = sum(
-                candidate_distr_Q[j_start:j_end]
+        if num_merged_bins > 0:
+            merged = np.minimum(
+                np.arange(i) // num_merged_bins, quant_range - 1
             )
-            j_start += num_merged_bins
-            j_end += num_merged_bins
-            if (idx + 1) == quant_range - 1:
-                j_end = i
-        candidate_distr_Q = expand_quantized_bins(
-            candidate_distr_Q_quantized, reference_distr_bins
-        )
-        Q_sum = sum(candidate_distr_Q)
-        kl_divergence = safe_entropy(
-            reference_distr_P, P_sum, candidate_distr_Q, Q_sum
+        else:
+            merged = np.full([i], quant_range - 1)
+        nonzero = reference_distr_P != 0
+        quantized = np.bincount(merged, hist[0:i], quant_range)
+        nonzero_count = np.bincount(merged, nonzero, quant_range)
+        avg_bin_ele = np.divide(
+            quantized,
+            nonzero_count,
+            out=np.zeros([quant_range]),
+            where=nonzero_count > 0,
         )
+        candidate_distr_Q = np.where(nonzero, avg_bin_ele[merged], 0)
+        Q_sum = np.sum(candidate_distr_Q)
+        p = reference_distr_P[nonzero]
+        q = candidate_distr_Q[nonzero]
+        kl_divergence = (
+            np.sum(p * np.log(Q_sum * p)) - np.sum(p * np.log(P_sum * q))
+        ) / P_sum
         if not kl_inited:
             min_kl_divergence = kl_divergence
             min_kl_index = i
@@ -131,8 +138,6 @@ def cal_kl_threshold(hist, bin_width, bits):
         elif kl_divergence < min_kl_divergence:
             min_kl_divergence = kl_divergence
             min_kl_index = i
-        else:
-            pass
     if min_kl_index == 0:
         while starting_iter > 0:
             if hist[starting_iter] == 0:
@@ -0,0 +1,187 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from ..log_helper import get_logger
+from .cal_kl_threshold import cal_kl_threshold
+
+_logger = get_logger(
+    __name__, logging.INFO, fmt='%(asctime)s-%(levelname)s: %(message)s'
+)
+
+# NOTE: [ vectorized calibration ]
+# PostTrainingQuantization used to reduce weights channel by channel in
+# python loops, and to search the scale of activations for the mse and emd
+# algos by quantizing the whole tensor once per candidate scale. Here the
+# reductions run over all channels at once, and all candidate scales are
+# evaluated as one broadcast operation of shape [num_scales, chunk], over
+# chunks of the tensor so that the temporaries stay bounded. KL thresholds
+# of different activations are independent, so they are computed in a
+# process pool.
+
+# The number of elements of the [num_scales, chunk] temporaries.
+_SEARCH_CHUNK_ELEMENTS = 1 << 18
+
+
+def _reduce_axes(tensor, quant_axis):
+    return tuple(axis for axis in range(tensor.ndim) if axis != quant_axis)
+
+
+def abs_max(tensor, quant_axis=None):
+    '''
+    Get the abs max of the tensor, or the list of the abs max of every
+    channel along quant_axis.
+    '''
+    if quant_axis is None:
+        return float(max(np.max(tensor), -np.min(tensor)))
+    axes = _reduce_axes(tensor, quant_axis)
+    return np.maximum(
+        np.max(tensor, axis=axes), -np.min(tensor, axis=axes)
+    ).tolist()
+
+
+def min_max(tensor, quant_axis=None):
+    '''
+    Get the min and the max of the tensor, or the lists of the min and the
+    max of every channel along quant_axis.
+    '''
+    if quant_axis is None:
+        return float(np.min(tensor)), float(np.max(tensor))
+    axes = _reduce_axes(tensor, quant_axis)
+    return (
+        np.min(tensor, axis=axes).tolist(),
+        np.max(tensor, axis=axes).tolist(),
+    )
+
+
+def candidate_scales(abs_max_value):
+    '''
+    Get the scales searched by the mse and emd algos, from 0.3 to 1.0 times
+    abs_max_value by steps of 0.02.
+    '''
+    scales = []
+    s = 0.3
+    while s <= 1.0:
+        scales.append(s * abs_max_value)
+        s += 0.02
+    return scales
+
+
+def _quant_dequant(x, scales, bits, onnx_format):
+    # the same operations as quantizing with every scale in turn, done in
+    # place on a single [num_scales, chunk] buffer.
+    bins = 2 ** (bits - 1) - 1
+    if onnx_format:
+        out = np.divide(x, scales)
+        out *= bins
+        np.round(out, out=out)
+        np.clip(out, -bins - 1, bins, out=out)
+    else:
+        out = np.clip(x, 0.0, scales)
+        out /= scales
+        out *= bins
+        np.round(out, out=out)
+    out /= bins
+    out *= scales
+    return out
+
+
+def search_losses(tensor, scales, bits, onnx_format, loss="mse"):
+    '''
+    Quantize and dequantize the tensor with every scale, and get the mse or
+    emd loss against the tensor for every scale.
+
+    Args:
+        tensor(numpy.ndarray): The tensor to quantize.
+        scales(list[float]): The candidate scales.
+        bits(int): The quantization bits.
+        onnx_format(bool): Whether to quantize as in the ONNX format.
+        loss(str): "mse" or "emd".
+
+    Returns:
+        The losses of every scale, as a numpy.ndarray.
+    '''
+    x = tensor.reshape([-1])
+    size = x.size
+    mean = float(np.mean(x, dtype=np.float64))
+    scales = np.array(scales, dtype=x.dtype)[:, None]
+    chunk = max(1, _SEARCH_CHUNK_ELEMENTS // scales.shape[0])
+    # sums of the squared errors for mse, sums of the quantized values and
+    # their squares shifted by the mean of the tensor for emd, in float64 as
+    # the emd loss is a difference of close values.
+    total = np.zeros([scales.shape[0]], dtype=np.float64)
+    total_sq = np.zeros([scales.shape[0]], dtype=np.float64)
+    for start in range(0, size, chunk):
+        x_chunk = x[start : start + chunk]
+        quant_dequant = _quant_dequant(x_chunk, scales, bits, onnx_format)
+        if loss == "mse":
+            quant_dequant -= x_chunk
+            quant_dequant *= quant_dequant
+            total += np.sum(quant_dequant, axis=1, dtype=np.float64)
+        else:
+            shifted = quant_dequant.astype(np.float64)
+            shifted -= mean
+            total += np.sum(shifted, axis=1)
+            shifted *= shifted
+            total_sq += np.sum(shifted, axis=1)
+    if loss == "mse":
+        return total / size
+    shift = total / size
+    std = np.sqrt(np.maximum(total_sq / size - shift**2, 0.0))
+    return np.abs(shift) + np.abs(float(np.std(x, dtype=np.float64)) - std)
+
+
+def cal_kl_thresholds(histograms, bits, num_workers=0):
+    '''
+    Compute the KL thresholds of several histograms in a process pool.
+
+    Args:
+        histograms(dict): The hist and the bin width of every variable.
+        bits(int): The quantization bits.
+        num_workers(int, optional): The number of processes, 0 to compute
+            in the current process. None uses as many processes as cpus.
+            Default is 0.
+
+    Returns:
+        A dict of the threshold of every variable.
+    '''
+    names = list(histograms)
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = min(num_workers, len(names))
+    if num_workers > 1:
+        try:
+            with ProcessPoolExecutor(num_workers) as executor:
+                futures = [
+                    executor.submit(cal_kl_threshold, *histograms[name], bits)
+                    for name in names
+                ]
+                return {
+                    name: future.result()
+                    for name, future in zip(names, futures)
+                }
+        except (OSError, BrokenProcessPool) as e:
+            _logger.warning(
+                f"Failed to compute KL thresholds in processes: {e}, "
+                "fall back to the current process."
+            )
+    return {
+        name: cal_kl_threshold(*histograms[name], bits) for name in names
+    }
@@ -29,9 +29,8 @@ from ... import static
 from ...framework import core
 from ...utils import unique_name
 from ..log_helper import get_logger
-from . import utils
+from . import calibration, utils
 from .adaround import run_adaround
-from .cal_kl_threshold import cal_kl_threshold
 from .quant_config import (
     SUPPORT_QUANTIZATION_OP_DICT,
     ARMCPUQuantizer,
@@ -149,6 +148,7 @@ class PostTrainingQuantization:
         scale_dict=None,
         return_graph=False,
         deploy_backend=None,
+        calibration_workers=0,
     ):
         """
         Constructor.
@@ -242,6 +242,11 @@ class PostTrainingQuantization:
             deploy_backend(str, optional): Deploy backend, it can be None, `TensorRT`,
                 `MKLDNN`, `ARM`. And it will extend the new backend. Default is None,
                 which means to use the default general quantization configuration.
+            calibration_workers(int, optional): The number of processes computing
+                the KL thresholds of activations, 0 to compute them in the current
+                process and None to use as many processes as cpus. Processes are
+                forked from the current process, which is unsafe once threads or
+                CUDA are initialized. Default is 0.
         Returns:
             None
 
@@ -340,6 +345,7 @@ class PostTrainingQuantization:
         self._activation_quantize_type = activation_quantize_type
         self._weight_quantize_type = weight_quantize_type
         self._onnx_format = onnx_format
+        self._calibration_workers = calibration_workers
         self._clip_extra = True if self._onnx_format else False
         self._skip_tensor_list = skip_tensor_list
         self._optimize_model = optimize_model
@@ -722,6 +728,20 @@ class PostTrainingQuantization:
                 var.persistable = False
                 self._scope.find_var(var.name).get_tensor()._clear()
 
+    def _weight_quant_axis(self, var_name):
+        '''
+        Get the channel axis of the weight for channel_wise_abs_max, or None
+        for abs_max.
+        '''
+        if self._weight_quantize_type == "abs_max":
+            return None
+        if (
+            self._weight_op_pairs[var_name]
+            in utils._channelwise_quant_axis1_ops
+        ):
+            return 1
+        return 0
+
     def _sampling(self):
         '''
         Sample the min/max, abs_max or histogram in every iterations.
@@ -745,24 +765,9 @@ class PostTrainingQuantization:
         if self._quantized_threshold == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+                self._quantized_threshold[var_name] = calibration.abs_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
         _logger.info("MSE searching stage ...")
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
@@ -770,27 +775,19 @@ class PostTrainingQuantization:
                 self._zero_size_var_names.add(var_name)
                 continue
             var_tensor = var_tensor.flatten()
-            abs_max_value = float(np.max(np.abs(var_tensor)))
+            abs_max_value = calibration.abs_max(var_tensor)
             abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
-            s = 0.3
             if var_name not in self._best_calibration_loss:
                 self._best_calibration_loss[var_name] = float('inf')
-            while s <= 1.0:
-                scale = s * abs_max_value
-                s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                mse_loss = ((var_tensor - quant_dequant_var) ** 2).mean()
+            scales = calibration.candidate_scales(abs_max_value)
+            mse_losses = calibration.search_losses(
+                var_tensor,
+                scales,
+                self._activation_bits,
+                self._onnx_format,
+                loss="mse",
+            )
+            for scale, mse_loss in zip(scales, mse_losses.tolist()):
                 if mse_loss <= self._best_calibration_loss[var_name]:
                     self._best_calibration_loss[var_name] = mse_loss
                     self._quantized_threshold[var_name] = scale
@@ -799,24 +796,9 @@ class PostTrainingQuantization:
         if self._quantized_threshold == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+                self._quantized_threshold[var_name] = calibration.abs_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
         _logger.info("EMD searching stage ...")
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
@@ -824,29 +806,19 @@ class PostTrainingQuantization:
                 self._zero_size_var_names.add(var_name)
                 continue
             var_tensor = var_tensor.flatten()
-            abs_max_value = float(np.max(np.abs(var_tensor)))
+            abs_max_value = calibration.abs_max(var_tensor)
             abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
-            s = 0.3
             if var_name not in self._best_calibration_loss:
                 self._best_calibration_loss[var_name] = float('inf')
-            while s <= 1.0:
-                scale = s * abs_max_value
-                s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                emd_loss = np.abs(
-                    np.mean(var_tensor) - np.mean(quant_dequant_var)
-                ) + np.abs(np.std(var_tensor) - np.std(quant_dequant_var))
+            scales = calibration.candidate_scales(abs_max_value)
+            emd_losses = calibration.search_losses(
+                var_tensor,
+                scales,
+                self._activation_bits,
+                self._onnx_format,
+                loss="emd",
+            )
+            for scale, emd_loss in zip(scales, emd_losses.tolist()):
                 if emd_loss <= self._best_calibration_loss[var_name]:
                     self._best_calibration_loss[var_name] = emd_loss
                     self._quantized_threshold[var_name] = scale
@@ -855,38 +827,21 @@ class PostTrainingQuantization:
         if self._quantized_threshold == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+                self._quantized_threshold[var_name] = calibration.abs_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
 
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
-            abs_max_value = float(np.max(np.abs(var_tensor)))
             if var_name not in self._quantized_var_avg:
                 self._quantized_var_avg[var_name] = []
             abs_avg_value = float(
                 np.mean(
-                    np.max(
-                        np.abs(var_tensor.reshape(var_tensor.shape[0], -1)),
-                        axis=(1),
+                    calibration.abs_max(
+                        var_tensor.reshape(var_tensor.shape[0], -1), 0
                     )
                 )
             )
@@ -896,31 +851,16 @@ class PostTrainingQuantization:
         if self._quantized_threshold == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+                self._quantized_threshold[var_name] = calibration.abs_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
 
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
-            abs_max_value = float(np.max(np.abs(var_tensor)))
+            abs_max_value = calibration.abs_max(var_tensor)
             if (var_name not in self._quantized_threshold) or (
                 abs_max_value > self._quantized_threshold[var_name]
             ):
@@ -930,23 +870,9 @@ class PostTrainingQuantization:
         if self._quantized_var_min == {} and self._quantized_var_max == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    min_value = float(np.min(var_tensor))
-                    max_value = float(np.max(var_tensor))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    min_value = []
-                    max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            min_value.append(float(np.min(var_tensor[:, i])))
-                            max_value.append(float(np.max(var_tensor[:, i])))
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            min_value.append(float(np.min(var_tensor[i])))
-                            max_value.append(float(np.max(var_tensor[i])))
+                min_value, max_value = calibration.min_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
                 self._quantized_var_min[var_name] = min_value
                 self._quantized_var_max[var_name] = max_value
 
@@ -955,8 +881,7 @@ class PostTrainingQuantization:
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
-            min_value = float(np.min(var_tensor))
-            max_value = float(np.max(var_tensor))
+            min_value, max_value = calibration.min_max(var_tensor)
             if (var_name not in self._quantized_var_min) or (
                 min_value < self._quantized_var_min[var_name]
             ):
@@ -976,7 +901,11 @@ class PostTrainingQuantization:
                 continue
             var_tensor_abs = np.abs(var_tensor)
             bins = self._sampling_act_histogram[var_name][1]
-            hist, _ = np.histogram(var_tensor_abs, bins=bins)
+            # the edges are uniform, pass their range to use the faster
+            # histogram of uniform bins, which gives the same counts.
+            hist, _ = np.histogram(
+                var_tensor_abs, bins=len(bins) - 1, range=(bins[0], bins[-1])
+            )
             self._sampling_act_histogram[var_name][0] += hist
 
     def _sample_ptf(self):
@@ -987,31 +916,16 @@ class PostTrainingQuantization:
         if self._quantized_threshold == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+                self._quantized_threshold[var_name] = calibration.abs_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
 
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
-            abs_max_value = float(np.max(np.abs(var_tensor)))
+            abs_max_value = calibration.abs_max(var_tensor)
             q_max = 2 ** (self._activation_bits - 1) - 1
             scale8 = abs_max_value / q_max
             scale4 = scale8 / 2
@@ -1115,25 +1029,11 @@ class PostTrainingQuantization:
         # Abs_max threshold for weights
         for var_name in self._quantized_weight_var_name:
             weight_data = utils.load_variable_data(self._scope, var_name)
-            if self._weight_quantize_type == "abs_max":
-                weight_threshold = float(np.max(np.abs(weight_data)))
-            elif self._weight_quantize_type == "channel_wise_abs_max":
-                weight_threshold = []
-                if (
-                    self._weight_op_pairs[var_name]
-                    in utils._channelwise_quant_axis1_ops
-                ):
-                    for i in range(weight_data.shape[1]):
-                        weight_threshold.append(
-                            float(np.max(np.abs(weight_data[:, i])))
-                        )
-                else:
-                    for i in range(weight_data.shape[0]):
-                        weight_threshold.append(
-                            float(np.max(np.abs(weight_data[i])))
-                        )
-            self._quantized_var_threshold[var_name] = weight_threshold
+            self._quantized_var_threshold[var_name] = calibration.abs_max(
+                weight_data, self._weight_quant_axis(var_name)
+            )
 
+        kl_histograms = {}
         for var_name in self._quantized_act_var_name:
             if (var_name in self._zero_size_var_names) and (
                 var_name not in self._sampling_act_histogram
@@ -1142,13 +1042,20 @@ class PostTrainingQuantization:
             hist, hist_edges = self._sampling_act_histogram[var_name]
             if self._algo == "KL":
                 bin_width = hist_edges[1] - hist_edges[0]
-                self._quantized_var_threshold[var_name] = cal_kl_threshold(
-                    hist, bin_width, self._activation_bits
-                )
+                kl_histograms[var_name] = (hist, bin_width)
             elif self._algo == "hist":
                 self._quantized_var_threshold[var_name] = (
                     self._get_hist_scaling_factor(hist, hist_edges)
                 )
+        # the KL search of every activation is independent and costly, run
+        # them in processes, see NOTE: [ vectorized calibration ].
+        self._quantized_var_threshold.update(
+            calibration.cal_kl_thresholds(
+                kl_histograms,
+                self._activation_bits,
+                self._calibration_workers,
+            )
+        )
 
     def _update_program(self):
         '''
@@ -1500,6 +1407,7 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
         cache_dir=None,
         scale_dict=None,
         return_graph=True,
+        calibration_workers=0,
     ):
         super().__init__(
             executor,
@@ -1532,6 +1440,7 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
             cache_dir,
             scale_dict,
             return_graph,
+            calibration_workers=calibration_workers,
         )
         self.FLAG = False
         self._program = program
@@ -0,0 +1,217 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+import numpy as np
+
+import paddle
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    import numpy.typing as npt
+
+    _Fields = dict[str, Union["RaggedArray", "npt.NDArray[Any]"]]
+
+__all__ = []
+
+# NOTE: [ preprocessed text dataset cache ]
+# Text datasets tokenize the raw tarball and map every word through the
+# dictionary on construction, which costs tens of seconds for IMDB. The
+# result of that work is written once under
+#
+#   DATA_HOME/<module>/preprocessed/v<CACHE_VERSION>/<key>/
+#
+# where <key> hashes the source file (path, size and mtime) together with
+# every constructor argument that changes the output. Variable length
+# sequences are stored as a flat int32 ``<field>.ids.npy`` plus an int64
+# ``<field>.offsets.npy``, fixed shape fields as ``<field>.npy``, and the
+# small python objects (e.g. word dicts) in ``manifest.json``. Later
+# constructions memory-map the arrays, so they only pay for the pages
+# actually touched, and forked DataLoader workers share the pages instead of
+# copying python lists.
+#
+# The mapping is read-only and narrower than the int64 arrays the datasets
+# used to return, so ``__getitem__`` still hands out a fresh writable int64
+# copy of each sample (see ``to_sample``). Copying one sample is cheap next
+# to the tokenization the cache saves, and callers keep editing samples in
+# place and relying on their dtype as before.
+#
+# Bump CACHE_VERSION whenever the preprocessing of any dataset changes.
+CACHE_VERSION = 1
+
+_MANIFEST = 'manifest.json'
+
+
+class RaggedArray:
+    """
+    A list of variable length integer sequences stored as one flat array of
+    values and an array of ``len + 1`` offsets into it.
+    """
+
+    def __init__(self, ids: npt.NDArray[Any], offsets: npt.NDArray[Any]):
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_lists(
+        cls, seqs: Sequence[Sequence[int]], dtype: npt.DTypeLike = np.int32
+    ) -> RaggedArray:
+        lengths = np.fromiter(map(len, seqs), dtype=np.int64, count=len(seqs))
+        offsets = np.zeros(len(seqs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ids = np.fromiter(
+            itertools.chain.from_iterable(seqs),
+            dtype=dtype,
+            count=int(offsets[-1]),
+        )
+        return cls(ids, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: int) -> npt.NDArray[Any]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(
+                f"index {idx} is out of range for {len(self)} sequences"
+            )
+        return self.ids[self.offsets[idx] : self.offsets[idx + 1]]
+
+    def __iter__(self) -> Iterator[npt.NDArray[Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+def to_sample(array: npt.ArrayLike) -> npt.NDArray[np.int64]:
+    """
+    Return a writable int64 copy of a cached ``array``, which is the dtype
+    the datasets returned before the cache existed.
+    """
+    return np.array(array, dtype=np.int64)
+
+
+def cache_path(module_name: str, data_file: str, **params: Any) -> str:
+    """
+    Return the cache directory of the preprocessed ``data_file`` for the
+    given constructor arguments.
+    """
+    data_file = os.path.abspath(data_file)
+    stat = os.stat(data_file)
+    key = json.dumps(
+        [data_file, stat.st_size, stat.st_mtime_ns, params], sort_keys=True
+    )
+    return os.path.join(
+        paddle.dataset.common.DATA_HOME,
+        module_name,
+        'preprocessed',
+        f'v{CACHE_VERSION}',
+        hashlib.sha1(key.encode()).hexdigest(),
+    )
+
+
+def _load(path: str) -> tuple[_Fields, dict[str, Any]] | None:
+    try:
+        with open(os.path.join(path, _MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest['version'] != CACHE_VERSION:
+            return None
+
+        def mmap(name):
+            # np.asarray drops the memmap subclass so that samples are plain
+            # ndarray views, the mapping is kept alive by their ``base``.
+            return np.asarray(
+                np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+            )
+
+        fields = {}
+        for name in manifest['ragged']:
+            fields[name] = RaggedArray(
+                mmap(name + '.ids'), mmap(name + '.offsets')
+            )
+        for name in manifest['dense']:
+            fields[name] = mmap(name)
+        return fields, manifest['meta']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save(path: str, fields: _Fields, meta: dict[str, Any]) -> None:
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    # write into a private directory and rename it into place, so that
+    # concurrent builders never observe a partial cache.
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix='.tmp_')
+    try:
+        ragged, dense = [], []
+        for name, value in fields.items():
+            if isinstance(value, RaggedArray):
+                np.save(os.path.join(tmp_path, name + '.ids.npy'), value.ids)
+                np.save(
+                    os.path.join(tmp_path, name + '.offsets.npy'),
+                    value.offsets,
+                )
+                ragged.append(name)
+            else:
+                np.save(os.path.join(tmp_path, name + '.npy'), value)
+                dense.append(name)
+        manifest = {
+            'version': CACHE_VERSION,
+            'ragged': ragged,
+            'dense': dense,
+            'meta': meta,
+        }
+        with open(os.path.join(tmp_path, _MANIFEST), 'w') as f:
+            json.dump(manifest, f)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # another process has finished first, keep its cache
+            if not os.path.exists(os.path.join(path, _MANIFEST)):
+                raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load_or_build(
+    path: str, build: Callable[[], tuple[_Fields, dict[str, Any]]]
+) -> tuple[_Fields, dict[str, Any]]:
+    """
+    Load the preprocessed fields and meta from ``path``, or call ``build``
+    and save its result there first. ``meta`` must be json serializable.
+
+    If the cache can not be written (e.g. a read-only DATA_HOME), the
+    freshly built in-memory result is returned instead.
+    """
+    cached = _load(path)
+    if cached is not None:
+        return cached
+
+    fields, meta = build()
+    try:
+        _save(path, fields, meta)
+    except OSError:
+        return fields, meta
+    cached = _load(path)
+    return cached if cached is not None else (fields, meta)
@@ -14,6 +14,8 @@
 from __future__ import annotations
 
 import collections
+import functools
+import itertools
 import re
 import string
 import tarfile
@@ -24,8 +26,11 @@ import numpy as np
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
+from .cache import RaggedArray, cache_path, load_or_build, to_sample
+
 if TYPE_CHECKING:
-    from re import Pattern
+    from collections.abc import Iterable, Iterator
+    from re import Match, Pattern
 
     import numpy.typing as npt
 
@@ -93,8 +98,8 @@ class Imdb(Dataset):
     data_file: str | None
     mode: _ImdbDataSetMode
     word_idx: dict[str, int]
-    docs: list
-    labels: list
+    docs: RaggedArray
+    labels: npt.NDArray[np.int64]
 
     def __init__(
         self,
@@ -118,16 +123,25 @@ class Imdb(Dataset):
                 data_file, URL, MD5, 'imdb', download
             )
 
-        # Build a word dictionary from the corpus
-        self.word_idx = self._build_work_dict(cutoff)
-
-        # read dataset into memory
-        self._load_anno()
-
-    def _build_work_dict(self, cutoff: int) -> dict[str, int]:
+        # the dictionary and both modes are preprocessed in one pass over
+        # the tarball, see NOTE: [ preprocessed text dataset cache ]
+        fields, meta = load_or_build(
+            cache_path('imdb', self.data_file, cutoff=cutoff),
+            functools.partial(self._preprocess, cutoff),
+        )
+        # tokens are bytes, latin-1 maps them to json strings one to one
+        self.word_idx = {
+            w.encode('latin-1'): i for i, w in enumerate(meta['words'])
+        }
+        self.word_idx['<unk>'] = len(meta['words'])
+        self.docs = fields[f'{self.mode}_docs']
+        self.labels = fields[f'{self.mode}_labels']
+
+    def _build_work_dict(
+        self, cutoff: int, docs: Iterable[list[bytes]]
+    ) -> dict[str, int]:
         word_freq = collections.defaultdict(int)
-        pattern = re.compile(r"aclImdb/((train)|(test))/((pos)|(neg))/.*\.txt$")
-        for doc in self._tokenize(pattern):
+        for doc in docs:
             for word in doc:
                 word_freq[word] += 1
 
@@ -140,14 +154,16 @@ class Imdb(Dataset):
         word_idx['<unk>'] = len(words)
         return word_idx
 
-    def _tokenize(self, pattern: Pattern[str]) -> list[list[str]]:
-        data = []
+    def _tokenize(
+        self, pattern: Pattern[str]
+    ) -> Iterator[tuple[Match[str], list[bytes]]]:
         with tarfile.open(self.data_file) as tarf:
             tf = tarf.next()
             while tf is not None:
-                if bool(pattern.match(tf.name)):
+                match = pattern.match(tf.name)
+                if match:
                     # newline and punctuations removal and ad-hoc tokenization.
-                    data.append(
+                    yield match, (
                         tarf.extractfile(tf)
                         .read()
                         .rstrip(b'\n\r')
@@ -157,27 +173,40 @@ class Imdb(Dataset):
                     )
                 tf = tarf.next()
 
-        return data
-
-    def _load_anno(self) -> None:
-        pos_pattern = re.compile(fr"aclImdb/{self.mode}/pos/.*\.txt$")
-        neg_pattern = re.compile(fr"aclImdb/{self.mode}/neg/.*\.txt$")
+    def _preprocess(self, cutoff: int) -> tuple[dict, dict]:
+        pattern = re.compile(r"aclImdb/(train|test)/(pos|neg)/.*\.txt$")
+        # documents of every (mode, label) in the order of the tarball
+        groups = {
+            (mode, label): []
+            for mode in ['train', 'test']
+            for label in ['pos', 'neg']
+        }
+        for match, doc in self._tokenize(pattern):
+            groups[match.groups()].append(doc)
 
-        UNK = self.word_idx['<unk>']
-
-        self.docs = []
-        self.labels = []
-        for doc in self._tokenize(pos_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(0)
-        for doc in self._tokenize(neg_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(1)
+        # Build a word dictionary from the corpus
+        word_idx = self._build_work_dict(
+            cutoff, itertools.chain.from_iterable(groups.values())
+        )
+
+        UNK = word_idx.pop('<unk>')
+        fields = {}
+        for mode in ['train', 'test']:
+            pos = groups[(mode, 'pos')]
+            neg = groups[(mode, 'neg')]
+            fields[f'{mode}_docs'] = RaggedArray.from_lists(
+                [[word_idx.get(w, UNK) for w in doc] for doc in pos + neg]
+            )
+            fields[f'{mode}_labels'] = np.array(
+                [0] * len(pos) + [1] * len(neg), dtype=np.int64
+            )
+        meta = {'words': [w.decode('latin-1') for w in word_idx]}
+        return fields, meta
 
     def __getitem__(
         self, idx: int
     ) -> tuple[npt.NDArray[np.int_], npt.NDArray[np.int_]]:
-        return (np.array(self.docs[idx]), np.array([self.labels[idx]]))
+        return (to_sample(self.docs[idx]), to_sample(self.labels[idx, None]))
 
     def __len__(self) -> int:
         return len(self.docs)
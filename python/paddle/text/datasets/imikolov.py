@@ -22,6 +22,8 @@ import numpy as np
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
+from .cache import RaggedArray, cache_path, load_or_build, to_sample
+
 if TYPE_CHECKING:
     import numpy.typing as npt
 
@@ -32,6 +34,8 @@ __all__ = []
 URL = 'https://dataset.bj.bcebos.com/imikolov%2Fsimple-examples.tgz'
 MD5 = '30177ea32e27c525793142b6bf2c8e2d'
 
+_MARKS = ['<s>', '<e>']
+
 
 class Imikolov(Dataset):
     """
@@ -95,6 +99,7 @@ class Imikolov(Dataset):
     mode: _ImikolovDataSetMode
     min_word_freq: int
     word_idx: dict[str, int]
+    data: RaggedArray | npt.NDArray[np.int32]
 
     def __init__(
         self,
@@ -129,11 +134,26 @@ class Imikolov(Dataset):
                 data_file, URL, MD5, 'imikolov', download
             )
 
-        # Build a word dictionary from the corpus
-        self.word_idx = self._build_work_dict(min_word_freq)
-
-        # read dataset into memory
-        self._load_anno()
+        # see NOTE: [ preprocessed text dataset cache ]
+        fields, meta = load_or_build(
+            cache_path(
+                'imikolov',
+                self.data_file,
+                data_type=self.data_type,
+                window_size=window_size,
+                mode=self.mode,
+                min_word_freq=min_word_freq,
+            ),
+            self._preprocess,
+        )
+        # tokens are bytes except for the sentence marks, latin-1 maps them
+        # to json strings one to one
+        self.word_idx = {
+            w if w in _MARKS else w.encode('latin-1'): i
+            for i, w in enumerate(meta['words'])
+        }
+        self.word_idx['<unk>'] = len(meta['words'])
+        self.data = fields['data']
 
     def word_count(self, f, word_freq=None):
         if word_freq is None:
@@ -169,8 +189,21 @@ class Imikolov(Dataset):
 
         return word_idx
 
-    def _load_anno(self) -> None:
-        self.data = []
+    def _preprocess(self) -> tuple[dict, dict]:
+        # Build a word dictionary from the corpus
+        self.word_idx = self._build_work_dict(self.min_word_freq)
+        data = self._load_anno()
+
+        words = [
+            w if w in _MARKS else w.decode('latin-1')
+            for w in self.word_idx
+            if w != '<unk>'
+        ]
+        return {'data': data}, {'words': words}
+
+    def _load_anno(self) -> RaggedArray | npt.NDArray[np.int32]:
+        ngrams = []
+        seqs = []
         with tarfile.open(self.data_file) as tf:
             filename = f'./simple-examples/data/ptb.{self.mode}.txt'
             f = tf.extractfile(filename)
@@ -182,23 +215,37 @@ class Imikolov(Dataset):
                     l = ["<s>", *l.strip().split(), "<e>"]
                     if len(l) >= self.window_size:
                         l = [self.word_idx.get(w, UNK) for w in l]
-                        for i in range(self.window_size, len(l) + 1):
-                            self.data.append(tuple(l[i - self.window_size : i]))
+                        ngrams.append(
+                            np.lib.stride_tricks.sliding_window_view(
+                                np.array(l, dtype=np.int32), self.window_size
+                            )
+                        )
                 elif self.data_type == 'SEQ':
                     l = l.strip().split()
                     l = [self.word_idx.get(w, UNK) for w in l]
-                    src_seq = [self.word_idx["<s>"], *l]
-                    trg_seq = [*l, self.word_idx["<e>"]]
-                    if self.window_size > 0 and len(src_seq) > self.window_size:
+                    # the source sequence is [<s>, *l] and the target one is
+                    # [*l, <e>], both are slices of the whole sentence.
+                    if self.window_size > 0 and len(l) + 1 > self.window_size:
                         continue
-                    self.data.append((src_seq, trg_seq))
+                    seqs.append(
+                        [self.word_idx["<s>"], *l, self.word_idx["<e>"]]
+                    )
                 else:
                     raise AssertionError('Unknow data type')
 
+        if self.data_type == 'SEQ':
+            return RaggedArray.from_lists(seqs)
+        if not ngrams:
+            return np.zeros([0, max(self.window_size, 0)], dtype=np.int32)
+        return np.concatenate(ngrams)
+
     def __getitem__(
         self, idx: int
     ) -> tuple[npt.NDArray[np.int_], npt.NDArray[np.int_]]:
-        return tuple([np.array(d) for d in self.data[idx]])
+        if self.data_type == 'SEQ':
+            seq = self.data[idx]
+            return to_sample(seq[:-1]), to_sample(seq[1:])
+        return tuple([to_sample(d) for d in self.data[idx]])
 
     def __len__(self) -> int:
         return len(self.data)
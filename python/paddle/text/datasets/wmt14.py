@@ -21,6 +21,8 @@ import numpy as np
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
+from .cache import RaggedArray, cache_path, load_or_build, to_sample
+
 if TYPE_CHECKING:
     import numpy.typing as npt
 
@@ -104,9 +106,9 @@ class WMT14(Dataset):
     mode: _Wmt14DataSetMode
     data_file: str | None
     dict_size: int
-    src_ids: list[list[int]]
-    trg_ids: list[list[int]]
-    trg_ids_next: list[list[int]]
+    src_ids: RaggedArray
+    trg_ids: RaggedArray
+    trg_ids_next: RaggedArray
     src_dict: dict[str, int]
     trg_dict: dict[str, int]
 
@@ -136,7 +138,29 @@ class WMT14(Dataset):
         # read dataset into memory
         assert dict_size > 0, "dict_size should be set as positive number"
         self.dict_size = dict_size
+
+        # see NOTE: [ preprocessed text dataset cache ]
+        fields, meta = load_or_build(
+            cache_path(
+                'wmt14', self.data_file, mode=self.mode, dict_size=dict_size
+            ),
+            self._preprocess,
+        )
+        self.src_dict = meta['src_dict']
+        self.trg_dict = meta['trg_dict']
+        self.src_ids = fields['src_ids']
+        self.trg_ids = fields['trg_ids']
+        self.trg_ids_next = fields['trg_ids_next']
+
+    def _preprocess(self) -> tuple[dict, dict]:
         self._load_data()
+        fields = {
+            'src_ids': RaggedArray.from_lists(self.src_ids),
+            'trg_ids': RaggedArray.from_lists(self.trg_ids),
+            'trg_ids_next': RaggedArray.from_lists(self.trg_ids_next),
+        }
+        meta = {'src_dict': self.src_dict, 'trg_dict': self.trg_dict}
+        return fields, meta
 
     def _load_data(self) -> None:
         def __to_dict(fd, size: int) -> dict[str, int]:
@@ -206,9 +230,9 @@ class WMT14(Dataset):
         npt.NDArray[np.int_],
     ]:
         return (
-            np.array(self.src_ids[idx]),
-            np.array(self.trg_ids[idx]),
-            np.array(self.trg_ids_next[idx]),
+            to_sample(self.src_ids[idx]),
+            to_sample(self.trg_ids[idx]),
+            to_sample(self.trg_ids_next[idx]),
         )
 
     def __len__(self) -> int:
@@ -25,6 +25,8 @@ import paddle
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
+from .cache import RaggedArray, cache_path, load_or_build, to_sample
+
 if TYPE_CHECKING:
     import numpy.typing as npt
 
@@ -123,9 +125,9 @@ class WMT16(Dataset):
     trg_dict_size: int
     src_dict: dict[str, int]
     trg_dict: dict[str, int]
-    src_ids: list[list[int]]
-    trg_ids: list[list[int]]
-    trg_ids_next: list[list[int]]
+    src_ids: RaggedArray
+    trg_ids: RaggedArray
+    trg_ids_next: RaggedArray
 
     def __init__(
         self,
@@ -168,8 +170,30 @@ class WMT16(Dataset):
             "de" if lang == "en" else "en", trg_dict_size
         )
 
-        # load data
-        self.data = self._load_data()
+        # load data, see NOTE: [ preprocessed text dataset cache ]
+        fields, _ = load_or_build(
+            cache_path(
+                'wmt16',
+                self.data_file,
+                mode=self.mode,
+                src_dict_size=src_dict_size,
+                trg_dict_size=trg_dict_size,
+                lang=lang,
+            ),
+            self._preprocess,
+        )
+        self.src_ids = fields['src_ids']
+        self.trg_ids = fields['trg_ids']
+        self.trg_ids_next = fields['trg_ids_next']
+
+    def _preprocess(self) -> tuple[dict, dict]:
+        self._load_data()
+        fields = {
+            'src_ids': RaggedArray.from_lists(self.src_ids),
+            'trg_ids': RaggedArray.from_lists(self.trg_ids),
+            'trg_ids_next': RaggedArray.from_lists(self.trg_ids_next),
+        }
+        return fields, {}
 
     @overload
     def _load_dict(
@@ -277,9 +301,9 @@ class WMT16(Dataset):
         npt.NDArray[np.int_],
     ]:
         return (
-            np.array(self.src_ids[idx]),
-            np.array(self.trg_ids[idx]),
-            np.array(self.trg_ids_next[idx]),
+            to_sample(self.src_ids[idx]),
+            to_sample(self.trg_ids[idx]),
+            to_sample(self.trg_ids_next[idx]),
         )
 
     def __len__(self) -> int:
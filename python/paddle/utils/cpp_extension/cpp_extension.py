@@ -43,6 +43,15 @@ from .extension_utils import (
     _write_setup_file,
     _jit_compile,
 )
+from .extension_utils import (
+    _build_cache_key,
+    _evict_build_cache,
+    _get_build_cache_directory,
+    _get_build_cache_size,
+    _get_library_path,
+    _restore_from_build_cache,
+    _save_to_build_cache,
+)
 from .extension_utils import (
     check_abi_compatibility,
     log_v,
@@ -64,6 +73,7 @@ from .extension_utils import (
 from .extension_utils import CLANG_COMPILE_FLAGS, CLANG_LINK_FLAGS
 
 from ...base import core
+from ..file_lock import FileLock
 from concurrent.futures import ThreadPoolExecutor
 
 
@@ -402,6 +412,8 @@ class BuildExtension(build_ext):
         super().__init__(*args, **kwargs)
         self.no_python_abi_suffix = kwargs.get("no_python_abi_suffix", True)
         self.output_dir = kwargs.get("output_dir", None)
+        # the number of sources compiled in parallel, None for cpu count
+        self.jobs = kwargs.get("jobs", None)
         # whether containing cuda source file in Extensions
         self.contain_cuda_file = False
 
@@ -552,7 +564,8 @@ class BuildExtension(build_ext):
             )
             cc_args = self._get_cc_args(pp_opts, debug, extra_preargs)
             # Create a thread pool
-            worker_number = min(os.cpu_count(), len(objects))
+            jobs = current_extension_builder.jobs or os.cpu_count() or 1
+            worker_number = max(1, min(jobs, len(objects)))
             with ThreadPoolExecutor(max_workers=worker_number) as executor:
                 # Submit all compilation tasks to the thread pool.
                 futures = {
@@ -902,6 +915,7 @@ def load(
     extra_library_paths: Sequence[str] | None = None,
     build_directory: str | None = None,
     verbose: bool = False,
+    jobs: int | None = None,
 ) -> ModuleType:
     """
     An Interface to automatically compile C++/CUDA source files Just-In-Time
@@ -931,6 +945,15 @@ def load(
     ``python setup.py install`` command. The interface contains all compiling and installing
     process underground.
 
+    The compiled shared library is cached under a hash of the sources, the headers they include,
+    the flags, the compiler version and the Paddle build, in ``PADDLE_EXTENSION_CACHE_DIR`` from
+    os.environ if set, else in ``build_directory`` . Setting ``PADDLE_EXTENSION_CACHE_DIR`` to a
+    directory shared by the jobs or ranks on a host makes only one of them compile the sources,
+    while the others wait for it and load the cached shared library. The cache is locked with
+    ``flock`` , so it must not be shared by several hosts through a network filesystem.
+    Only the ``PADDLE_EXTENSION_CACHE_SIZE`` (4 by default) most recently used builds of every
+    extension are kept in the cache, remove the cache directory to clean it completely.
+
     Note:
 
         1. Currently we support Linux, MacOS and Windows platform.
@@ -982,6 +1005,8 @@ def load(
                             it will use ``PADDLE_EXTENSION_DIR`` from os.environ. Use
                             ``paddle.utils.cpp_extension.get_build_directory()`` to see the location. Default is None.
         verbose(bool, optional): whether to verbose compiled log information. Default is False.
+        jobs(int|None, optional): Specify the number of source files compiled in parallel. If set None,
+                            it will use the number of cpus. Default is None.
 
     Returns:
         Module: A callable python module contains all CustomOp Layer APIs.
@@ -1009,6 +1034,9 @@ def load(
     assert isinstance(
         extra_cuda_cflags, list
     ), f"Required type(extra_cuda_cflags) == list[str], but received {extra_cuda_cflags}"
+    assert jobs is None or (
+        isinstance(jobs, int) and jobs > 0
+    ), f"Required jobs to be None or a positive int, but received {jobs}"
 
     log_v(
         "additional extra_cxx_cflags: [{}], extra_cuda_cflags: [{}]".format(
@@ -1031,8 +1059,39 @@ def load(
         extra_cuda_cflags,
         extra_ldflags,
         verbose,
+        jobs,
+    )
+
+    # see NOTE: [ extension build cache ]
+    cache_key = _build_cache_key(
+        name,
+        sources,
+        extra_include_paths,
+        extra_library_paths,
+        extra_cxx_cflags,
+        extra_cuda_cflags,
+        extra_ldflags,
+    )
+    cache_directory = _get_build_cache_directory(build_directory)
+    library_path = _get_library_path(name, build_base_dir)
+    cache_path = os.path.join(
+        cache_directory, cache_key, os.path.basename(library_path)
+    )
+    log_v(f"build cache key: {cache_key}", verbose)
+    with FileLock(os.path.join(cache_directory, 'locks', cache_key)):
+        if not _restore_from_build_cache(cache_path, library_path, verbose):
+            # the library left by a previous build may look newer than the
+            # sources, remove it so that build_ext doesn't skip the build.
+            if os.path.exists(library_path):
+                os.remove(library_path)
+            _jit_compile(file_path, verbose)
+            _save_to_build_cache(cache_path, library_path, verbose)
+    _evict_build_cache(
+        cache_directory,
+        os.path.basename(library_path),
+        _get_build_cache_size(),
+        verbose,
     )
-    _jit_compile(file_path, verbose)
 
     # import as callable python api
     custom_op_api = _import_module_from_library(name, build_base_dir, verbose)
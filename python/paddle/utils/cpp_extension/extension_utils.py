@@ -25,6 +25,7 @@ import json
 import logging
 import os
 import re
+import shutil
 import subprocess
 import sys
 import sysconfig
@@ -44,6 +45,7 @@ except ImportError:
 from ...base import core
 from ...base.framework import OpProtoHolder
 from ...sysconfig import get_include, get_lib
+from ..file_lock import FileLock
 
 logger = logging.getLogger("utils.cpp_extension")
 logger.setLevel(logging.INFO)
@@ -378,6 +380,237 @@ def clean_object_if_change_cflags(so_path, extension):
         serialize(version_file, details)
 
 
+# NOTE: [ extension build cache ]
+# `load` used to compile the sources from scratch in every new container and
+# on every rank. The built shared library is now cached under a key hashing
+# the contents of the sources and of the headers they include, the flags, the
+# compiler versions, the python version and the Paddle build. The cache lives
+# in PADDLE_EXTENSION_CACHE_DIR, which may be shared by the jobs on a host,
+# or in the build directory by default. A key is built under a file lock, so
+# concurrent ranks build once and the others copy the cached library.
+#
+# Headers are followed from the directories of the sources and the extra
+# include paths, except the headers of Paddle and python themselves, which
+# are covered by their versions.
+#
+# The locks are flock locks, which only exclude the processes on one host,
+# so the cache may be shared by the jobs and ranks on a host but not through
+# a filesystem shared by several hosts.
+#
+# Every build is kept in ``<cache>/<key>/<library>`` beside its lock file
+# ``<cache>/locks/<key>``. After a build, only the PADDLE_EXTENSION_CACHE_SIZE
+# (4 by default) most recently used builds of the same library are kept, so
+# editing the sources doesn't grow the cache forever. Each evicted build is
+# removed under its own lock, one at a time, so eviction never waits for a
+# lock while holding another. The lock files are tiny and never removed, as
+# removing a lock file while a process waits on it breaks the exclusion.
+# Removing the cache directory cleans the cache completely, as long as no
+# job is using it.
+
+_INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.M)
+
+
+def _find_included_headers(sources, include_dirs):
+    """
+    Return the headers included by sources, recursively, which are found in
+    the directory of the including file or in include_dirs.
+    """
+    ignored_dirs = tuple(
+        os.path.join(os.path.realpath(include_dir), '')
+        for include_dir in [get_include(), sysconfig.get_paths()['include']]
+    )
+
+    headers = []
+    visited = set()
+    pending = [os.path.realpath(source) for source in sources]
+    while pending:
+        path = pending.pop()
+        if path in visited:
+            continue
+        visited.add(path)
+        try:
+            with open(path, 'r', errors='ignore') as f:
+                content = f.read()
+        except OSError:
+            continue
+        if path not in sources:
+            headers.append(path)
+        for include in _INCLUDE_PATTERN.findall(content):
+            for include_dir in [os.path.dirname(path), *include_dirs]:
+                header = os.path.realpath(os.path.join(include_dir, include))
+                if os.path.isfile(header):
+                    if not header.startswith(ignored_dirs):
+                        pending.append(header)
+                    break
+    return sorted(headers)
+
+
+def _compiler_version(compiler):
+    """
+    Return the version output of compiler, or an empty string if it fails.
+    """
+    try:
+        return subprocess.check_output(
+            [compiler, '--version'], stderr=subprocess.STDOUT
+        ).decode(errors='ignore')
+    except Exception:
+        return ''
+
+
+def _build_cache_key(
+    name,
+    sources,
+    include_dirs,
+    library_dirs,
+    extra_cxx_cflags,
+    extra_cuda_cflags,
+    link_args,
+):
+    """
+    Return the key of the shared library built from sources in the build
+    cache, see NOTE: [ extension build cache ].
+    """
+    import paddle
+
+    sources = [os.path.realpath(source) for source in sources]
+    include_dirs = list(include_dirs or [])
+    for flag in [*extra_cxx_cflags, *extra_cuda_cflags]:
+        if flag.startswith(('-I', '/I')) and len(flag) > 2:
+            include_dirs.append(flag[2:])
+
+    sha = hashlib.sha256()
+
+    def update(value):
+        sha.update(repr(value).encode())
+        sha.update(b'\0')
+
+    for field in [
+        name,
+        include_dirs,
+        library_dirs,
+        extra_cxx_cflags,
+        extra_cuda_cflags,
+        link_args,
+    ]:
+        update(field)
+    for path in sources + _find_included_headers(sources, include_dirs):
+        update(path)
+        with open(path, 'rb') as f:
+            sha.update(f.read())
+
+    # the environment of the compilers and the ABI of Paddle
+    update([os.environ.get(var) for var in ['CC', 'CXX', 'CFLAGS', 'LDFLAGS']])
+    if IS_WINDOWS:
+        update(_compiler_version('cl'))
+    else:
+        update(_compiler_version(os.environ.get('CXX', 'c++')))
+    if any(is_cuda_file(source) for source in sources):
+        if core.is_compiled_with_rocm():
+            home, cuda_compiler = find_rocm_home(), 'hipcc'
+        else:
+            home, cuda_compiler = find_cuda_home(), 'nvcc'
+        if home is not None:
+            update(_compiler_version(os.path.join(home, 'bin', cuda_compiler)))
+    update(
+        [
+            sys.version,
+            sysconfig.get_config_var('SOABI'),
+            OS_NAME,
+            paddle.version.full_version,
+            paddle.version.commit,
+            core.is_compiled_with_cuda(),
+            core.is_compiled_with_rocm(),
+        ]
+    )
+    return sha.hexdigest()
+
+
+def _get_build_cache_directory(build_directory):
+    """
+    Return the directory of the build cache, ``PADDLE_EXTENSION_CACHE_DIR``
+    if set, else the ``cache`` directory under build_directory.
+    """
+    cache_directory = os.environ.get('PADDLE_EXTENSION_CACHE_DIR')
+    if not cache_directory:
+        cache_directory = os.path.join(build_directory, 'cache')
+    return os.path.abspath(cache_directory)
+
+
+def _copy_file_atomic(src, dst):
+    # copy into a temporary file beside dst, so that dst is either missing
+    # or complete even if processes copy it concurrently or get killed.
+    tmp_dst = f'{dst}.{os.getpid()}.tmp'
+    try:
+        shutil.copyfile(src, tmp_dst)
+        os.replace(tmp_dst, dst)
+    finally:
+        if os.path.exists(tmp_dst):
+            os.remove(tmp_dst)
+
+
+def _restore_from_build_cache(cache_path, library_path, verbose=False):
+    """
+    Copy the cached library to library_path, return whether it is cached.
+    """
+    if not os.path.isfile(cache_path):
+        return False
+    os.makedirs(os.path.dirname(library_path), exist_ok=True)
+    _copy_file_atomic(cache_path, library_path)
+    # mark the build as recently used for eviction
+    os.utime(cache_path)
+    log_v(f"using cached shared library: {cache_path}", verbose)
+    return True
+
+
+def _save_to_build_cache(cache_path, library_path, verbose=False):
+    """
+    Save the built library into the build cache, a failure only warns as
+    the library is built anyway.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _copy_file_atomic(library_path, cache_path)
+    except OSError as e:
+        warnings.warn(f"Failed to save {library_path} into cache: {e}")
+        return
+    log_v(f"save shared library into cache: {cache_path}", verbose)
+
+
+def _get_build_cache_size():
+    """
+    Return the number of builds of a library kept in the build cache,
+    ``PADDLE_EXTENSION_CACHE_SIZE`` if set, else 4.
+    """
+    return max(int(os.environ.get('PADDLE_EXTENSION_CACHE_SIZE', 4)), 1)
+
+
+def _evict_build_cache(cache_directory, library_name, keep, verbose=False):
+    """
+    Remove the builds of library_name in the build cache except the keep
+    most recently used ones, see NOTE: [ extension build cache ].
+    """
+    builds = []
+    try:
+        keys = os.listdir(cache_directory)
+    except OSError:
+        return
+    for key in keys:
+        cache_path = os.path.join(cache_directory, key, library_name)
+        try:
+            builds.append((os.path.getmtime(cache_path), key))
+        except OSError:
+            continue
+    builds.sort(reverse=True)
+    for _, key in builds[keep:]:
+        # the lock file is kept, a process blocked on it would otherwise
+        # hold the lock together with a process opening a new file.
+        with FileLock(os.path.join(cache_directory, 'locks', key)):
+            shutil.rmtree(
+                os.path.join(cache_directory, key), ignore_errors=True
+            )
+        log_v(f"evict shared library from cache: {key}", verbose)
+
+
 def prepare_unix_cudaflags(cflags):
     """
     Prepare all necessary compiled flags for nvcc compiling CUDA files.
@@ -1006,9 +1239,9 @@ def parse_op_info(op_name: str) -> tuple[list[str], list[str], list[str]]:
     return in_names, attr_names, out_names
 
 
-def _import_module_from_library(module_name, build_directory, verbose=False):
+def _get_library_path(module_name, build_directory):
     """
-    Load shared library and import it as callable python module.
+    Return the path of the shared library built by `load`.
     """
     if IS_WINDOWS:
         dynamic_suffix = '.pyd'
@@ -1016,7 +1249,14 @@ def _import_module_from_library(module_name, build_directory, verbose=False):
         dynamic_suffix = '.dylib'
     else:
         dynamic_suffix = '.so'
-    ext_path = os.path.join(build_directory, module_name + dynamic_suffix)
+    return os.path.join(build_directory, module_name + dynamic_suffix)
+
+
+def _import_module_from_library(module_name, build_directory, verbose=False):
+    """
+    Load shared library and import it as callable python module.
+    """
+    ext_path = _get_library_path(module_name, build_directory)
     if not os.path.exists(ext_path):
         raise FileNotFoundError(f"Extension path: {ext_path} does not exist.")
 
@@ -1317,6 +1557,7 @@ def _write_setup_file(
     extra_cuda_cflags,
     link_args,
     verbose=False,
+    jobs=None,
 ):
     """
     Automatically generate setup.py and write it into build directory.
@@ -1339,7 +1580,8 @@ def _write_setup_file(
                 extra_link_args={extra_link_args})],
         cmdclass={{"build_ext" : BuildExtension.with_options(
             output_dir=r'{build_dir}',
-            no_python_abi_suffix=True)
+            no_python_abi_suffix=True,
+            jobs={jobs})
         }})"""
     ).lstrip()
 
@@ -1358,6 +1600,7 @@ def _write_setup_file(
         extra_cuda_cflags=list2str(extra_cuda_cflags),
         extra_link_args=list2str(link_args),
         build_dir=build_dir,
+        jobs=jobs,
     )
 
     log_v(f'write setup.py into {file_path}', verbose)
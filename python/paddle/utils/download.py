@@ -14,7 +14,9 @@
 
 from __future__ import annotations
 
+import collections
 import hashlib
+import json
 import os
 import os.path as osp
 import shutil
@@ -22,10 +24,13 @@ import sys
 import tarfile
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 
 import httpx
 
+from .file_lock import FileLock
+
 try:
     from tqdm import tqdm
 except:
@@ -37,7 +42,8 @@ except:
 
         def update(self, n):
             self.n += n
-            if self.total is None:
+            if not self.total:
+                # the size is unknown, or the file is empty
                 sys.stderr.write(f"\r{self.n:.1f} bytes")
             else:
                 sys.stderr.write(f"\r{100 * self.n / float(self.total):.1f}%")
@@ -60,6 +66,14 @@ WEIGHTS_HOME = osp.expanduser("~/.cache/paddle/hapi/weights")
 
 DOWNLOAD_RETRY_LIMIT = 3
 
+# the downloaded files with md5sum are cached here by their md5sum, and
+# shared by all the processes on the host
+DOWNLOAD_CACHE_HOME = osp.expanduser("~/.cache/paddle/download")
+
+DOWNLOAD_NUM_WORKERS = 8
+
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 def is_url(path: str) -> bool:
     """
@@ -168,33 +182,164 @@ def get_path_from_url(
     return fullpath
 
 
-def _get_download(url, fullname):
-    # using requests.get method
-    fname = osp.basename(fullname)
+def _lock_path(fullname):
+    key = hashlib.sha1(osp.abspath(fullname).encode('utf-8')).hexdigest()
+    return osp.join(DOWNLOAD_CACHE_HOME, 'locks', key)
+
+
+def _load_partial(url, tmp_fullname, md5):
+    # return the size and the validator of the partial file left by the
+    # last failed download, and hash the downloaded part
+    meta_fullname = tmp_fullname + ".meta"
     try:
-        with httpx.stream(
-            "GET", url, timeout=None, follow_redirects=True
-        ) as req:
-            if req.status_code != 200:
-                raise RuntimeError(
-                    f"Downloading from {url} failed with code "
-                    f"{req.status_code}!"
+        with open(meta_fullname) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return 0, None
+    if meta.get('url') != url or not meta.get('validator'):
+        return 0, None
+    if not osp.exists(tmp_fullname):
+        return 0, None
+
+    offset = 0
+    with open(tmp_fullname, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            md5.update(chunk)
+            offset += len(chunk)
+    return offset, meta['validator']
+
+
+def _get_validator(headers):
+    # only a strong ETag can be used by If-Range
+    etag = headers.get('etag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('last-modified')
+
+
+def _fetch_range(client, url, start, end, validator):
+    headers = {'Range': f'bytes={start}-{end - 1}'}
+    if validator:
+        headers['If-Range'] = validator
+    req = client.get(url, headers=headers)
+    if req.status_code != 206 or len(req.content) != end - start:
+        raise RuntimeError(
+            f"Downloading bytes [{start}, {end}) from {url} failed with "
+            f"code {req.status_code}!"
+        )
+    return req.content
+
+
+def _write_ranges(client, url, f, md5, pbar, start, total_size, validator):
+    # fetch the chunks in parallel, but write and hash them in order, so
+    # the partial file is always a prefix to resume from
+    ranges = iter(
+        [
+            (s, min(s + DOWNLOAD_CHUNK_SIZE, total_size))
+            for s in range(start, total_size, DOWNLOAD_CHUNK_SIZE)
+        ]
+    )
+    with ThreadPoolExecutor(DOWNLOAD_NUM_WORKERS) as pool:
+        pending = collections.deque()
+
+        def submit():
+            r = next(ranges, None)
+            if r is not None:
+                pending.append(
+                    pool.submit(_fetch_range, client, url, *r, validator)
                 )
 
-            tmp_fullname = fullname + "_tmp"
-            total_size = req.headers.get('content-length')
-            with open(tmp_fullname, 'wb') as f:
-                if total_size:
-                    with tqdm(total=(int(total_size) + 1023) // 1024) as pbar:
-                        for chunk in req.iter_bytes(chunk_size=1024):
-                            f.write(chunk)
-                            pbar.update(1)
+        for _ in range(2 * DOWNLOAD_NUM_WORKERS):
+            submit()
+        try:
+            while pending:
+                data = pending.popleft().result()
+                f.write(data)
+                md5.update(data)
+                pbar.update(len(data))
+                submit()
+        except:
+            for future in pending:
+                future.cancel()
+            raise
+
+
+def _get_download(url, fullname):
+    # using httpx, the chunks are fetched by parallel range requests if the
+    # server supports, a failed download is resumed from where it stopped,
+    # return the md5 of the file computed while downloading
+    fname = osp.basename(fullname)
+    tmp_fullname = fullname + "_tmp"
+    meta_fullname = tmp_fullname + ".meta"
+    try:
+        with httpx.Client(timeout=None, follow_redirects=True) as client:
+            md5 = hashlib.md5()
+            offset, validator = _load_partial(url, tmp_fullname, md5)
+            # the first chunk also probes whether ranges are supported
+            headers = {
+                'Range': f'bytes={offset}-{offset + DOWNLOAD_CHUNK_SIZE - 1}'
+            }
+            if offset > 0:
+                headers['If-Range'] = validator
+            with client.stream("GET", url, headers=headers) as req:
+                if req.status_code == 206:
+                    content_range = req.headers.get('content-range', '')
+                    total_size = int(content_range.split('/')[-1])
+                elif req.status_code == 200:
+                    # no range support, or the file has been changed
+                    offset = 0
+                    md5 = hashlib.md5()
+                    total_size = req.headers.get('content-length')
+                    total_size = int(total_size) if total_size else None
+                elif req.status_code == 416 and offset > 0:
+                    # start from zero next time
+                    os.remove(meta_fullname)
+                    raise RuntimeError(f"Partial file of {fname} is invalid")
+                elif req.status_code == 416 and req.headers.get(
+                    'content-range', ''
+                ).endswith('/0'):
+                    # the range of an empty file is not satisfiable
+                    total_size = 0
                 else:
-                    for chunk in req.iter_bytes(chunk_size=1024):
-                        if chunk:
-                            f.write(chunk)
+                    raise RuntimeError(
+                        f"Downloading from {url} failed with code "
+                        f"{req.status_code}!"
+                    )
+
+                validator = _get_validator(req.headers)
+                if offset == 0:
+                    with open(meta_fullname, 'w') as f:
+                        json.dump({'url': url, 'validator': validator}, f)
+
+                with open(tmp_fullname, 'ab' if offset else 'wb') as f:
+                    with tqdm(total=total_size) as pbar:
+                        pbar.update(offset)
+                        if req.status_code != 416:
+                            for chunk in req.iter_bytes(chunk_size=1024 * 1024):
+                                f.write(chunk)
+                                md5.update(chunk)
+                                pbar.update(len(chunk))
+                                offset += len(chunk)
+                        if req.status_code == 206 and offset < total_size:
+                            _write_ranges(
+                                client,
+                                url,
+                                f,
+                                md5,
+                                pbar,
+                                offset,
+                                total_size,
+                                validator,
+                            )
+                    if total_size is not None and f.tell() != total_size:
+                        raise RuntimeError(
+                            f"Downloading {fname} from {url} is incomplete"
+                        )
+
             shutil.move(tmp_fullname, fullname)
-            return fullname
+            if osp.exists(meta_fullname):
+                os.remove(meta_fullname)
+            return md5.hexdigest()
 
     except Exception as e:  # requests.exceptions.ConnectionError
         logger.info(f"Downloading {fname} from {url} failed with exception {e}")
@@ -204,10 +349,50 @@ def _get_download(url, fullname):
 _download_methods = {'get': _get_download}
 
 
+def _download_with_retry(url, fullname, md5sum, method):
+    fname = osp.basename(fullname)
+    retry_cnt = 0
+    while True:
+        if retry_cnt < DOWNLOAD_RETRY_LIMIT:
+            retry_cnt += 1
+        else:
+            raise RuntimeError(
+                f"Download from {url} failed. " "Retry limit reached"
+            )
+
+        calc_md5sum = _download_methods[method](url, fullname)
+        if not calc_md5sum:
+            time.sleep(1)
+            continue
+        if md5sum is None or calc_md5sum == md5sum:
+            return fullname
+
+        logger.info(
+            f"File {fname} md5 check failed, {calc_md5sum}(calc) != "
+            f"{md5sum}(base)"
+        )
+        os.remove(fullname)
+
+
+def _link_or_copy(src, dst):
+    tmp_dst = dst + "_tmp"
+    if osp.exists(tmp_dst):
+        os.remove(tmp_dst)
+    try:
+        os.link(src, tmp_dst)
+    except OSError:
+        shutil.copyfile(src, tmp_dst)
+    os.replace(tmp_dst, dst)
+
+
 def _download(url, path, md5sum=None, method='get'):
     """
     Download from url, save to path.
 
+    The file with md5sum is downloaded to DOWNLOAD_CACHE_HOME once and linked
+    to path, the processes on the host downloading the same file wait for
+    the one downloading it.
+
     url (str): download url
     path (str): download to given path
     md5sum (str): md5 sum of download package
@@ -217,25 +402,31 @@ def _download(url, path, md5sum=None, method='get'):
     assert method in _download_methods, f'make sure `{method}` implemented'
 
     if not osp.exists(path):
-        os.makedirs(path)
+        os.makedirs(path, exist_ok=True)
 
     fname = osp.split(url)[-1]
     fullname = osp.join(path, fname)
-    retry_cnt = 0
 
-    logger.info(f"Downloading {fname} from {url}")
-    while not (osp.exists(fullname) and _md5check(fullname, md5sum)):
+    with FileLock(_lock_path(fullname)):
         logger.info(f"md5check {fullname} and {md5sum}")
-        if retry_cnt < DOWNLOAD_RETRY_LIMIT:
-            retry_cnt += 1
-        else:
-            raise RuntimeError(
-                f"Download from {url} failed. " "Retry limit reached"
-            )
+        if osp.exists(fullname) and _md5check(fullname, md5sum):
+            return fullname
 
-        if not _download_methods[method](url, fullname):
-            time.sleep(1)
-            continue
+        logger.info(f"Downloading {fname} from {url}")
+        if md5sum is None:
+            return _download_with_retry(url, fullname, md5sum, method)
+
+        cached = osp.join(DOWNLOAD_CACHE_HOME, 'md5', md5sum)
+        try:
+            os.makedirs(osp.dirname(cached), exist_ok=True)
+        except OSError:
+            return _download_with_retry(url, fullname, md5sum, method)
+        with FileLock(_lock_path(cached)):
+            if not osp.exists(cached):
+                _download_with_retry(url, cached, md5sum, method)
+            else:
+                logger.info(f"Found {fname} in {DOWNLOAD_CACHE_HOME}")
+        _link_or_copy(cached, fullname)
 
     return fullname
 
@@ -0,0 +1,61 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import logging
+import os
+
+__all__ = []
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Exclusive lock among the processes on a host, it is a no-op on the
+    platforms without fcntl. The lock is not reliable on a filesystem shared
+    by several hosts, and the lock file must not be removed while it may be
+    locked.
+
+    Args:
+        path(str): The path of the lock file, the parent directories are
+            created if they do not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._f = None
+
+    def __enter__(self) -> FileLock:
+        try:
+            import fcntl
+        except ImportError:
+            return self
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._f = open(self.path, 'a')
+        except OSError as e:
+            logger.warning(f"Lock {self.path} failed with exception {e}")
+            return self
+        fcntl.flock(self._f.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._f is not None:
+            import fcntl
+
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+            self._f.close()
+            self._f = None
@@ -16,9 +16,11 @@
 from __future__ import annotations
 
 import importlib
-from typing import TYPE_CHECKING
+import sys
+from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
     from types import ModuleType
 
 
@@ -46,3 +48,50 @@ def try_import(module_name: str, err_msg: str | None = None) -> ModuleType:
                 f"manually installed (usually with `pip install {install_name}`). "
             )
         raise ImportError(err_msg)
+
+
+def lazy_submodules(
+    module_name: str,
+    submodules: Iterable[str],
+    attributes: Mapping[str, str] | None = None,
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build the PEP 562 ``__getattr__`` and ``__dir__`` of module ``module_name``
+    to import its ``submodules`` on first access. ``attributes`` maps the names
+    of the module to the submodules defining them, which are imported on first
+    access of the names as well. The imported values are set on the module, so
+    ``__getattr__`` is only called once for every name.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # in the __init__.py of a package
+            >>> # doctest: +SKIP('only works in a package')
+            >>> __getattr__, __dir__ = lazy_submodules(
+            ...     __name__, ['vision'], {'Model': 'hapi'}
+            ... )
+    """
+    submodules = frozenset(submodules)
+    attributes = dict(attributes or {})
+
+    def __getattr__(name: str) -> Any:
+        if name in submodules:
+            value = importlib.import_module(f"{module_name}.{name}")
+        elif name in attributes:
+            submodule = importlib.import_module(
+                f"{module_name}.{attributes[name]}"
+            )
+            value = getattr(submodule, name)
+        else:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            )
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(
+            set(vars(sys.modules[module_name])) | submodules | set(attributes)
+        )
+
+    return __getattr__, __dir__
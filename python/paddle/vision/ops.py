@@ -1954,21 +1954,29 @@ def nms(
 
     If category_idxs and categories are provided, NMS will be performed with a batched style,
     which means NMS will be applied to each category respectively and results of each category
-    will be concatenated and sorted by scores.
+    will be concatenated and sorted by scores. Boxes whose category is not in categories are ignored.
+    The boxes of all the categories are processed by a single NMS kernel, each category is moved
+    by a coordinate offset so that boxes of different categories never overlap.
 
-    If K is provided, only the first k elements will be returned. Otherwise, all box indices sorted by scores will be returned.
+    If boxes is a 3D-Tensor, NMS will be applied to each image of the batch respectively in the
+    same way, and the indices into the flattened boxes of shape [batch_size * num_boxes, 4] are
+    returned, sorted by image firstly and then by scores.
+
+    If K is provided, only the first k elements (of each image) will be returned. Otherwise, all box indices sorted by scores will be returned.
 
     Args:
         boxes(Tensor): The input boxes data to be computed, it's a 2D-Tensor with
-            the shape of [num_boxes, 4]. The data type is float32 or float64.
+            the shape of [num_boxes, 4], or a 3D-Tensor with the shape of [batch_size, num_boxes, 4].
+            The data type is float32 or float64.
             Given as [[x1, y1, x2, y2], …],  (x1, y1) is the top left coordinates,
             and (x2, y2) is the bottom right coordinates.
             Their relation should be ``0 <= x1 < x2 && 0 <= y1 < y2``.
         iou_threshold(float, optional): IoU threshold for determine overlapping boxes. Default value: 0.3.
         scores(Tensor|None, optional): Scores corresponding to boxes, it's a 1D-Tensor with
-            shape of [num_boxes]. The data type is float32 or float64. Default: None.
+            shape of [num_boxes], or a 2D-Tensor with shape of [batch_size, num_boxes] for batched boxes.
+            The data type is float32 or float64. Default: None.
         category_idxs(Tensor|None, optional): Category indices corresponding to boxes.
-            it's a 1D-Tensor with shape of [num_boxes]. The data type is int64. Default: None.
+            it's a Tensor with the same shape as scores. The data type is int64. Default: None.
         categories(list|tuple|None, optional): A list of unique id of all categories. The data type is int64. Default: None.
         top_k(int|None, optional): The top K boxes who has higher score and kept by NMS preds to
             consider. top_k should be smaller equal than num_boxes. Default: None.
@@ -2026,12 +2034,10 @@ def nms(
             )
             return out
 
-    if scores is None:
-        return _nms(boxes, iou_threshold)
-
-    import paddle
-
-    if category_idxs is None:
+    batched = len(boxes.shape) == 3
+    if not batched and category_idxs is None:
+        if scores is None:
+            return _nms(boxes, iou_threshold)
         sorted_global_indices = paddle.argsort(scores, descending=True)
         sorted_keep_boxes_indices = _nms(
             boxes[sorted_global_indices], iou_threshold
@@ -2039,67 +2045,94 @@ def nms(
         return sorted_global_indices[sorted_keep_boxes_indices]
 
     if top_k is not None:
+        assert scores is not None, "top_k is only supported with scores"
         assert (
-            top_k <= scores.shape[0]
+            top_k <= scores.shape[-1]
         ), "top_k should be smaller equal than the number of boxes"
-    assert (
-        categories is not None
-    ), "if category_idxs is given, categories which is a list of unique id of all categories is necessary"
-
-    mask = paddle.zeros_like(scores, dtype='int32')
-
-    for category_id in categories:
-        cur_category_boxes_idxs = paddle.where(
-            paddle.equal(category_idxs, paddle.to_tensor(category_id))
-        )[0]
-        shape = cur_category_boxes_idxs.shape[0]
-        cur_category_boxes_idxs = paddle.reshape(
-            cur_category_boxes_idxs, [shape]
-        )
-        if shape == 0:
-            continue
-        elif shape == 1:
-            mask[cur_category_boxes_idxs] = 1
-            continue
-        cur_category_boxes = boxes[cur_category_boxes_idxs]
-        cur_category_scores = scores[cur_category_boxes_idxs]
-        cur_category_sorted_indices = paddle.argsort(
-            cur_category_scores, descending=True
-        )
-        cur_category_sorted_boxes = cur_category_boxes[
-            cur_category_sorted_indices
-        ]
-
-        cur_category_keep_boxes_sub_idxs = cur_category_sorted_indices[
-            _nms(cur_category_sorted_boxes, iou_threshold)
-        ]
-
-        updates = paddle.ones_like(
-            cur_category_boxes_idxs[cur_category_keep_boxes_sub_idxs],
-            dtype='int32',
+    if category_idxs is not None:
+        assert (
+            categories is not None
+        ), "if category_idxs is given, categories which is a list of unique id of all categories is necessary"
+
+    # NOTE: NMS is performed for all the categories (and images) in a single
+    # kernel launch: every box is moved by an offset of its group, so that
+    # the boxes of different groups never overlap with each other. Groups
+    # are numbered densely by the rank of the category (and the image), not
+    # by the category id, and the offset boxes are computed in float64:
+    # ``num_groups * span`` quickly exceeds the range float32 represents
+    # exactly (2^24), while float64 is exact up to 2^53.
+    flat_boxes = paddle.reshape(boxes, [-1, 4])
+    if batched:
+        image_ids = (
+            paddle.cumsum(
+                paddle.ones_like(boxes[:, :, 0], dtype='int64'), axis=0
+            )
+            - 1
         )
-        mask = paddle.scatter(
-            mask,
-            cur_category_boxes_idxs[cur_category_keep_boxes_sub_idxs],
-            updates,
-            overwrite=True,
+        image_ids = paddle.reshape(image_ids, [-1])
+
+    if category_idxs is not None:
+        if len(categories) == 0:
+            return paddle.zeros([0], dtype='int64')
+        flat_category_idxs = paddle.reshape(category_idxs, [-1]).astype('int64')
+        category_tensor = paddle.to_tensor(list(categories), dtype='int64')
+        # boxes whose category is not in categories are ignored
+        valid = paddle.isin(flat_category_idxs, category_tensor)
+        candidate_idxs = paddle.reshape(paddle.where(valid)[0], [-1])
+        if in_dygraph_mode() and candidate_idxs.shape[0] == 0:
+            return candidate_idxs
+        # NOTE: there may be no candidate in static mode, the offsets are
+        # computed from categories and all the boxes, which are not empty.
+        group_ids = paddle.searchsorted(
+            paddle.sort(category_tensor), flat_category_idxs[candidate_idxs]
         )
-    keep_boxes_idxs = paddle.where(mask)[0]
-    shape = keep_boxes_idxs.shape[0]
-    keep_boxes_idxs = paddle.reshape(keep_boxes_idxs, [shape])
-    sorted_sub_indices = paddle.argsort(
-        scores[keep_boxes_idxs], descending=True
+        if batched:
+            group_ids = image_ids[candidate_idxs] * len(categories) + group_ids
+        candidate_boxes = flat_boxes[candidate_idxs]
+    else:
+        candidate_idxs = None
+        group_ids = image_ids
+        candidate_boxes = flat_boxes
+
+    min_coordinate = flat_boxes.min().astype('float64')
+    span = flat_boxes.max().astype('float64') - min_coordinate + 1
+    offset_boxes = (
+        candidate_boxes.astype('float64')
+        - min_coordinate
+        + group_ids.astype('float64').unsqueeze(-1) * span
     )
 
-    if top_k is None:
-        return keep_boxes_idxs[sorted_sub_indices]
-
-    if in_dygraph_mode():
-        top_k = min(top_k, shape)
-        _, topk_sub_indices = paddle.topk(scores[keep_boxes_idxs], top_k)
-        return keep_boxes_idxs[topk_sub_indices]
+    if scores is not None:
+        flat_scores = paddle.reshape(scores, [-1])
+        if candidate_idxs is not None:
+            flat_scores = flat_scores[candidate_idxs]
+        order = paddle.argsort(flat_scores, descending=True, stable=True)
+    else:
+        order = paddle.cumsum(paddle.ones_like(group_ids), axis=0) - 1
+    if batched:
+        # sort by image, and then by score within every image
+        sorted_image_ids = image_ids
+        if candidate_idxs is not None:
+            sorted_image_ids = sorted_image_ids[candidate_idxs]
+        order = order[paddle.argsort(sorted_image_ids[order], stable=True)]
+
+    keep = order[_nms(offset_boxes[order], iou_threshold)]
+    if candidate_idxs is not None:
+        keep = candidate_idxs[keep]
 
-    return keep_boxes_idxs[sorted_sub_indices][:top_k]
+    if top_k is None:
+        return keep
+    if not batched:
+        return keep[:top_k]
+
+    # the rank of every kept box within its image
+    keep_image_ids = image_ids[keep]
+    rank = (
+        paddle.cumsum(paddle.ones_like(keep_image_ids), axis=0)
+        - 1
+        - paddle.searchsorted(keep_image_ids, keep_image_ids)
+    )
+    return keep[paddle.reshape(paddle.where(rank < top_k)[0], [-1])]
 
 
 @overload
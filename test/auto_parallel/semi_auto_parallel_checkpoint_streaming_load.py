@@ -0,0 +1,73 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+
+import numpy as np
+
+import paddle
+import paddle.distributed as dist
+
+
+class TestStreamingLoad:
+    def __init__(self):
+        self._ckpt_path = os.getenv("ckpt_path")
+
+    def test_streaming_load(self):
+        rank = paddle.distributed.get_rank()
+        mesh = dist.ProcessMesh([0, 1])
+        # each shard of w is large enough to be read by byte ranges
+        w = paddle.arange(1024 * 64, dtype='float32').reshape([1024, 64])
+        b = paddle.arange(16, dtype='int64')
+        state_dict = {
+            "w": dist.shard_tensor(w, mesh, [dist.Shard(0)]),
+            "b": dist.shard_tensor(b, mesh, [dist.Shard(0)]),
+        }
+        dist.save_state_dict(state_dict, self._ckpt_path)
+        paddle.distributed.barrier()
+
+        # every rank can only access its own data file, so the shards of
+        # the other rank have to be sent by point-to-point communication
+        local_path = os.path.join(self._ckpt_path, f"rank_{rank}")
+        os.makedirs(local_path)
+        for file_name in os.listdir(self._ckpt_path):
+            if file_name.endswith(".metadata") or file_name.startswith(
+                f"{rank}_"
+            ):
+                shutil.copy(
+                    os.path.join(self._ckpt_path, file_name), local_path
+                )
+
+        target = {
+            "w": dist.shard_tensor(
+                paddle.zeros([1024, 64]), mesh, [dist.Replicate()]
+            ),
+            "b": dist.shard_tensor(
+                paddle.zeros([16], dtype='int64'), mesh, [dist.Replicate()]
+            ),
+        }
+        # the budget splits each shard of w into several batches
+        dist.load_state_dict(
+            target, local_path, streaming=True, memory_budget=16 * 1024
+        )
+        np.testing.assert_equal(target["w"]._local_value().numpy(), w.numpy())
+        np.testing.assert_equal(target["b"]._local_value().numpy(), b.numpy())
+
+    def run_test_case(self):
+        self.test_streaming_load()
+
+
+if __name__ == '__main__':
+    TestStreamingLoad().run_test_case()
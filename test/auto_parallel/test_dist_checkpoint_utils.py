@@ -64,6 +64,20 @@ class TestDistCheckpointUtils(test_base.CommunicationTestDistBase):
             )
             ckpt_path_tmp.cleanup()
 
+    def test_streaming_load(self):
+        envs_list = test_base.gen_product_envs_list(
+            self._default_envs, self._changeable_envs
+        )
+        for envs in envs_list:
+            ckpt_path_tmp = tempfile.TemporaryDirectory()
+            ckpt_path = ckpt_path_tmp.name
+            envs["ckpt_path"] = ckpt_path
+            self.run_test_case(
+                "semi_auto_parallel_checkpoint_streaming_load.py",
+                user_defined_envs=envs,
+            )
+            ckpt_path_tmp.cleanup()
+
     def test_flatten_state_dict(self):
         state_dict = {
             "model": {
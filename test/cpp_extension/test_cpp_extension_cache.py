@@ -0,0 +1,144 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from paddle.utils.cpp_extension.extension_utils import (
+    _build_cache_key,
+    _evict_build_cache,
+    _find_included_headers,
+    _get_build_cache_directory,
+    _restore_from_build_cache,
+    _save_to_build_cache,
+)
+
+
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.temp_dir.name)
+        os.makedirs(os.path.join(self.root, 'src', 'sub'))
+        os.makedirs(os.path.join(self.root, 'include'))
+        self.source = self.write(
+            'src/op.cc', '#include "sub/a.h"\n#include <common.h>\n'
+        )
+        self.header = self.write('src/sub/a.h', '  #  include "b.h"\n')
+        self.nested_header = self.write('src/sub/b.h', '#include "a.h"\n')
+        self.include_dir = os.path.join(self.root, 'include')
+        self.common_header = self.write(
+            'include/common.h', '#include <vector>'
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, content):
+        path = os.path.join(self.root, path)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def key(self, cflags=()):
+        return _build_cache_key(
+            'custom_op',
+            [self.source],
+            [self.include_dir],
+            None,
+            list(cflags),
+            [],
+            None,
+        )
+
+    def test_included_headers(self):
+        self.assertEqual(
+            _find_included_headers([self.source], [self.include_dir]),
+            sorted([self.common_header, self.header, self.nested_header]),
+        )
+
+    def test_key(self):
+        key = self.key()
+        self.assertEqual(self.key(), key)
+        self.assertNotEqual(self.key(['-O3']), key)
+
+        self.write('include/common.h', '#include <vector>\n// changed')
+        header_key = self.key()
+        self.assertNotEqual(header_key, key)
+
+        self.write('src/op.cc', '#include "sub/a.h"\n')
+        self.assertNotEqual(self.key(), header_key)
+
+    def test_restore_and_save(self):
+        cache_directory = os.path.join(self.root, 'cache')
+        os.environ['PADDLE_EXTENSION_CACHE_DIR'] = cache_directory
+        try:
+            self.assertEqual(
+                _get_build_cache_directory(self.root), cache_directory
+            )
+        finally:
+            del os.environ['PADDLE_EXTENSION_CACHE_DIR']
+        self.assertEqual(
+            _get_build_cache_directory(self.root),
+            os.path.join(self.root, 'cache'),
+        )
+
+        cache_path = os.path.join(cache_directory, self.key(), 'custom_op.so')
+        library_path = os.path.join(self.root, 'build', 'custom_op.so')
+        self.assertFalse(_restore_from_build_cache(cache_path, library_path))
+
+        built_path = self.write('custom_op.so', 'library')
+        _save_to_build_cache(cache_path, built_path)
+        self.assertTrue(_restore_from_build_cache(cache_path, library_path))
+        with open(library_path) as f:
+            self.assertEqual(f.read(), 'library')
+        self.assertEqual(
+            os.listdir(os.path.dirname(cache_path)), ['custom_op.so']
+        )
+
+    def test_evict(self):
+        cache_directory = os.path.join(self.root, 'cache')
+        built_path = self.write('custom_op.so', 'library')
+        keys = [f'key{i}' for i in range(4)]
+        for i, key in enumerate(keys):
+            cache_path = os.path.join(cache_directory, key, 'custom_op.so')
+            _save_to_build_cache(cache_path, built_path)
+            os.makedirs(os.path.join(cache_directory, 'locks'), exist_ok=True)
+            self.write(os.path.join('cache', 'locks', key), '')
+            os.utime(cache_path, (i, i))
+        other_path = os.path.join(cache_directory, 'other', 'other_op.so')
+        _save_to_build_cache(other_path, built_path)
+        os.utime(other_path, (0, 0))
+
+        # restoring key0 makes it the most recently used
+        library_path = os.path.join(self.root, 'build', 'custom_op.so')
+        self.assertTrue(
+            _restore_from_build_cache(
+                os.path.join(cache_directory, 'key0', 'custom_op.so'),
+                library_path,
+            )
+        )
+        _evict_build_cache(cache_directory, 'custom_op.so', 2)
+        self.assertEqual(
+            sorted(os.listdir(cache_directory)),
+            ['key0', 'key3', 'locks', 'other'],
+        )
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(cache_directory, 'locks'))),
+            keys,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
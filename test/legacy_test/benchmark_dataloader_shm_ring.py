@@ -0,0 +1,114 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of batch transport between DataLoader workers and main process,
+# compare the default shared memory DenseTensor transport with the shared
+# memory ring enabled by FLAGS_dataloader_shm_ring_slab_size.
+#
+# Usage:
+#   python benchmark_dataloader_shm_ring.py --batch_size 64 --image_size 224
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+
+
+class ImageDataset(Dataset):
+    def __init__(self, sample_num, image_size):
+        self.sample_num = sample_num
+        self.image = np.random.random([3, image_size, image_size]).astype(
+            'float32'
+        )
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        return self.image, np.array([idx], dtype='int64')
+
+
+def run(args, slab_size):
+    if slab_size > 0:
+        os.environ['FLAGS_dataloader_shm_ring_slab_size'] = str(slab_size)
+    else:
+        os.environ.pop('FLAGS_dataloader_shm_ring_slab_size', None)
+
+    dataset = ImageDataset(args.batch_size * args.batch_num, args.image_size)
+    loader = DataLoader(
+        dataset,
+        places=paddle.CPUPlace(),
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        drop_last=True,
+    )
+    loader_iter = iter(loader)
+
+    costs = []
+    start = time.perf_counter()
+    for image, label in loader_iter:
+        costs.append(time.perf_counter() - start)
+        # consume the batch as a training step would do
+        image.numpy().sum()
+        del image, label
+        start = time.perf_counter()
+
+    batch_nbytes = args.batch_size * (
+        3 * args.image_size * args.image_size * 4 + 8
+    )
+    # skip warmup batches
+    costs = (
+        costs[args.num_workers :] if len(costs) > args.num_workers else costs
+    )
+    ring_batches = loader_iter._shm_ring_batches
+    copied_batches = (
+        len(costs) if slab_size == 0 else (loader_iter._shm_fallback_batches)
+    )
+    return {
+        'latency_ms': 1000 * float(np.mean(costs)),
+        'ring_batches': ring_batches,
+        'ring_mbytes': loader_iter._shm_ring_nbytes / 2**20,
+        'copied_mbytes': copied_batches * batch_nbytes / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--batch_size', type=int, default=64)
+    parser.add_argument('--batch_num', type=int, default=100)
+    parser.add_argument('--image_size', type=int, default=224)
+    parser.add_argument('--num_workers', type=int, default=4)
+    args = parser.parse_args()
+
+    paddle.disable_static()
+    batch_nbytes = args.batch_size * (
+        3 * args.image_size * args.image_size * 4 + 8
+    )
+    slab_size = batch_nbytes + 4096
+    for name, size in [('default', 0), ('shm_ring', slab_size)]:
+        result = run(args, size)
+        print(
+            f"{name:>10}: batch latency {result['latency_ms']:.3f} ms, "
+            f"{result['ring_batches']} batches ({result['ring_mbytes']:.1f} MB) "
+            f"wrapped without copying, "
+            f"{result['copied_mbytes']:.1f} MB copied into new shared memory"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the time of `import paddle` measured by `-X importtime`,
+# compare the lazy subpackages with the eager ones (PADDLE_LAZY_IMPORT=0),
+# and fail if the lazy import is slower than --max_seconds.
+#
+# Usage:
+#   python benchmark_import_time.py --repeat 5 --top 10 --max_seconds 10
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from test_import_lazy import import_time
+
+
+def run(args, lazy):
+    env = dict(os.environ, PADDLE_LAZY_IMPORT='1' if lazy else '0')
+    costs = []
+    for _ in range(args.repeat):
+        modules = import_time('import paddle', env)
+        costs.append(modules['paddle'] / 1e6)
+    # the top level subpackages taking the most time, NOTE: the subpackages
+    # imported by importlib, e.g. the lazy ones, are not listed by importtime
+    subpackages = {
+        name: cost
+        for name, cost in modules.items()
+        if name.startswith('paddle.') and name.count('.') == 1
+    }
+    top = sorted(subpackages.items(), key=lambda x: -x[1])[: args.top]
+    return float(np.median(costs)), len(modules), top
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max_seconds', type=float, default=None)
+    args = parser.parse_args()
+
+    results = {}
+    for name, lazy in [('eager', False), ('lazy', True)]:
+        cost, num_modules, top = run(args, lazy)
+        results[name] = cost
+        print(f"{name:>6}: import paddle {cost:.3f} s, {num_modules} modules")
+        for module, module_cost in top:
+            print(f"        {module:<40} {module_cost / 1e6:.3f} s")
+
+    if args.max_seconds is not None and results['lazy'] > args.max_seconds:
+        print(
+            f"import paddle takes {results['lazy']:.3f} s, more than "
+            f"{args.max_seconds} s"
+        )
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the Python overhead of calling dygraph layers, a Sequential
+# of many tiny layers is called with the forward hooks of different kinds
+# registered on every sublayer.
+#
+# Usage:
+#   python benchmark_layer_call.py --num_layers 1000 --repeat 20
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle
+
+
+class Identity(paddle.nn.Layer):
+    def forward(self, x):
+        return x
+
+
+def build(num_layers, hooks):
+    layers = [Identity() for _ in range(num_layers)]
+    for layer in layers:
+        if hooks in ('pre', 'both'):
+            layer.register_forward_pre_hook(lambda layer, inputs: None)
+        if hooks in ('post', 'both'):
+            layer.register_forward_post_hook(
+                lambda layer, inputs, outputs: None
+            )
+    return layers, paddle.nn.Sequential(*layers)
+
+
+def run(args, hooks):
+    layers, model = build(args.num_layers, hooks)
+    x = paddle.zeros([1])
+
+    def call_sequential():
+        model(x)
+
+    def call_loop():
+        # layers called one by one as in a user defined forward
+        y = x
+        for layer in layers:
+            y = layer(y)
+
+    results = {}
+    for name, fn in [('sequential', call_sequential), ('loop', call_loop)]:
+        fn()
+        costs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            costs.append(time.perf_counter() - start)
+        results[name] = 1e6 * float(np.median(costs)) / args.num_layers
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--num_layers', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    paddle.disable_static()
+    for hooks in ['none', 'pre', 'post', 'both']:
+        result = run(args, hooks)
+        print(
+            f"hooks {hooks:>4}: "
+            f"{result['sequential']:.3f} us/layer in Sequential, "
+            f"{result['loop']:.3f} us/layer called one by one"
+        )
+
+
+if __name__ == '__main__':
+    main()
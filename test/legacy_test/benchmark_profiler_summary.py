@@ -0,0 +1,194 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the profiler summary on a large synthetic trace, every step
+# runs operators with inner events, each launching kernels and memcpys on a
+# few streams. Reports the time of building the columnar event table, of
+# every summary computed from it, and of the interval algebra compared with
+# the list based helpers.
+#
+# Usage:
+#   python benchmark_profiler_summary.py --num_steps 100 --num_ops 500
+
+import argparse
+import random
+import time
+
+import numpy as np
+from test_profiler_statistic import (
+    DevicePythonNode,
+    HostPythonNode,
+    MemPythonNode,
+)
+
+from paddle.profiler import profiler_statistic, statistic_helper
+from paddle.profiler.event_table import EventTable
+from paddle.profiler.profiler_statistic import (
+    TracerEventType,
+    TracerMemEventType,
+)
+
+OP_NAMES = ['matmul', 'conv2d', 'relu', 'add', 'c_allreduce_sum', 'softmax']
+
+
+def build_trace(args):
+    rng = random.Random(0)
+    nodetrees = {}
+    for thread in range(args.num_threads):
+        thread_id = 1000 + thread
+        root = HostPythonNode(
+            'Root Node',
+            TracerEventType.UserDefined,
+            0,
+            float('inf'),
+            1,
+            thread_id,
+        )
+        now = 0
+        for step in range(args.num_steps):
+            step_node = HostPythonNode(
+                f'ProfileStep#{step}',
+                TracerEventType.ProfileStep,
+                now,
+                now + 100 * args.num_ops,
+                1,
+                thread_id,
+            )
+            forward = HostPythonNode(
+                'Forward',
+                TracerEventType.Forward,
+                now,
+                now + 100 * args.num_ops,
+                1,
+                thread_id,
+            )
+            step_node.children_node.append(forward)
+            for _ in range(args.num_ops):
+                op = HostPythonNode(
+                    rng.choice(OP_NAMES),
+                    TracerEventType.Operator,
+                    now,
+                    now + 90,
+                    1,
+                    thread_id,
+                )
+                compute = HostPythonNode(
+                    op.name + '::compute',
+                    TracerEventType.OperatorInner,
+                    now + 10,
+                    now + 80,
+                    1,
+                    thread_id,
+                )
+                launch = HostPythonNode(
+                    'cudaLaunchKernel',
+                    TracerEventType.CudaRuntime,
+                    now + 20,
+                    now + 30,
+                    1,
+                    thread_id,
+                )
+                for stream in range(2):
+                    start = now + 25 + rng.randint(0, 100)
+                    launch.device_node.append(
+                        DevicePythonNode(
+                            op.name + '_kernel',
+                            TracerEventType.Kernel,
+                            start,
+                            start + rng.randint(1, 80),
+                            0,
+                            0,
+                            stream,
+                        )
+                    )
+                compute.mem_node.append(
+                    MemPythonNode(
+                        now + 15,
+                        0,
+                        TracerMemEventType.Allocate,
+                        1,
+                        thread_id,
+                        256,
+                        'Place(gpu:0)',
+                        256,
+                        1024,
+                        4096,
+                        8192,
+                    )
+                )
+                compute.runtime_node.append(launch)
+                op.children_node.append(compute)
+                forward.children_node.append(op)
+                now += 100
+            root.children_node.append(step_node)
+        nodetrees[f'thread{thread_id}'] = root
+    return nodetrees
+
+
+def timeit(fn, repeat):
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        costs.append(time.perf_counter() - start)
+    return 1e3 * float(np.median(costs))
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--num_threads', type=int, default=2)
+    parser.add_argument('--num_steps', type=int, default=100)
+    parser.add_argument('--num_ops', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    nodetrees = build_trace(args)
+    table = EventTable(nodetrees)
+    print(f"{table.size} events, {table.mem_owner.size} memory events")
+
+    cost = timeit(lambda: EventTable(nodetrees), args.repeat)
+    print(f"EventTable: {cost:.1f} ms")
+    for name in [
+        'TimeRangeSummary',
+        'EventSummary',
+        'DistributedSummary',
+        'MemorySummary',
+    ]:
+        summary_class = getattr(profiler_statistic, name)
+        cost = timeit(
+            lambda: summary_class().parse(nodetrees, table), args.repeat
+        )
+        print(f"{name}: {cost:.1f} ms")
+    cost = timeit(
+        lambda: profiler_statistic.StatisticData(nodetrees, {}), args.repeat
+    )
+    print(f"StatisticData: {cost:.1f} ms")
+
+    kernel = table.launched & table.is_type(TracerEventType.Kernel)
+    starts, ends = table.start[kernel], table.end[kernel]
+    ranges = statistic_helper.to_ranges(starts, ends)
+    vectorized = timeit(
+        lambda: statistic_helper.merge_intervals(starts, ends), args.repeat
+    )
+    python_loop = timeit(
+        lambda: statistic_helper.merge_self_ranges(list(ranges)), args.repeat
+    )
+    print(
+        f"merge {len(ranges)} kernel ranges: {vectorized:.1f} ms vectorized, "
+        f"{python_loop:.1f} ms with lists of tuples"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the time to sync the peers of a launch rendezvous versus the
+# number of peers. Every peer runs in its own process with a relay store,
+# the peers form a tree of the given fanout and report the time from the
+# start of the sync to receiving the values of all the peers.
+#
+# Usage:
+#   python benchmark_rendezvous.py --sizes 8 32 128 512 --fanout 8
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from paddle.distributed.launch.utils.rendezvous import (
+    RendezvousClient,
+    RendezvousStore,
+    rendezvous,
+)
+
+
+def _benchmark_worker(endpoint, size, fanout, index, barrier, queue):
+    relay = None
+    relay_endpoint = ''
+    if size > fanout:
+        relay = RendezvousStore(0)
+        relay.start()
+        relay_endpoint = f"127.0.0.1:{relay.server_address[1]}"
+    client = RendezvousClient(endpoint)
+    client.wait_server_ready()
+    # start the sync after all the workers are launched
+    barrier.wait()
+    start = time.time()
+    peers = rendezvous(
+        client,
+        '/bench/info',
+        f'/bench/info/pod{index:05d}/-1',
+        json.dumps({'candidate': f'127.0.0.1:{index}'}),
+        size,
+        fanout=fanout,
+        relay=relay,
+        relay_endpoint=relay_endpoint,
+    )
+    queue.put((time.time() - start, len(peers)))
+    # keep the relay alive for the children
+    time.sleep(2)
+
+
+def benchmark(sizes=(8, 32, 128, 512), fanout=8):
+    """Measure the time to sync the peers versus the number of peers."""
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for size in sizes:
+        store = RendezvousStore(0)
+        store.start()
+        endpoint = f"127.0.0.1:{store.server_address[1]}"
+        queue = ctx.Queue()
+        barrier = ctx.Barrier(size)
+        procs = [
+            ctx.Process(
+                target=_benchmark_worker,
+                args=(endpoint, size, fanout, i, barrier, queue),
+            )
+            for i in range(size)
+        ]
+        for p in procs:
+            p.start()
+        costs = [queue.get() for _ in range(size)]
+        for p in procs:
+            p.join()
+        store.stop()
+        assert all(n == size for _, n in costs)
+        results[size] = max(cost for cost, _ in costs)
+        print(f"peers {size:5d} fanout {fanout:3d} sync {results[size]:.3f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[8, 32, 128, 512]
+    )
+    parser.add_argument('--fanout', type=int, default=8)
+    args = parser.parse_args()
+    benchmark(args.sizes, args.fanout)
+
+
+if __name__ == '__main__':
+    main()
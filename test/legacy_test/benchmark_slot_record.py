@@ -0,0 +1,92 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the output of MultiSlotDataGenerator, the text protocol
+# formatting every sample as a line against the binary slot records encoding
+# a batch of samples at once. Samples hold sparse uint64 slots with a few
+# feasigns each, and a dense float slot. Reports the encoding throughput and
+# the size of the output of both formats.
+#
+# Usage:
+#   python benchmark_slot_record.py --num_samples 20000 --batch_size 128
+
+import argparse
+import time
+
+import numpy as np
+
+from paddle.distributed import fleet
+
+
+def build_samples(args):
+    rng = np.random.RandomState(0)
+    samples = []
+    for _ in range(args.num_samples):
+        sample = []
+        for slot in range(args.num_sparse_slots):
+            num = rng.randint(1, 2 * args.feasigns_per_slot)
+            sample.append(
+                (f"slot{slot}", rng.randint(0, 2**62, num).tolist())
+            )
+        sample.append(("dense", rng.rand(args.dense_dim).tolist()))
+        sample.append(("label", [int(rng.randint(0, 2))]))
+        samples.append(sample)
+    return samples
+
+
+def encode_text(samples, batch_size):
+    generator = fleet.MultiSlotDataGenerator()
+    chunks = []
+    for sample in samples:
+        chunks.append(generator._gen_str(sample))
+    return "".join(chunks).encode()
+
+
+def encode_binary(samples, batch_size):
+    generator = fleet.MultiSlotDataGenerator()
+    chunks = []
+    for start in range(0, len(samples), batch_size):
+        chunks.append(
+            generator._gen_records(samples[start : start + batch_size])
+        )
+    return b"".join(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--num_samples', type=int, default=20000)
+    parser.add_argument('--num_sparse_slots', type=int, default=20)
+    parser.add_argument('--feasigns_per_slot', type=int, default=5)
+    parser.add_argument('--dense_dim', type=int, default=16)
+    parser.add_argument('--batch_size', type=int, default=128)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    samples = build_samples(args)
+    for name, encode in [("text", encode_text), ("binary", encode_binary)]:
+        costs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            data = encode(samples, args.batch_size)
+            costs.append(time.perf_counter() - start)
+        cost = float(np.median(costs))
+        print(
+            f"{name}: {cost * 1e3:.1f} ms, "
+            f"{args.num_samples / cost:.0f} samples/s, "
+            f"{len(data) / 2**20:.1f} MB"
+        )
+
+
+if __name__ == '__main__':
+    main()
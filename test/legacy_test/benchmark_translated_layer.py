@@ -0,0 +1,101 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the latency of TranslatedLayer inference at batch size 1, for
+# small models where the python setup of every call is a large part of the
+# cost. Reports the median latency of a call with gradients disabled, with
+# numpy or Tensor inputs.
+#
+# Usage:
+#   FLAGS_enable_pir_api=0 python benchmark_translated_layer.py --repeat 2000
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import paddle
+from paddle import nn
+
+
+class MLP(nn.Layer):
+    def __init__(self, hidden_size, num_layers):
+        super().__init__()
+        self.layers = nn.LayerList(
+            [nn.Linear(hidden_size, hidden_size) for _ in range(num_layers)]
+        )
+
+    def forward(self, x):
+        for layer in self.layers:
+            x = nn.functional.relu(layer(x))
+        return x
+
+
+class TwoTower(nn.Layer):
+    def __init__(self, hidden_size, num_layers):
+        super().__init__()
+        self.user = MLP(hidden_size, num_layers)
+        self.item = MLP(hidden_size, num_layers)
+
+    def forward(self, user, item):
+        return (self.user(user) * self.item(item)).sum(axis=-1)
+
+
+def measure(layer, inputs, repeat):
+    with paddle.no_grad():
+        for _ in range(10):
+            layer(*inputs)
+        costs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            layer(*inputs)
+            costs.append(time.perf_counter() - start)
+    return float(np.median(costs))
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--hidden_size', type=int, default=64)
+    parser.add_argument('--num_layers', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    paddle.disable_static(paddle.CPUPlace())
+    spec = paddle.static.InputSpec([None, args.hidden_size], 'float32')
+    models = [
+        ("mlp", MLP(args.hidden_size, args.num_layers), [spec]),
+        ("two_tower", TwoTower(args.hidden_size, args.num_layers), [spec] * 2),
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, model, input_spec in models:
+            model.eval()
+            path = os.path.join(temp_dir, name)
+            paddle.jit.save(model, path, input_spec=input_spec)
+            layer = paddle.jit.load(path)
+            layer.eval()
+
+            arrays = [
+                np.random.rand(1, args.hidden_size).astype('float32')
+                for _ in input_spec
+            ]
+            tensors = [paddle.to_tensor(array) for array in arrays]
+            for kind, inputs in [("numpy", arrays), ("tensor", tensors)]:
+                cost = measure(layer, inputs, args.repeat)
+                print(f"{name} ({kind} inputs): {cost * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from paddle.distributed.auto_tuner.scheduler import (
+    ParallelTrialScheduler,
+    Trial,
+    read_metric_values,
+    split_devices,
+)
+from paddle.distributed.auto_tuner.tuner import AutoTuner
+
+
+def get_tuner_cfg():
+    return {
+        "dp_degree": "auto",
+        "mp_degree": "auto",
+        "pp_degree": "auto",
+        "micro_batch_size": "auto",
+        "sharding_degree": "auto",
+        "sharding_stage": "auto",
+        "use_recompute": "auto",
+        "recompute_granularity": "auto",
+        "task_limit": 100,
+        "search_algo": {"name": "model_based", "num_init": 4, "seed": 1},
+        "model_cfg": {
+            "hidden_size": 2048,
+            "global_batch_size": 64,
+            "num_layers": 24,
+            "num_attention_heads": 16,
+            "vocab_size": 50304,
+        },
+        "metric_cfg": {
+            "name": "step/s",
+            "OptimizationDirection": "Maximize",
+        },
+        "nodes": 1,
+        "gpus_per_node": 8,
+        "num_gpus": 8,
+    }
+
+
+def fake_metric(cfg):
+    # the best config is mp 2 with the largest micro batch size and without
+    # recompute
+    return math.exp(
+        -((math.log2(cfg["mp_degree"]) - 1) ** 2)
+        + 0.2 * math.log2(cfg["micro_batch_size"])
+        - 0.5 * cfg["use_recompute"]
+    )
+
+
+class TestModelBasedSearch(unittest.TestCase):
+    def test_search_batch(self):
+        tuner = AutoTuner(get_tuner_cfg())
+        searched = set()
+        while True:
+            new_cfgs = tuner.search_batch(4)
+            if not new_cfgs:
+                break
+            for cfg in new_cfgs:
+                key = str(sorted(cfg.items()))
+                self.assertNotIn(key, searched)
+                searched.add(key)
+                tuner.add_cfg(cfg)
+            for cfg in new_cfgs:
+                cfg["time"] = fake_metric(cfg)
+                cfg["step/s"] = cfg["time"]
+            if len(tuner.history_cfgs) >= 24:
+                break
+        best = max(fake_metric(cfg) for cfg in tuner.algo.all_tasks)
+        found = max(cfg["step/s"] for cfg in tuner.history_cfgs)
+        self.assertGreaterEqual(found, 0.9 * best)
+
+    def test_task_limit(self):
+        tuner_cfg = get_tuner_cfg()
+        tuner_cfg["task_limit"] = 3
+        tuner = AutoTuner(tuner_cfg)
+        self.assertEqual(len(tuner.search_batch(2)), 2)
+        self.assertEqual(len(tuner.search_batch(2)), 1)
+        self.assertEqual(tuner.search_batch(2), [])
+
+
+class TestParallelTrialUtils(unittest.TestCase):
+    def test_split_devices(self):
+        self.assertEqual(
+            split_devices(["0", "1", "2", "3"], 2), [["0", "1"], ["2", "3"]]
+        )
+        with self.assertRaises(ValueError):
+            split_devices(["0", "1", "2"], 2)
+
+    def test_read_metric_values(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            with open(os.path.join(log_dir, "workerlog.0"), "w") as f:
+                f.write("step/s: 1.5, loss: 2.0\n")
+                f.write("loss: 1.0\n")
+                f.write("step/s: 2.5, loss: 0.5\n")
+            self.assertEqual(
+                read_metric_values(log_dir, target_metric="step/s"), [1.5, 2.5]
+            )
+
+
+class FakeProcess:
+    def __init__(self, pid, num_polls):
+        self.pid = pid
+        self.num_polls = num_polls
+        self.killed = False
+
+    def poll(self):
+        self.num_polls -= 1
+        return 0 if self.killed or self.num_polls <= 0 else None
+
+    def wait(self, timeout=None):
+        self.killed = True
+
+
+class FakeAutoTuner:
+    def __init__(self, cfgs):
+        self.cfgs = cfgs
+
+    def search_batch(self, num):
+        cfgs, self.cfgs = self.cfgs[:num], self.cfgs[num:]
+        return cfgs
+
+    def add_cfg(self, cfg):
+        pass
+
+
+class FakeRecorder:
+    def __init__(self):
+        self.history = []
+        self.directions = []
+
+    def add_cfg(self, **kwargs):
+        self.history.append(kwargs)
+
+    def get_best(self, metric, direction):
+        self.directions.append(direction)
+        return self.history[0], False
+
+    def store_history(self, path):
+        pass
+
+
+class TestParallelTrialScheduler(unittest.TestCase):
+    def test_run(self):
+        # name: (num polls before exit, metric values in log, final metric)
+        trials = {
+            "fast": (1, [10.0] * 5, 10.0),
+            "slow": (100, [2.0] * 3, None),
+            "good": (2, [9.0] * 5, 9.0),
+        }
+        tuner_cfg = get_tuner_cfg()
+        # OptimizationDirection is optional
+        tuner_cfg["metric_cfg"] = {"name": "step/s"}
+        tuner_cfg.update(
+            parallel_trials=2, early_stop_steps=3, poll_interval=0
+        )
+        recorder = FakeRecorder()
+        scheduler = ParallelTrialScheduler(
+            FakeAutoTuner([{"name": name} for name in trials]),
+            recorder,
+            tuner_cfg,
+            ["0", "1", "2", "3"],
+            "train.py",
+            [],
+            "logs",
+        )
+
+        def launch(self, cfg, devices):
+            self.job_id += 1
+            process = FakeProcess(self.job_id, trials[cfg["name"]][0])
+            return Trial(self.job_id, cfg, devices, cfg["name"], process)
+
+        def metric_values(path, file="workerlog.0", target_metric='step/s'):
+            return trials[path][1]
+
+        def read_log(path, metric_file, target_metric, memory_file):
+            metric = trials[path][2]
+            # the killed trial has no final metric
+            if metric is None:
+                return -1, 1024, 1 << 0
+            return metric, 1024, 0
+
+        module = "paddle.distributed.auto_tuner.scheduler"
+        with patch.object(ParallelTrialScheduler, "_launch", launch), patch(
+            f"{module}.read_metric_values", metric_values
+        ), patch(f"{module}.read_log", read_log), patch(
+            f"{module}.os.killpg"
+        ) as killpg:
+            scheduler.run("history.csv")
+
+        history = {cfg["name"]: cfg for cfg in recorder.history}
+        self.assertEqual(list(history), ["fast", "slow", "good"])
+        # the slow trial is stopped after its first steps
+        killpg.assert_called_once()
+        self.assertEqual(killpg.call_args[0][0], 2)
+        self.assertTrue(history["slow"]["early_stopped"])
+        self.assertFalse(history["slow"]["has_error"])
+        self.assertEqual(history["slow"]["step/s"], 2.0)
+        for name in ["fast", "good"]:
+            self.assertFalse(history[name]["early_stopped"])
+            self.assertEqual(history[name]["step/s"], trials[name][2])
+        self.assertEqual(scheduler.best_metric, 10.0)
+        self.assertEqual(recorder.directions, ["Maximize"] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
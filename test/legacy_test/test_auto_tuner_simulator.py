@@ -0,0 +1,142 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from paddle.distributed.auto_tuner.prune import prune_by_simulator
+from paddle.distributed.auto_tuner.simulator import (
+    TransformerSimulator,
+    validate_simulator,
+)
+
+MODEL_CFG = {
+    "hidden_size": 2048,
+    "num_layers": 24,
+    "num_attention_heads": 16,
+    "vocab_size": 50304,
+    "seq_length": 2048,
+    "global_batch_size": 64,
+}
+
+
+def make_cfg(**kwargs):
+    cfg = {
+        "dp_degree": 8,
+        "mp_degree": 1,
+        "pp_degree": 1,
+        "vpp_degree": 1,
+        "sharding_degree": 1,
+        "sharding_stage": 1,
+        "micro_batch_size": 1,
+        "use_recompute": False,
+        "recompute_granularity": None,
+    }
+    cfg.update(kwargs)
+    return cfg
+
+
+class TestTransformerSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = TransformerSimulator(MODEL_CFG)
+
+    def test_recompute(self):
+        base = make_cfg(micro_batch_size=4)
+        memory = self.simulator.estimate_memory(base)
+        step_time = self.simulator.estimate_step_time(base)
+        for granularity in ["core_attn", "full_attn", "full"]:
+            cfg = make_cfg(
+                micro_batch_size=4,
+                use_recompute=True,
+                recompute_granularity=granularity,
+            )
+            self.assertLess(self.simulator.estimate_memory(cfg), memory)
+            self.assertGreater(
+                self.simulator.estimate_step_time(cfg), step_time
+            )
+            memory = self.simulator.estimate_memory(cfg)
+
+    def test_sharding_stage(self):
+        memory = [
+            self.simulator.estimate_memory(
+                make_cfg(dp_degree=1, sharding_degree=8, sharding_stage=stage)
+            )
+            for stage in [1, 2, 3]
+        ]
+        self.assertGreater(memory[0], memory[1])
+        self.assertGreater(memory[1], memory[2])
+        self.assertGreater(
+            self.simulator.estimate_memory(make_cfg()), memory[0]
+        )
+
+    def test_pipeline_bubble(self):
+        cfg = make_cfg(dp_degree=1, pp_degree=8)
+        interleaved = make_cfg(dp_degree=1, pp_degree=8, vpp_degree=3)
+        self.assertLess(
+            self.simulator.estimate_step_time(interleaved),
+            self.simulator.estimate_step_time(cfg),
+        )
+
+    def test_prune(self):
+        tuner_cfg = {
+            "model_cfg": MODEL_CFG,
+            "simulator": {"time_ratio": 1.5},
+            "max_mem_usage": 80,
+        }
+        cfg = make_cfg()
+        self.assertFalse(prune_by_simulator(tuner_cfg, cfg, []))
+        self.assertIn("estimated_memory_usage", cfg)
+        # out of memory
+        self.assertTrue(
+            prune_by_simulator(tuner_cfg, make_cfg(micro_batch_size=8), [cfg])
+        )
+        # much slower than the config not pruned
+        slow_cfg = make_cfg(
+            micro_batch_size=1, mp_degree=8, dp_degree=1, pp_degree=1
+        )
+        self.assertTrue(prune_by_simulator(tuner_cfg, slow_cfg, [cfg]))
+
+    def test_validate(self):
+        history = []
+        for cfg in [
+            make_cfg(),
+            make_cfg(use_recompute=True, recompute_granularity="full"),
+            make_cfg(mp_degree=2, dp_degree=4),
+        ]:
+            cfg["step/s"] = 1 / self.simulator.estimate_step_time(cfg)
+            cfg["max_mem_usage"] = self.simulator.estimate_memory(cfg) * 1.1
+            history.append(cfg)
+        history.append(make_cfg(micro_batch_size=16, max_mem_usage="OOM"))
+        tuner_cfg = {
+            "model_cfg": MODEL_CFG,
+            "metric_cfg": {
+                "name": "step/s",
+                "OptimizationDirection": "Maximize",
+            },
+            "max_mem_usage": 80,
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "history.csv")
+            pd.DataFrame(history).to_csv(path, index=False)
+            result = validate_simulator(path, tuner_cfg)
+        self.assertAlmostEqual(result["memory_mape"], 1 / 11, places=4)
+        self.assertEqual(result["oom_recall"], 1.0)
+        self.assertAlmostEqual(result["time_spearman"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
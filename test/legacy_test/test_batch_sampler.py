@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import random
 import unittest
 
@@ -20,6 +21,7 @@ import numpy as np
 from paddle.io import (
     BatchSampler,
     Dataset,
+    DistributedBatchSampler,
     RandomSampler,
     Sampler,
     SequenceSampler,
@@ -360,5 +362,115 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+def distributed_batch_indices(
+    num_samples, batch_size, nranks, rank, shuffle, drop_last, epoch
+):
+    # reference implementation with python list of indices
+    local_num_samples = int(math.ceil(num_samples / nranks))
+    total_size = local_num_samples * nranks
+    indices = list(range(num_samples))
+    indices = (indices * math.ceil(total_size / num_samples))[:total_size]
+    if shuffle:
+        np.random.RandomState(epoch).shuffle(indices)
+
+    last_batch_size = total_size % (batch_size * nranks)
+    last_local_batch_size = last_batch_size // nranks
+    local_indices = []
+    for i in range(
+        rank * batch_size, total_size - last_batch_size, batch_size * nranks
+    ):
+        local_indices.extend(indices[i : i + batch_size])
+    tail = indices[total_size - last_batch_size :]
+    local_indices.extend(
+        tail[rank * last_local_batch_size : (rank + 1) * last_local_batch_size]
+    )
+
+    batches = [
+        local_indices[i : i + batch_size]
+        for i in range(0, local_num_samples, batch_size)
+    ]
+    if drop_last and len(batches[-1]) < batch_size:
+        batches.pop()
+    return batches
+
+
+class TestDistributedBatchSampler(unittest.TestCase):
+    def test_same_as_list_indices(self):
+        for num_samples in [1, 7, 100, 1003]:
+            for batch_size in [1, 3, 64]:
+                for nranks in [1, 2, 3, 8]:
+                    for shuffle in [False, True]:
+                        for drop_last in [False, True]:
+                            for rank in range(nranks):
+                                sampler = DistributedBatchSampler(
+                                    range(num_samples),
+                                    batch_size,
+                                    num_replicas=nranks,
+                                    rank=rank,
+                                    shuffle=shuffle,
+                                    drop_last=drop_last,
+                                )
+                                sampler.set_epoch(5)
+                                batches = list(sampler)
+                                self.assertEqual(len(batches), len(sampler))
+                                self.assertEqual(
+                                    batches,
+                                    distributed_batch_indices(
+                                        num_samples,
+                                        batch_size,
+                                        nranks,
+                                        rank,
+                                        shuffle,
+                                        drop_last,
+                                        5,
+                                    ),
+                                )
+
+    def test_feistel_shuffle(self):
+        num_samples, nranks = 1003, 4
+        shards = []
+        for rank in range(nranks):
+            sampler = DistributedBatchSampler(
+                range(num_samples),
+                16,
+                num_replicas=nranks,
+                rank=rank,
+                shuffle=True,
+                shuffle_method='feistel',
+            )
+            sampler.set_epoch(1)
+            shards.append([i for batch in sampler for i in batch])
+            sampler.set_epoch(1)
+            self.assertEqual(
+                shards[-1], [i for batch in sampler for i in batch]
+            )
+
+        indices = [i for shard in shards for i in shard]
+        self.assertEqual(len(indices), sampler.total_size)
+        self.assertEqual(set(indices), set(range(num_samples)))
+        self.assertNotEqual(indices[:num_samples], list(range(num_samples)))
+
+    def test_sample_offset(self):
+        for shuffle_method in ['numpy', 'feistel']:
+            sampler = DistributedBatchSampler(
+                range(1000),
+                8,
+                num_replicas=4,
+                rank=1,
+                shuffle=True,
+                shuffle_method=shuffle_method,
+            )
+            sampler.set_epoch(3)
+            batches = list(sampler)
+
+            sampler.set_epoch(3)
+            sampler.set_sample_offset(40)
+            self.assertEqual(len(sampler), len(batches) - 5)
+            self.assertEqual(list(sampler), batches[5:])
+            # offset is only used for one iteration
+            sampler.set_epoch(3)
+            self.assertEqual(list(sampler), batches)
+
+
 if __name__ == '__main__':
     unittest.main()
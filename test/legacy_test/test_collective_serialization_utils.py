@@ -0,0 +1,89 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.distributed.communication.serialization_utils import (
+    convert_object_to_tensor,
+    convert_tensor_to_object,
+    get_object_tensor_sizes,
+    pad_object_tensor,
+)
+
+
+class TestObjectSerialization(unittest.TestCase):
+    def test_round_trip(self):
+        obj = {
+            "name": "shard",
+            "array": np.arange(1000, dtype=np.float32).reshape([10, 100]),
+            "arrays": [np.ones([3, 5]), np.zeros([0]), np.arange(6)[::2]],
+            "tensor": paddle.to_tensor([1.0, 2.0, 3.0], stop_gradient=False),
+        }
+        tensor, len_of_tensor = convert_object_to_tensor(obj)
+        self.assertEqual(tensor.dtype, paddle.uint8)
+        # the padding of all gather should be ignored
+        padded = pad_object_tensor(tensor, int(len_of_tensor) + 13)
+        self.assertEqual(padded.shape, [int(len_of_tensor) + 13])
+
+        result = convert_tensor_to_object(padded, len_of_tensor)
+        self.assertEqual(result["name"], obj["name"])
+        np.testing.assert_array_equal(result["array"], obj["array"])
+        for out, expected in zip(result["arrays"], obj["arrays"]):
+            np.testing.assert_array_equal(out, expected)
+        self.assertIsInstance(result["tensor"], paddle.Tensor)
+        self.assertFalse(result["tensor"].stop_gradient)
+        np.testing.assert_array_equal(
+            result["tensor"].numpy(), obj["tensor"].numpy()
+        )
+
+    def test_tensors(self):
+        tensor = paddle.arange(12, dtype='int64').reshape([3, 4])
+        obj = {
+            "a": tensor,
+            "b": tensor,
+            "scalar": paddle.to_tensor(1.5),
+        }
+        out, len_of_tensor = convert_object_to_tensor(obj)
+        result = convert_tensor_to_object(out, len_of_tensor)
+        # a tensor referenced twice is sent once
+        self.assertIs(result["a"], result["b"])
+        self.assertEqual(result["a"].shape, [3, 4])
+        self.assertEqual(result["a"].dtype, paddle.int64)
+        np.testing.assert_array_equal(result["a"].numpy(), tensor.numpy())
+        self.assertEqual(result["scalar"].shape, [])
+        self.assertEqual(float(result["scalar"]), 1.5)
+
+    def test_object_tensor_sizes(self):
+        tensors = [
+            convert_object_to_tensor(obj)[0]
+            for obj in ["a", np.arange(100), paddle.ones([5])]
+        ]
+        self.assertEqual(
+            get_object_tensor_sizes(
+                [pad_object_tensor(t, 1024)[:1024] for t in tensors]
+            ),
+            [t.shape[0] for t in tensors],
+        )
+
+    def test_plain_object(self):
+        obj = [1, "a", {"b": None}]
+        tensor, len_of_tensor = convert_object_to_tensor(obj)
+        self.assertEqual(convert_tensor_to_object(tensor, len_of_tensor), obj)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import struct
+import sys
+import unittest
+
+import numpy as np
+
+from paddle.distributed import fleet
+from paddle.distributed.fleet.data_generator.data_generator import (
+    _decode_records,
+)
+
+
+class MyMultiSlotDataGenerator(fleet.MultiSlotDataGenerator):
+    def generate_sample(self, line):
+        def data_iter():
+            for i in range(10):
+                if i == 1:
+                    yield None
+                yield ("words", list(range(i + 1))), ("label", [i % 2])
+
+        return data_iter
+
+
+class TestBinaryRecords(unittest.TestCase):
+    def test_layout(self):
+        generator = fleet.MultiSlotDataGenerator()
+        data = generator._gen_records([[("words", [7, 8]), ("score", [0.5])]])
+        expected = struct.pack(
+            "<IIQQIf", 4 + 16 + 4 + 4, 2, 7, 8, 1 | (1 << 31), 0.5
+        )
+        self.assertEqual(data, expected)
+
+    def test_round_trip(self):
+        rng = np.random.RandomState(0)
+        samples = []
+        expected = []
+        for _ in range(50):
+            words = rng.randint(0, 2**40, rng.randint(1, 20)).tolist()
+            scores = rng.rand(rng.randint(1, 5)).astype("float32").tolist()
+            samples.append(
+                zip(["words", "score", "label"], [words, scores, [-1]])
+            )
+            expected.append([words, scores, [2**64 - 1]])
+        generator = fleet.MultiSlotDataGenerator()
+        decoded = _decode_records(generator._gen_records(samples))
+        self.assertEqual(decoded, expected)
+        self.assertEqual(
+            generator._proto_info,
+            [("words", "uint64"), ("score", "float"), ("label", "uint64")],
+        )
+
+    def test_wrap_around(self):
+        generator = fleet.MultiSlotDataGenerator()
+        decoded = _decode_records(
+            generator._gen_records([[("words", [-1, 2**63 + 5])]])
+        )
+        self.assertEqual(decoded, [[[2**64 - 1, 2**63 + 5]]])
+        self.assertEqual(generator._proto_info, [("words", "uint64")])
+
+    def test_float_slot_is_kept(self):
+        generator = fleet.MultiSlotDataGenerator()
+        generator._gen_records([[("label", [0.5])]])
+        decoded = _decode_records(generator._gen_records([[("label", [1])]]))
+        self.assertEqual(decoded, [[[1.0]]])
+        self.assertEqual(generator._proto_info, [("label", "float")])
+
+    def test_errors(self):
+        generator = fleet.MultiSlotDataGenerator()
+        for lines in [
+            ["words"],
+            [[("words", [])]],
+            [[("words", "1")]],
+            [[("words", ["1"])]],
+            [[("words", [[1, 2]])]],
+            [[(1, [1])]],
+            [[("words", [1])], [("label", [1])]],
+            [[("words", [1])], [("words", [1]), ("label", [1])]],
+        ]:
+            generator._proto_info = None
+            with self.assertRaises(ValueError):
+                generator._gen_records(lines)
+        with self.assertRaises(ValueError):
+            generator.set_record_format("json")
+        with self.assertRaises(NotImplementedError):
+            fleet.MultiSlotStringDataGenerator()._gen_records(
+                [[("words", ["1"])]]
+            )
+
+    def test_run_from_memory(self):
+        stdout = sys.stdout
+        sys.stdout = io.TextIOWrapper(io.BytesIO())
+        try:
+            generator = MyMultiSlotDataGenerator()
+            generator.set_batch(4)
+            generator.set_record_format("binary")
+            generator.run_from_memory()
+            data = sys.stdout.buffer.getvalue()
+        finally:
+            sys.stdout = stdout
+        self.assertEqual(
+            _decode_records(data),
+            [[list(range(i + 1)), [i % 2]] for i in range(10)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
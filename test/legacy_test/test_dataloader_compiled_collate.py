@@ -0,0 +1,207 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import CompiledCollateFn, DataLoader, Dataset
+from paddle.io.dataloader.collate import default_collate_fn
+from paddle.io.dataloader.flat import _flatten_batch
+from paddle.io.dataloader.shm_ring import _SharedMemoryRing
+
+
+def make_sample(i):
+    return {
+        'image': np.full([3, 8, 8], i, dtype='float32'),
+        'label': i,
+        'score': 0.5 * i,
+        'name': f'sample_{i}',
+        'extra': (np.arange(4, dtype='int64') + i, [i, np.float32(i)]),
+    }
+
+
+class DictDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        return make_sample(idx)
+
+
+class TestCompiledCollateFn(unittest.TestCase):
+    def assert_same(self, x, y):
+        if isinstance(x, dict):
+            self.assertEqual(list(x.keys()), list(y.keys()))
+            for key in x:
+                self.assert_same(x[key], y[key])
+        elif isinstance(x, list):
+            self.assertEqual(len(x), len(y))
+            for a, b in zip(x, y):
+                self.assert_same(a, b)
+        elif isinstance(x, np.ndarray):
+            self.assertEqual(x.dtype, y.dtype)
+            np.testing.assert_array_equal(x, y)
+        else:
+            self.assertEqual(x, y)
+
+    def test_same_as_default(self):
+        collate_fn = CompiledCollateFn()
+        for _ in range(3):
+            batch = [make_sample(i) for i in range(8)]
+            self.assert_same(collate_fn(batch), default_collate_fn(batch))
+        self.assertEqual(collate_fn.num_fallbacks, 0)
+
+        batch = [(np.ones([2, 2]), 1) for _ in range(4)]
+        self.assert_same(collate_fn(batch), default_collate_fn(batch))
+        self.assertEqual(collate_fn.num_fallbacks, 0)
+
+    def test_schema_change(self):
+        collate_fn = CompiledCollateFn()
+        batch = [make_sample(i) for i in range(8)]
+        collate_fn(batch)
+
+        # dtype of a number field changed
+        batch = [make_sample(i) for i in range(8)]
+        batch[3]['label'] = 2.5
+        self.assert_same(collate_fn(batch), default_collate_fn(batch))
+        self.assertEqual(collate_fn.num_fallbacks, 1)
+
+        # dtype of an array field changed
+        batch = [make_sample(i) for i in range(8)]
+        batch[5]['image'] = batch[5]['image'].astype('float64')
+        self.assert_same(collate_fn(batch), default_collate_fn(batch))
+        self.assertEqual(collate_fn.num_fallbacks, 2)
+
+        # shape of an array field changed
+        batch = [make_sample(i) for i in range(8)]
+        batch[2]['image'] = np.zeros([3, 4, 4], dtype='float32')
+        with self.assertRaises(ValueError):
+            collate_fn(batch)
+
+        # fields number not same among samples
+        batch = [(np.ones([2]), 1, 2)] + [(np.ones([2]), 1)] * 3
+        with self.assertRaises(RuntimeError):
+            collate_fn(batch)
+
+    def test_allocator(self):
+        allocated = []
+
+        def allocator(specs):
+            arrays = [np.empty(shape, dtype) for shape, dtype in specs]
+            allocated.extend(arrays)
+            return arrays
+
+        collate_fn = CompiledCollateFn(allocator=allocator)
+        batch = [make_sample(i) for i in range(4)]
+        data = collate_fn(batch)
+        self.assertIs(data['image'], allocated[0])
+        self.assertIs(data['label'], allocated[1])
+        self.assert_same(data, default_collate_fn(batch))
+
+
+class TestCompiledCollateFnWithShmRing(unittest.TestCase):
+    def setUp(self):
+        self.ring = _SharedMemoryRing(2, 64 * 1024)
+        self.worker_ring = _SharedMemoryRing(
+            self.ring.num_slabs, self.ring.slab_size, name=self.ring.name
+        )
+
+    def tearDown(self):
+        self.worker_ring.close()
+        self.ring.close()
+
+    def test_zero_copy(self):
+        collate_fn = CompiledCollateFn(
+            allocator=self.worker_ring.collate_allocator
+        )
+        batch = [make_sample(i) for i in range(4)]
+        data = collate_fn(batch)
+        # the batch is stacked into the first slab
+        slab = np.ndarray(
+            (self.ring.slab_size,),
+            dtype=np.uint8,
+            buffer=self.worker_ring._shm.buf,
+            offset=self.worker_ring._slab_offset(0),
+        )
+        self.assertTrue(np.shares_memory(data['image'], slab))
+        self.assertTrue(np.shares_memory(data['label'], slab))
+
+        flat_batch, _ = _flatten_batch(data)
+        shm_batch = self.worker_ring.put_batch(0, flat_batch, lambda x: x)
+        # the slab stacked into is sent, no other slab is acquired
+        self.assertEqual(shm_batch.slab_id, 0)
+        self.assertEqual(self.ring.num_free_slabs(), 1)
+
+        tensors = self.ring.wrap(shm_batch)
+        expected, _ = _flatten_batch(default_collate_fn(batch))
+        for tensor, value in zip(tensors, expected):
+            if isinstance(value, np.ndarray) and value.dtype.kind != 'U':
+                np.testing.assert_array_equal(np.array(tensor), value)
+        del tensors
+
+    def test_modified_batch_is_copied(self):
+        collate_fn = CompiledCollateFn(
+            allocator=self.worker_ring.collate_allocator
+        )
+        data = collate_fn([make_sample(i) for i in range(4)])
+        data['image'] = data['image'] + 1
+        flat_batch, _ = _flatten_batch(data)
+        shm_batch = self.worker_ring.put_batch(0, flat_batch, lambda x: x)
+        self.assertEqual(shm_batch.slab_id, 1)
+        self.assertEqual(self.ring.num_free_slabs(), 1)
+
+
+class TestCompiledCollateFnWithDataLoader(unittest.TestCase):
+    def run_main(self):
+        paddle.disable_static()
+        dataset = DictDataset(32)
+        loader = DataLoader(
+            dataset,
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            num_workers=2,
+            collate_fn=CompiledCollateFn(),
+        )
+        for i, data in enumerate(loader):
+            expected = default_collate_fn(
+                [dataset[i * 4 + j] for j in range(4)]
+            )
+            np.testing.assert_array_equal(
+                data['image'].numpy(), expected['image']
+            )
+            np.testing.assert_array_equal(
+                data['label'].numpy(), expected['label']
+            )
+            self.assertEqual(data['name'], expected['name'])
+        self.assertEqual(i, 7)
+
+    def test_main(self):
+        self.run_main()
+
+    def test_with_shm_ring(self):
+        os.environ['FLAGS_dataloader_shm_ring_slab_size'] = str(1024 * 1024)
+        try:
+            self.run_main()
+        finally:
+            del os.environ['FLAGS_dataloader_shm_ring_slab_size']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import os
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.shm_ring import _SharedMemoryRing
+
+IMAGE_SIZE = 64
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([3, IMAGE_SIZE, IMAGE_SIZE]).astype('float32')
+        label = np.random.randint(0, 9, (1,)).astype('int64')
+        return image, label
+
+
+class TestSharedMemoryRing(unittest.TestCase):
+    def setUp(self):
+        self.ring = _SharedMemoryRing(2, 4096)
+        self.worker_ring = _SharedMemoryRing(
+            self.ring.num_slabs, self.ring.slab_size, name=self.ring.name
+        )
+
+    def tearDown(self):
+        self.worker_ring.close()
+        self.ring.close()
+
+    def test_put_and_wrap(self):
+        x = np.random.random([4, 8]).astype('float32')
+        y = np.arange(4).astype('int64')
+        shm_batch = self.worker_ring.put_batch(0, [x, y], None)
+        self.assertIsNotNone(shm_batch)
+        self.assertEqual(shm_batch.nbytes, x.nbytes + y.nbytes)
+        self.assertEqual(self.ring.num_free_slabs(), 1)
+
+        tensors = self.ring.wrap(shm_batch)
+        np.testing.assert_array_equal(np.array(tensors[0]), x)
+        np.testing.assert_array_equal(np.array(tensors[1]), y)
+
+        del tensors
+        gc.collect()
+        self.assertEqual(self.ring.num_free_slabs(), 2)
+
+    def test_fallback(self):
+        x = np.zeros([4096], dtype='float32')
+        # larger than a slab
+        self.assertIsNone(self.worker_ring.put_batch(0, [x], None))
+
+        y = np.zeros([16], dtype='float32')
+        batches = [self.worker_ring.put_batch(0, [y], None) for _ in range(3)]
+        # no free slab for the last batch
+        self.assertIsNotNone(batches[0])
+        self.assertIsNotNone(batches[1])
+        self.assertIsNone(batches[2])
+
+
+class TestDataLoaderWithSharedMemoryRing(unittest.TestCase):
+    def setUp(self):
+        os.environ['FLAGS_dataloader_shm_ring_slab_size'] = str(1024 * 1024)
+
+    def tearDown(self):
+        del os.environ['FLAGS_dataloader_shm_ring_slab_size']
+
+    def test_main(self):
+        paddle.disable_static()
+        dataset = RandomDataset(32)
+        loader = DataLoader(
+            dataset,
+            places=paddle.CPUPlace(),
+            batch_size=4,
+            num_workers=2,
+            drop_last=True,
+        )
+        loader_iter = iter(loader)
+        for i, (image, label) in enumerate(loader_iter):
+            expected = [dataset[i * 4 + j] for j in range(4)]
+            np.testing.assert_array_equal(
+                image.numpy(), np.stack([e[0] for e in expected])
+            )
+            np.testing.assert_array_equal(
+                label.numpy(), np.stack([e[1] for e in expected])
+            )
+        self.assertEqual(i, 7)
+        self.assertGreater(loader_iter._shm_ring_batches, 0)
+        self.assertEqual(
+            loader_iter._shm_ring_batches + loader_iter._shm_fallback_batches,
+            8,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
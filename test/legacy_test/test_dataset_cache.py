@@ -0,0 +1,229 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.text.datasets import WMT16, Imdb, Imikolov
+from paddle.text.datasets.cache import RaggedArray
+
+
+def _make_tar(path, files):
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _mapped(array):
+    return isinstance(array.base, np.memmap)
+
+
+class TestRaggedArray(unittest.TestCase):
+    def test_from_lists(self):
+        seqs = [[1, 2, 3], [], [4], [5, 6]]
+        ragged = RaggedArray.from_lists(seqs)
+        self.assertEqual(len(ragged), 4)
+        self.assertEqual(ragged.ids.dtype, np.int32)
+        self.assertEqual([x.tolist() for x in ragged], seqs)
+        self.assertEqual(ragged[-1].tolist(), [5, 6])
+        with self.assertRaises(IndexError):
+            ragged[4]
+
+    def test_empty(self):
+        ragged = RaggedArray.from_lists([])
+        self.assertEqual(len(ragged), 0)
+        self.assertEqual(list(ragged), [])
+
+
+class DatasetCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_home = mock.patch.object(
+            paddle.dataset.common,
+            'DATA_HOME',
+            os.path.join(self.temp_dir.name, 'dataset'),
+        )
+        self.data_home.start()
+        os.makedirs(paddle.dataset.common.DATA_HOME)
+
+    def tearDown(self):
+        self.data_home.stop()
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+
+class TestImdbCache(DatasetCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data_file = self.path('imdb.tar.gz')
+        _make_tar(
+            self.data_file,
+            {
+                'aclImdb/train/pos/0.txt': 'a good movie, good!\n',
+                'aclImdb/train/neg/0.txt': 'a bad movie\n',
+                'aclImdb/train/neg/1.txt': 'bad bad plot\n',
+                'aclImdb/test/pos/0.txt': 'good plot\n',
+                'aclImdb/test/neg/0.txt': 'an awful movie\n',
+            },
+        )
+
+    def test_cache(self):
+        imdb = Imdb(data_file=self.data_file, mode='train', cutoff=1)
+        word_idx = imdb.word_idx
+        self.assertEqual(
+            word_idx,
+            {
+                b'bad': 0,
+                b'good': 1,
+                b'movie': 2,
+                b'a': 3,
+                b'plot': 4,
+                '<unk>': 5,
+            },
+        )
+        self.assertEqual(len(imdb), 3)
+        docs = [imdb[i][0].tolist() for i in range(3)]
+        labels = [imdb[i][1].tolist() for i in range(3)]
+        self.assertEqual(docs, [[3, 1, 2, 1], [3, 0, 2], [0, 0, 4]])
+        self.assertEqual(labels, [[0], [1], [1]])
+
+        # both modes are preprocessed at once, later constructions only map
+        # the cache.
+        with mock.patch.object(
+            Imdb, '_preprocess', side_effect=AssertionError
+        ):
+            test = Imdb(data_file=self.data_file, mode='test', cutoff=1)
+            self.assertEqual(test.word_idx, word_idx)
+            self.assertEqual(test[0][0].tolist(), [1, 4])
+            self.assertEqual(test[1][1].tolist(), [1])
+            self.assertTrue(_mapped(test.docs.ids))
+
+            # samples are writable int64 copies, not views of the mapping
+            doc, label = test[0]
+            self.assertEqual(doc.dtype, np.int64)
+            self.assertEqual(label.dtype, np.int64)
+            doc[0] = -1
+            self.assertEqual(test[0][0].tolist(), [1, 4])
+
+            train = Imdb(data_file=self.data_file, mode='train', cutoff=1)
+            self.assertEqual([train[i][0].tolist() for i in range(3)], docs)
+
+        # other arguments are preprocessed again
+        imdb = Imdb(data_file=self.data_file, mode='train', cutoff=0)
+        self.assertEqual(len(imdb.word_idx), 8)
+
+    def test_read_only_data_home(self):
+        with mock.patch(
+            'paddle.text.datasets.cache._save', side_effect=OSError
+        ):
+            imdb = Imdb(data_file=self.data_file, mode='test', cutoff=1)
+        self.assertEqual(imdb[0][0].tolist(), [1, 4])
+        self.assertFalse(_mapped(imdb.docs.ids))
+
+
+class TestImikolovCache(DatasetCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data_file = self.path('imikolov.tgz')
+        _make_tar(
+            self.data_file,
+            {
+                './simple-examples/data/ptb.train.txt': 'a b c\nb c\na\n',
+                './simple-examples/data/ptb.valid.txt': 'c d\n',
+                './simple-examples/data/ptb.test.txt': 'a d c\n',
+            },
+        )
+        # <e> 0, <s> 1, c 2, a 3, b 4, d 5, <unk> 6
+
+    def test_ngram(self):
+        for _ in range(2):
+            imikolov = Imikolov(
+                data_file=self.data_file,
+                data_type='NGRAM',
+                window_size=3,
+                mode='test',
+                min_word_freq=0,
+            )
+            self.assertEqual(len(imikolov), 3)
+            self.assertEqual(
+                [tuple(int(x) for x in imikolov[i]) for i in range(3)],
+                [(1, 3, 5), (3, 5, 2), (5, 2, 0)],
+            )
+        self.assertTrue(_mapped(imikolov.data))
+        self.assertTrue(all(x.dtype == np.int64 for x in imikolov[0]))
+
+    def test_seq(self):
+        imikolov = Imikolov(
+            data_file=self.data_file,
+            data_type='SEQ',
+            window_size=3,
+            mode='train',
+            min_word_freq=1,
+        )
+        # only <e>, <s>, c, a and b occur more than once
+        self.assertEqual(imikolov.word_idx['<unk>'], 5)
+        self.assertEqual(len(imikolov), 2)
+        src, trg = imikolov[0]
+        self.assertEqual(src.tolist(), [1, 4, 2])
+        self.assertEqual(trg.tolist(), [4, 2, 0])
+        src, trg = imikolov[1]
+        self.assertEqual(src.tolist(), [1, 3])
+        self.assertEqual(trg.tolist(), [3, 0])
+
+
+class TestWMT16Cache(DatasetCacheTestCase):
+    def test_cache(self):
+        data_file = self.path('wmt16.tar.gz')
+        os.makedirs(os.path.join(paddle.dataset.common.DATA_HOME, 'wmt16'))
+        _make_tar(
+            data_file,
+            {
+                'wmt16/train': 'a b\tx y\na c\tx z\n',
+                'wmt16/val': 'a d\tx x\n',
+            },
+        )
+        expected = None
+        for _ in range(2):
+            wmt16 = WMT16(
+                data_file=data_file,
+                mode='val',
+                src_dict_size=5,
+                trg_dict_size=5,
+            )
+            self.assertEqual(len(wmt16), 1)
+            sample = [x.tolist() for x in wmt16[0]]
+            self.assertEqual(sample[0], [0, 3, 2, 1])
+            self.assertEqual(sample[1][0], 0)
+            self.assertEqual(sample[2][-1], 1)
+            self.assertEqual(sample[1][1:], sample[2][:-1])
+            if expected is not None:
+                self.assertEqual(sample, expected)
+            expected = sample
+        self.assertTrue(_mapped(wmt16.src_ids.ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
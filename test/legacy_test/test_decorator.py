@@ -13,11 +13,15 @@
 # limitations under the License.
 
 import functools
+import os
 import sys
 import time
 import unittest
 
+import numpy as np
+
 import paddle.reader
+from paddle.reader import pipeline
 
 __all__ = []
 
@@ -183,5 +187,98 @@ class TestMultiProcessReader(unittest.TestCase):
             self.reader_test(use_pipe=True)
 
 
+class ProcessPoolFlagMixin:
+    def setUp(self):
+        os.environ['FLAGS_reader_use_process_pool'] = '1'
+
+    def tearDown(self):
+        del os.environ['FLAGS_reader_use_process_pool']
+
+
+@unittest.skipIf(
+    not pipeline.is_process_pool_available(), "process pool needs fork"
+)
+class TestXmapProcessPool(ProcessPoolFlagMixin, TestXmap):
+    pass
+
+
+class TestXmapSharedState(unittest.TestCase):
+    def test_thread_by_default(self):
+        # the mappers run in threads of the current process by default
+        seen = []
+
+        def mapper(x):
+            seen.append(x)
+            return x
+
+        reader = paddle.reader.xmap_readers(
+            mapper, lambda: iter(range(10)), 2, 4
+        )
+        self.assertEqual(sorted(reader()), list(range(10)))
+        self.assertEqual(sorted(seen), list(range(10)))
+
+
+@unittest.skipIf(
+    not pipeline.is_process_pool_available(), "process pool needs fork"
+)
+class TestPipeline(ProcessPoolFlagMixin, unittest.TestCase):
+    def array_reader(self, num, size=16):
+        def reader():
+            for i in range(num):
+                yield np.full([size], i, dtype='float32')
+
+        return reader
+
+    def test_process_map_order(self):
+        reader = pipeline.process_map(
+            lambda x: x * 2, self.array_reader(100), 4, 4, order=True
+        )
+        for _ in range(2):
+            result = [float(x[0]) for x in reader()]
+            self.assertEqual(result, [2.0 * i for i in range(100)])
+        self.assertEqual(reader.stats['map'].count, 200)
+        self.assertEqual(reader.stats['output'].count, 200)
+
+    def test_process_map_batched(self):
+        def mapper(samples):
+            return [float(s.sum()) for s in samples]
+
+        reader = pipeline.process_map(
+            mapper, self.array_reader(50), 3, 2, batch_size=8, batched=True
+        )
+        self.assertEqual(sorted(reader()), [16.0 * i for i in range(50)])
+
+    def test_large_sample(self):
+        # samples larger than a slot are sent through the pipe
+        reader = pipeline.process_map(
+            lambda x: x + 1, self.array_reader(4, size=1 << 21), 2, 1, True
+        )
+        self.assertEqual([float(x[-1]) for x in reader()], [1, 2, 3, 4])
+
+    def test_mapper_error(self):
+        def mapper(x):
+            raise KeyError("mapper failed")
+
+        reader = pipeline.process_map(mapper, self.array_reader(10), 2, 2)
+        with self.assertRaises(RuntimeError):
+            list(reader())
+
+    def test_early_exit(self):
+        reader = pipeline.process_map(
+            lambda x: x, self.array_reader(1000), 2, 2
+        )
+        it = reader()
+        next(it)
+        it.close()
+
+    def test_multiprocess_reader_error(self):
+        def reader():
+            yield 1
+            raise ValueError("reader failed")
+
+        with self.assertRaises(ValueError):
+            list(paddle.reader.multiprocess_reader([reader, reader])())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,193 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.distributed as dist
+from paddle.distributed.checkpoint import range_reader
+from paddle.distributed.checkpoint.load_state_dict import (
+    ReadItem,
+    get_read_schedule,
+)
+from paddle.distributed.checkpoint.metadata import LocalTensorIndex
+from paddle.distributed.checkpoint.range_reader import (
+    RangeReader,
+    contiguous_runs,
+    get_storage_index,
+)
+
+
+def _slice(array, offsets, lengths):
+    return array[tuple(slice(o, o + n) for o, n in zip(offsets, lengths))]
+
+
+class TestContiguousRuns(unittest.TestCase):
+    def check(self, shape, offsets, lengths):
+        array = np.arange(np.prod(shape)).reshape(shape)
+        starts, run = contiguous_runs(shape, offsets, lengths)
+        flat = array.reshape([-1])
+        got = np.concatenate([flat[start : start + run] for start in starts])
+        np.testing.assert_array_equal(
+            got, _slice(array, offsets, lengths).reshape([-1])
+        )
+        return len(starts)
+
+    def test_runs(self):
+        # rows of a column split are one run each
+        self.assertEqual(self.check([8, 6], [0, 3], [8, 3]), 8)
+        # a row split is a single run
+        self.assertEqual(self.check([8, 6], [2, 0], [4, 6]), 1)
+        self.assertEqual(self.check([2, 3, 4], [1, 1, 0], [1, 2, 4]), 1)
+        self.assertEqual(self.check([2, 3, 4], [0, 0, 1], [2, 3, 2]), 6)
+        self.assertEqual(self.check([5], [0], [5]), 1)
+
+
+class TestRangeReader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.saved = range_reader.READ_CHUNK_SIZE
+        range_reader.READ_CHUNK_SIZE = 4096
+
+    def tearDown(self):
+        range_reader.READ_CHUNK_SIZE = self.saved
+        self.temp_dir.cleanup()
+
+    def test_read(self):
+        arrays = {
+            'w': np.random.rand(300, 200).astype('float32'),
+            'b': np.arange(10, dtype='int64'),
+            'f': np.asfortranarray(np.random.rand(200, 100)),
+            's': np.array(1.5),
+        }
+        file_path = os.path.join(self.temp_dir.name, '0_0.distcp')
+        paddle.save(
+            {k: paddle.to_tensor(v) for k, v in arrays.items()}, file_path
+        )
+
+        index = get_storage_index(file_path)
+        self.assertEqual(sorted(index.keys()), sorted(arrays.keys()))
+        # the large C-contiguous tensor is read by ranges from the file
+        self.assertIsNone(index['w'].array)
+        self.assertGreater(index['w'].offset, 0)
+
+        requests = []
+        expected = []
+        rng = np.random.default_rng(0)
+        for key, array in arrays.items():
+            for _ in range(10):
+                offsets = [int(rng.integers(0, n + 1)) for n in array.shape]
+                lengths = [
+                    int(rng.integers(0, n - o + 1))
+                    for n, o in zip(array.shape, offsets)
+                ]
+                requests.append((file_path, index[key], offsets, lengths))
+                expected.append(_slice(array, offsets, lengths))
+
+        with RangeReader(num_workers=4) as reader:
+            outs = reader.read(requests)
+        for out, exp in zip(outs, expected):
+            self.assertEqual(out.dtype, exp.dtype)
+            np.testing.assert_array_equal(out, exp)
+
+    def test_pickle_without_ranges(self):
+        array = np.random.rand(100, 100)
+        file_path = os.path.join(self.temp_dir.name, '0_0.distcp')
+        with open(file_path, 'wb') as f:
+            pickle.dump({'w': ('w', array)}, f, protocol=2)
+        entry = get_storage_index(file_path)['w']
+        self.assertIsNotNone(entry.array)
+        with RangeReader() as reader:
+            (out,) = reader.read([(file_path, entry, [10, 20], [5, 30])])
+        np.testing.assert_array_equal(out, array[10:15, 20:50])
+
+
+class TestReadSchedule(unittest.TestCase):
+    def item(self, key, rank, offsets, lengths):
+        return ReadItem(
+            LocalTensorIndex(key, (0, 0)),
+            rank,
+            'float32',
+            (0, 0),
+            tuple(offsets),
+            tuple(lengths),
+        )
+
+    def test_schedule(self):
+        storage_files = {
+            LocalTensorIndex('a', (0, 0)): '0_0.distcp',
+            LocalTensorIndex('b', (0, 0)): '1_0.distcp',
+        }
+        rank_to_local_data_files = {0: ['0_0.distcp'], 1: ['1_0.distcp']}
+        read_items = [
+            # 64 x 16 float32 is 4KB
+            self.item('a', 0, [0, 0], [64, 16]),
+            self.item('a', 1, [0, 0], [64, 16]),
+            self.item('b', 0, [0, 0], [8, 16]),
+        ]
+        batches = get_read_schedule(
+            read_items, storage_files, rank_to_local_data_files, 1024
+        )
+        parts = [part for batch in batches for part in batch]
+        # every item is split into parts of at most 1KB
+        self.assertEqual(len(parts), 4 + 4 + 1)
+        for part, _, _ in parts:
+            self.assertLessEqual(np.prod(part.lengths) * 4, 1024)
+        self.assertEqual(
+            [part.storage_offset[0] for part, _, _ in parts[:4]],
+            [0, 16, 32, 48],
+        )
+        # each part is read by the rank that needs it if it can, otherwise
+        # by the rank holding the file.
+        readers = [(part.rank, reader) for part, _, reader in parts]
+        self.assertEqual(readers[:4], [(0, 0)] * 4)
+        self.assertEqual(readers[4:8], [(1, 0)] * 4)
+        self.assertEqual(readers[8], (0, 1))
+        # no rank holds more than the budget in a batch
+        for batch in batches:
+            held = {}
+            for part, _, reader in batch:
+                for rank in {part.rank, reader}:
+                    held[rank] = held.get(rank, 0) + np.prod(part.lengths) * 4
+            self.assertLessEqual(max(held.values()), 1024)
+
+
+class TestStreamingLoad(unittest.TestCase):
+    def test_load(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        state_dict = {
+            'w': paddle.rand([64, 32]),
+            'b': paddle.arange(16, dtype='int64'),
+        }
+        dist.save_state_dict(state_dict, temp_dir.name)
+
+        target = {
+            'w': paddle.zeros([64, 32]),
+            'b': paddle.zeros([16], dtype='int64'),
+        }
+        dist.load_state_dict(
+            target, temp_dir.name, streaming=True, memory_budget=1024
+        )
+        for key, value in state_dict.items():
+            np.testing.assert_array_equal(target[key].numpy(), value.numpy())
+        temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
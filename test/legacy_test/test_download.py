@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import os
+import tempfile
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+from paddle.utils import download
 from paddle.utils.download import get_path_from_url, get_weights_path_from_url
 
 
@@ -141,5 +147,137 @@ class TestDownload(unittest.TestCase):
                 )
 
 
+class RangeHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        data = server.data
+        server.requests.append(self.headers.get('Range'))
+        rng = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if (
+            rng
+            and server.support_range
+            and (if_range is None or if_range == server.etag)
+        ):
+            start, end = rng.split('=')[1].split('-')
+            start = int(start)
+            end = min(int(end) if end else len(data) - 1, len(data) - 1)
+            body = data[start : end + 1]
+            self.send_response(206)
+            self.send_header(
+                'Content-Range', f'bytes {start}-{end}/{len(data)}'
+            )
+        else:
+            body = data
+            self.send_response(200)
+        server.sent += len(body)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        return
+
+
+class TestParallelDownload(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data = os.urandom(10 * 1024 + 7)
+        self.md5sum = hashlib.md5(self.data).hexdigest()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        self.server.data = self.data
+        self.server.etag = '"v1"'
+        self.server.support_range = True
+        self.server.requests = []
+        self.server.sent = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/a.bin"
+
+        self.saved = (
+            download.DOWNLOAD_CACHE_HOME,
+            download.DOWNLOAD_CHUNK_SIZE,
+        )
+        download.DOWNLOAD_CACHE_HOME = os.path.join(self.temp_dir.name, 'cache')
+        download.DOWNLOAD_CHUNK_SIZE = 1024
+
+    def tearDown(self):
+        download.DOWNLOAD_CACHE_HOME, download.DOWNLOAD_CHUNK_SIZE = self.saved
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def read(self, fullname):
+        with open(fullname, 'rb') as f:
+            return f.read()
+
+    def test_parallel_ranges(self):
+        fullname = download._download(self.url, self.path('out'), self.md5sum)
+        self.assertEqual(self.read(fullname), self.data)
+        self.assertEqual(len(self.server.requests), 11)
+        self.assertEqual(self.server.sent, len(self.data))
+
+    def test_no_range_support(self):
+        self.server.support_range = False
+        fullname = download._download(self.url, self.path('out'), None)
+        self.assertEqual(self.read(fullname), self.data)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_resume(self):
+        fullname = os.path.join(self.path('out'), 'a.bin')
+        os.makedirs(self.path('out'))
+        with open(fullname + '_tmp', 'wb') as f:
+            f.write(self.data[:4096])
+        with open(fullname + '_tmp.meta', 'w') as f:
+            json.dump({'url': self.url, 'validator': '"v1"'}, f)
+        download._download(self.url, self.path('out'))
+        self.assertEqual(self.read(fullname), self.data)
+        self.assertEqual(self.server.sent, len(self.data) - 4096)
+        self.assertFalse(os.path.exists(fullname + '_tmp.meta'))
+
+    def test_resume_changed(self):
+        fullname = os.path.join(self.path('out'), 'a.bin')
+        os.makedirs(self.path('out'))
+        with open(fullname + '_tmp', 'wb') as f:
+            f.write(b'x' * 4096)
+        with open(fullname + '_tmp.meta', 'w') as f:
+            json.dump({'url': self.url, 'validator': '"v0"'}, f)
+        download._download(self.url, self.path('out'))
+        self.assertEqual(self.read(fullname), self.data)
+
+    def test_empty_file(self):
+        self.server.data = b''
+        fullname = download._download(self.url, self.path('out'), None)
+        self.assertEqual(self.read(fullname), b'')
+
+    def test_md5_mismatch(self):
+        with self.assertRaises(RuntimeError):
+            download._download(self.url, self.path('out'), '0' * 32)
+
+    def test_shared_cache(self):
+        threads = [
+            threading.Thread(
+                target=download._download,
+                args=(self.url, self.path(f'out{i}'), self.md5sum),
+            )
+            for i in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i in range(4):
+            fullname = os.path.join(self.path(f'out{i}'), 'a.bin')
+            self.assertEqual(self.read(fullname), self.data)
+        # downloaded only once for all the destinations
+        self.assertEqual(self.server.sent, len(self.data))
+
+
 if __name__ == '__main__':
     unittest.main()
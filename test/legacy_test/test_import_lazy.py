@@ -0,0 +1,101 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+import unittest
+
+import paddle
+
+# the subpackages which should not be imported by `import paddle`
+LAZY_SUBMODULES = [f'paddle.{name}' for name in paddle._LAZY_SUBMODULES] + [
+    'paddle.hapi'
+]
+
+
+def import_time(code, env=None):
+    """
+    Run code with `-X importtime`, return the dict of the imported modules
+    and their cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:') :].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        modules[fields[2].strip()] = int(fields[1])
+    return modules
+
+
+def imported_modules(code, env=None):
+    """Run code and return the set of the modules in sys.modules."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            f'{code}\nimport sys\nprint("\\n".join(sys.modules))',
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.splitlines())
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_not_imported(self):
+        modules = import_time('import paddle')
+        self.assertIn('paddle', modules)
+        for name in LAZY_SUBMODULES:
+            self.assertNotIn(name, modules)
+        self.assertTrue(
+            imported_modules('import paddle').isdisjoint(LAZY_SUBMODULES)
+        )
+
+    def test_eager_import(self):
+        env = dict(os.environ, PADDLE_LAZY_IMPORT='0')
+        modules = imported_modules('import paddle', env)
+        for name in LAZY_SUBMODULES:
+            self.assertIn(name, modules)
+
+    def test_access(self):
+        code = '\n'.join(
+            [
+                'import paddle',
+                'assert "vision" in dir(paddle)',
+                'assert paddle.vision.models.resnet18 is not None',
+                'assert paddle.Model is paddle.hapi.Model',
+                'from paddle import summary, text',
+                'assert summary is paddle.hapi.summary',
+                'from paddle.sparse import sparse_coo_tensor',
+            ]
+        )
+        modules = imported_modules(code)
+        self.assertIn('paddle.vision', modules)
+        self.assertIn('paddle.text', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
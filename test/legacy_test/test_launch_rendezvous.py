@@ -0,0 +1,147 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from benchmark_rendezvous import benchmark
+
+from paddle.distributed.launch.utils.rendezvous import (
+    RendezvousClient,
+    RendezvousStore,
+    rendezvous,
+)
+
+
+def _endpoint(store):
+    return f"127.0.0.1:{store.server_address[1]}"
+
+
+class TestRendezvousStore(unittest.TestCase):
+    def setUp(self):
+        self.store = RendezvousStore(0)
+        self.store.start()
+        self.client = RendezvousClient(_endpoint(self.store))
+        self.assertTrue(self.client.wait_server_ready())
+
+    def tearDown(self):
+        self.store.stop()
+
+    def test_put_get(self):
+        self.assertTrue(self.client.put('/a/x', 'vx'))
+        self.assertTrue(self.client.put_batch({'/a/y': 'vy', '/b/z': 'vz'}))
+        self.assertEqual(self.client.get('/a/x'), 'vx')
+        self.assertEqual(
+            self.client.get_prefix('/a'), {'/a/x': 'vx', '/a/y': 'vy'}
+        )
+        self.assertTrue(self.client.delete('/a/x'))
+        self.assertEqual(self.client.get_prefix('/a'), {'/a/y': 'vy'})
+        self.assertFalse(self.client.delete('/a/x'))
+
+    def test_wait_prefix(self):
+        self.assertEqual(self.client.wait_prefix('/w', 2, timeout=0.1), {})
+
+        def put():
+            client = RendezvousClient(_endpoint(self.store))
+            client.put('/w/0', '0')
+            client.put('/w/1', '1')
+
+        t = threading.Thread(target=put)
+        t.start()
+        ret = self.client.wait_prefix('/w', 2, timeout=10)
+        t.join()
+        self.assertEqual(ret, {'/w/0': '0', '/w/1': '1'})
+
+    def test_join_tree(self):
+        parents = []
+        for i in range(7):
+            index, parent = self.client.join(
+                '/j', f'/j/{i}', str(i), relay=f'relay{i}', fanout=2
+            )
+            self.assertEqual(index, i)
+            parents.append(parent)
+        self.assertEqual(
+            parents,
+            ['', '', 'relay0', 'relay0', 'relay1', 'relay1', 'relay2'],
+        )
+        # join again keeps the position in the tree
+        self.assertEqual(self.client.join('/j', '/j/3', '3', 'x', 2)[0], 3)
+
+
+class TestRendezvous(unittest.TestCase):
+    def _run(self, size, fanout, with_relay):
+        root = RendezvousStore(0)
+        root.start()
+        relays = []
+        results = [None] * size
+
+        def peer(i):
+            relay = None
+            if with_relay:
+                relay = RendezvousStore(0)
+                relay.start()
+                relays.append(relay)
+            results[i] = rendezvous(
+                RendezvousClient(_endpoint(root)),
+                '/info',
+                f'/info/pod{i:03d}/-1',
+                str(i),
+                size,
+                fanout=fanout,
+                relay=relay,
+                relay_endpoint=_endpoint(relay) if relay else '',
+            )
+
+        threads = [
+            threading.Thread(target=peer, args=(i,)) for i in range(size)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for relay in relays:
+            relay.stop()
+        root.stop()
+
+        expected = {f'/info/pod{i:03d}/-1': str(i) for i in range(size)}
+        for ret in results:
+            self.assertEqual(ret, expected)
+
+    def test_flat(self):
+        self._run(8, 0, False)
+
+    def test_tree(self):
+        self._run(20, 3, True)
+
+    def test_abort(self):
+        root = RendezvousStore(0)
+        root.start()
+        ret = rendezvous(
+            RendezvousClient(_endpoint(root)),
+            '/info',
+            '/info/pod/-1',
+            'v',
+            2,
+            is_done=lambda: True,
+        )
+        root.stop()
+        self.assertEqual(ret, {})
+
+    def test_benchmark(self):
+        results = benchmark(sizes=(4, 16), fanout=4)
+        self.assertEqual(sorted(results.keys()), [4, 16])
+
+
+if __name__ == '__main__':
+    unittest.main()
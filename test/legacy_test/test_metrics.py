@@ -295,6 +295,86 @@ class TestAuc(unittest.TestCase):
         m.reset()
         self.assertEqual(m.accumulate(), 0.0)
 
+    def test_auc_pr(self):
+        x = np.array(
+            [
+                [0.78, 0.22],
+                [0.62, 0.38],
+                [0.55, 0.45],
+                [0.30, 0.70],
+                [0.14, 0.86],
+                [0.59, 0.41],
+                [0.91, 0.08],
+                [0.16, 0.84],
+            ]
+        )
+        y = np.array([[0], [1], [1], [0], [1], [0], [0], [1]])
+        m = paddle.metric.Auc(curve='PR')
+        m.update(x, y)
+        r = m.accumulate()
+        self.assertAlmostEqual(r, 0.8354166666666666)
+
+        m.reset()
+        self.assertEqual(m.accumulate(), 0.0)
+
+    def test_auc_large_batch(self):
+        np.random.seed(2024)
+        n = 10000
+        class1_preds = np.random.random(size=(n, 1))
+        x = np.concatenate((1 - class1_preds, class1_preds), axis=1)
+        y = np.random.randint(2, size=(n, 1))
+        m = paddle.metric.Auc()
+        m.update(x, y)
+
+        # reference implementation of the per-sample bucketing
+        stat_pos = np.zeros(4096)
+        stat_neg = np.zeros(4096)
+        for i, lbl in enumerate(y):
+            bin_idx = int(x[i, 1] * 4095)
+            if lbl:
+                stat_pos[bin_idx] += 1.0
+            else:
+                stat_neg[bin_idx] += 1.0
+        np.testing.assert_array_equal(m.get_state()['stat_pos'], stat_pos)
+        np.testing.assert_array_equal(m.get_state()['stat_neg'], stat_neg)
+
+        tot_pos, tot_neg, auc = 0.0, 0.0, 0.0
+        for idx in range(4095, -1, -1):
+            tot_pos_prev, tot_neg_prev = tot_pos, tot_neg
+            tot_pos += stat_pos[idx]
+            tot_neg += stat_neg[idx]
+            auc += m.trapezoid_area(
+                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+            )
+        self.assertAlmostEqual(m.accumulate(), auc / tot_pos / tot_neg)
+
+    def test_auc_merge(self):
+        np.random.seed(2024)
+        n = 1000
+        class1_preds = np.random.random(size=(n, 1))
+        x = np.concatenate((1 - class1_preds, class1_preds), axis=1)
+        y = np.random.randint(2, size=(n, 1))
+
+        m = paddle.metric.Auc()
+        m.update(x, y)
+
+        m0 = paddle.metric.Auc()
+        m1 = paddle.metric.Auc()
+        m2 = paddle.metric.Auc()
+        m0.update(x[:300], y[:300])
+        m1.update(x[300:700], y[300:700])
+        m2.update(x[700:], y[700:])
+        m0.merge(m1)
+        m0.merge(m2.get_state())
+        self.assertAlmostEqual(m0.accumulate(), m.accumulate())
+
+        with self.assertRaises(ValueError):
+            m0.merge(paddle.metric.Auc(num_thresholds=200))
+
+    def test_auc_invalid_curve(self):
+        with self.assertRaises(ValueError):
+            paddle.metric.Auc(curve='XX')
+
 
 if __name__ == '__main__':
     unittest.main()
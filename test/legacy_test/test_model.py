@@ -549,6 +549,69 @@ class TestModelFunction(unittest.TestCase):
             np.testing.assert_allclose(loss.flatten(), ref.flatten())
             base.disable_dygraph() if dynamic else None
 
+    def test_fit_deferred_sync(self):
+        class LogsRecorder(paddle.callbacks.Callback):
+            def __init__(self):
+                super().__init__()
+                self.batch_logs = []
+                self.epoch_logs = []
+
+            def on_train_batch_end(self, step, logs=None):
+                self.batch_logs.append(dict(logs))
+
+            def on_epoch_end(self, epoch, logs=None):
+                self.epoch_logs.append(dict(logs))
+
+        x = np.random.random(size=(40, 20)).astype(np.float32)
+        y = np.random.randint(0, 10, size=(40, 1)).astype(np.int64)
+        dataset = paddle.io.TensorDataset([to_tensor(x), to_tensor(y)])
+
+        def fit(deferred_sync):
+            paddle.disable_static(paddle.set_device('cpu'))
+            self.set_seed()
+            net = MyModel()
+            optim = paddle.optimizer.SGD(
+                learning_rate=0.001, parameters=net.parameters()
+            )
+            model = Model(net)
+            model.prepare(
+                optim,
+                loss=CrossEntropyLoss(reduction="sum"),
+                metrics=Accuracy(),
+            )
+            recorder = LogsRecorder()
+            model.fit(
+                dataset,
+                batch_size=4,
+                epochs=2,
+                log_freq=3,
+                shuffle=False,
+                verbose=0,
+                callbacks=[recorder],
+                deferred_sync=deferred_sync,
+            )
+            # the outputs of the adapter are fetched after fit
+            (loss,) = model.train_batch([x[:4]], [y[:4]])
+            self.assertIsInstance(loss, np.ndarray)
+            paddle.enable_static()
+            return recorder
+
+        expected = fit(False)
+        result = fit(True)
+        for expected_logs, logs in zip(expected.epoch_logs, result.epoch_logs):
+            np.testing.assert_allclose(logs['loss'], expected_logs['loss'])
+            np.testing.assert_allclose(logs['acc'], expected_logs['acc'])
+        # the logs are synchronized every log_freq steps
+        for step in [2, 5, 8]:
+            np.testing.assert_allclose(
+                result.batch_logs[step]['loss'],
+                expected.batch_logs[step]['loss'],
+            )
+            np.testing.assert_allclose(
+                result.batch_logs[step]['acc'],
+                expected.batch_logs[step]['acc'],
+            )
+
     def test_test_batch(self):
         dim = 20
         data = np.random.random(size=(4, dim)).astype(np.float32)
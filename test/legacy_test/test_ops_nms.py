@@ -141,6 +141,165 @@ class TestOpsNMS(unittest.TestCase):
                     err_msg=f'paddle out: {out}\n py out: {out_py}\n',
                 )
 
+    def test_multiclass_nms_ignore_categories(self):
+        for device in self.devices:
+            for dtype in self.dtypes:
+                boxes, scores, category_idxs, categories = gen_args(
+                    self.num_boxes, dtype
+                )
+                paddle.set_device(device)
+                out = paddle.vision.ops.nms(
+                    paddle.to_tensor(boxes),
+                    self.threshold,
+                    paddle.to_tensor(scores),
+                    paddle.to_tensor(category_idxs),
+                    [1, 3],
+                )
+                selected = _find(np.isin(category_idxs, [1, 3]))
+                out_py = selected[
+                    multiclass_nms(
+                        boxes[selected],
+                        scores[selected],
+                        category_idxs[selected],
+                        self.threshold,
+                        self.num_boxes,
+                    )
+                ]
+
+                np.testing.assert_array_equal(
+                    out.numpy(),
+                    out_py,
+                    err_msg=f'paddle out: {out}\n py out: {out_py}\n',
+                )
+
+    def test_batched_multiclass_nms_dynamic(self):
+        batch_size = 3
+        for device in self.devices:
+            for dtype in self.dtypes:
+                args = [
+                    gen_args(self.num_boxes, dtype) for _ in range(batch_size)
+                ]
+                boxes = np.stack([arg[0] for arg in args])
+                scores = np.stack([arg[1] for arg in args])
+                category_idxs = np.stack([arg[2] for arg in args])
+                categories = args[0][3]
+                paddle.set_device(device)
+                out = paddle.vision.ops.nms(
+                    paddle.to_tensor(boxes),
+                    self.threshold,
+                    paddle.to_tensor(scores),
+                    paddle.to_tensor(category_idxs),
+                    categories,
+                    self.topk,
+                )
+                out_py = np.concatenate(
+                    [
+                        multiclass_nms(
+                            boxes[i],
+                            scores[i],
+                            category_idxs[i],
+                            self.threshold,
+                            self.topk,
+                        )
+                        + i * self.num_boxes
+                        for i in range(batch_size)
+                    ]
+                )
+
+                np.testing.assert_array_equal(
+                    out.numpy(),
+                    out_py,
+                    err_msg=f'paddle out: {out}\n py out: {out_py}\n',
+                )
+
+                # without categories, every image is suppressed respectively
+                out = paddle.vision.ops.nms(
+                    paddle.to_tensor(boxes),
+                    self.threshold,
+                    paddle.to_tensor(scores),
+                )
+                out_py = np.concatenate(
+                    [
+                        np.argsort(-scores[i])[
+                            nms(
+                                boxes[i][np.argsort(-scores[i])], self.threshold
+                            )
+                        ]
+                        + i * self.num_boxes
+                        for i in range(batch_size)
+                    ]
+                )
+                np.testing.assert_array_equal(
+                    out.numpy(),
+                    out_py,
+                    err_msg=f'paddle out: {out}\n py out: {out_py}\n',
+                )
+
+    def test_multiclass_nms_sparse_categories(self):
+        batch_size = 3
+        categories = [1, 100000]
+        for device in self.devices:
+            for dtype in self.dtypes:
+                args = [
+                    gen_args(self.num_boxes, dtype) for _ in range(batch_size)
+                ]
+                # large coordinates, the offsets of sparse category ids used
+                # to exceed the exact range of float32
+                boxes = np.stack([arg[0] for arg in args]) * 1000
+                scores = np.stack([arg[1] for arg in args])
+                category_idxs = np.random.choice(
+                    categories, [batch_size, self.num_boxes]
+                )
+                paddle.set_device(device)
+
+                out = paddle.vision.ops.nms(
+                    paddle.to_tensor(boxes[0]),
+                    self.threshold,
+                    paddle.to_tensor(scores[0]),
+                    paddle.to_tensor(category_idxs[0]),
+                    categories,
+                    self.topk,
+                )
+                out_py = multiclass_nms(
+                    boxes[0],
+                    scores[0],
+                    category_idxs[0],
+                    self.threshold,
+                    self.topk,
+                )
+                np.testing.assert_array_equal(
+                    out.numpy(),
+                    out_py,
+                    err_msg=f'paddle out: {out}\n py out: {out_py}\n',
+                )
+
+                out = paddle.vision.ops.nms(
+                    paddle.to_tensor(boxes),
+                    self.threshold,
+                    paddle.to_tensor(scores),
+                    paddle.to_tensor(category_idxs),
+                    categories,
+                    self.topk,
+                )
+                out_py = np.concatenate(
+                    [
+                        multiclass_nms(
+                            boxes[i],
+                            scores[i],
+                            category_idxs[i],
+                            self.threshold,
+                            self.topk,
+                        )
+                        + i * self.num_boxes
+                        for i in range(batch_size)
+                    ]
+                )
+                np.testing.assert_array_equal(
+                    out.numpy(),
+                    out_py,
+                    err_msg=f'paddle out: {out}\n py out: {out_py}\n',
+                )
+
     def test_multiclass_nms_static(self):
         for device in self.devices:
             for dtype in self.dtypes:
@@ -195,6 +354,51 @@ class TestOpsNMS(unittest.TestCase):
                         err_msg=f'paddle out: {out}\n py out: {out_py}\n',
                     )
 
+    def test_multiclass_nms_static_without_candidates(self):
+        for device in self.devices:
+            # no box is in the categories, or there is no category
+            for categories in [[5, 6], []]:
+                with paddle.static.program_guard(
+                    paddle.static.Program(), paddle.static.Program()
+                ):
+                    paddle.enable_static()
+                    boxes, scores, category_idxs, _ = gen_args(
+                        self.num_boxes, 'float32'
+                    )
+                    boxes_static = paddle.static.data(
+                        shape=boxes.shape, dtype=boxes.dtype, name="boxes"
+                    )
+                    scores_static = paddle.static.data(
+                        shape=scores.shape, dtype=scores.dtype, name="scores"
+                    )
+                    category_idxs_static = paddle.static.data(
+                        shape=category_idxs.shape,
+                        dtype=category_idxs.dtype,
+                        name="category_idxs",
+                    )
+                    out = paddle.vision.ops.nms(
+                        boxes_static,
+                        self.threshold,
+                        scores_static,
+                        category_idxs_static,
+                        categories,
+                    )
+                    place = paddle.CPUPlace()
+                    if device == 'gpu':
+                        place = paddle.CUDAPlace(0)
+                    exe = paddle.static.Executor(place)
+                    (out,) = exe.run(
+                        paddle.static.default_main_program(),
+                        feed={
+                            'boxes': boxes,
+                            'scores': scores,
+                            'category_idxs': category_idxs,
+                        },
+                        fetch_list=[out],
+                    )
+                    paddle.disable_static()
+                    self.assertEqual(np.array(out).size, 0)
+
     def test_multiclass_nms_dynamic_to_static(self):
         for device in self.devices:
             for dtype in self.dtypes:
@@ -15,6 +15,7 @@
 import os
 import tempfile
 import unittest
+from fractions import Fraction
 from io import BytesIO
 
 import numpy as np
@@ -25,6 +26,7 @@ import paddle.optimizer as opt
 from paddle import base, nn
 from paddle.base import framework
 from paddle.framework import in_pir_mode
+from paddle.framework.async_checkpoint import _get_async_checkpoint_engine
 from paddle.framework.io_utils import get_value, is_pir_fetch_var, set_value
 from paddle.optimizer import Adam
 from paddle.optimizer.lr import LRScheduler
@@ -1087,11 +1089,16 @@ class TestAsyncSaveLoad(unittest.TestCase):
         layer_state_dict = layer.state_dict()
         opt_state_dict = opt.state_dict()
 
-        paddle.async_save(
+        layer_handle = paddle.async_save(
             layer_state_dict, layer_save_path, sync_other_task=True
         )
-        paddle.async_save(opt_state_dict, opt_save_path)
+        opt_handle = paddle.async_save(opt_state_dict, opt_save_path)
         paddle.clear_async_save_task_queue()
+        for handle in [layer_handle, opt_handle]:
+            self.assertTrue(handle.done())
+            self.assertIsNone(handle.result())
+            self.assertTrue(handle.staged.done())
+            self.assertEqual(handle.progress(), 1.0)
 
         # load
         load_layer_state_dict = paddle.load(layer_save_path)
@@ -1100,6 +1107,61 @@ class TestAsyncSaveLoad(unittest.TestCase):
         self.check_load_state_dict(layer_state_dict, load_layer_state_dict)
         self.check_load_state_dict(opt_state_dict, load_opt_state_dict)
 
+        # the snapshot is not affected by the later modification
+        weight = layer._linear.weight.numpy()
+        handle = paddle.async_save(layer_state_dict, layer_save_path)
+        layer._linear.weight.set_value(paddle.zeros_like(layer._linear.weight))
+        handle.result()
+        np.testing.assert_array_equal(
+            paddle.load(layer_save_path)['_linear.weight'].numpy(), weight
+        )
+
+        # save a single tensor to memory buffer
+        byio = BytesIO()
+        tensor = paddle.rand([3, 4])
+        paddle.async_save(tensor, byio).result()
+        byio.seek(0)
+        np.testing.assert_array_equal(paddle.load(byio).numpy(), tensor.numpy())
+
+        # nested tensors are saved as paddle.save does and loaded as tensors
+        nested_obj = {
+            'master_weights': {'w': paddle.rand([2, 3])},
+            'tensors': [paddle.rand([4]), paddle.rand([2, 2])],
+            'step': 3,
+        }
+        nested_save_path = os.path.join(
+            self.temp_dir.name, "test_paddle_async_save_load.nested.pdopt"
+        )
+        paddle.async_save(nested_obj, nested_save_path).result()
+        load_nested_obj = paddle.load(nested_save_path)
+        self.assertEqual(load_nested_obj['step'], 3)
+        loaded_w = load_nested_obj['master_weights']['w']
+        self.assertIsInstance(loaded_w, paddle.Tensor)
+        np.testing.assert_array_equal(
+            loaded_w.numpy(), nested_obj['master_weights']['w'].numpy()
+        )
+        for tensor, loaded in zip(
+            nested_obj['tensors'], load_nested_obj['tensors']
+        ):
+            self.assertIsInstance(loaded, paddle.Tensor)
+            np.testing.assert_array_equal(loaded.numpy(), tensor.numpy())
+
+        # the checkpoints above are written by the writer process, objects
+        # which it can not unpickle are written by a thread
+        writer_process = _get_async_checkpoint_engine()._writer_process
+        self.assertIsNotNone(writer_process)
+        self.assertTrue(writer_process.alive())
+        other_obj = {'ratio': Fraction(1, 3), 'w': paddle.rand([2])}
+        other_save_path = os.path.join(
+            self.temp_dir.name, "test_paddle_async_save_load.other.pdopt"
+        )
+        paddle.async_save(other_obj, other_save_path).result()
+        load_other_obj = paddle.load(other_save_path)
+        self.assertEqual(load_other_obj['ratio'], Fraction(1, 3))
+        np.testing.assert_array_equal(
+            load_other_obj['w'].numpy(), other_obj['w'].numpy()
+        )
+
         # test assertion on illegal object
         some_tuple_obj = (1, 2, 3)
         tuple_save_path = os.path.join(
@@ -0,0 +1,123 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.framework import tensor_file
+
+
+class TestSaveTensorFile(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.pdparams')
+        self.layer = paddle.nn.Linear(13, 7)
+        self.state_dict = self.layer.state_dict()
+        self.state_dict['step'] = 10
+        self.state_dict['array'] = np.arange(6, dtype='int32').reshape([2, 3])
+        self.state_dict['empty'] = paddle.zeros([0, 4], dtype='float16')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_load_result(self, load_result, return_numpy=False):
+        self.assertEqual(set(load_result.keys()), set(self.state_dict.keys()))
+        self.assertEqual(load_result['step'], 10)
+        for key, value in self.state_dict.items():
+            if key == 'step':
+                continue
+            expected = value if isinstance(value, np.ndarray) else value.numpy()
+            loaded = load_result[key]
+            if return_numpy:
+                self.assertIsInstance(loaded, np.ndarray)
+            else:
+                self.assertIsInstance(loaded, paddle.Tensor)
+                loaded = loaded.numpy()
+            self.assertEqual(loaded.dtype, expected.dtype)
+            np.testing.assert_array_equal(loaded, expected)
+
+    def test_save_load(self):
+        for num_io_threads in [1, 4]:
+            paddle.save(
+                self.state_dict,
+                self.path,
+                use_tensor_file=True,
+                num_io_threads=num_io_threads,
+            )
+            self.check_load_result(paddle.load(self.path))
+            self.check_load_result(
+                paddle.load(self.path, return_numpy=True), return_numpy=True
+            )
+
+        load_result = paddle.load(self.path)
+        self.assertEqual(load_result['weight'].name, self.layer.weight.name)
+        layer = paddle.nn.Linear(13, 7)
+        layer.set_state_dict(load_result)
+        np.testing.assert_array_equal(
+            layer.weight.numpy(), self.layer.weight.numpy()
+        )
+
+    def test_chunked_save(self):
+        x = paddle.rand([100, 37])
+        tensor_file._save_tensor_file({'x': x}, self.path, chunk_size=1000)
+        np.testing.assert_array_equal(
+            paddle.load(self.path, return_numpy=True)['x'], x.numpy()
+        )
+
+    def test_mmap_load(self):
+        paddle.save(self.state_dict, self.path, use_tensor_file=True)
+        load_result = paddle.load(self.path, mmap=True)
+        self.assertIsInstance(load_result, tensor_file.LazyTensorFile)
+        self.check_load_result(load_result)
+
+        # modifying the loaded array never changes the file
+        array = paddle.load(self.path, mmap=True, return_numpy=True)['array']
+        array[:] = -1
+        np.testing.assert_array_equal(
+            paddle.load(self.path, return_numpy=True)['array'],
+            self.state_dict['array'],
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            paddle.save(
+                {'x': paddle.rand([2]), 'obj': object()},
+                self.path,
+                use_tensor_file=True,
+            )
+        with self.assertRaises(TypeError):
+            paddle.save(paddle.rand([2]), self.path, use_tensor_file=True)
+        with self.assertRaises(ValueError):
+            paddle.save(
+                {'x': paddle.rand([2])},
+                self.path,
+                use_tensor_file=True,
+                use_binary_format=True,
+            )
+
+    def test_interrupted_save(self):
+        # the header is written last, a partially written file is not
+        # recognized as tensor file
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 1024)
+        self.assertFalse(tensor_file._is_tensor_file(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+import numpy as np
+from test_profiler_statistic import DevicePythonNode, HostPythonNode
+
+from paddle import profiler
+from paddle.profiler import event_table, statistic_helper
+from paddle.profiler.event_table import EventTable
+
+
+def random_ranges(rng, num):
+    ranges = []
+    for _ in range(num):
+        start = rng.randint(0, 1000)
+        ranges.append((start, start + rng.randint(0, 50)))
+    return ranges
+
+
+def as_arrays(ranges):
+    return (
+        np.array([r[0] for r in ranges], dtype=np.int64),
+        np.array([r[1] for r in ranges], dtype=np.int64),
+    )
+
+
+class TestIntervals(unittest.TestCase):
+    def test_merge_and_union(self):
+        rng = random.Random(0)
+        for num in [0, 1, 5, 50, 200]:
+            ranges1 = random_ranges(rng, num)
+            ranges2 = random_ranges(rng, rng.randint(0, 100))
+            starts1, ends1 = statistic_helper.merge_intervals(
+                *as_arrays(ranges1)
+            )
+            self.assertEqual(
+                statistic_helper.to_ranges(starts1, ends1),
+                statistic_helper.merge_self_ranges(list(ranges1)),
+            )
+            starts2, ends2 = statistic_helper.merge_intervals(
+                *as_arrays(ranges2)
+            )
+            starts, ends = statistic_helper.union_intervals(
+                starts1, ends1, starts2, ends2
+            )
+            self.assertEqual(
+                statistic_helper.to_ranges(starts, ends),
+                statistic_helper.merge_ranges(
+                    list(ranges1), list(ranges2), is_sorted=False
+                ),
+            )
+
+    def test_intersect(self):
+        rng = random.Random(1)
+        for num in [0, 1, 5, 50, 200]:
+            ranges1 = statistic_helper.merge_self_ranges(
+                random_ranges(rng, num)
+            )
+            ranges2 = statistic_helper.merge_self_ranges(
+                random_ranges(rng, rng.randint(0, 100))
+            )
+            starts, ends = statistic_helper.intersect_intervals(
+                *as_arrays(ranges1), *as_arrays(ranges2)
+            )
+            expected = statistic_helper.intersection_ranges(
+                ranges1, ranges2, is_sorted=True
+            )
+            self.assertEqual(
+                statistic_helper.sum_intervals(starts, ends),
+                statistic_helper.sum_ranges(expected),
+            )
+            self.assertEqual(
+                [r for r in statistic_helper.to_ranges(starts, ends) if r[1]],
+                [r for r in expected if r[1]],
+            )
+
+
+class TestEventTable(unittest.TestCase):
+    def build_tree(self):
+        root = HostPythonNode(
+            'Root Node',
+            profiler.TracerEventType.UserDefined,
+            0,
+            float('inf'),
+            1000,
+            1001,
+        )
+        step = HostPythonNode(
+            'ProfileStep#1',
+            profiler.TracerEventType.ProfileStep,
+            0,
+            100,
+            1000,
+            1001,
+        )
+        matmul = HostPythonNode(
+            'matmul', profiler.TracerEventType.Operator, 10, 40, 1000, 1001
+        )
+        relu = HostPythonNode(
+            'relu', profiler.TracerEventType.Operator, 50, 60, 1000, 1001
+        )
+        launch = HostPythonNode(
+            'cudaLaunchKernel',
+            profiler.TracerEventType.CudaRuntime,
+            20,
+            25,
+            1000,
+            1001,
+        )
+        kernel = DevicePythonNode(
+            'gemm', profiler.TracerEventType.Kernel, 30, 70, 0, 0, 0
+        )
+        root.children_node.append(step)
+        step.children_node.extend([matmul, relu])
+        matmul.runtime_node.append(launch)
+        launch.device_node.append(kernel)
+        return {'thread1001': root}
+
+    def test_columns(self):
+        table = EventTable(self.build_tree())
+        names = [table.names[i] for i in table.name]
+        # host nodes are visited as when popping them from a stack, every
+        # host node is followed by its runtime and device nodes.
+        self.assertEqual(
+            names,
+            [
+                'Root Node',
+                'ProfileStep#1',
+                'relu',
+                'matmul',
+                'cudaLaunchKernel',
+                'gemm',
+            ],
+        )
+        self.assertEqual(table.parent.tolist(), [-1, 0, 1, 1, 3, 4])
+        self.assertEqual(table.depth.tolist(), [0, 1, 2, 2, 3, 4])
+        self.assertEqual(table.index.tolist(), [0, 0, 1, 0, 0, 0])
+        self.assertEqual(
+            table.kind.tolist(),
+            [event_table.HOST] * 4 + [event_table.RUNTIME, event_table.DEVICE],
+        )
+        # the infinite time range of the root node is not stored
+        self.assertEqual(table.start.tolist(), [0, 0, 50, 10, 20, 30])
+        self.assertEqual(table.end.tolist(), [0, 100, 60, 40, 25, 70])
+        self.assertEqual(table.host.tolist(), [0, 1, 2, 3, 3, 3])
+        self.assertEqual(table.launched.tolist(), [False] * 5 + [True])
+        self.assertEqual([row for row, _ in table.operator_nodes], [2, 3])
+
+        kernel_time = np.where(
+            table.is_type(profiler.TracerEventType.Kernel),
+            table.end - table.start,
+            0,
+        )
+        self.assertEqual(
+            table.subtree_sum(kernel_time).tolist(), [40, 40, 0, 40, 40, 40]
+        )
+        self.assertEqual(
+            table.inherit(table.name == table.name[3]).tolist(),
+            [False, False, False, True, True, True],
+        )
+
+    def test_group_by(self):
+        keys = np.array([3, 1, 3, 2, 1])
+        group, first = event_table.group_by(keys)
+        # groups are numbered by their first row
+        self.assertEqual(group.tolist(), [0, 1, 0, 2, 1])
+        self.assertEqual(first.tolist(), [0, 1, 3])
+        group, first = event_table.group_by(keys, np.array([0, 0, 1, 0, 0]))
+        self.assertEqual(group.tolist(), [0, 1, 2, 3, 1])
+        groups = event_table.split_by(np.arange(5), keys)
+        self.assertEqual(
+            [rows.tolist() for rows in groups], [[0, 2], [1, 4], [3]]
+        )
+        total, high, low = event_table.aggregate(
+            np.array([0, 1, 0]), 2, np.array([5, 7, 3])
+        )
+        self.assertEqual((total, high, low), ([8, 7], [5, 7], [3, 7]))
+
+
+if __name__ == '__main__':
+    unittest.main()
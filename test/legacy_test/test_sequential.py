@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import unittest
 
+import numpy as np
+
 import paddle
 
 
@@ -40,5 +43,79 @@ class TestDataFeeder(unittest.TestCase):
             tmp = sequential[-11]
 
 
+class AddLayer(paddle.nn.Layer):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    def forward(self, x):
+        return x + self.value
+
+
+class BuildOnceLayer(AddLayer):
+    def _build_once(self, x):
+        self.value = self.value * 10
+
+
+class TestSequentialCallPlan(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.x = paddle.zeros([2])
+
+    def check(self, model, expected):
+        np.testing.assert_allclose(model(self.x).numpy(), [expected] * 2)
+
+    def test_hooks_change(self):
+        layers = [AddLayer(1), AddLayer(2), AddLayer(3)]
+        model = paddle.nn.Sequential(*layers)
+        self.check(model, 6)
+
+        pre = layers[1].register_forward_pre_hook(lambda l, x: x[0] * 10)
+        self.check(model, 13)
+        post = layers[2].register_forward_post_hook(lambda l, x, y: y * 2)
+        self.check(model, 26)
+
+        pre.remove()
+        self.check(model, 12)
+        # hooks removed from the dict directly
+        layers[2]._forward_post_hooks.clear()
+        self.check(model, 6)
+
+    def test_hooks_order(self):
+        layer = AddLayer(1)
+        model = paddle.nn.Sequential(layer)
+        layer.register_forward_post_hook(lambda l, x, y: y * 2)
+        h = layer.register_forward_post_hook(lambda l, x, y: y + 1)
+        self.check(model, 3)
+        layer._forward_post_hooks.move_to_end(h._hook_id, last=False)
+        self.check(model, 4)
+
+    def test_sublayers_change(self):
+        model = paddle.nn.Sequential(AddLayer(1), AddLayer(2))
+        self.check(model, 3)
+        model[1] = AddLayer(5)
+        self.check(model, 6)
+        model.append(AddLayer(1))
+        self.check(model, 7)
+        del model[0]
+        self.check(model, 6)
+        model.insert(0, AddLayer(4))
+        self.check(model, 10)
+
+    def test_build_once(self):
+        model = paddle.nn.Sequential(BuildOnceLayer(1), AddLayer(1))
+        self.check(model, 11)
+        self.check(model, 11)
+
+    def test_copy(self):
+        layer = AddLayer(1)
+        model = paddle.nn.Sequential(layer, AddLayer(1))
+        self.check(model, 2)
+        copied = copy.deepcopy(model)
+        layer.register_forward_post_hook(lambda l, x, y: y * 3)
+        self.check(model, 4)
+        self.check(copied, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
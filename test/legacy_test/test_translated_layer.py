@@ -219,5 +219,88 @@ class TestTranslatedLayer(unittest.TestCase):
             self.assertEqual(layer.training, True)
 
 
+class TestTranslatedLayerCallPlan(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static(paddle.CPUPlace())
+        paddle.seed(SEED)
+        self.layer = LinearNet()
+        self.layer.eval()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.temp_dir.name, 'linear')
+        paddle.jit.save(self.layer, self.model_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_outputs_are_not_overwritten(self):
+        translated_layer = paddle.jit.load(self.model_path)
+        translated_layer.eval()
+        x = paddle.randn([1, IMAGE_SIZE], 'float32')
+        y = paddle.randn([1, IMAGE_SIZE], 'float32')
+        with paddle.no_grad():
+            out_x = translated_layer(x)
+            out_y = translated_layer(y)
+            self.assertIsNot(out_x, out_y)
+            np.testing.assert_array_equal(
+                out_x.numpy(), self.layer(x).numpy()
+            )
+            np.testing.assert_array_equal(
+                out_y.numpy(), self.layer(y).numpy()
+            )
+            for _ in range(3):
+                np.testing.assert_array_equal(
+                    translated_layer(y).numpy(), out_y.numpy()
+                )
+        self.assertEqual(len(translated_layer._call_plans), 1)
+
+    def test_detached_outputs_are_not_overwritten(self):
+        translated_layer = paddle.jit.load(self.model_path)
+        translated_layer.eval()
+        x = paddle.randn([1, IMAGE_SIZE], 'float32')
+        y = paddle.randn([1, IMAGE_SIZE], 'float32')
+        with paddle.no_grad():
+            # the detached tensor shares the buffer of the output, which is
+            # not referenced by python any more
+            out_x = translated_layer(x).detach()
+            expected = out_x.numpy()
+            translated_layer(y)
+            np.testing.assert_array_equal(out_x.numpy(), expected)
+            np.testing.assert_array_equal(
+                out_x.numpy(), self.layer(x).numpy()
+            )
+
+    def test_too_many_inputs(self):
+        translated_layer = paddle.jit.load(self.model_path)
+        x = paddle.randn([1, IMAGE_SIZE], 'float32')
+        with self.assertRaises(IndexError):
+            translated_layer(x, x)
+
+    def test_plans_follow_mode_and_parameters(self):
+        translated_layer = paddle.jit.load(self.model_path)
+        x = paddle.randn([1, IMAGE_SIZE], 'float32')
+        translated_layer.eval()
+        translated_layer(x)
+        translated_layer.train()
+        translated_layer(x)
+        self.assertEqual(len(translated_layer._call_plans), 2)
+
+        translated_layer.eval()
+        translated_layer.to(dtype='float32')
+        self.assertEqual(len(translated_layer._call_plans), 0)
+
+        for name, param in list(translated_layer.named_parameters()):
+            new_param = translated_layer.create_parameter(
+                param.shape,
+                default_initializer=paddle.nn.initializer.Constant(1.0),
+            )
+            setattr(translated_layer, name, new_param)
+        self.assertEqual(len(translated_layer._call_plans), 0)
+        np.testing.assert_allclose(
+            translated_layer(x).numpy(),
+            np.full([1, CLASS_NUM], x.numpy().sum() + 1.0),
+            rtol=1e-5,
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
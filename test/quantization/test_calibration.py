@@ -0,0 +1,165 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import numpy as np
+
+from paddle.static.quantization import calibration
+from paddle.static.quantization.cal_kl_threshold import (
+    cal_kl_threshold,
+    expand_quantized_bins,
+    safe_entropy,
+)
+
+
+def reference_kl_threshold(hist, bin_width, bits):
+    hist_bins = hist.shape[0]
+    starting_iter = int((hist_bins - 1) * 0.5)
+    quant_range = 2 ** (bits - 1) - 1
+    P_sum = np.sum(hist)
+    min_kl_divergence = None
+    min_kl_index = 0
+    for i in range(starting_iter, hist_bins):
+        reference_distr_P = hist[0:i].tolist()
+        if reference_distr_P[i - 1] == 0:
+            continue
+        reference_distr_P[i - 1] += sum(hist[i:])
+        num_merged_bins = int(i / quant_range)
+        quantized = []
+        for idx in range(quant_range):
+            j_start = idx * num_merged_bins
+            j_end = (
+                i if idx == quant_range - 1 else j_start + num_merged_bins
+            )
+            quantized.append(sum(hist[j_start:j_end]))
+        candidate_distr_Q = expand_quantized_bins(
+            quantized, reference_distr_P
+        )
+        kl_divergence = safe_entropy(
+            reference_distr_P, P_sum, candidate_distr_Q, sum(candidate_distr_Q)
+        )
+        if min_kl_divergence is None or kl_divergence < min_kl_divergence:
+            min_kl_divergence = kl_divergence
+            min_kl_index = i
+    return (min_kl_index + 0.5) * bin_width
+
+
+def reference_losses(tensor, scales, bits, onnx_format, loss):
+    x = tensor.reshape([-1]).astype(np.float64)
+    bins = 2 ** (bits - 1) - 1
+    losses = []
+    for scale in scales:
+        scale = np.float32(scale)
+        if onnx_format:
+            quant = np.clip(np.round(tensor / scale * bins), -bins - 1, bins)
+            quant_dequant = quant / bins * scale
+        else:
+            quant_dequant = (
+                np.round(np.clip(tensor, 0.0, scale) / scale * bins)
+                / bins
+                * scale
+            )
+        quant_dequant = quant_dequant.reshape([-1]).astype(np.float64)
+        if loss == "mse":
+            losses.append(np.mean((x - quant_dequant) ** 2))
+        else:
+            losses.append(
+                abs(np.mean(x) - np.mean(quant_dequant))
+                + abs(np.std(x) - np.std(quant_dequant))
+            )
+    return losses
+
+
+class TestReductions(unittest.TestCase):
+    def test_abs_max_and_min_max(self):
+        rng = np.random.RandomState(0)
+        weight = rng.standard_normal([8, 6, 3, 3]).astype("float32")
+        self.assertEqual(
+            calibration.abs_max(weight), float(np.max(np.abs(weight)))
+        )
+        for axis in [0, 1]:
+            channels = np.moveaxis(weight, axis, 0)
+            self.assertEqual(
+                calibration.abs_max(weight, axis),
+                [float(np.max(np.abs(c))) for c in channels],
+            )
+            min_value, max_value = calibration.min_max(weight, axis)
+            self.assertEqual(min_value, [float(np.min(c)) for c in channels])
+            self.assertEqual(max_value, [float(np.max(c)) for c in channels])
+
+
+class TestSearchLosses(unittest.TestCase):
+    def test_losses(self):
+        rng = np.random.RandomState(1)
+        tensor = (rng.standard_normal([4, 32, 50]) + 0.3).astype("float32")
+        scales = calibration.candidate_scales(calibration.abs_max(tensor))
+        self.assertEqual(len(scales), 35)
+        for onnx_format in [True, False]:
+            for loss in ["mse", "emd"]:
+                np.testing.assert_allclose(
+                    calibration.search_losses(
+                        tensor, scales, 8, onnx_format, loss=loss
+                    ),
+                    reference_losses(tensor, scales, 8, onnx_format, loss),
+                    rtol=1e-6,
+                )
+
+
+class TestKLThreshold(unittest.TestCase):
+    def test_kl_threshold(self):
+        rng = np.random.RandomState(2)
+        histograms = {}
+        for i, bins in enumerate([2048, 300, 64]):
+            data = np.abs(rng.standard_normal(20000)) ** (i + 1)
+            hist, edges = np.histogram(data, bins=bins)
+            hist[rng.randint(0, bins, bins // 4)] = 0
+            histograms[f"var{i}"] = (hist, edges[1] - edges[0])
+            for bits in [8, 4]:
+                self.assertEqual(
+                    cal_kl_threshold(hist, edges[1] - edges[0], bits),
+                    reference_kl_threshold(hist, edges[1] - edges[0], bits),
+                )
+        thresholds = calibration.cal_kl_thresholds(histograms, 8, 0)
+        self.assertEqual(
+            calibration.cal_kl_thresholds(histograms, 8, 2), thresholds
+        )
+        self.assertEqual(
+            calibration.cal_kl_thresholds(histograms, 8), thresholds
+        )
+
+        # a worker killed in the pool falls back to the current process
+        class BrokenExecutor:
+            def __init__(self, num_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def submit(self, *args):
+                raise BrokenProcessPool("A child process terminated abruptly")
+
+        with patch.object(calibration, "ProcessPoolExecutor", BrokenExecutor):
+            self.assertEqual(
+                calibration.cal_kl_thresholds(histograms, 8, 2), thresholds
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,6 +29,7 @@ from paddle.jit.sot.opcode_translator.custom_code import CustomCode
 from paddle.jit.sot.opcode_translator.executor.executor_cache import (
     OpcodeExecutorCache,
 )
+from paddle.jit.sot.profiler import get_guard_stats
 
 if TYPE_CHECKING:
     from types import FrameType
@@ -151,6 +152,56 @@ class TestOpcodeExecutorCache(unittest.TestCase):
             self.assertEqual(ctx.translate_count, 2)
 
 
+def make_frame(x, flag):
+    frame = inspect.currentframe()
+    assert frame is not None
+    return frame
+
+
+def mock_start_translate_with_discriminators(frame: FrameType, **kwargs):
+    x, flag = frame.f_locals['x'], frame.f_locals['flag']
+    guard = eval(
+        f"lambda frame: frame.f_locals['x'] == {x} and frame.f_locals['flag'] == {flag}"
+    )
+    guard.discriminators = {
+        "frame.f_locals['x']": {},
+        "frame.f_locals['flag']": {},
+    }
+    return CustomCode(None, False), guard
+
+
+class TestGuardIndex(unittest.TestCase):
+    @patch(
+        "paddle.jit.sot.opcode_translator.executor.executor_cache.start_translate",
+        mock_start_translate_with_discriminators,
+    )
+    def test_guard_index(self):
+        with test_instruction_translator_cache_context() as ctx:
+            frames = [
+                make_frame(x, flag) for x in range(8) for flag in [True, False]
+            ]
+            for frame in frames:
+                OpcodeExecutorCache()(frame)
+            self.assertEqual(ctx.translate_count, len(frames))
+
+            stats = get_guard_stats()
+            stats.reset()
+            for frame in frames:
+                OpcodeExecutorCache()(frame)
+            self.assertEqual(ctx.translate_count, len(frames))
+            self.assertEqual(stats.hits, len(frames))
+            self.assertEqual(stats.misses, 0)
+            # only the guard of the matched code is evaluated
+            self.assertEqual(stats.guard_evals, len(frames))
+
+            # a new key misses without evaluating any guard
+            stats.reset()
+            OpcodeExecutorCache()(make_frame(100, True))
+            self.assertEqual(ctx.translate_count, len(frames) + 1)
+            self.assertEqual(stats.misses, 1)
+            self.assertEqual(stats.guard_evals, 0)
+
+
 def foo(x):
     return x + 1
 
@@ -0,0 +1,179 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import tempfile
+import unittest
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import numpy as np
+from test_case_base import test_instruction_translator_cache_context
+
+import paddle
+from paddle.jit import sot
+from paddle.jit.sot import symbolic_translate
+from paddle.jit.sot.opcode_translator.custom_code import CustomCode
+from paddle.jit.sot.opcode_translator.executor.executor_cache import (
+    dummy_guard,
+)
+from paddle.jit.sot.opcode_translator.executor.persistent_cache import (
+    get_persistent_cache,
+)
+from paddle.jit.sot.utils import sot_cache_dir_guard, strict_mode_guard
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+
+def make_frame(x):
+    frame = inspect.currentframe()
+    assert frame is not None
+    return frame
+
+
+def make_other_frame(x):
+    frame = inspect.currentframe()
+    assert frame is not None
+    return frame
+
+
+def translated_fn(x):
+    return x + 1
+
+
+def mock_start_translate(frame: FrameType, **kwargs):
+    x = frame.f_locals['x']
+    if x is None:
+        return CustomCode(None, False), dummy_guard
+    return CustomCode(translated_fn.__code__, False), lambda frame: True
+
+
+def fn_with_fallback(x):
+    sot.psdb.fallback()
+    return x + 1
+
+
+@patch(
+    "paddle.jit.sot.opcode_translator.executor.executor_cache.start_translate",
+    mock_start_translate,
+)
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reload_fallback(self):
+        with sot_cache_dir_guard(self.temp_dir.name):
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+            # simulate a new process
+            with test_instruction_translator_cache_context() as ctx:
+                custom_code = ctx(make_frame(None))
+                self.assertIsNone(custom_code.code)
+                self.assertEqual(ctx.translate_count, 0)
+
+    def test_skip_translated_code(self):
+        with sot_cache_dir_guard(self.temp_dir.name):
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(1))
+            cache = get_persistent_cache()
+            self.assertFalse(os.path.exists(cache._path(make_frame.__code__)))
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(1))
+                self.assertEqual(ctx.translate_count, 1)
+
+    def check_invalid_file(self, modify):
+        with sot_cache_dir_guard(self.temp_dir.name):
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+            path = get_persistent_cache()._path(make_frame.__code__)
+            with open(path) as f:
+                data = json.load(f)
+            modify(data)
+            with open(path, "w") as f:
+                json.dump(data, f)
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+                self.assertEqual(ctx.translate_count, 1)
+
+    def test_tampered_file(self):
+        def tamper(data):
+            data["entries"][0]["disable_eval_frame"] = True
+
+        self.check_invalid_file(tamper)
+
+    def test_invalid_entry(self):
+        def corrupt(data):
+            data["entries"] = [{"disable_eval_frame": "__import__('os')"}]
+            data["checksum"] = "0" * 64
+
+        self.check_invalid_file(corrupt)
+
+    def test_broken_file(self):
+        with sot_cache_dir_guard(self.temp_dir.name):
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+            path = get_persistent_cache()._path(make_frame.__code__)
+            with open(path, "wb") as f:
+                f.write(b"broken")
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+                self.assertEqual(ctx.translate_count, 1)
+            # the broken file is replaced with a valid one
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+                self.assertEqual(ctx.translate_count, 0)
+
+    def test_evict(self):
+        with sot_cache_dir_guard(self.temp_dir.name):
+            with test_instruction_translator_cache_context() as ctx:
+                ctx(make_frame(None))
+                cache = get_persistent_cache()
+                path = cache._path(make_frame.__code__)
+                cache.max_size = os.path.getsize(path)
+                # mark it as least recently used
+                os.utime(path, (0, 0))
+                ctx(make_other_frame(None))
+            self.assertFalse(os.path.exists(cache._path(make_frame.__code__)))
+            self.assertTrue(
+                os.path.exists(cache._path(make_other_frame.__code__))
+            )
+
+
+class TestPersistentCacheWithTranslation(unittest.TestCase):
+    @strict_mode_guard(False)
+    def test_reload_fallback(self):
+        x = paddle.to_tensor([1.0, 2.0])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with sot_cache_dir_guard(temp_dir):
+                with test_instruction_translator_cache_context() as ctx:
+                    out = symbolic_translate(fn_with_fallback)(x)
+                    self.assertEqual(ctx.translate_count, 1)
+                # simulate a new process
+                with test_instruction_translator_cache_context() as ctx:
+                    reloaded_out = symbolic_translate(fn_with_fallback)(x)
+                    self.assertEqual(ctx.translate_count, 0)
+        np.testing.assert_array_equal(out.numpy(), reloaded_out.numpy())
+        np.testing.assert_array_equal(out.numpy(), (x + 1).numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()